@@ -4,3 +4,16 @@ from .time_manager import LocationAndTimeManager
 from .video_manager import VideoManager
 from .youtube_manager import YouTubeAuth, YouTubeUpload, YouTubeChannelManager
 from .weather_station_info import WeatherStationInfo, MeteoRocks
+from .weather_hub import WeatherHub
+from .frame import Frame
+from .segment_writer import SegmentedVideoWriter
+from .encoders import EncoderBackend, EncoderSettings
+from .job_queue import Job, JobDeferred, JobQueue, JobStatus, JobWorkerPool
+from .worker_priority import WorkerPriority, apply_worker_priority, initialize_worker_process
+from .frame_manifest import FrameManifest, ManifestEntry
+from .media_catalog import CatalogEntry, MediaCatalog
+from .frame_store import MappedFrameStore, PackedFrame, PackedFrameStore
+from .deletion_service import DeletionService, DeletionStats
+from .retention import RetentionEngine, RetentionPolicy, RetentionReport
+from .tier_migrator import MigrationPolicy, MigrationReport, TierMigrator
+from .storage import LocalStorage, S3Storage, StorageBackend
@@ -7,6 +7,12 @@ from calendar import month_name
 # File types
 JPG_FILE: str = ".jpg"
 MP4_FILE: str = ".mp4"
+RAW_FILE: str = ".raw"
+FRAMES_METADATA_FILE: str = "frames.jsonl"
+FRAMES_MANIFEST_FILE: str = "frames.manifest"
+PACKED_FRAMES_FILE: str = "frames.pack"
+MAPPED_FRAMES_DIR: str = ".frames"
+NPY_FILE: str = ".npy"
 LOG_FILE: str = ".log"
 
 # Cacheing configurations
@@ -89,6 +95,34 @@ class AuthMethod(Enum):
 
 # Video defaults
 DEFAULT_VIDEO_CODEC = "mp4v"
+DEFAULT_FFMPEG_VIDEO_CODEC: str = "libx264"
+SEGMENTS_DIR: str = ".segments"
+SEGMENT_FILE_PREFIX: str = "segment_"
+PART_FILE_SUFFIX: str = ".part"
+DEFAULT_FRAMES_PER_SEGMENT: int = 300
+DEFAULT_SEGMENT_SECONDS: int = 300
+DEFAULT_MAPPED_FRAMES_PER_SEGMENT: int = 240
+DEFAULT_READ_AHEAD_FRAMES: int = 8
+DEFAULT_READ_AHEAD_WORKERS: int = 4
+FFMPEG_EXECUTABLE: str = "ffmpeg"
+SUMMARY_SEEK_THRESHOLD_FRAMES: int = 30
+MIN_FRAMES_PER_CHUNK: int = 100
+JOBS_DB_FILE: str = "jobs.sqlite3"
+DEFAULT_JOB_WORKERS: int = 2
+DEFAULT_JOB_MAX_ATTEMPTS: int = 5
+DEFAULT_JOB_BACKOFF_SECONDS: float = 30.0
+DEFAULT_JOB_MAX_BACKOFF_SECONDS: float = 3600.0
+DEFAULT_JOB_POLL_SECONDS: float = 5.0
+# the jobs which put the response of a video created by a job to the video queue, e.g. for its upload
+UPLOAD_JOB_TYPE: str = "upload"
+DEFAULT_WORKER_NICE: int = 10
+IONICE_EXECUTABLE: str = "ionice"
+CATALOG_DB_FILE: str = "catalog.sqlite3"
+FRAMES_MEDIA_TYPE: str = "frames"
+CATALOG_BACKFILL_MARK: str = "backfill"
+RETENTION_CHECK_SECONDS: int = 300
+TRASH_DIR: str = ".trash"
+DEFAULT_DELETION_BATCH_SIZE: int = 256
 DEFAULT_VIDEO_DESCRIPTION = (
     "Video created with Automatic Time Lapse Creator"
 )
@@ -97,6 +131,7 @@ WEEKLY_SUMMARY_VIDEO_DESCRIPTION = "Weekly summary of all daily videos for "
 BLACK_BACKGROUND = (0, 0, 0)
 WHITE_TEXT = (255, 255, 255)
 FILLED_RECTANGLE_VALUE = -1
+DEFAULT_TEXT_BOX_CACHE_SIZE = 64
 
 class VideoType(Enum):
     DAILY = "daily"
@@ -104,5 +139,33 @@ class VideoType(Enum):
     MONTHLY = "monthly"
     ANNUALLY = "annually"
 
+# RetentionEngine defaults, media with a lower priority are evicted first
+DEFAULT_RETENTION_PRIORITIES: dict[str, int] = {
+    FRAMES_MEDIA_TYPE: 0,
+    VideoType.DAILY.value: 1,
+    VideoType.WEEKLY.value: 2,
+    VideoType.MONTHLY.value: 3,
+    VideoType.ANNUALLY.value: 4,
+}
+
+# TierMigrator defaults, the age in days after which the videos are moved to the cold tier
+DEFAULT_MIGRATION_AGE_DAYS: dict[str, int] = {
+    VideoType.DAILY.value: 7,
+    VideoType.WEEKLY.value: 30,
+    VideoType.MONTHLY.value: 30,
+}
+MIGRATION_CHUNK_SIZE: int = 1024 * 1024
+
+# S3Storage defaults, the parts of a multipart upload (except the last) must be at least 5 MiB
+S3_MIN_PART_SIZE: int = 5 * 1024 * 1024
+DEFAULT_S3_PART_SIZE: int = 8 * 1024 * 1024
+DEFAULT_S3_UPLOAD_WORKERS: int = 4
+DEFAULT_S3_FRAMES_BATCH_SIZE: int = 50
+DEFAULT_S3_UPLOAD_ATTEMPTS: int = 3
+DEFAULT_S3_RETRY_SECONDS: float = 1.0
+S3_PENDING_FILE: str = ".s3_pending"
+
 # WeatherStationInfo defaults
-OLD_TIMESTAMP_HOURS = 5
\ No newline at end of file
+OLD_TIMESTAMP_HOURS = 5
+DEFAULT_WEATHER_REFRESH_SECONDS = 300
+STALE_WEATHER_DATA_MARK = "(old data)"
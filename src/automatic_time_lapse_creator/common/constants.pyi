@@ -4,6 +4,12 @@ from logging import Formatter
 # File types
 JPG_FILE: str
 MP4_FILE: str
+RAW_FILE: str
+FRAMES_METADATA_FILE: str
+FRAMES_MANIFEST_FILE: str
+PACKED_FRAMES_FILE: str
+MAPPED_FRAMES_DIR: str
+NPY_FILE: str
 LOG_FILE: str
 
 # Cacheing configurations
@@ -82,12 +88,40 @@ class AuthMethod(Enum):
 
 # Video defaults
 DEFAULT_VIDEO_CODEC: str
+DEFAULT_FFMPEG_VIDEO_CODEC: str
+SEGMENTS_DIR: str
+SEGMENT_FILE_PREFIX: str
+PART_FILE_SUFFIX: str
+DEFAULT_FRAMES_PER_SEGMENT: int
+DEFAULT_SEGMENT_SECONDS: int
+DEFAULT_MAPPED_FRAMES_PER_SEGMENT: int
+DEFAULT_READ_AHEAD_FRAMES: int
+DEFAULT_READ_AHEAD_WORKERS: int
+FFMPEG_EXECUTABLE: str
+SUMMARY_SEEK_THRESHOLD_FRAMES: int
+MIN_FRAMES_PER_CHUNK: int
+JOBS_DB_FILE: str
+DEFAULT_JOB_WORKERS: int
+DEFAULT_JOB_MAX_ATTEMPTS: int
+DEFAULT_JOB_BACKOFF_SECONDS: float
+DEFAULT_JOB_MAX_BACKOFF_SECONDS: float
+DEFAULT_JOB_POLL_SECONDS: float
+UPLOAD_JOB_TYPE: str
+DEFAULT_WORKER_NICE: int
+IONICE_EXECUTABLE: str
+CATALOG_DB_FILE: str
+FRAMES_MEDIA_TYPE: str
+CATALOG_BACKFILL_MARK: str
+RETENTION_CHECK_SECONDS: int
+TRASH_DIR: str
+DEFAULT_DELETION_BATCH_SIZE: int
 DEFAULT_VIDEO_DESCRIPTION: str
 MONTHLY_SUMMARY_VIDEO_DESCRIPTION: str
 WEEKLY_SUMMARY_VIDEO_DESCRIPTION: str
 BLACK_BACKGROUND: tuple[int]
 WHITE_TEXT: tuple[int]
 FILLED_RECTANGLE_VALUE: int
+DEFAULT_TEXT_BOX_CACHE_SIZE: int
 
 class VideoType(Enum):
     DAILY: Enum
@@ -95,6 +129,19 @@ class VideoType(Enum):
     MONTHLY: Enum
     ANNUALLY: Enum
 
+DEFAULT_RETENTION_PRIORITIES: dict[str, int]
+DEFAULT_MIGRATION_AGE_DAYS: dict[str, int]
+MIGRATION_CHUNK_SIZE: int
+S3_MIN_PART_SIZE: int
+DEFAULT_S3_PART_SIZE: int
+DEFAULT_S3_UPLOAD_WORKERS: int
+DEFAULT_S3_FRAMES_BATCH_SIZE: int
+DEFAULT_S3_UPLOAD_ATTEMPTS: int
+DEFAULT_S3_RETRY_SECONDS: float
+S3_PENDING_FILE: str
+
 
 # WeatherStationInfo defaults
-OLD_TIMESTAMP_HOURS: int
\ No newline at end of file
+OLD_TIMESTAMP_HOURS: int
+DEFAULT_WEATHER_REFRESH_SECONDS: int
+STALE_WEATHER_DATA_MARK: str
@@ -63,6 +63,25 @@ def configure_root_logger(
     return logger
 
 
+def configure_worker_logger(log_queue: Queue[Any], logger_name: str) -> Logger:
+    """
+    Sends the records of a logger in a worker process to the log_queue of the parent.
+
+    The handlers of the parent are inherited only by forked processes, so a logger which
+    is passed to a spawned worker has none. The existing handlers are replaced, so a forked
+    worker does not log twice.
+    """
+    logger: Logger = logging.getLogger(logger_name)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    handler = QueueHandler(log_queue)
+    handler.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
 def configure_child_logger(logger_name: str, logger: Logger | None):
 
     if logger is None:
@@ -8,4 +8,6 @@ def configure_root_logger(
     logger_name: str = ...,
 ) -> Logger: ...
 
+def configure_worker_logger(log_queue: Queue[str | LogRecord], logger_name: str) -> Logger: ...
+
 def configure_child_logger(logger_name: str, logger: Logger | None) -> Logger: ...
\ No newline at end of file
@@ -1,12 +1,14 @@
 import os
 import json
+import shutil
 from abc import ABC
 from .constants import (
     DEFAULT_VIDEO_DESCRIPTION,
     MONTHLY_SUMMARY_VIDEO_DESCRIPTION,
     MONTH_NAMES,
     VideoType,
-    MP4_FILE
+    MP4_FILE,
+    FFMPEG_EXECUTABLE,
 )
 from pathlib import Path
 from datetime import datetime
@@ -65,6 +67,9 @@ class MonthlyVideoResponse(VideoResponse):
 class WeeklyVideoResponse(MonthlyVideoResponse):
     video_type = VideoType.WEEKLY.value
 
+class AnnualVideoResponse(MonthlyVideoResponse):
+    video_type = VideoType.ANNUALLY.value
+
 
 def create_log_message(location: str, url: str, method: str) -> str:
     """
@@ -127,4 +132,50 @@ def get_weekly_video_files_paths(folder_path: Path) -> list[str]:
     """
     Recursively traverse the folder_path and return a sorted list with the MP4 videos
     """
-    return sorted(map(str, folder_path.rglob(f"*{MP4_FILE}")))
\ No newline at end of file
+    return sorted(map(str, folder_path.rglob(f"*{MP4_FILE}")))
+
+def get_jpeg_size(image_bytes: bytes) -> tuple[int, int] | None:
+    """Reads the size of a JPEG image from its start of frame (SOF) header without decoding it.
+
+    Args::
+        image_bytes: bytes - the encoded image
+
+    Returns::
+        tuple[int, int] | None - (width, height) of the image or None if the bytes are not a JPEG
+            or the header could not be found
+    """
+    if image_bytes[:2] != b"\xff\xd8":
+        return None
+
+    index = 2
+    length = len(image_bytes)
+    while index + 4 <= length:
+        if image_bytes[index] != 0xFF:
+            return None
+        marker = image_bytes[index + 1]
+        if marker == 0xFF:
+            index += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            index += 2
+            continue
+
+        segment_length = int.from_bytes(image_bytes[index + 2 : index + 4], "big")
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            if index + 9 > length:
+                return None
+            height = int.from_bytes(image_bytes[index + 5 : index + 7], "big")
+            width = int.from_bytes(image_bytes[index + 7 : index + 9], "big")
+            return width, height
+        index += 2 + segment_length
+
+    return None
+
+
+def find_ffmpeg() -> str | None:
+    """Looks for the ffmpeg executable on the PATH.
+
+    Returns::
+        str | None - the path to the executable or None if ffmpeg is not installed
+    """
+    return shutil.which(FFMPEG_EXECUTABLE)
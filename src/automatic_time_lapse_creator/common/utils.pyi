@@ -48,6 +48,9 @@ class MonthlyVideoResponse(VideoResponse):
 class WeeklyVideoResponse(MonthlyVideoResponse):
     ...
 
+class AnnualVideoResponse(MonthlyVideoResponse):
+    ...
+
 def create_log_message(location: str, url: str, method: str) -> str: ...
 
 def shorten(path: str) -> str: ...
@@ -56,4 +59,8 @@ def dash_sep_strings(*args: str, sep: str = "-") -> str: ...
 
 def create_description_for_monthly_video(monthly_video: str) -> str: ...
 
-def get_weekly_video_files_paths(folder_path: Path) -> list[str]: ...
\ No newline at end of file
+def get_weekly_video_files_paths(folder_path: Path) -> list[str]: ...
+
+def get_jpeg_size(image_bytes: bytes) -> tuple[int, int] | None: ...
+
+def find_ffmpeg() -> str | None: ...
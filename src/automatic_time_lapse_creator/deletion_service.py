@@ -0,0 +1,281 @@
+from __future__ import annotations
+import logging
+import os
+import time
+import uuid
+from itertools import islice
+from logging import Logger
+from pathlib import Path
+from queue import Queue
+from threading import Event, Lock, Thread
+from typing import Callable, Iterable, Iterator, NamedTuple
+from .common.constants import DEFAULT_DELETION_BATCH_SIZE, JPG_FILE, MAPPED_FRAMES_DIR, PACKED_FRAMES_FILE, TRASH_DIR
+from .common.utils import shorten
+from .frame_manifest import FrameManifest
+
+
+class DeletionStats(NamedTuple):
+    """The totals of a DeletionService."""
+    files: int
+    folders: int
+    bytes_freed: int
+    errors: int
+
+
+class _DeletionTask(NamedTuple):
+    """Files (or whole trees) to delete in the background and the folder to remove when it is empty."""
+    label: str
+    paths: list[str]
+    pattern: tuple[str, str, float] | None
+    remove_folder: str | None
+
+
+class DeletionService:
+    """
+    Deletes the processed frames and videos in a background thread, so the capture and the
+    encoding never wait for thousands of unlinks.
+
+    Everything which can be detached at once is moved out of the way when the deletion is
+    requested: the folders (and the packed frames) are renamed into the TRASH_DIR of the base
+    path, the frames listed in a FrameManifest are taken from the manifest. The files are then
+    deleted by the worker thread in batches of batch_size entries read with os.scandir, with an
+    optional pause between the batches. The files of a folder which is scanned in the background
+    are deleted only if they were modified before the request, so the frames saved in the same
+    folder afterwards are kept.
+
+    close() finishes the requested deletions. The trash left by a process which was stopped before
+    (or by a close() whose timeout expired) is deleted when the next service starts.
+    """
+
+    def __init__(
+        self,
+        base_path: str | Path,
+        batch_size: int = DEFAULT_DELETION_BATCH_SIZE,
+        pause: float = 0.0,
+        logger: Logger | None = None,
+        initializer: Callable[[], None] | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.trash = Path(base_path) / TRASH_DIR
+        self.batch_size = max(1, batch_size)
+        self.pause = pause
+        self.initializer = initializer
+        self._tasks: Queue[_DeletionTask | None] = Queue()
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread: Thread | None = None
+        self._files = self._folders = self._bytes = self._errors = 0
+
+        if self.trash.is_dir():
+            leftovers = [str(path) for path in self.trash.iterdir()]
+            if leftovers:
+                self.__submit(_DeletionTask(shorten(str(self.trash)), leftovers, None, None))
+
+    @property
+    def stats(self) -> DeletionStats:
+        """The files, folders and bytes deleted so far and the number of the failed deletions."""
+        with self._lock:
+            return DeletionStats(self._files, self._folders, self._bytes, self._errors)
+
+    @property
+    def pending(self) -> int:
+        """The number of the requested deletions which are not finished."""
+        return self._tasks.unfinished_tasks
+
+    def delete_folder(self, path: str | Path) -> bool:
+        """
+        Renames the folder into the trash and deletes it in the background.
+
+        Returns:
+            bool - False if the folder does not exist
+        """
+        path = Path(path)
+        if not path.exists():
+            return False
+        self.__submit(_DeletionTask(shorten(str(path)), [self.__detach(path)], None, None))
+        return True
+
+    def delete_media_files(self, path: str | Path, extension: str = JPG_FILE, delete_folder: bool = False) -> None:
+        """
+        Deletes the files with the extension from the folder in the background, like
+        VideoManager.delete_source_media_files. The packed and the mapped frames of the folder are
+        detached and the manifest is removed before this method returns.
+
+        Args:
+            path: str | Path - the folder path
+            extension: str - the file extension of the files intended for deletion
+            delete_folder: bool - if the folder should be deleted after the files. The folder is
+                deleted only if it's empty
+        """
+        path = Path(path)
+        paths: list[str] = []
+        pattern: tuple[str, str, float] | None = None
+        if extension == JPG_FILE:
+            for store in (path / PACKED_FRAMES_FILE, path / MAPPED_FRAMES_DIR):
+                if store.exists():
+                    paths.append(self.__detach(store))
+            if FrameManifest.exists(path):
+                manifest = FrameManifest(path)
+                paths.extend(manifest.frame_files(extension))
+                manifest.remove()
+            else:
+                pattern = (str(path), extension, time.time())
+        else:
+            pattern = (str(path), extension, time.time())
+
+        self.__submit(_DeletionTask(shorten(str(path)), paths, pattern, str(path) if delete_folder else None))
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Waits until the requested deletions are finished.
+
+        Returns:
+            bool - False if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._tasks.all_tasks_done:
+            while self._tasks.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._tasks.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = None) -> None:
+        """Finishes the requested deletions and stops the worker thread. If the timeout expires first,
+        the worker stops after its current batch and the detached files left in the trash are deleted
+        by the next service."""
+        if self._thread is not None:
+            self._tasks.put(None)
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                self._stop.set()
+            self._thread = None
+
+    def __detach(self, path: Path) -> str:
+        """Renames the path into the trash. Returns the path to delete."""
+        target = self.trash / f"{uuid.uuid4().hex}-{path.name}"
+        try:
+            self.trash.mkdir(parents=True, exist_ok=True)
+            os.rename(path, target)
+            return str(target)
+        except OSError as exc:
+            # e.g. the folder is on another filesystem, it is deleted in place
+            self.logger.warning(f"Could not move {shorten(str(path))} to the trash: {exc}")
+            return str(path)
+
+    def __submit(self, task: _DeletionTask) -> None:
+        self._tasks.put(task)
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = Thread(target=self._work, name="deletion-service", daemon=True)
+                self._thread.start()
+
+    def _work(self) -> None:
+        if self.initializer is not None:
+            self.initializer()
+        while True:
+            task = self._tasks.get()
+            if task is None or self._stop.is_set():
+                self._tasks.task_done()
+                return
+            try:
+                self.__run(task)
+            except Exception as exc:
+                self.logger.error(f"Deleting from {task.label} failed: {exc}", exc_info=True)
+            finally:
+                self._tasks.task_done()
+
+    def __run(self, task: _DeletionTask) -> None:
+        before = self.stats
+        self.__delete_paths(task.paths)
+        if task.pattern is not None:
+            folder, extension, requested_at = task.pattern
+            try:
+                self.__delete_paths(
+                    entry.path for entry in os.scandir(folder)
+                    if entry.name.endswith(extension)
+                    and entry.is_file(follow_symlinks=False)
+                    and entry.stat(follow_symlinks=False).st_mtime <= requested_at
+                )
+            except FileNotFoundError:
+                pass
+        if task.remove_folder is not None:
+            try:
+                os.rmdir(task.remove_folder)
+                self.__count(folders=1)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                self.logger.info(f"Folder {shorten(task.remove_folder)} is not empty and was not deleted")
+
+        after = self.stats
+        self.logger.info(
+            f"Deleted {after.files - before.files} files ({after.bytes_freed - before.bytes_freed} bytes) "
+            f"from {task.label}"
+        )
+
+    def __delete_paths(self, paths: Iterable[str]) -> None:
+        """Deletes the files and trees in batches."""
+        paths = iter(paths)
+        while batch := list(islice(paths, self.batch_size)):
+            for path in batch:
+                if os.path.isdir(path) and not os.path.islink(path):
+                    self.__delete_tree(path)
+                else:
+                    self.__delete_file(path)
+            if self._stop.is_set():
+                return
+            if self.pause:
+                time.sleep(self.pause)
+
+    def __delete_tree(self, root: str) -> None:
+        """Deletes the files of the tree in batches, then its folders."""
+        folders = [root]
+        for folder in folders:
+            try:
+                self.__delete_paths(self.__files(folder, folders))
+            except FileNotFoundError:
+                continue
+        for folder in reversed(folders):
+            try:
+                os.rmdir(folder)
+                self.__count(folders=1)
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                self.logger.warning(f"Could not delete {shorten(folder)}: {exc}")
+                self.__count(errors=1)
+
+    @staticmethod
+    def __files(folder: str, folders: list[str]) -> Iterator[str]:
+        """Yields the files of the folder and appends its subfolders to folders."""
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    folders.append(entry.path)
+                else:
+                    yield entry.path
+
+    def __delete_file(self, path: str) -> None:
+        try:
+            size = os.lstat(path).st_size
+            os.remove(path)
+            self.__count(files=1, freed=size)
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            self.logger.warning(f"Could not delete {shorten(path)}: {exc}")
+            self.__count(errors=1)
+
+    def __count(self, files: int = 0, folders: int = 0, freed: int = 0, errors: int = 0) -> None:
+        with self._lock:
+            self._files += files
+            self._folders += folders
+            self._bytes += freed
+            self._errors += errors
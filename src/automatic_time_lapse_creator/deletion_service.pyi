@@ -0,0 +1,49 @@
+from logging import Logger
+from pathlib import Path
+from queue import Queue
+from threading import Event, Lock, Thread
+from typing import Callable, NamedTuple
+
+class DeletionStats(NamedTuple):
+    files: int
+    folders: int
+    bytes_freed: int
+    errors: int
+
+class _DeletionTask(NamedTuple):
+    label: str
+    paths: list[str]
+    pattern: tuple[str, str, float] | None
+    remove_folder: str | None
+
+class DeletionService:
+    logger: Logger
+    trash: Path
+    batch_size: int
+    pause: float
+    initializer: Callable[[], None] | None
+    _tasks: Queue[_DeletionTask | None]
+    _lock: Lock
+    _stop: Event
+    _thread: Thread | None
+    _files: int
+    _folders: int
+    _bytes: int
+    _errors: int
+    def __init__(
+        self,
+        base_path: str | Path,
+        batch_size: int = ...,
+        pause: float = ...,
+        logger: Logger | None = ...,
+        initializer: Callable[[], None] | None = ...,
+    ) -> None: ...
+    @property
+    def stats(self) -> DeletionStats: ...
+    @property
+    def pending(self) -> int: ...
+    def delete_folder(self, path: str | Path) -> bool: ...
+    def delete_media_files(self, path: str | Path, extension: str = ..., delete_folder: bool = ...) -> None: ...
+    def wait(self, timeout: float | None = ...) -> bool: ...
+    def close(self, timeout: float | None = ...) -> None: ...
+    def _work(self) -> None: ...
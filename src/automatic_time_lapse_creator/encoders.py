@@ -0,0 +1,308 @@
+from __future__ import annotations
+import cv2
+import logging
+import os
+import subprocess
+import numpy as np
+from abc import ABC, abstractmethod
+from enum import Enum
+from logging import Logger
+from typing import Any, NamedTuple
+from cv2.typing import MatLike
+from .common.constants import DEFAULT_VIDEO_CODEC, DEFAULT_FFMPEG_VIDEO_CODEC
+from .common.utils import find_ffmpeg
+
+try:
+    import av  # type: ignore
+except ImportError:  # PyAV is an optional dependency
+    av = None
+
+
+class EncoderBackend(Enum):
+    OPENCV = "opencv"
+    FFMPEG = "ffmpeg"
+    PYAV = "pyav"
+
+
+class EncoderSettings(NamedTuple):
+    """
+    The settings of the video encoder.
+
+    Attributes:
+        backend: EncoderBackend - the library which encodes the video, defaults to EncoderBackend.OPENCV
+        codec: str | None - the codec, e.g. "libx264", "libx265" or "libsvtav1" for FFMPEG and PYAV
+            (defaults to DEFAULT_FFMPEG_VIDEO_CODEC) or a fourcc for OPENCV (defaults to DEFAULT_VIDEO_CODEC)
+        crf: int | None - the constant rate factor (quality) of the encoder, ignored by OPENCV
+        bitrate: str | None - the target bitrate (e.g. "2M") if crf is not set, ignored by OPENCV
+        preset: str | None - the speed/size preset of the encoder (e.g. "veryfast"), ignored by OPENCV
+        threads: int | None - the number of encoding threads (0 or None - chosen by the encoder), ignored by OPENCV
+    """
+    backend: EncoderBackend = EncoderBackend.OPENCV
+    codec: str | None = None
+    crf: int | None = None
+    bitrate: str | None = None
+    preset: str | None = None
+    threads: int | None = None
+
+
+class VideoEncoder(ABC):
+    """
+    Writes BGR frames of the same size into a video file.
+
+    The encoder is a context manager: if an exception leaves the with block, the encoder is
+    stopped with abort(), so no encoder process or incomplete video is left behind.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        fps: int,
+        frame_size: tuple[int, int],
+        settings: EncoderSettings,
+        logger: Logger | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.output_path = output_path
+        self.fps = fps
+        self.frame_size = frame_size
+        self.settings = settings
+
+    def __enter__(self) -> VideoEncoder:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: Any) -> None:
+        if exc_type is not None:
+            self.abort()
+
+    def is_opened(self) -> bool:
+        """Returns False if the encoder could not open the video, so the frames would be lost."""
+        return True
+
+    @abstractmethod
+    def write(self, frame: MatLike) -> None:
+        pass
+
+    @abstractmethod
+    def release(self) -> bool:
+        """Finishes the video. Returns True if the video was written successfully."""
+        pass
+
+    def abort(self) -> None:
+        """Stops the encoder after an error and removes the incomplete video."""
+        try:
+            self._stop()
+        except Exception as exc:
+            self.logger.warning(f"Could not stop the encoder of {self.output_path}: {exc}")
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+    def _stop(self) -> None:
+        """Releases the resources of the encoder without finishing the video."""
+        self.release()
+
+
+class OpenCVEncoder(VideoEncoder):
+    """Encodes the video with cv2.VideoWriter (single threaded, only the codec can be chosen)."""
+
+    def __init__(
+        self,
+        output_path: str,
+        fps: int,
+        frame_size: tuple[int, int],
+        settings: EncoderSettings,
+        logger: Logger | None = None,
+    ) -> None:
+        super().__init__(output_path, fps, frame_size, settings, logger)
+        fourcc = cv2.VideoWriter.fourcc(*(settings.codec or DEFAULT_VIDEO_CODEC))
+        self._writer = cv2.VideoWriter(output_path, fourcc, fps, frame_size)
+
+    def is_opened(self) -> bool:
+        return self._writer.isOpened()
+
+    def write(self, frame: MatLike) -> None:
+        self._writer.write(frame)
+
+    def release(self) -> bool:
+        self._writer.release()
+        return True
+
+
+class FFmpegPipeEncoder(VideoEncoder):
+    """Pipes raw BGR frames to a local ffmpeg process, so any codec of the ffmpeg build
+    (multithreaded H.264, HEVC, AV1...) can be used."""
+
+    def __init__(
+        self,
+        output_path: str,
+        fps: int,
+        frame_size: tuple[int, int],
+        settings: EncoderSettings,
+        logger: Logger | None = None,
+        ffmpeg: str | None = None,
+    ) -> None:
+        super().__init__(output_path, fps, frame_size, settings, logger)
+        executable = ffmpeg or find_ffmpeg()
+        if executable is None:
+            raise FileNotFoundError("ffmpeg was not found on the PATH")
+
+        self._process = subprocess.Popen(
+            self.build_command(executable, output_path, fps, frame_size, settings),
+            stdin=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+    def is_opened(self) -> bool:
+        return self._process.poll() is None
+
+    @staticmethod
+    def build_command(
+        ffmpeg: str,
+        output_path: str,
+        fps: int,
+        frame_size: tuple[int, int],
+        settings: EncoderSettings,
+    ) -> list[str]:
+        """Returns the ffmpeg command reading raw frames from stdin."""
+        width, height = frame_size
+        command = [
+            ffmpeg, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}", "-r", str(fps),
+            "-i", "-",
+            "-c:v", settings.codec or DEFAULT_FFMPEG_VIDEO_CODEC,
+        ]
+        if settings.crf is not None:
+            command += ["-crf", str(settings.crf)]
+        elif settings.bitrate is not None:
+            command += ["-b:v", settings.bitrate]
+        if settings.preset is not None:
+            command += ["-preset", settings.preset]
+        if settings.threads is not None:
+            command += ["-threads", str(settings.threads)]
+        # yuv420p (needed by most players) requires even width and height
+        command += [
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-pix_fmt", "yuv420p",
+            "-movflags", "+faststart",
+            output_path,
+        ]
+        return command
+
+    def write(self, frame: MatLike) -> None:
+        if self._process.stdin is not None:
+            self._process.stdin.write(np.ascontiguousarray(frame).tobytes())
+
+    def release(self) -> bool:
+        _, stderr = self._process.communicate()
+        if self._process.returncode != 0:
+            self.logger.error(f"ffmpeg failed to encode {self.output_path}: {stderr.decode().strip()}")
+            return False
+        return True
+
+    def _stop(self) -> None:
+        self._process.kill()
+        self._process.communicate()
+
+
+class PyAVEncoder(VideoEncoder):
+    """Encodes the video in process with PyAV (libav). Requires the optional "av" package."""
+
+    def __init__(
+        self,
+        output_path: str,
+        fps: int,
+        frame_size: tuple[int, int],
+        settings: EncoderSettings,
+        logger: Logger | None = None,
+    ) -> None:
+        super().__init__(output_path, fps, frame_size, settings, logger)
+        if av is None:
+            raise ImportError('PyAV is not installed, install it with "pip install av"')
+
+        options: dict[str, str] = {}
+        if settings.crf is not None:
+            options["crf"] = str(settings.crf)
+        if settings.preset is not None:
+            options["preset"] = settings.preset
+
+        self._container: Any = av.open(output_path, mode="w")
+        self._stream: Any = self._container.add_stream(
+            settings.codec or DEFAULT_FFMPEG_VIDEO_CODEC, rate=fps, options=options
+        )
+        width, height = frame_size
+        self._padded_size = (width + width % 2, height + height % 2)
+        self._stream.width, self._stream.height = self._padded_size
+        self._stream.pix_fmt = "yuv420p"
+        if settings.crf is None and settings.bitrate is not None:
+            self._stream.bit_rate = self.parse_bitrate(settings.bitrate)
+        if settings.threads is not None:
+            self._stream.thread_count = settings.threads
+
+    @staticmethod
+    def parse_bitrate(bitrate: str) -> int:
+        """Converts an ffmpeg style bitrate ("2500k", "2M") to bits per second."""
+        multipliers = {"k": 1_000, "m": 1_000_000}
+        suffix = bitrate[-1].lower()
+        if suffix in multipliers:
+            return int(float(bitrate[:-1]) * multipliers[suffix])
+        return int(bitrate)
+
+    def write(self, frame: MatLike) -> None:
+        # yuv420p needs even dimensions, pad the bottom and right edges like the ffmpeg pad filter
+        width, height = self._padded_size
+        pad_bottom, pad_right = height - frame.shape[0], width - frame.shape[1]
+        if pad_bottom > 0 or pad_right > 0:
+            frame = cv2.copyMakeBorder(
+                frame, 0, max(pad_bottom, 0), 0, max(pad_right, 0), cv2.BORDER_CONSTANT, value=(0, 0, 0)
+            )
+        video_frame = av.VideoFrame.from_ndarray(np.ascontiguousarray(frame), format="bgr24")
+        for packet in self._stream.encode(video_frame):
+            self._container.mux(packet)
+
+    def release(self) -> bool:
+        for packet in self._stream.encode(None):
+            self._container.mux(packet)
+        self._container.close()
+        return True
+
+    def _stop(self) -> None:
+        self._container.close()
+
+
+ENCODERS: dict[EncoderBackend, type[VideoEncoder]] = {
+    EncoderBackend.OPENCV: OpenCVEncoder,
+    EncoderBackend.FFMPEG: FFmpegPipeEncoder,
+    EncoderBackend.PYAV: PyAVEncoder,
+}
+
+
+def create_encoder(
+    output_path: str,
+    fps: int,
+    frame_size: tuple[int, int],
+    settings: EncoderSettings | None = None,
+    logger: Logger | None = None,
+) -> VideoEncoder:
+    """
+    Creates the encoder of the chosen backend. If the backend is not available (ffmpeg is not
+    installed or PyAV is not importable) the video is encoded with OpenCV instead.
+
+    Args:
+        output_path: str - the path of the video
+        fps: int - frames per second of the video
+        frame_size: tuple[int, int] - (width, height) of the frames
+        settings: EncoderSettings | None - defaults to EncoderSettings()
+        logger: Logger | None - the logger of the encoder and of the fallback warning
+
+    Returns:
+        VideoEncoder - the encoder, which should be released after the last frame
+    """
+    settings = settings if settings is not None else EncoderSettings()
+    try:
+        return ENCODERS[settings.backend](output_path, fps, frame_size, settings, logger)
+    except (ImportError, FileNotFoundError) as exc:
+        (logger or logging.getLogger(__name__)).warning(f"{exc}. The video will be encoded with OpenCV.")
+        return OpenCVEncoder(output_path, fps, frame_size, settings._replace(codec=None), logger)
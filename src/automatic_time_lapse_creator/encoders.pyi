@@ -0,0 +1,80 @@
+import subprocess
+from enum import Enum
+from logging import Logger
+from typing import Any, NamedTuple
+from cv2.typing import MatLike
+
+class EncoderBackend(Enum):
+    OPENCV = "opencv"
+    FFMPEG = "ffmpeg"
+    PYAV = "pyav"
+
+class EncoderSettings(NamedTuple):
+    backend: EncoderBackend = ...
+    codec: str | None = ...
+    crf: int | None = ...
+    bitrate: str | None = ...
+    preset: str | None = ...
+    threads: int | None = ...
+
+class VideoEncoder:
+    logger: Logger
+    output_path: str
+    fps: int
+    frame_size: tuple[int, int]
+    settings: EncoderSettings
+    def __init__(
+        self,
+        output_path: str,
+        fps: int,
+        frame_size: tuple[int, int],
+        settings: EncoderSettings,
+        logger: Logger | None = ...,
+    ) -> None: ...
+    def __enter__(self) -> VideoEncoder: ...
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: Any) -> None: ...
+    def is_opened(self) -> bool: ...
+    def write(self, frame: MatLike) -> None: ...
+    def release(self) -> bool: ...
+    def abort(self) -> None: ...
+    def _stop(self) -> None: ...
+
+class OpenCVEncoder(VideoEncoder):
+    _writer: Any
+
+class FFmpegPipeEncoder(VideoEncoder):
+    _process: subprocess.Popen[bytes]
+    def __init__(
+        self,
+        output_path: str,
+        fps: int,
+        frame_size: tuple[int, int],
+        settings: EncoderSettings,
+        logger: Logger | None = ...,
+        ffmpeg: str | None = ...,
+    ) -> None: ...
+    @staticmethod
+    def build_command(
+        ffmpeg: str,
+        output_path: str,
+        fps: int,
+        frame_size: tuple[int, int],
+        settings: EncoderSettings,
+    ) -> list[str]: ...
+
+class PyAVEncoder(VideoEncoder):
+    _container: Any
+    _stream: Any
+    _padded_size: tuple[int, int]
+    @staticmethod
+    def parse_bitrate(bitrate: str) -> int: ...
+
+ENCODERS: dict[EncoderBackend, type[VideoEncoder]]
+
+def create_encoder(
+    output_path: str,
+    fps: int,
+    frame_size: tuple[int, int],
+    settings: EncoderSettings | None = ...,
+    logger: Logger | None = ...,
+) -> VideoEncoder: ...
@@ -0,0 +1,181 @@
+from __future__ import annotations
+import cv2
+import numpy as np
+from datetime import datetime
+from threading import Lock
+from cv2.typing import MatLike
+from .common.constants import JPG_FILE
+from .common.utils import get_jpeg_size
+
+
+class Frame:
+    """
+    A single image captured from a Source.
+
+    A frame starts either from the encoded bytes (ImageSource, BrowserSource) or from an already
+    decoded BGR image (StreamSource) and materializes the other representations only when they are
+    requested. Every representation is computed at most once and shared by all consumers of the
+    frame (blank detection, the overlay and the saving of the image), so a frame is decoded once
+    instead of once per consumer.
+
+    If the target_size of the saved image is known, the blank detection uses the colour decode for
+    that size (see image_for_size), so the same decode is reused when the image is saved.
+
+    Attributes:
+        source_name: str | None - the location name of the source which captured the frame
+        captured_at: datetime - the time of the capture
+        target_size: tuple[int, int] | None - (width, height) of the image the frame will be saved as
+    """
+
+    THUMBNAIL_SCALE: int = 8
+    REDUCED_IMREAD_FLAGS: tuple[tuple[int, int], ...] = (
+        (8, cv2.IMREAD_REDUCED_COLOR_8),
+        (4, cv2.IMREAD_REDUCED_COLOR_4),
+        (2, cv2.IMREAD_REDUCED_COLOR_2),
+    )
+
+    def __init__(
+        self,
+        encoded: bytes | None = None,
+        image: MatLike | None = None,
+        source_name: str | None = None,
+        captured_at: datetime | None = None,
+        target_size: tuple[int, int] | None = None,
+    ) -> None:
+        if encoded is None and image is None:
+            raise ValueError("A frame needs either the encoded bytes or the decoded image")
+
+        self.source_name = source_name
+        self.captured_at = captured_at if captured_at is not None else datetime.now()
+        self.target_size = target_size
+        self._encoded = encoded
+        self._image = image
+        self._reduced_images: dict[int, MatLike | None] = {}
+        self._thumbnail: MatLike | None = None
+        self._brightness: float | None = None
+        self._lock = Lock()
+
+    @staticmethod
+    def get_imread_flag(image_bytes: bytes, width: int, height: int) -> int:
+        """
+        Chooses the largest JPEG decode reduction which still gives an image at least as big as
+        the target size. The JPEG decoder scales the image in the DCT domain, so a reduced decode
+        is several times faster and smaller than a full decode followed by cv2.resize.
+
+        Args:
+            image_bytes: bytes - the encoded image
+            width: int - the width of the final image
+            height: int - the height of the final image
+
+        Returns:
+            int - one of the cv2.IMREAD_REDUCED_COLOR_* flags or cv2.IMREAD_COLOR if the image
+                is not a JPEG or is not big enough to be reduced
+        """
+        size = get_jpeg_size(image_bytes)
+        if size is None:
+            return cv2.IMREAD_COLOR
+
+        # compare the sorted sides, the EXIF orientation may swap width and height of the decoded image
+        source_short, source_long = sorted(size)
+        target_short, target_long = sorted((width, height))
+        for factor, flag in Frame.REDUCED_IMREAD_FLAGS:
+            if source_short // factor >= target_short and source_long // factor >= target_long:
+                return flag
+        return cv2.IMREAD_COLOR
+
+    @property
+    def encoded(self) -> bytes | None:
+        """The encoded image (JPEG if the frame was created from a decoded image) or None if
+        the image could not be encoded."""
+        with self._lock:
+            if self._encoded is None and self._image is not None:
+                success, buffer = cv2.imencode(JPG_FILE, self._image)
+                self._encoded = buffer.tobytes() if success else b""
+            return self._encoded or None
+
+    @property
+    def image(self) -> MatLike | None:
+        """The decoded BGR image at full resolution or None if the bytes could not be decoded."""
+        with self._lock:
+            return self.__full_image()
+
+    def image_for_size(self, width: int, height: int) -> MatLike | None:
+        """
+        Returns the smallest decoded image which is not below (width, height). A full resolution
+        image is returned as it is if it was already decoded.
+
+        Returns:
+            MatLike | None - the decoded BGR image or None if the bytes could not be decoded
+        """
+        with self._lock:
+            return self.__image_for_size(width, height)
+
+    @property
+    def thumbnail(self) -> MatLike | None:
+        """A grayscale image at 1/THUMBNAIL_SCALE of the size, e.g. for blank or duplicate detection.
+        It is downsampled from the colour decode for the target_size (or the full image), if there is one."""
+        with self._lock:
+            if self._thumbnail is None:
+                image = self.__color_image()
+                if image is not None:
+                    gray = image
+                    if gray.ndim == 3:
+                        gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+                    height, width = gray.shape[:2]
+                    self._thumbnail = cv2.resize(
+                        gray,
+                        (max(1, width // self.THUMBNAIL_SCALE), max(1, height // self.THUMBNAIL_SCALE)),
+                        interpolation=cv2.INTER_AREA,
+                    )
+                else:
+                    self._thumbnail = self.__decode(cv2.IMREAD_REDUCED_GRAYSCALE_8)
+            return self._thumbnail
+
+    @property
+    def brightness(self) -> float | None:
+        """The mean brightness (0-255) of the frame or None if it could not be decoded."""
+        if self._brightness is None:
+            thumbnail = self.thumbnail
+            if thumbnail is not None:
+                self._brightness = float(thumbnail.mean())
+        return self._brightness
+
+    @property
+    def size(self) -> tuple[int, int] | None:
+        """(width, height) of the full image, read from the JPEG header when possible, so the
+        frame does not have to be decoded."""
+        if self._image is not None:
+            return self._image.shape[1], self._image.shape[0]
+        if self._encoded is not None:
+            size = get_jpeg_size(self._encoded)
+            if size is not None:
+                return size
+        image = self.image
+        return None if image is None else (image.shape[1], image.shape[0])
+
+    def __image_for_size(self, width: int, height: int) -> MatLike | None:
+        if self._image is not None or self._encoded is None:
+            return self._image
+
+        flag = self.get_imread_flag(self._encoded, width, height)
+        if flag == cv2.IMREAD_COLOR:
+            return self.__full_image()
+        if flag not in self._reduced_images:
+            self._reduced_images[flag] = self.__decode(flag)
+        return self._reduced_images[flag]
+
+    def __color_image(self) -> MatLike | None:
+        """The full image if it is decoded, else the decode for the target_size if it is set, else None."""
+        if self._image is None and self.target_size is not None:
+            return self.__image_for_size(*self.target_size)
+        return self._image
+
+    def __full_image(self) -> MatLike | None:
+        if self._image is None and self._encoded is not None:
+            self._image = self.__decode(cv2.IMREAD_COLOR)
+        return self._image
+
+    def __decode(self, flag: int) -> MatLike | None:
+        if not self._encoded:
+            return None
+        return cv2.imdecode(np.frombuffer(self._encoded, dtype=np.uint8), flag)
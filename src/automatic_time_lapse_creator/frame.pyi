@@ -0,0 +1,41 @@
+from datetime import datetime
+from threading import Lock
+from cv2.typing import MatLike
+
+class Frame:
+    THUMBNAIL_SCALE: int
+    REDUCED_IMREAD_FLAGS: tuple[tuple[int, int], ...]
+    source_name: str | None
+    captured_at: datetime
+    target_size: tuple[int, int] | None
+    _encoded: bytes | None
+    _image: MatLike | None
+    _reduced_images: dict[int, MatLike | None]
+    _thumbnail: MatLike | None
+    _brightness: float | None
+    _lock: Lock
+    def __init__(
+        self,
+        encoded: bytes | None = ...,
+        image: MatLike | None = ...,
+        source_name: str | None = ...,
+        captured_at: datetime | None = ...,
+        target_size: tuple[int, int] | None = ...,
+    ) -> None: ...
+    @staticmethod
+    def get_imread_flag(image_bytes: bytes, width: int, height: int) -> int: ...
+    @property
+    def encoded(self) -> bytes | None: ...
+    @property
+    def image(self) -> MatLike | None: ...
+    def image_for_size(self, width: int, height: int) -> MatLike | None: ...
+    @property
+    def thumbnail(self) -> MatLike | None: ...
+    @property
+    def brightness(self) -> float | None: ...
+    @property
+    def size(self) -> tuple[int, int] | None: ...
+    def __image_for_size(self, width: int, height: int) -> MatLike | None: ...
+    def __color_image(self) -> MatLike | None: ...
+    def __full_image(self) -> MatLike | None: ...
+    def __decode(self, flag: int) -> MatLike | None: ...
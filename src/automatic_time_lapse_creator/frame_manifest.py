@@ -0,0 +1,114 @@
+from __future__ import annotations
+import hashlib
+import os
+from datetime import datetime as dt
+from pathlib import Path
+from threading import Lock
+from typing import NamedTuple
+from .common.constants import FRAMES_MANIFEST_FILE
+
+
+class ManifestEntry(NamedTuple):
+    """A frame saved in a daily folder."""
+    file: str
+    captured_at: str
+    size: int
+    hash: str
+
+
+class FrameManifest:
+    """
+    The index of the frames saved in a daily folder.
+
+    Every saved frame is appended as one tab separated line (file name, capture time, size in bytes
+    and blake2b hash of the file) to the FRAMES_MANIFEST_FILE of the folder. Creating the video,
+    deleting the images and resuming after a restart read the manifest instead of listing the folder,
+    which is slow on SD cards and network filesystems with thousands of files.
+
+    A line is appended after its frame is saved, so a listed frame is always complete. A line cut by
+    a crash is ignored.
+    """
+
+    _lock = Lock()
+
+    def __init__(self, folder: str | Path) -> None:
+        self.folder = Path(folder)
+        self.path = self.folder / FRAMES_MANIFEST_FILE
+
+    @staticmethod
+    def exists(folder: str | Path) -> bool:
+        """Checks if the folder has a manifest."""
+        return os.path.exists(Path(folder) / FRAMES_MANIFEST_FILE)
+
+    def append(self, file_path: str | Path, captured_at: dt | None = None, data: bytes | None = None) -> bool:
+        """
+        Adds a saved frame of the folder to the manifest.
+
+        Args:
+            file_path: str | Path - the saved frame
+            captured_at: datetime | None - the capture time, defaults to now
+            data: bytes | None - the saved bytes of the frame if the caller has them, so the file is
+                not read back, defaults to None (the file is read)
+
+        Returns:
+            bool - False if the file does not exist (e.g. the frame was not saved)
+        """
+        file_path = Path(file_path)
+        if data is None:
+            try:
+                with open(file_path, "rb") as file:
+                    data = file.read()
+            except FileNotFoundError:
+                return False
+
+        captured_at = captured_at or dt.now()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        line = f"{file_path.name}\t{captured_at.isoformat(timespec='seconds')}\t{len(data)}\t{digest}\n"
+        with self._lock, open(self.path, "a") as file:
+            file.write(line)
+        return True
+
+    def entries(self) -> list[ManifestEntry]:
+        """Returns the listed frames sorted by file name. A frame listed more than once is returned once."""
+        try:
+            with open(self.path) as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return []
+
+        entries: dict[str, ManifestEntry] = {}
+        for line in lines:
+            fields = line.rstrip("\n").split("\t")
+            if not line.endswith("\n") or len(fields) != len(ManifestEntry._fields) or not fields[2].isdigit():
+                continue
+            entries[fields[0]] = ManifestEntry(fields[0], fields[1], int(fields[2]), fields[3])
+        return [entries[name] for name in sorted(entries)]
+
+    def frame_files(self, extension: str | None = None) -> list[str]:
+        """
+        Returns the paths of the listed frames sorted by file name.
+
+        Args:
+            extension: str | None - replaces the extension of the saved files, e.g. the images
+                processed from raw frames, defaults to None (the saved files)
+        """
+        return [
+            str(self.folder / (Path(entry.file).stem + extension if extension else entry.file))
+            for entry in self.entries()
+        ]
+
+    def verify(self, entry: ManifestEntry) -> bool:
+        """Checks if the file of the entry has the listed size and hash."""
+        try:
+            with open(self.folder / entry.file, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return False
+        return len(data) == entry.size and hashlib.blake2b(data, digest_size=16).hexdigest() == entry.hash
+
+    def remove(self) -> None:
+        """Deletes the manifest."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,23 @@
+from datetime import datetime as dt
+from pathlib import Path
+from threading import Lock
+from typing import NamedTuple
+
+class ManifestEntry(NamedTuple):
+    file: str
+    captured_at: str
+    size: int
+    hash: str
+
+class FrameManifest:
+    _lock: Lock
+    folder: Path
+    path: Path
+    def __init__(self, folder: str | Path) -> None: ...
+    @staticmethod
+    def exists(folder: str | Path) -> bool: ...
+    def append(self, file_path: str | Path, captured_at: dt | None = ..., data: bytes | None = ...) -> bool: ...
+    def entries(self) -> list[ManifestEntry]: ...
+    def frame_files(self, extension: str | None = ...) -> list[str]: ...
+    def verify(self, entry: ManifestEntry) -> bool: ...
+    def remove(self) -> None: ...
@@ -0,0 +1,336 @@
+from __future__ import annotations
+import bisect
+import os
+import shutil
+import struct
+from datetime import datetime as dt
+from pathlib import Path
+from threading import Lock
+from typing import BinaryIO, Iterator, NamedTuple
+import numpy as np
+from cv2.typing import MatLike
+from .common.constants import (
+    DEFAULT_MAPPED_FRAMES_PER_SEGMENT,
+    MAPPED_FRAMES_DIR,
+    NPY_FILE,
+    PACKED_FRAMES_FILE,
+    SEGMENT_FILE_PREFIX,
+)
+
+
+class PackedFrame(NamedTuple):
+    """The position of an encoded frame in a PackedFrameStore."""
+    captured_at: float
+    offset: int
+    size: int
+
+
+class PackedFrameStore:
+    """
+    Stores the encoded frames of a source for one day in a single append-only file instead of
+    one image file per frame, which saves inodes, directory scans and SD card wear.
+
+    Every record is a header (the size of the frame and its capture time as a POSIX timestamp)
+    followed by the encoded frame. The offset index is built by reading only the headers, so the
+    frames can be streamed in order or read by their capture time, and the day is deleted with
+    a single unlink.
+
+    A record cut by a crash is ignored by the readers and truncated before the next frame is
+    appended by the process.
+    """
+
+    _HEADER = struct.Struct("<Id")
+    _lock = Lock()
+    _repaired: set[str] = set()
+
+    def __init__(self, folder: str | Path) -> None:
+        self.folder = Path(folder)
+        self.path = self.folder / PACKED_FRAMES_FILE
+        self._index: list[PackedFrame] | None = None
+
+    @staticmethod
+    def exists(folder: str | Path) -> bool:
+        """Checks if the folder has packed frames."""
+        return os.path.exists(Path(folder) / PACKED_FRAMES_FILE)
+
+    def append(self, data: bytes, captured_at: dt | None = None) -> PackedFrame:
+        """
+        Appends an encoded frame.
+
+        Args:
+            data: bytes - the encoded frame
+            captured_at: datetime | None - the capture time, defaults to now
+
+        Returns:
+            PackedFrame - the position of the frame
+        """
+        timestamp = (captured_at or dt.now()).timestamp()
+        with self._lock:
+            if str(self.path) not in self._repaired:
+                self.repair()
+                self._repaired.add(str(self.path))
+            with open(self.path, "ab") as file:
+                offset = file.tell() + self._HEADER.size
+                file.write(self._HEADER.pack(len(data), timestamp) + data)
+
+        frame = PackedFrame(timestamp, offset, len(data))
+        if self._index is not None:
+            self._index.append(frame)
+        return frame
+
+    def index(self) -> list[PackedFrame]:
+        """Returns the positions of the complete frames in the order they were appended."""
+        if self._index is None:
+            self._index = []
+            try:
+                with open(self.path, "rb") as file:
+                    self._index = list(self.__scan(file))
+            except FileNotFoundError:
+                pass
+        return self._index
+
+    def __len__(self) -> int:
+        return len(self.index())
+
+    def __scan(self, file: BinaryIO) -> Iterator[PackedFrame]:
+        """Reads the headers and skips the frames, stops at a cut record."""
+        end = os.fstat(file.fileno()).st_size
+        position = 0
+        while position + self._HEADER.size <= end:
+            file.seek(position)
+            size, timestamp = self._HEADER.unpack(file.read(self._HEADER.size))
+            offset = position + self._HEADER.size
+            if offset + size > end:
+                return
+            yield PackedFrame(timestamp, offset, size)
+            position = offset + size
+
+    def read_frames(self) -> Iterator[tuple[float, bytes]]:
+        """Streams the capture times and the encoded frames in the order they were appended."""
+        try:
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with file:
+            while True:
+                header = file.read(self._HEADER.size)
+                if len(header) < self._HEADER.size:
+                    return
+                size, timestamp = self._HEADER.unpack(header)
+                data = file.read(size)
+                if len(data) < size:
+                    return
+                yield timestamp, data
+
+    def read_at(self, captured_at: dt) -> bytes | None:
+        """
+        Returns the last frame captured at or before captured_at or None if there is no such frame.
+        The frames are expected in the order of their capture times.
+        """
+        index = self.index()
+        position = bisect.bisect_right([frame.captured_at for frame in index], captured_at.timestamp()) - 1
+        if position < 0:
+            return None
+
+        frame = index[position]
+        with open(self.path, "rb") as file:
+            file.seek(frame.offset)
+            return file.read(frame.size)
+
+    def size(self) -> int:
+        """Returns the size of the store in bytes."""
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def repair(self) -> None:
+        """Truncates a record cut by a crash, so the next frames are appended after the complete ones."""
+        try:
+            with open(self.path, "r+b") as file:
+                complete = 0
+                for frame in self.__scan(file):
+                    complete = frame.offset + frame.size
+                if complete < os.fstat(file.fileno()).st_size:
+                    file.truncate(complete)
+        except FileNotFoundError:
+            pass
+        self._index = None
+
+    def delete(self) -> int:
+        """
+        Deletes all frames of the store with a single unlink.
+
+        Returns:
+            int - the number of the freed bytes
+        """
+        size = self.size()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            size = 0
+        with self._lock:
+            self._repaired.discard(str(self.path))
+        self._index = None
+        return size
+
+
+class _MappedSegment(NamedTuple):
+    """The segment of a MappedFrameStore which is being filled and its number of frames."""
+    path: Path
+    frames: np.ndarray
+    times: np.ndarray
+    count: int
+
+
+class MappedFrameStore:
+    """
+    Stores the rendered frames of a source for one day uncompressed in memory-mapped arrays, so the
+    video of the day is encoded from zero-copy slices without decoding (or encoding) a single image.
+
+    The frames are kept in preallocated segments of frames_per_segment frames in the MAPPED_FRAMES_DIR
+    of the folder - a uint8 array (frames x height x width x 3) and the capture times of its frames as
+    POSIX timestamps (NaN for a free slot). The files are sparse, so a segment takes disk space only for
+    its written frames. The size of the frames is set by the first frame, frames of another size are
+    rejected. The segment being filled is kept mapped by the appending process until the store is
+    deleted, so a store is expected to be appended to by a single process.
+
+    The capture time is written after the frame, so the frames of a segment are its leading slots with
+    a capture time and a frame cut by a crash is overwritten by the next one. The store is meant for
+    the same-day processing and is deleted after the video of the day is created.
+    """
+
+    _lock = Lock()
+    _open_segments: dict[str, _MappedSegment] = {}
+
+    def __init__(self, folder: str | Path, frames_per_segment: int = DEFAULT_MAPPED_FRAMES_PER_SEGMENT) -> None:
+        self.folder = Path(folder)
+        self.path = self.folder / MAPPED_FRAMES_DIR
+        self.frames_per_segment = frames_per_segment
+
+    @staticmethod
+    def exists(folder: str | Path) -> bool:
+        """Checks if the folder has mapped frames."""
+        return os.path.isdir(Path(folder) / MAPPED_FRAMES_DIR)
+
+    def segments(self) -> list[Path]:
+        """Returns the frame arrays of the store in the order they were created."""
+        return sorted(self.path.glob(f"{SEGMENT_FILE_PREFIX}[0-9][0-9][0-9]{NPY_FILE}"))
+
+    @staticmethod
+    def __times_path(segment: Path) -> Path:
+        return segment.with_suffix(f".times{NPY_FILE}")
+
+    @staticmethod
+    def __count(times: np.ndarray) -> int:
+        """Returns the number of the leading slots with a capture time."""
+        free = np.flatnonzero(np.isnan(times))
+        return int(free[0]) if free.size else len(times)
+
+    def __open_last(self) -> _MappedSegment | None:
+        """Maps the last segment of the store for writing."""
+        segments = self.segments()
+        if not segments:
+            return None
+        frames = np.load(segments[-1], mmap_mode="r+")
+        times = np.load(self.__times_path(segments[-1]), mmap_mode="r+")
+        return _MappedSegment(segments[-1], frames, times, self.__count(times))
+
+    def __create_segment(self, image: MatLike) -> _MappedSegment:
+        """Preallocates the next segment for frames of the size of image."""
+        segment = self.path / f"{SEGMENT_FILE_PREFIX}{len(self.segments()):03d}{NPY_FILE}"
+        self.path.mkdir(parents=True, exist_ok=True)
+        frames = np.lib.format.open_memmap(
+            segment, mode="w+", dtype=np.uint8, shape=(self.frames_per_segment, *image.shape)
+        )
+        times = np.lib.format.open_memmap(
+            self.__times_path(segment), mode="w+", dtype=np.float64, shape=(self.frames_per_segment,)
+        )
+        times[:] = np.nan
+        return _MappedSegment(segment, frames, times, 0)
+
+    def append(self, image: MatLike, captured_at: dt | None = None) -> bool:
+        """
+        Copies a rendered frame into the next free slot. The segment being filled stays mapped
+        between the appends of the process, so a frame is a single copy into the mapping.
+
+        Args:
+            image: MatLike - a BGR frame
+            captured_at: datetime | None - the capture time, defaults to now
+
+        Returns:
+            bool - False if the size of the frame differs from the size of the stored frames
+        """
+        timestamp = (captured_at or dt.now()).timestamp()
+        with self._lock:
+            current = self._open_segments.get(str(self.path))
+            if current is None or not current.path.exists():
+                current = self.__open_last()
+            if current is not None and (
+                current.frames.shape[1:] != image.shape or current.frames.dtype != image.dtype
+            ):
+                return False
+            if current is None or current.count >= len(current.times):
+                current = self.__create_segment(image)
+
+            current.frames[current.count] = image
+            current.times[current.count] = timestamp
+            self._open_segments[str(self.path)] = current._replace(count=current.count + 1)
+        return True
+
+    def read_frames(self) -> Iterator[tuple[float, MatLike]]:
+        """
+        Streams the capture times and read-only views of the frames in the order they were appended.
+        A view is only valid until the next iteration, copy the frames which are kept longer.
+        """
+        for segment in self.segments():
+            frames = np.load(segment, mmap_mode="r")
+            times = np.load(self.__times_path(segment), mmap_mode="r")
+            for position in range(self.__count(times)):
+                yield float(times[position]), frames[position]
+
+    def __len__(self) -> int:
+        return sum(self.__count(np.load(self.__times_path(segment), mmap_mode="r")) for segment in self.segments())
+
+    def read_at(self, captured_at: dt) -> MatLike | None:
+        """
+        Returns a copy of the last frame captured at or before captured_at or None if there is no
+        such frame. The frames are expected in the order of their capture times.
+        """
+        timestamp = captured_at.timestamp()
+        found: tuple[Path, int] | None = None
+        for segment in self.segments():
+            times = np.load(self.__times_path(segment), mmap_mode="r")
+            count = self.__count(times)
+            position = int(np.searchsorted(times[:count], timestamp, side="right"))
+            if position > 0:
+                found = segment, position - 1
+            if position < count:
+                break
+
+        if found is None:
+            return None
+        segment, position = found
+        return np.array(np.load(segment, mmap_mode="r")[position])
+
+    def size(self) -> int:
+        """Returns the disk space taken by the store in bytes."""
+        size = 0
+        for file in self.path.glob(f"*{NPY_FILE}"):
+            stat = file.stat()
+            blocks = getattr(stat, "st_blocks", None)
+            size += min(stat.st_size, blocks * 512) if blocks is not None else stat.st_size
+        return size
+
+    def delete(self) -> int:
+        """
+        Deletes all frames of the store.
+
+        Returns:
+            int - the number of the freed bytes
+        """
+        with self._lock:
+            self._open_segments.pop(str(self.path), None)
+            size = self.size()
+            shutil.rmtree(self.path, ignore_errors=True)
+        return size
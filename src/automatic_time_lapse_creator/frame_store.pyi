@@ -0,0 +1,54 @@
+from datetime import datetime as dt
+from pathlib import Path
+from struct import Struct
+from threading import Lock
+from typing import Iterator, NamedTuple
+import numpy as np
+from cv2.typing import MatLike
+
+class PackedFrame(NamedTuple):
+    captured_at: float
+    offset: int
+    size: int
+
+class PackedFrameStore:
+    _HEADER: Struct
+    _lock: Lock
+    _repaired: set[str]
+    folder: Path
+    path: Path
+    _index: list[PackedFrame] | None
+    def __init__(self, folder: str | Path) -> None: ...
+    @staticmethod
+    def exists(folder: str | Path) -> bool: ...
+    def append(self, data: bytes, captured_at: dt | None = ...) -> PackedFrame: ...
+    def index(self) -> list[PackedFrame]: ...
+    def __len__(self) -> int: ...
+    def read_frames(self) -> Iterator[tuple[float, bytes]]: ...
+    def read_at(self, captured_at: dt) -> bytes | None: ...
+    def size(self) -> int: ...
+    def repair(self) -> None: ...
+    def delete(self) -> int: ...
+
+class _MappedSegment(NamedTuple):
+    path: Path
+    frames: np.ndarray
+    times: np.ndarray
+    count: int
+
+class MappedFrameStore:
+    _lock: Lock
+    _open_segments: dict[str, _MappedSegment]
+    folder: Path
+    path: Path
+    frames_per_segment: int
+    def __init__(self, folder: str | Path, frames_per_segment: int = ...) -> None: ...
+    @staticmethod
+    def exists(folder: str | Path) -> bool: ...
+    def segments(self) -> list[Path]: ...
+    def append(self, image: MatLike, captured_at: dt | None = ...) -> bool: ...
+    def read_frames(self) -> Iterator[tuple[float, MatLike]]: ...
+    def __len__(self) -> int: ...
+    def read_at(self, captured_at: dt) -> MatLike | None: ...
+    def size(self) -> int: ...
+    def delete(self) -> int: ...
@@ -0,0 +1,389 @@
+from __future__ import annotations
+import json
+import logging
+import sqlite3
+import time
+from enum import Enum
+from logging import Logger
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Iterable, NamedTuple
+from .common.constants import (
+    DEFAULT_JOB_BACKOFF_SECONDS,
+    DEFAULT_JOB_MAX_ATTEMPTS,
+    DEFAULT_JOB_MAX_BACKOFF_SECONDS,
+    DEFAULT_JOB_POLL_SECONDS,
+    DEFAULT_JOB_WORKERS,
+)
+
+
+class JobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class JobDeferred(Exception):
+    """
+    Raised by a handler whose job can't run yet, e.g. because it waits for other jobs.
+    The job is returned to PENDING and run again after delay_seconds, the attempt is not counted.
+    """
+
+    def __init__(self, reason: str, delay_seconds: float = DEFAULT_JOB_BACKOFF_SECONDS) -> None:
+        super().__init__(reason)
+        self.delay_seconds = delay_seconds
+
+
+class Job(NamedTuple):
+    """A unit of post-capture work stored in the JobQueue."""
+    id: int
+    key: str
+    job_type: str
+    payload: dict[str, Any]
+    status: JobStatus
+    attempts: int
+    run_after: float
+    last_error: str | None
+
+
+class JobQueue:
+    """
+    A durable queue of jobs in a local SQLite database.
+
+    Every job has a unique key, so enqueueing the same work twice (e.g. after a restart)
+    adds it only once. A claimed job is RUNNING until it is completed or failed. Failed
+    jobs are retried with exponential backoff until max_attempts is reached. Jobs which
+    were RUNNING when the process died are returned to PENDING when the queue is opened.
+
+    The queue can be shared by the threads of a process.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            key TEXT NOT NULL UNIQUE,
+            job_type TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            run_after REAL NOT NULL,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, run_after);
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_attempts: int = DEFAULT_JOB_MAX_ATTEMPTS,
+        backoff_seconds: float = DEFAULT_JOB_BACKOFF_SECONDS,
+        max_backoff_seconds: float = DEFAULT_JOB_MAX_BACKOFF_SECONDS,
+        logger: Logger | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.path = Path(path)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._lock = Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(self._SCHEMA)
+
+        recovered = self.recover()
+        if recovered:
+            self.logger.info(f"{recovered} interrupted jobs will be run again")
+
+    def enqueue(
+        self,
+        job_type: str,
+        key: str,
+        payload: dict[str, Any] | None = None,
+        delay_seconds: float = 0,
+    ) -> bool:
+        """
+        Adds a job if there is no job with the same key.
+
+        Args:
+            job_type: str - the type of the job, selects the handler of the JobWorkerPool
+            key: str - the unique key of the job
+            payload: dict[str, Any] | None - JSON serializable arguments of the handler
+            delay_seconds: float - the job is not run before this delay, defaults to 0
+
+        Returns:
+            bool - True if the job was added, False if the key already exists
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO jobs (key, job_type, payload, status, run_after, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, job_type, json.dumps(payload or {}), JobStatus.PENDING.value, now + delay_seconds, now, now),
+            )
+        return cursor.rowcount == 1
+
+    def claim(self, job_types: Iterable[str] | None = None) -> Job | None:
+        """
+        Marks the oldest ready job as RUNNING and returns it.
+
+        Args:
+            job_types: Iterable[str] | None - claim only jobs of these types, defaults to None (any type)
+
+        Returns:
+            Job | None - the claimed job or None if no job is ready
+        """
+        query = "SELECT * FROM jobs WHERE status = ? AND run_after <= ?"
+        params: list[Any] = [JobStatus.PENDING.value, time.time()]
+        if job_types is not None:
+            types = list(job_types)
+            if not types:
+                return None
+            query += f" AND job_type IN ({', '.join('?' * len(types))})"
+            params += types
+        query += " ORDER BY run_after, id LIMIT 1"
+
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(query, params).fetchone()
+                if row is not None:
+                    self._connection.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                        (JobStatus.RUNNING.value, time.time(), row[0]),
+                    )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+        job = self.__to_job(row)
+        return job._replace(status=JobStatus.RUNNING, attempts=job.attempts + 1)
+
+    def complete(self, job_id: int) -> None:
+        """Marks a job as DONE."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+                (JobStatus.DONE.value, time.time(), job_id),
+            )
+
+    def fail(self, job_id: int, error: str) -> JobStatus:
+        """
+        Records the error of a job. The job is retried after backoff_seconds * 2 ** (attempts - 1)
+        (at most max_backoff_seconds) or marked as FAILED after max_attempts.
+
+        Returns:
+            JobStatus - PENDING if the job will be retried, otherwise FAILED
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            attempts = row[0] if row is not None else self.max_attempts
+            if attempts >= self.max_attempts:
+                status = JobStatus.FAILED
+                run_after = time.time()
+            else:
+                status = JobStatus.PENDING
+                run_after = time.time() + min(self.backoff_seconds * 2 ** (attempts - 1), self.max_backoff_seconds)
+
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, run_after = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                (status.value, run_after, error, time.time(), job_id),
+            )
+        return status
+
+    def defer(self, job_id: int, delay_seconds: float) -> None:
+        """Returns a claimed job to PENDING for delay_seconds without counting its attempt."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, attempts = MAX(attempts - 1, 0), run_after = ?, updated_at = ? WHERE id = ?",
+                (JobStatus.PENDING.value, time.time() + delay_seconds, time.time(), job_id),
+            )
+
+    def unfinished(self, key_prefix: str) -> int:
+        """Returns the number of the PENDING or RUNNING jobs whose key starts with key_prefix."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?) AND substr(key, 1, ?) = ?",
+                (JobStatus.PENDING.value, JobStatus.RUNNING.value, len(key_prefix), key_prefix),
+            ).fetchone()
+        return row[0]
+
+    def recover(self) -> int:
+        """
+        Returns the RUNNING jobs to PENDING, e.g. after the process was killed.
+
+        Returns:
+            int - the number of recovered jobs
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (JobStatus.PENDING.value, time.time(), JobStatus.RUNNING.value),
+            )
+        return cursor.rowcount
+
+    def get(self, key: str) -> Job | None:
+        """Returns the job with the key or None if there is no such job."""
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM jobs WHERE key = ?", (key,)).fetchone()
+        return None if row is None else self.__to_job(row)
+
+    def counts(self) -> dict[JobStatus, int]:
+        """Returns the number of jobs in every status."""
+        with self._lock:
+            rows = self._connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JobStatus}
+        for status, count in rows:
+            counts[JobStatus(status)] = count
+        return counts
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def __to_job(row: tuple[Any, ...]) -> Job:
+        return Job(
+            id=row[0],
+            key=row[1],
+            job_type=row[2],
+            payload=json.loads(row[3]),
+            status=JobStatus(row[4]),
+            attempts=row[5],
+            run_after=row[6],
+            last_error=row[7],
+        )
+
+
+class JobWorkerPool:
+    """
+    Runs the jobs of a JobQueue in background threads.
+
+    A handler receives the Job and returns True if the work is done. A handler which returns
+    False or raises an exception fails the job, which is then retried with backoff. A handler
+    which raises JobDeferred postpones the job without failing it.
+    The number of jobs of a type which run at the same time is limited by concurrency
+    (1 for the types which are not listed). The optional initializer is called by every
+    worker thread when it starts, e.g. to lower its priority.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: dict[str, Callable[[Job], bool]],
+        concurrency: dict[str, int] | None = None,
+        workers: int = DEFAULT_JOB_WORKERS,
+        poll_interval: float = DEFAULT_JOB_POLL_SECONDS,
+        logger: Logger | None = None,
+        initializer: Callable[[], None] | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.initializer = initializer
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency or {}
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self._running: dict[str, int] = {job_type: 0 for job_type in handlers}
+        self._lock = Lock()
+        self._wake = Event()
+        self._stop = Event()
+        self._threads: list[Thread] = []
+
+    @property
+    def is_running(self) -> bool:
+        """True if the worker threads are started."""
+        return bool(self._threads)
+
+    def start(self) -> None:
+        """Starts the worker threads."""
+        if self._threads:
+            return
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def wake(self) -> None:
+        """Lets the idle workers check the queue without waiting for the poll interval."""
+        self._wake.set()
+
+    def run_pending(self) -> int:
+        """
+        Runs the ready jobs in the calling thread until there are none.
+
+        Returns:
+            int - the number of the jobs which were run
+        """
+        count = 0
+        while self._run_next():
+            count += 1
+        return count
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stops the worker threads after their current jobs."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def _work(self) -> None:
+        if self.initializer is not None:
+            self.initializer()
+        while not self._stop.is_set():
+            if not self._run_next():
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def _run_next(self) -> bool:
+        """Claims and runs one job. Returns False if no job is ready."""
+        with self._lock:
+            available = [
+                job_type for job_type, running in self._running.items()
+                if running < self.concurrency.get(job_type, 1)
+            ]
+            job = self.queue.claim(available)
+            if job is None:
+                return False
+            self._running[job.job_type] += 1
+
+        try:
+            if self.handlers[job.job_type](job):
+                self.queue.complete(job.id)
+            else:
+                self.__fail(job, "the handler returned False")
+        except JobDeferred as exc:
+            self.logger.info(f"Job {job.key} is deferred: {exc}")
+            self.queue.defer(job.id, exc.delay_seconds)
+        except Exception as exc:
+            self.logger.error(f"Job {job.key} failed: {exc}", exc_info=True)
+            self.__fail(job, str(exc))
+        finally:
+            with self._lock:
+                self._running[job.job_type] -= 1
+        return True
+
+    def __fail(self, job: Job, error: str) -> None:
+        status = self.queue.fail(job.id, error)
+        if status == JobStatus.FAILED:
+            self.logger.error(f"Job {job.key} failed after {job.attempts} attempts: {error}")
+        else:
+            self.logger.warning(f"Job {job.key} will be retried: {error}")
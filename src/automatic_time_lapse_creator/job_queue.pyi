@@ -0,0 +1,82 @@
+from enum import Enum
+from logging import Logger
+from pathlib import Path
+from typing import Any, Callable, Iterable, NamedTuple
+
+class JobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+class JobDeferred(Exception):
+    delay_seconds: float
+    def __init__(self, reason: str, delay_seconds: float = ...) -> None: ...
+
+class Job(NamedTuple):
+    id: int
+    key: str
+    job_type: str
+    payload: dict[str, Any]
+    status: JobStatus
+    attempts: int
+    run_after: float
+    last_error: str | None
+
+class JobQueue:
+    logger: Logger
+    path: Path
+    max_attempts: int
+    backoff_seconds: float
+    max_backoff_seconds: float
+    def __init__(
+        self,
+        path: str | Path,
+        max_attempts: int = ...,
+        backoff_seconds: float = ...,
+        max_backoff_seconds: float = ...,
+        logger: Logger | None = ...,
+    ) -> None: ...
+    def enqueue(
+        self,
+        job_type: str,
+        key: str,
+        payload: dict[str, Any] | None = ...,
+        delay_seconds: float = ...,
+    ) -> bool: ...
+    def claim(self, job_types: Iterable[str] | None = ...) -> Job | None: ...
+    def complete(self, job_id: int) -> None: ...
+    def fail(self, job_id: int, error: str) -> JobStatus: ...
+    def defer(self, job_id: int, delay_seconds: float) -> None: ...
+    def unfinished(self, key_prefix: str) -> int: ...
+    def recover(self) -> int: ...
+    def get(self, key: str) -> Job | None: ...
+    def counts(self) -> dict[JobStatus, int]: ...
+    def close(self) -> None: ...
+
+class JobWorkerPool:
+    logger: Logger
+    queue: JobQueue
+    handlers: dict[str, Callable[[Job], bool]]
+    concurrency: dict[str, int]
+    workers: int
+    poll_interval: float
+    initializer: Callable[[], None] | None
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: dict[str, Callable[[Job], bool]],
+        concurrency: dict[str, int] | None = ...,
+        workers: int = ...,
+        poll_interval: float = ...,
+        logger: Logger | None = ...,
+        initializer: Callable[[], None] | None = ...,
+    ) -> None: ...
+    @property
+    def is_running(self) -> bool: ...
+    def start(self) -> None: ...
+    def wake(self) -> None: ...
+    def run_pending(self) -> int: ...
+    def stop(self, timeout: float | None = ...) -> None: ...
+    def _work(self) -> None: ...
+    def _run_next(self) -> bool: ...
@@ -0,0 +1,248 @@
+from __future__ import annotations
+import logging
+import os
+import sqlite3
+import time
+from datetime import date
+from logging import Logger
+from pathlib import Path
+from threading import Lock
+from typing import Any, NamedTuple
+
+
+class CatalogEntry(NamedTuple):
+    """A frame folder or a video recorded in the MediaCatalog."""
+    id: int
+    source: str
+    media_type: str
+    path: str
+    date: str
+    iso_year: int
+    iso_week: int
+    size: int
+    items: int
+    created_at: float
+
+
+class MediaCatalog:
+    """
+    A local SQLite index of the frame folders and the videos of all sources.
+
+    The media are recorded when they are created and removed when they are deleted, so the
+    summaries (and the other components which need the media of a period) run indexed queries
+    instead of walking the folders of the archive. The media type is a VideoType value or
+    FRAMES_MEDIA_TYPE, the date is the day of a daily video or frame folder and the first day
+    of the period of a summary.
+
+    The catalog can be shared by the threads of a process.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS media (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT NOT NULL,
+            media_type TEXT NOT NULL,
+            path TEXT NOT NULL UNIQUE,
+            date TEXT NOT NULL,
+            iso_year INTEGER NOT NULL,
+            iso_week INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            items INTEGER NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS media_by_date ON media (source, media_type, date);
+        CREATE INDEX IF NOT EXISTS media_by_week ON media (source, media_type, iso_year, iso_week);
+        CREATE INDEX IF NOT EXISTS media_by_type ON media (media_type, date);
+        CREATE TABLE IF NOT EXISTS marks (
+            name TEXT PRIMARY KEY,
+            created_at REAL NOT NULL
+        );
+    """
+    _COLUMNS = "id, source, media_type, path, date, iso_year, iso_week, size, items, created_at"
+
+    def __init__(self, path: str | Path, logger: Logger | None = None) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.path = Path(path)
+        self._lock = Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(self._SCHEMA)
+
+    def add(
+        self,
+        source: str,
+        media_type: str,
+        path: str | Path,
+        day: date,
+        size: int | None = None,
+        items: int = 0,
+    ) -> None:
+        """
+        Records a frame folder or a video. A media which is already recorded is updated.
+
+        Args:
+            source: str - the location name of the source
+            media_type: str - a VideoType value or FRAMES_MEDIA_TYPE
+            path: str | Path - the video or the frame folder
+            day: date - the day of the media or the first day of its period
+            size: int | None - the size in bytes, defaults to None (the size of the file)
+            items: int - the frames of a frame folder or the videos joined in a summary, defaults to 0
+        """
+        if size is None:
+            size = os.path.getsize(path) if os.path.isfile(path) else 0
+        iso_year, iso_week, _ = day.isocalendar()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO media (source, media_type, path, date, iso_year, iso_week, size, items, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET source = excluded.source, media_type = excluded.media_type, "
+                "date = excluded.date, iso_year = excluded.iso_year, iso_week = excluded.iso_week, "
+                "size = excluded.size, items = excluded.items",
+                (source, media_type, str(path), day.isoformat(), iso_year, iso_week, size, items, time.time()),
+            )
+
+    def remove(self, path: str | Path) -> bool:
+        """Removes a media from the catalog. Returns False if it was not recorded."""
+        with self._lock:
+            cursor = self._connection.execute("DELETE FROM media WHERE path = ?", (str(path),))
+        return cursor.rowcount > 0
+
+    def get(self, path: str | Path) -> CatalogEntry | None:
+        """Returns the entry of the media or None if it is not recorded."""
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {self._COLUMNS} FROM media WHERE path = ?", (str(path),)
+            ).fetchone()
+        return None if row is None else CatalogEntry(*row)
+
+    def find(
+        self,
+        source: str | None = None,
+        media_type: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        iso_year: int | None = None,
+        iso_week: int | None = None,
+    ) -> list[CatalogEntry]:
+        """
+        Returns the recorded media matching all given filters, sorted by date.
+
+        Args:
+            source: str | None - the location name of the source
+            media_type: str | None - a VideoType value or FRAMES_MEDIA_TYPE
+            start: date | None - the first day (inclusive)
+            end: date | None - the last day (inclusive)
+            iso_year: int | None - the ISO year of the week
+            iso_week: int | None - the ISO week
+        """
+        conditions: list[str] = []
+        params: list[Any] = []
+        for column, operator, value in (
+            ("source", "=", source),
+            ("media_type", "=", media_type),
+            ("date", ">=", start.isoformat() if start is not None else None),
+            ("date", "<=", end.isoformat() if end is not None else None),
+            ("iso_year", "=", iso_year),
+            ("iso_week", "=", iso_week),
+        ):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+
+        query = f"SELECT {self._COLUMNS} FROM media"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY date, id"
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [CatalogEntry(*row) for row in rows]
+
+    def paths(
+        self,
+        source: str | None = None,
+        media_type: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        iso_year: int | None = None,
+        iso_week: int | None = None,
+    ) -> list[str]:
+        """Returns the paths of the media found with the filters of find(), sorted by date."""
+        return [entry.path for entry in self.find(source, media_type, start, end, iso_year, iso_week)]
+
+    def total_size(self, source: str | None = None, media_type: str | None = None) -> int:
+        """Returns the bytes of the recorded media of the source and type (all if None)."""
+        query = "SELECT COALESCE(SUM(size), 0) FROM media WHERE (? IS NULL OR source = ?) AND (? IS NULL OR media_type = ?)"
+        with self._lock:
+            row = self._connection.execute(query, (source, source, media_type, media_type)).fetchone()
+        return row[0]
+
+    def usage(self, root: str | Path | None = None) -> dict[str, int]:
+        """
+        Returns the bytes of the recorded media by source.
+
+        Args:
+            root: str | Path | None - count only the media under this folder, e.g. the base path without
+                the videos moved to a cold tier, defaults to None (all media)
+        """
+        prefix = os.path.join(str(Path(root)), "") if root is not None else ""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT source, SUM(size) FROM media WHERE substr(path, 1, ?) = ? GROUP BY source",
+                (len(prefix), prefix),
+            ).fetchall()
+        return {source: size for source, size in rows}
+
+    def grow(self, path: str | Path, size: int, items: int = 1) -> bool:
+        """
+        Adds the bytes and the items of new frames to a recorded frame folder without measuring the folder.
+
+        Returns:
+            bool - False if the media is not recorded
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE media SET size = size + ?, items = items + ? WHERE path = ?", (size, items, str(path))
+            )
+        return cursor.rowcount > 0
+
+    def relocate(self, path: str | Path, new_path: str | Path, size: int | None = None) -> bool:
+        """
+        Records that a media was moved, e.g. to another storage tier.
+
+        Args:
+            path: str | Path - the recorded path
+            new_path: str | Path - the new location of the media
+            size: int | None - the new size in bytes, defaults to None (unchanged)
+
+        Returns:
+            bool - False if the media is not recorded
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE media SET path = ?, size = COALESCE(?, size) WHERE path = ?", (str(new_path), size, str(path))
+            )
+        return cursor.rowcount > 0
+
+    def has_mark(self, name: str) -> bool:
+        """Checks if a one-time operation on the catalog (e.g. a backfill) was completed."""
+        with self._lock:
+            row = self._connection.execute("SELECT 1 FROM marks WHERE name = ?", (name,)).fetchone()
+        return row is not None
+
+    def mark(self, name: str) -> None:
+        """Records that a one-time operation on the catalog was completed."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO marks (name, created_at) VALUES (?, ?)", (name, time.time())
+            )
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
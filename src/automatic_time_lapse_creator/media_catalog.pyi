@@ -0,0 +1,57 @@
+from datetime import date
+from logging import Logger
+from pathlib import Path
+from typing import NamedTuple
+
+class CatalogEntry(NamedTuple):
+    id: int
+    source: str
+    media_type: str
+    path: str
+    date: str
+    iso_year: int
+    iso_week: int
+    size: int
+    items: int
+    created_at: float
+
+class MediaCatalog:
+    logger: Logger
+    path: Path
+    def __init__(self, path: str | Path, logger: Logger | None = ...) -> None: ...
+    def add(
+        self,
+        source: str,
+        media_type: str,
+        path: str | Path,
+        day: date,
+        size: int | None = ...,
+        items: int = ...,
+    ) -> None: ...
+    def remove(self, path: str | Path) -> bool: ...
+    def get(self, path: str | Path) -> CatalogEntry | None: ...
+    def find(
+        self,
+        source: str | None = ...,
+        media_type: str | None = ...,
+        start: date | None = ...,
+        end: date | None = ...,
+        iso_year: int | None = ...,
+        iso_week: int | None = ...,
+    ) -> list[CatalogEntry]: ...
+    def paths(
+        self,
+        source: str | None = ...,
+        media_type: str | None = ...,
+        start: date | None = ...,
+        end: date | None = ...,
+        iso_year: int | None = ...,
+        iso_week: int | None = ...,
+    ) -> list[str]: ...
+    def total_size(self, source: str | None = ..., media_type: str | None = ...) -> int: ...
+    def usage(self, root: str | Path | None = ...) -> dict[str, int]: ...
+    def grow(self, path: str | Path, size: int, items: int = ...) -> bool: ...
+    def relocate(self, path: str | Path, new_path: str | Path, size: int | None = ...) -> bool: ...
+    def has_mark(self, name: str) -> bool: ...
+    def mark(self, name: str) -> None: ...
+    def close(self) -> None: ...
@@ -0,0 +1,177 @@
+from __future__ import annotations
+import logging
+import os
+import shutil
+from datetime import date, timedelta
+from logging import Logger
+from pathlib import Path
+from typing import NamedTuple
+from .common.constants import DEFAULT_RETENTION_PRIORITIES, FRAMES_MEDIA_TYPE, JPG_FILE, VideoType
+from .common.utils import shorten
+from .deletion_service import DeletionService
+from .media_catalog import CatalogEntry, MediaCatalog
+from .storage import StorageBackend
+from .video_manager import VideoManager as vm
+
+
+class RetentionPolicy(NamedTuple):
+    """
+    The disk budgets and the age rules of the RetentionEngine. The media types are VideoType values
+    and FRAMES_MEDIA_TYPE.
+
+    Attributes:
+        max_bytes: int | None - the budget of the media of all sources, defaults to None (no budget)
+        source_max_bytes: dict[str, int] | None - the budgets by the location name of the source
+        max_age_days: dict[str, int] | None - the maximum age of the media in days by media type
+        priorities: dict[str, int] | None - the priorities by media type, the media with a lower priority
+            are evicted first, defaults to DEFAULT_RETENTION_PRIORITIES
+        min_free_bytes: int - the free space which is kept on the disk of the base path, defaults to 0
+    """
+    max_bytes: int | None = None
+    source_max_bytes: dict[str, int] | None = None
+    max_age_days: dict[str, int] | None = None
+    priorities: dict[str, int] | None = None
+    min_free_bytes: int = 0
+
+    def priority(self, media_type: str) -> int:
+        """Returns the priority of the media type."""
+        priorities = self.priorities if self.priorities is not None else DEFAULT_RETENTION_PRIORITIES
+        return priorities.get(media_type, DEFAULT_RETENTION_PRIORITIES.get(media_type, 0))
+
+
+class RetentionReport(NamedTuple):
+    """The media evicted by RetentionEngine.enforce()."""
+    evicted: list[CatalogEntry]
+    bytes_freed: int
+
+
+class RetentionEngine:
+    """
+    Keeps the media of the sources within the disk budgets of a RetentionPolicy.
+
+    The usage is taken from the sizes recorded in the MediaCatalog, which are updated when the
+    media are created, grow or are deleted, so the folders are never measured. Only the media under
+    the base path count against the budgets and are evicted for space - the videos moved to a cold
+    tier are evicted only by their age. The media of the current day are never evicted and neither are
+    the frames of a day whose daily video is not recorded yet (e.g. its job is still queued) nor the
+    media which the storage has not stored yet. enforce() first evicts the media older than their maximum age,
+    then the media of the sources over their budget and finally the media of all sources while the
+    total budget is exceeded or the disk has less than min_free_bytes free space. The media with the
+    lowest priority are evicted first and the oldest of them first.
+
+    The frames are deleted with the DeletionService if one is given, the videos are deleted at once.
+    """
+
+    def __init__(
+        self,
+        catalog: MediaCatalog,
+        policy: RetentionPolicy,
+        base_path: str | Path,
+        deletion_service: DeletionService | None = None,
+        storage: StorageBackend | None = None,
+        logger: Logger | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.catalog = catalog
+        self.policy = policy
+        self.base_path = Path(base_path)
+        self.deletion_service = deletion_service
+        self.storage = storage
+
+    def enforce(self, today: date | None = None) -> RetentionReport:
+        """
+        Evicts the media which are too old or exceed the budgets.
+
+        Args:
+            today: date | None - the current day, defaults to date.today()
+
+        Returns:
+            RetentionReport - the evicted media and their recorded bytes
+        """
+        today = today or date.today()
+        entries = self.catalog.find(end=today - timedelta(days=1))
+        evicted: dict[int, CatalogEntry] = {}
+        encoded_days = {
+            (entry.source, entry.date) for entry in entries if entry.media_type == VideoType.DAILY.value
+        }
+        entries = [entry for entry in entries if self.__can_evict(entry, encoded_days)]
+
+        for entry in entries:
+            max_age = (self.policy.max_age_days or {}).get(entry.media_type)
+            if max_age is not None and (today - date.fromisoformat(entry.date)).days > max_age:
+                self.__evict(entry, evicted)
+
+        candidates = sorted(
+            (
+                entry for entry in entries
+                if entry.id not in evicted and Path(entry.path).is_relative_to(self.base_path)
+            ),
+            key=lambda entry: (self.policy.priority(entry.media_type), entry.date, entry.id),
+        )
+        usage = self.catalog.usage(self.base_path)
+
+        for source, budget in (self.policy.source_max_bytes or {}).items():
+            excess = usage.get(source, 0) - budget
+            for entry in candidates:
+                if excess <= 0:
+                    break
+                if entry.source == source and self.__evict(entry, evicted):
+                    excess -= entry.size
+                    usage[source] -= entry.size
+
+        excess = sum(usage.values()) - self.policy.max_bytes if self.policy.max_bytes is not None else 0
+        if self.policy.min_free_bytes > 0:
+            excess = max(excess, self.policy.min_free_bytes - shutil.disk_usage(self.base_path).free)
+        for entry in candidates:
+            if excess <= 0:
+                break
+            if self.__evict(entry, evicted):
+                excess -= entry.size
+
+        report = RetentionReport(list(evicted.values()), sum(entry.size for entry in evicted.values()))
+        if report.evicted:
+            self.logger.info(f"Retention evicted {len(report.evicted)} media ({report.bytes_freed} bytes)")
+        return report
+
+    def __can_evict(self, entry: CatalogEntry, encoded_days: set[tuple[str, str]]) -> bool:
+        """Checks if the frames of the entry are encoded in a daily video and if the media is stored."""
+        if entry.media_type == FRAMES_MEDIA_TYPE and (entry.source, entry.date) not in encoded_days:
+            return False
+        return self.storage is None or not self.storage.pending(entry.path)
+
+    def __evict(self, entry: CatalogEntry, evicted: dict[int, CatalogEntry]) -> bool:
+        """Deletes the media and removes it from the catalog. Returns False if it was not deleted."""
+        if entry.id in evicted:
+            return False
+        try:
+            self.delete_media(entry)
+        except OSError as exc:
+            self.logger.error(f"Could not evict {shorten(entry.path)}: {exc}")
+            return False
+
+        self.catalog.remove(entry.path)
+        evicted[entry.id] = entry
+        return True
+
+    def delete_media(self, entry: CatalogEntry) -> None:
+        """Deletes the frames of a frame folder (and the folder if it's empty) or a video."""
+        if entry.media_type == FRAMES_MEDIA_TYPE:
+            if self.deletion_service is not None:
+                self.deletion_service.delete_media_files(entry.path, JPG_FILE, delete_folder=True)
+            else:
+                vm.delete_source_media_files(self.logger, entry.path, delete_folder=True)
+            return
+
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+        try:
+            os.rmdir(os.path.dirname(entry.path))
+        except OSError:
+            pass
+        self.logger.info(f"Deleted {shorten(entry.path)}")
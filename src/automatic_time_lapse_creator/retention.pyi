@@ -0,0 +1,38 @@
+from datetime import date
+from logging import Logger
+from pathlib import Path
+from typing import NamedTuple
+from .deletion_service import DeletionService
+from .media_catalog import CatalogEntry, MediaCatalog
+from .storage import StorageBackend
+
+class RetentionPolicy(NamedTuple):
+    max_bytes: int | None = ...
+    source_max_bytes: dict[str, int] | None = ...
+    max_age_days: dict[str, int] | None = ...
+    priorities: dict[str, int] | None = ...
+    min_free_bytes: int = ...
+    def priority(self, media_type: str) -> int: ...
+
+class RetentionReport(NamedTuple):
+    evicted: list[CatalogEntry]
+    bytes_freed: int
+
+class RetentionEngine:
+    logger: Logger
+    catalog: MediaCatalog
+    policy: RetentionPolicy
+    base_path: Path
+    deletion_service: DeletionService | None
+    storage: StorageBackend | None
+    def __init__(
+        self,
+        catalog: MediaCatalog,
+        policy: RetentionPolicy,
+        base_path: str | Path,
+        deletion_service: DeletionService | None = ...,
+        storage: StorageBackend | None = ...,
+        logger: Logger | None = ...,
+    ) -> None: ...
+    def enforce(self, today: date | None = ...) -> RetentionReport: ...
+    def delete_media(self, entry: CatalogEntry) -> None: ...
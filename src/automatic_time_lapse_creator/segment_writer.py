@@ -0,0 +1,212 @@
+from __future__ import annotations
+import cv2
+import logging
+import os
+import shutil
+import time
+from logging import Logger
+from pathlib import Path
+from cv2.typing import MatLike
+from .common.constants import (
+    DEFAULT_FRAMES_PER_SEGMENT,
+    DEFAULT_SEGMENT_SECONDS,
+    JPG_FILE,
+    MP4_FILE,
+    PART_FILE_SUFFIX,
+    SEGMENT_FILE_PREFIX,
+    SEGMENTS_DIR,
+)
+from .common.utils import shorten
+from .encoders import EncoderSettings, VideoEncoder, create_encoder
+from .video_manager import VideoManager
+
+
+class SegmentedVideoWriter:
+    """
+    Encodes the daily video of a source incrementally while the images are collected.
+
+    The frames are appended to short video segments in the SEGMENTS_DIR of the daily folder.
+    A segment is written as "<name>.part.mp4" and renamed when it is complete, because an
+    mp4 file is not readable until it is released. A segment is completed after
+    frames_per_segment frames or segment_seconds, whichever comes first, so if the process
+    is killed only the frames of the last segment_seconds are lost - the complete segments
+    stay on disk and a new writer for the same folder continues after them. The frames_count
+    of a new writer starts with the frames of the complete segments.
+
+    If the encoder can't open a segment, the frames of that segment are saved as images in a
+    folder with the name of the segment instead, and the folder is encoded by finalize().
+
+    At the end of the day finalize() joins the segments into the daily video without
+    re-encoding them (see VideoManager.stitch_videos).
+    """
+
+    def __init__(
+        self,
+        folder: str | Path,
+        fps: int,
+        frames_per_segment: int = DEFAULT_FRAMES_PER_SEGMENT,
+        logger: Logger | None = None,
+        encoder_settings: EncoderSettings | None = None,
+        segment_seconds: float = DEFAULT_SEGMENT_SECONDS,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.segments_folder = Path(folder) / SEGMENTS_DIR
+        self.fps = fps
+        self.frames_per_segment = max(1, frames_per_segment)
+        self.segment_seconds = segment_seconds
+        self.encoder_settings = encoder_settings
+        self._writer: VideoEncoder | None = None
+        self._part_path: Path | None = None
+        self._images_folder: Path | None = None
+        self._frame_size: tuple[int, int] | None = None
+        self._segment_frames = 0
+        self._segment_started = 0.0
+
+        self.__remove_incomplete_segments()
+        existing = self.segments()
+        self._next_index = self.__index(existing[-1]) + 1 if existing else 0
+        self.frames_count = sum(map(self.__frames_in, existing))
+
+    @staticmethod
+    def has_segments(folder: str | Path) -> bool:
+        """Checks if a daily folder contains complete segments."""
+        return bool(SegmentedVideoWriter.__list_segments(Path(folder) / SEGMENTS_DIR))
+
+    def segments(self) -> list[Path]:
+        """Returns the complete segments (videos and folders of images) in the order in which they were written."""
+        return self.__list_segments(self.segments_folder)
+
+    def write(self, image: MatLike) -> bool:
+        """
+        Appends an image to the open segment. The first image sets the size of the video,
+        images with another size are resized to it.
+
+        Returns:
+            bool - False if the image could not be written
+        """
+        height, width = image.shape[:2]
+        if self._frame_size is None:
+            self._frame_size = (width, height)
+        elif self._frame_size != (width, height):
+            image = cv2.resize(image, self._frame_size)
+
+        if self._writer is None and self._images_folder is None:
+            self.__open_segment(self._frame_size)
+        if self._writer is not None:
+            self._writer.write(image)
+        elif self._images_folder is not None:
+            if not cv2.imwrite(str(self._images_folder / f"{self._segment_frames:06d}{JPG_FILE}"), image):
+                return False
+        self._segment_frames += 1
+        self.frames_count += 1
+
+        if (
+            self._segment_frames >= self.frames_per_segment
+            or time.monotonic() - self._segment_started >= self.segment_seconds
+        ):
+            self.close()
+        return True
+
+    def close(self) -> None:
+        """Completes the open segment, if there is one."""
+        if self._images_folder is not None:
+            self._images_folder = None
+            self._segment_frames = 0
+            return
+        if self._writer is None or self._part_path is None:
+            return
+
+        self._writer.release()
+        self._writer = None
+        segment_path = self._part_path.with_name(self._part_path.name.replace(f"{PART_FILE_SUFFIX}{MP4_FILE}", MP4_FILE))
+        os.replace(self._part_path, segment_path)
+        self._part_path = None
+        self._segment_frames = 0
+
+    def finalize(self, output_video: str) -> bool:
+        """
+        Completes the open segment and joins all segments into output_video.
+        The segments are deleted if the video is created.
+
+        Returns:
+            bool - if the video was created
+        """
+        self.close()
+        segments = self.segments()
+        if not segments:
+            self.logger.info(f"No video segments in {shorten(str(self.segments_folder))}")
+            return False
+
+        videos: list[str] = []
+        for segment in segments:
+            video = self.__encode_images(segment) if segment.is_dir() else segment
+            if video is None:
+                return False
+            videos.append(str(video))
+
+        created = VideoManager.stitch_videos(
+            self.logger, videos, output_video, self.fps, self.encoder_settings
+        )
+        if created:
+            shutil.rmtree(self.segments_folder, ignore_errors=True)
+            self.logger.info(f"Video created from {len(segments)} segments: {shorten(output_video)}")
+        return created
+
+    def __open_segment(self, frame_size: tuple[int, int]) -> None:
+        """Opens the next segment or, if the encoder fails, a folder for its images."""
+        self.segments_folder.mkdir(parents=True, exist_ok=True)
+        name = f"{SEGMENT_FILE_PREFIX}{self._next_index:05d}"
+        self._next_index += 1
+        self._segment_started = time.monotonic()
+
+        part_path = self.segments_folder / f"{name}{PART_FILE_SUFFIX}{MP4_FILE}"
+        writer = create_encoder(str(part_path), self.fps, frame_size, self.encoder_settings, self.logger)
+        if writer.is_opened():
+            self._writer, self._part_path = writer, part_path
+            return
+
+        self.logger.warning(f"Could not open the video segment {shorten(str(part_path))}, saving its frames as images")
+        writer.release()
+        part_path.unlink(missing_ok=True)
+        self._images_folder = self.segments_folder / name
+        self._images_folder.mkdir(exist_ok=True)
+
+    def __encode_images(self, folder: Path) -> Path | None:
+        """Encodes a folder of images into the video segment with its name. Returns None if it failed."""
+        video = folder.with_name(f"{folder.name}{MP4_FILE}")
+        part_path = folder.with_name(f"{folder.name}{PART_FILE_SUFFIX}{MP4_FILE}")
+        if not VideoManager.create_timelapse(self.logger, folder, str(part_path), self.fps, self.encoder_settings):
+            self.logger.error(f"Could not encode the images of the video segment {shorten(str(folder))}")
+            return None
+        os.replace(part_path, video)
+        shutil.rmtree(folder, ignore_errors=True)
+        return video
+
+    @staticmethod
+    def __list_segments(segments_folder: Path) -> list[Path]:
+        videos = segments_folder.glob(f"{SEGMENT_FILE_PREFIX}*[0-9]{MP4_FILE}")
+        folders = (path for path in segments_folder.glob(f"{SEGMENT_FILE_PREFIX}*[0-9]") if path.is_dir())
+        return sorted([*videos, *folders], key=SegmentedVideoWriter.__index)
+
+    @staticmethod
+    def __index(segment: Path) -> int:
+        return int(segment.name[len(SEGMENT_FILE_PREFIX):].split(".")[0])
+
+    @staticmethod
+    def __frames_in(segment: Path) -> int:
+        if segment.is_dir():
+            return len(list(segment.glob(f"*{JPG_FILE}")))
+        cap = cv2.VideoCapture(str(segment))
+        try:
+            return int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        finally:
+            cap.release()
+
+    def __remove_incomplete_segments(self) -> None:
+        for part in self.segments_folder.glob(f"*{PART_FILE_SUFFIX}{MP4_FILE}"):
+            self.logger.warning(f"Removing incomplete video segment {shorten(str(part))}")
+            os.remove(part)
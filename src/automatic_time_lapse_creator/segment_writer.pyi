@@ -0,0 +1,44 @@
+from logging import Logger
+from pathlib import Path
+from cv2.typing import MatLike
+from .encoders import EncoderSettings, VideoEncoder
+
+class SegmentedVideoWriter:
+    logger: Logger
+    segments_folder: Path
+    fps: int
+    frames_per_segment: int
+    segment_seconds: float
+    frames_count: int
+    encoder_settings: EncoderSettings | None
+    _writer: VideoEncoder | None
+    _part_path: Path | None
+    _images_folder: Path | None
+    _frame_size: tuple[int, int] | None
+    _segment_frames: int
+    _segment_started: float
+    _next_index: int
+    def __init__(
+        self,
+        folder: str | Path,
+        fps: int,
+        frames_per_segment: int = ...,
+        logger: Logger | None = ...,
+        encoder_settings: EncoderSettings | None = ...,
+        segment_seconds: float = ...,
+    ) -> None: ...
+    @staticmethod
+    def has_segments(folder: str | Path) -> bool: ...
+    def segments(self) -> list[Path]: ...
+    def write(self, image: MatLike) -> bool: ...
+    def close(self) -> None: ...
+    def finalize(self, output_video: str) -> bool: ...
+    def __open_segment(self, frame_size: tuple[int, int]) -> None: ...
+    def __encode_images(self, folder: Path) -> Path | None: ...
+    def __remove_incomplete_segments(self) -> None: ...
+    @staticmethod
+    def __list_segments(segments_folder: Path) -> list[Path]: ...
+    @staticmethod
+    def __index(segment: Path) -> int: ...
+    @staticmethod
+    def __frames_in(segment: Path) -> int: ...
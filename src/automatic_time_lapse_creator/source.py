@@ -11,6 +11,7 @@ from .common.logger import configure_child_logger
 from .common.constants import OK_STATUS_CODE
 from .common.exceptions import InvalidStatusCodeException
 from .weather_station_info import WeatherStationInfo
+from .frame import Frame
 
 
 class Source(ABC):
@@ -33,10 +34,14 @@ class Source(ABC):
 
         owner: str | None - Optionally you can provide the name of identifier of the owner of the source.
 
+        frame_size: tuple[int, int] | None - (width, height) of the saved images, set by the TimeLapseCreator.
+        The frames are checked for blankness with the colour decode at this size, which is reused when they are saved.
+
         _is_valid_url: bool - Whether the provided URL is a valid for collecting images from.
         _has_weather_data: bool - Whether weather data should be included in images.
         _daily_video_created: bool - Indicates whether a daily video has been successfully created.
         _monthly_video_created: bool - Indicates whether a monthly video has been successfully created.
+        _annual_video_created: bool - Indicates whether an annual video has been successfully created.
         _images_count: int - Tracks the number of images collected from the source.
         _all_images_collected: bool - Flag indicating whether all images have been
             collected for a specific period.
@@ -77,6 +82,7 @@ class Source(ABC):
         self._daily_video_created: bool = False
         self._weekly_video_created: bool = False
         self._monthly_video_created: bool = False
+        self._annual_video_created: bool = False
         self._images_count: int = 0
         self._daily_videos_count: int = 0
         self._all_images_collected: bool = False
@@ -175,6 +181,21 @@ class Source(ABC):
         """
         return self._monthly_video_created
 
+    @property
+    def annual_video_created(self) -> bool:
+        """
+        Indicates whether an annual summary video has been successfully created from the monthly summary videos.
+
+        Returns:
+            bool: True if a video has been created, otherwise False.
+        """
+        return self._annual_video_created
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """A source cached before the annual summaries were added has no annual video created."""
+        self.__dict__.update(_annual_video_created=False)
+        self.__dict__.update(state)
+
     def set_daily_video_created(self) -> None:
         """Set the daily_video_created to True"""
         self._daily_video_created = True
@@ -199,6 +220,14 @@ class Source(ABC):
         """Reset the monthly_video_created to False"""
         self._monthly_video_created = False
 
+    def set_annual_video_created(self) -> None:
+        """Set the annual_video_created to True"""
+        self._annual_video_created = True
+
+    def reset_annual_video_created(self) -> None:
+        """Reset the annual_video_created to False"""
+        self._annual_video_created = False
+
     def increase_images(self) -> None:
         """Increases the count of the images by 1"""
         self._images_count += 1
@@ -207,6 +236,10 @@ class Source(ABC):
         """Resets the images count to 0"""
         self._images_count = 0
 
+    def set_images_count(self, count: int) -> None:
+        """Set the count of the images to the specified count"""
+        self._images_count = count
+
     def set_videos_count(self, count: int) -> None:
         """Set the count of the daily videos to the specified count"""
         self._daily_videos_count = count
@@ -232,6 +265,7 @@ class Source(ABC):
         self._images_partially_collected = False
 
     BLANK_BRIGHTNESS_THRESHOLD: float = 10.0
+    frame_size: tuple[int, int] | None = None
 
     def _is_blank_frame(self, jpeg_bytes: bytes) -> bool:
         """
@@ -239,20 +273,48 @@ class Source(ABC):
 
         This catches the common case where a video player has not yet buffered
         its first frame and renders a solid black rectangle. The check decodes
-        the JPEG to a greyscale image and compares the mean pixel brightness
-        against ``BLANK_BRIGHTNESS_THRESHOLD``.
+        the JPEG at the ``frame_size`` of the saved images (or to a greyscale
+        image at 1/8 of its size if it is not set) and compares the mean pixel
+        brightness of a downsampled thumbnail against ``BLANK_BRIGHTNESS_THRESHOLD``.
 
         Always returns *False* when the threshold is set to 0 (detection
         disabled) or when the image cannot be decoded.
         """
+        return self._is_blank(Frame(encoded=jpeg_bytes, target_size=self.frame_size))
+
+    def _is_blank_image(self, img: cv2.typing.MatLike) -> bool:
+        """
+        Same as ``_is_blank_frame`` for an already decoded BGR image, so frames
+        which are decoded anyway are not encoded and decoded again for the check.
+        """
+        return self._is_blank(Frame(image=img))
+
+    def _is_blank(self, frame: Frame) -> bool:
+        """
+        Same as ``_is_blank_frame`` for a Frame. The brightness is cached on the
+        frame, so the check does not decode the frame for its later consumers.
+        """
         if self.BLANK_BRIGHTNESS_THRESHOLD <= 0:
             return False
-        import numpy as np
-        arr = np.frombuffer(jpeg_bytes, dtype=np.uint8)
-        img = cv2.imdecode(arr, cv2.IMREAD_GRAYSCALE)
-        if img is None:
+        brightness = frame.brightness
+        if brightness is None:
             return False
-        return float(img.mean()) < self.BLANK_BRIGHTNESS_THRESHOLD
+        return brightness < self.BLANK_BRIGHTNESS_THRESHOLD
+
+    def get_frame(self) -> Frame | None:
+        """
+        Returns the next frame of the source as a Frame, so the decoded image can be
+        shared between the blank check, the overlay and the saving of the image.
+
+        The default implementation wraps the bytes of get_frame_bytes().
+
+        Returns:
+            Frame | None: the captured frame or None if unsuccessful.
+        """
+        frame_bytes = self.get_frame_bytes()
+        if not frame_bytes:
+            return None
+        return Frame(encoded=frame_bytes, source_name=self.location_name, target_size=self.frame_size)
 
     @abstractmethod
     def validate_url(self, url: str) -> bool:
@@ -287,8 +349,8 @@ class ImageSource(Source):
             self.logger.warning(f"{url} is NOT a valid source for collecting images")
             return False
 
-    def get_frame_bytes(self) -> bytes | None:
-        """Verifies the request status code is 200  and returns the response content as bytes.
+    def get_frame(self) -> Frame | None:
+        """Verifies the request status code is 200 and returns the response content as a Frame.
 
         Raises::
 
@@ -296,7 +358,7 @@ class ImageSource(Source):
             because request.content would not be accessible and the program will crash.
 
         Returns::
-            bytes | Any - the content of the response if Exception is not raised."""
+            Frame | None - the frame if Exception is not raised and the frame is not blank."""
 
         try:
             response = requests.get(self.url, timeout=15)
@@ -307,10 +369,25 @@ class ImageSource(Source):
         except Exception as exc:
             self.logger.error(f"{self.location_name}: {exc}")
             raise exc
-        if self._is_blank_frame(response.content):
+        frame = Frame(encoded=response.content, source_name=self.location_name, target_size=self.frame_size)
+        if self._is_blank(frame):
             self.logger.debug(f"{self.location_name}: blank frame detected, skipping.")
             return None
-        return response.content
+        return frame
+
+    def get_frame_bytes(self) -> bytes | None:
+        """Verifies the request status code is 200  and returns the response content as bytes.
+
+        Raises::
+
+            InvalidStatusCodeException if the code is different,
+            because request.content would not be accessible and the program will crash.
+
+        Returns::
+            bytes | Any - the content of the response if Exception is not raised."""
+
+        frame = self.get_frame()
+        return None if frame is None else frame.encoded
 
 
 class StreamSource(Source):
@@ -405,12 +482,13 @@ class StreamSource(Source):
             self.logger.error(f"An error occurred while validating stream url: {e}")
             return False
 
-    def get_frame_bytes(self) -> bytes | None:
+    def get_frame(self) -> Frame | None:
         """
-        Scrapes the latest frame from a video stream URL and returns it as bytes.
+        Scrapes the latest frame from a video stream URL and returns it as a Frame.
+        The frame keeps the decoded image, so it is encoded only if the bytes are requested.
 
         Returns:
-            bytes | None: The frame encoded as a JPEG byte array, or None if unsuccessful.
+            Frame | None: The captured frame, or None if unsuccessful.
         """
         _url = (
             self.get_url_with_yt_dlp(self.url)
@@ -419,28 +497,39 @@ class StreamSource(Source):
         )
 
         try:
-            ret, frame = self._read_frame(_url)
-            if not ret or frame is None:
+            ret, image = self._read_frame(_url)
+            if not ret or image is None:
                 self.logger.warning(
                     f"Failed to retrieve a frame from {self.location_name} video stream."
                 )
                 return None
 
-            success, buffer = cv2.imencode(".jpg", frame)
-            if not success:
-                self.logger.warning("Failed to encode frame to JPEG format.")
-                return None
-
-            jpeg = buffer.tobytes()
-            if self._is_blank_frame(jpeg):
+            frame = Frame(image=image, source_name=self.location_name)
+            if self._is_blank(frame):
                 self.logger.debug(f"{self.location_name}: blank frame detected, skipping.")
                 return None
-            return jpeg
+            return frame
 
         except Exception as e:
             self.logger.error(f"{self.location_name}: {e}")
             raise e
 
+    def get_frame_bytes(self) -> bytes | None:
+        """
+        Scrapes the latest frame from a video stream URL and returns it as bytes.
+
+        Returns:
+            bytes | None: The frame encoded as a JPEG byte array, or None if unsuccessful.
+        """
+        frame = self.get_frame()
+        if frame is None:
+            return None
+
+        jpeg = frame.encoded
+        if jpeg is None:
+            self.logger.warning("Failed to encode frame to JPEG format.")
+        return jpeg
+
 
 # Selectors tried in order when no explicit selector is provided.
 # Each entry is tried against the live DOM; the first non-empty result wins.
@@ -1,5 +1,7 @@
+from cv2.typing import MatLike
 from logging import Logger
 from .weather_station_info import WeatherStationInfo
+from .frame import Frame
 from abc import ABC, abstractmethod
 from playwright.sync_api import Browser, ElementHandle, Page, Playwright
 from typing import Any
@@ -38,14 +40,20 @@ class Source(ABC):
     def weekly_video_created(self) -> bool: ...
     @property
     def monthly_video_created(self) -> bool: ...
+    @property
+    def annual_video_created(self) -> bool: ...
+    def __setstate__(self, state: dict[str, Any]) -> None: ...
     def set_daily_video_created(self) -> None: ...
     def reset_daily_video_created(self) -> None: ...
     def set_weekly_video_created(self) -> None: ...
     def reset_weekly_video_created(self) -> None: ...
     def set_monthly_video_created(self) -> None: ...
     def reset_monthly_video_created(self) -> None: ...
+    def set_annual_video_created(self) -> None: ...
+    def reset_annual_video_created(self) -> None: ...
     def increase_images(self) -> None: ...
     def reset_images_counter(self) -> None: ...
+    def set_images_count(self, count: int) -> None: ...
     def set_videos_count(self, count: int) -> None: ...
     def reset_daily_videos_counter(self) -> None: ...
     def set_all_images_collected(self) -> None: ...
@@ -53,7 +61,11 @@ class Source(ABC):
     def reset_all_images_collected(self) -> None: ...
     def reset_images_partially_collected(self) -> None: ...
     BLANK_BRIGHTNESS_THRESHOLD: float
+    frame_size: tuple[int, int] | None
     def _is_blank_frame(self, jpeg_bytes: bytes) -> bool: ...
+    def _is_blank_image(self, img: MatLike) -> bool: ...
+    def _is_blank(self, frame: Frame) -> bool: ...
+    def get_frame(self) -> Frame | None: ...
     @abstractmethod
     def get_frame_bytes(self) -> bytes | None: ...
     @abstractmethod
@@ -61,6 +73,7 @@ class Source(ABC):
 
 class ImageSource(Source):
     def validate_url(self, url: str) -> bool: ...
+    def get_frame(self) -> Frame | None: ...
     def get_frame_bytes(self) -> bytes | None: ...
 
 class StreamSource(Source):
@@ -73,6 +86,7 @@ class StreamSource(Source):
     def _open_capture(url: str) -> object: ...
     def _read_frame(self, url: str) -> tuple[bool, object | None]: ...
     def validate_url(self, url: str) -> bool: ...
+    def get_frame(self) -> Frame | None: ...
     def get_frame_bytes(self) -> bytes | None: ...
 
 class BrowserSource(Source):
@@ -0,0 +1,321 @@
+from __future__ import annotations
+import logging
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging import Logger
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from .common.constants import (
+    DEFAULT_S3_FRAMES_BATCH_SIZE,
+    DEFAULT_S3_PART_SIZE,
+    DEFAULT_S3_RETRY_SECONDS,
+    DEFAULT_S3_UPLOAD_ATTEMPTS,
+    DEFAULT_S3_UPLOAD_WORKERS,
+    S3_MIN_PART_SIZE,
+    S3_PENDING_FILE,
+)
+from .common.utils import shorten
+
+try:
+    import boto3  # type: ignore
+except ImportError:  # boto3 is an optional dependency
+    boto3 = None
+
+
+class StorageBackend(ABC):
+    """
+    Where the finished frames and videos are kept.
+
+    The frames and the videos are always written under the local root first (the encoders and the
+    summaries read them there), then they are handed to the backend with store_frame() and
+    store_video(). The media are identified by their path relative to the root.
+    """
+
+    def __init__(self, root: str | Path, logger: Logger | None = None) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+        self.root = Path(root)
+
+    def key(self, path: str | Path) -> str:
+        """Returns the path relative to the root with "/" separators, or the file name if it is not under the root."""
+        path = Path(path)
+        try:
+            return path.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return path.name
+
+    @abstractmethod
+    def store_frame(self, path: str | Path) -> bool:
+        """Keeps a saved frame. Returns False if it could not be stored."""
+
+    @abstractmethod
+    def store_video(self, path: str | Path) -> str | None:
+        """Keeps a finished video. Returns its location or None if it could not be stored."""
+
+    def flush(self) -> int:
+        """Stores the frames which are waiting for a batch. Returns their number."""
+        return 0
+
+    def pending(self, path: str | Path) -> list[str]:
+        """Returns the media (the path itself or the media under it) which are not stored yet, e.g.
+        because their upload failed. They must be kept until they are stored by a later flush()."""
+        return []
+
+    def close(self) -> None:
+        """Flushes the waiting frames and releases the resources of the backend."""
+        self.flush()
+
+
+class LocalStorage(StorageBackend):
+    """Keeps the media where they were written (the default)."""
+
+    def store_frame(self, path: str | Path) -> bool:
+        return os.path.exists(path)
+
+    def store_video(self, path: str | Path) -> str | None:
+        return str(path) if os.path.exists(path) else None
+
+
+class S3Storage(StorageBackend):
+    """
+    Uploads the media to a bucket of an S3 compatible object storage (AWS S3, MinIO, etc.) with boto3.
+
+    A video larger than part_size (at least S3_MIN_PART_SIZE) is streamed from the disk with a multipart upload, max_workers parts
+    at a time, so at most max_workers * part_size bytes are in memory. A failed multipart upload is
+    aborted, so no incomplete parts are left in the bucket. The object key is the prefix followed by
+    the path of the media relative to the root.
+
+    If upload_frames is True the saved frames are also uploaded - they are spooled on the local disk and
+    uploaded in the background in batches of frames_batch_size, so the capture never waits for the
+    network. flush() uploads the frames of an incomplete batch.
+
+    A failed upload is retried upload_attempts times with exponential backoff from retry_seconds, the rest
+    of its batch is left for the next flush(), which uploads the failed media again in the upload threads.
+    Every media is recorded in a journal (S3_PENDING_FILE in the root) before it is uploaded and is marked
+    as stored when the upload succeeds, so pending() reports the media which are not stored yet - also the
+    ones being uploaded by another thread or process - and the media which a stopped process could not
+    upload are retried after a restart.
+
+    The client and the upload threads are created lazily and are not pickled, so the storage can be
+    cached with the TimeLapseCreator and passed to the video worker processes.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str | None = None,
+        client: Any | None = None,
+        client_kwargs: dict[str, Any] | None = None,
+        part_size: int = DEFAULT_S3_PART_SIZE,
+        max_workers: int = DEFAULT_S3_UPLOAD_WORKERS,
+        upload_frames: bool = False,
+        frames_batch_size: int = DEFAULT_S3_FRAMES_BATCH_SIZE,
+        upload_attempts: int = DEFAULT_S3_UPLOAD_ATTEMPTS,
+        retry_seconds: float = DEFAULT_S3_RETRY_SECONDS,
+        logger: Logger | None = None,
+    ) -> None:
+        super().__init__(root, logger)
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.endpoint_url = endpoint_url
+        self.client_kwargs = client_kwargs or {}
+        self.part_size = max(S3_MIN_PART_SIZE, part_size)
+        self.max_workers = max(1, max_workers)
+        self.upload_frames = upload_frames
+        self.frames_batch_size = max(1, frames_batch_size)
+        self.upload_attempts = max(1, upload_attempts)
+        self.retry_seconds = retry_seconds
+        self.pending_file = self.root / S3_PENDING_FILE
+        self._client = client
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = Lock()
+        self._spooled: list[str] = []
+        self._pending: list[Future[int]] = []
+        self.__compact()
+        self._failed: dict[str, None] = dict.fromkeys(self.__outstanding())
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Strips the client, the upload threads and the lock before the storage is pickled."""
+        state = self.__dict__.copy()
+        state.update(_client=None, _executor=None, _lock=None, _pending=[], _spooled=[], _failed={})
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    @property
+    def client(self) -> Any:
+        """The boto3 S3 client."""
+        if self._client is None:
+            if boto3 is None:
+                raise ImportError('boto3 is not installed, install it with "pip install boto3"')
+            self._client = boto3.client("s3", endpoint_url=self.endpoint_url, **self.client_kwargs)
+        return self._client
+
+    def object_key(self, path: str | Path) -> str:
+        """Returns the key of the object of a media."""
+        key = self.key(path)
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def store_frame(self, path: str | Path) -> bool:
+        if not self.upload_frames:
+            return True
+
+        self.__record("+", str(path))
+        with self._lock:
+            self._spooled.append(str(path))
+            if len(self._spooled) < self.frames_batch_size:
+                return True
+            batch, self._spooled = self._spooled, []
+            self.__submit(batch)
+        return True
+
+    def store_video(self, path: str | Path) -> str | None:
+        self.__record("+", str(path))
+        if not self.__upload(str(path)):
+            return None
+        location = f"s3://{self.bucket}/{self.object_key(path)}"
+        self.logger.info(f"Uploaded {shorten(str(path))} to {location}")
+        return location
+
+    def flush(self) -> int:
+        """Uploads the frames which are waiting for a batch and the media whose upload failed in the
+        upload threads and waits for the uploads. Returns the number of the uploaded media."""
+        with self._lock:
+            retried = [*self._spooled, *(path for path in self._failed if path not in self._spooled)]
+            self._spooled, self._failed = [], {}
+            for start in range(0, len(retried), self.frames_batch_size):
+                self.__submit(retried[start:start + self.frames_batch_size])
+            pending, self._pending = self._pending, []
+        return sum(future.result() for future in pending)
+
+    def pending(self, path: str | Path) -> list[str]:
+        path = Path(path)
+        return [media for media in self.__outstanding() if Path(media) == path or Path(media).is_relative_to(path)]
+
+    def close(self) -> None:
+        super().close()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def upload_file(self, path: str | Path, key: str) -> None:
+        """
+        Uploads a file to the key. Files larger than part_size are uploaded in parallel parts.
+
+        Raises:
+            Exception - the error of the client, after the multipart upload is aborted
+        """
+        size = os.path.getsize(path)
+        if size <= self.part_size:
+            with open(path, "rb") as file:
+                self.client.put_object(Bucket=self.bucket, Key=key, Body=file.read())
+            return
+
+        upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=key)["UploadId"]
+        try:
+            with ThreadPoolExecutor(self.max_workers, thread_name_prefix="s3-part") as executor:
+                parts = list(executor.map(
+                    lambda number: self.__upload_part(path, key, upload_id, number),
+                    range(1, math.ceil(size / self.part_size) + 1),
+                ))
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except Exception:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+
+    def __upload_part(self, path: str | Path, key: str, upload_id: str, number: int) -> dict[str, Any]:
+        """Reads and uploads one part of the file."""
+        with open(path, "rb") as file:
+            file.seek((number - 1) * self.part_size)
+            data = file.read(self.part_size)
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=data
+        )
+        return {"PartNumber": number, "ETag": response["ETag"]}
+
+    def __submit(self, paths: list[str]) -> None:
+        """Uploads a batch of media in the upload threads. Must be called with the lock held."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="s3-upload")
+        self._pending = [future for future in self._pending if not future.done()]
+        self._pending.append(self._executor.submit(self.__upload_frames, paths))
+
+    def __upload_frames(self, paths: list[str]) -> int:
+        """Uploads a batch of media. After a failed upload (e.g. the storage is unreachable) the rest of
+        the batch is not tried, it is retried by the next flush(). Returns the number of the uploaded media."""
+        uploaded = 0
+        for index, path in enumerate(paths):
+            if self.__upload(path):
+                uploaded += 1
+            elif path in self._failed:
+                with self._lock:
+                    self._failed.update(dict.fromkeys(paths[index + 1:]))
+                break
+        return uploaded
+
+    def __upload(self, path: str) -> bool:
+        """Uploads a media with retries and marks it as stored in the journal. A deleted media
+        is also marked, because it can't be uploaded anymore. Returns True if it was uploaded."""
+        for attempt in range(1, self.upload_attempts + 1):
+            try:
+                self.upload_file(path, self.object_key(path))
+            except FileNotFoundError:
+                self.logger.warning(f"{shorten(path)} was deleted before it was uploaded")
+                self.__record("-", path)
+                return False
+            except Exception as exc:
+                if attempt == self.upload_attempts:
+                    self.logger.error(f"Could not upload {shorten(path)}: {exc}", exc_info=True)
+                    with self._lock:
+                        self._failed[path] = None
+                    return False
+                self.logger.warning(f"Upload of {shorten(path)} failed, retrying: {exc}")
+                time.sleep(self.retry_seconds * 2 ** (attempt - 1))
+            else:
+                self.__record("-", path)
+                return True
+        return False
+
+    def __record(self, mark: str, path: str) -> None:
+        """Appends a media to the journal, "+" before it is uploaded and "-" when it is stored."""
+        self.pending_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.pending_file, "a") as file:
+            file.write(f"{mark}{path}\n")
+
+    def __outstanding(self) -> list[str]:
+        """Replays the journal. Returns the media which are not stored yet, in the order they were recorded."""
+        try:
+            lines = self.pending_file.read_text().splitlines()
+        except FileNotFoundError:
+            return []
+        outstanding: dict[str, None] = {}
+        for line in lines:
+            if line.startswith("+"):
+                outstanding[line[1:]] = None
+            elif line.startswith("-"):
+                outstanding.pop(line[1:], None)
+        return list(outstanding)
+
+    def __compact(self) -> None:
+        """Rewrites the journal with the media which are not stored yet and still exist."""
+        if not self.pending_file.exists():
+            return
+        outstanding = [media for media in self.__outstanding() if os.path.exists(media)]
+        if not outstanding:
+            self.pending_file.unlink(missing_ok=True)
+            return
+        part_file = self.pending_file.with_name(f"{self.pending_file.name}.part")
+        part_file.write_text("".join(f"+{media}\n" for media in outstanding))
+        os.replace(part_file, self.pending_file)
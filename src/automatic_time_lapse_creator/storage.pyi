@@ -0,0 +1,69 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging import Logger
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+class StorageBackend(ABC):
+    logger: Logger
+    root: Path
+    def __init__(self, root: str | Path, logger: Logger | None = ...) -> None: ...
+    def key(self, path: str | Path) -> str: ...
+    @abstractmethod
+    def store_frame(self, path: str | Path) -> bool: ...
+    @abstractmethod
+    def store_video(self, path: str | Path) -> str | None: ...
+    def flush(self) -> int: ...
+    def pending(self, path: str | Path) -> list[str]: ...
+    def close(self) -> None: ...
+
+class LocalStorage(StorageBackend):
+    def store_frame(self, path: str | Path) -> bool: ...
+    def store_video(self, path: str | Path) -> str | None: ...
+
+class S3Storage(StorageBackend):
+    bucket: str
+    prefix: str
+    endpoint_url: str | None
+    client_kwargs: dict[str, Any]
+    part_size: int
+    max_workers: int
+    upload_frames: bool
+    frames_batch_size: int
+    upload_attempts: int
+    retry_seconds: float
+    pending_file: Path
+    _client: Any | None
+    _executor: ThreadPoolExecutor | None
+    _lock: Lock
+    _spooled: list[str]
+    _pending: list[Future[int]]
+    _failed: dict[str, None]
+    def __init__(
+        self,
+        root: str | Path,
+        bucket: str,
+        prefix: str = ...,
+        endpoint_url: str | None = ...,
+        client: Any | None = ...,
+        client_kwargs: dict[str, Any] | None = ...,
+        part_size: int = ...,
+        max_workers: int = ...,
+        upload_frames: bool = ...,
+        frames_batch_size: int = ...,
+        upload_attempts: int = ...,
+        retry_seconds: float = ...,
+        logger: Logger | None = ...,
+    ) -> None: ...
+    def __getstate__(self) -> dict[str, Any]: ...
+    def __setstate__(self, state: dict[str, Any]) -> None: ...
+    @property
+    def client(self) -> Any: ...
+    def object_key(self, path: str | Path) -> str: ...
+    def store_frame(self, path: str | Path) -> bool: ...
+    def store_video(self, path: str | Path) -> str | None: ...
+    def flush(self) -> int: ...
+    def pending(self, path: str | Path) -> list[str]: ...
+    def close(self) -> None: ...
+    def upload_file(self, path: str | Path, key: str) -> None: ...
@@ -1,7 +1,13 @@
 import numpy as np
 import cv2
+import re
 from abc import ABC, abstractmethod
-from .common.constants import BLACK_BACKGROUND, WHITE_TEXT
+from collections import OrderedDict
+from copy import copy
+from threading import Lock
+from typing import Any, Callable, Hashable, Iterable
+from numpy.typing import NDArray
+from .common.constants import BLACK_BACKGROUND, WHITE_TEXT, DEFAULT_TEXT_BOX_CACHE_SIZE
 from cv2.typing import MatLike
 
 
@@ -43,36 +49,72 @@ class TextBox(ABC):
         self.text_size = cv2.getTextSize(self.text, self.font, self.font_scale, self.font_thickness)[0]
         self.height = int(self.text_size[1] * 2.5)
 
-        self.box = np.zeros((self.height, self.width, 4), dtype=np.uint8)
-        self.box[:, :, :3] = self.bg_color  # Fill the background color (BGR part)
-        self.box[:, :, 3] = int(self.alpha * 255)  # Set alpha (transparency)
-
-        # Create a BGR copy to render text (since OpenCV does not support text on BGRA)
-        rectangle = np.full((self.height, self.width, 3), self.bg_color, dtype=np.uint8)
-
         # Calculate text position
         self.text_x = int(self.width * 0.02)
         self.text_y = int(self.height * 0.7)
 
-        cv2.putText(
-            rectangle, 
-            self.text, 
-            (self.text_x, self.text_y), 
-            self.font, 
-            self.font_scale, 
-            self.text_color, 
-            self.font_thickness, 
-            lineType=cv2.LINE_AA
-        )
+        self.box = self._render(((self.text_x, self.text),))
+        self._blend_source: NDArray[np.uint8] | None = None
+
+    def _render(self, segments: Iterable[tuple[int, str]], width: int | None = None) -> NDArray[np.uint8]:
+        """Renders text segments at the given x positions on a new BGRA box.
+
+        Args:
+            segments (Iterable[tuple[int, str]]): the x position and the text of every segment.
+            width (int | None, optional): the width of the box. Defaults to self.width.
+
+        Returns:
+            NDArray[np.uint8]: the rendered box
+        """
+        width = self.width if width is None else width
+        box = np.zeros((self.height, width, 4), dtype=np.uint8)
+        box[:, :, 3] = int(self.alpha * 255)  # Set alpha (transparency)
+
+        # Create a BGR copy to render text (since OpenCV does not support text on BGRA)
+        rectangle = np.full((self.height, width, 3), self.bg_color, dtype=np.uint8)
+
+        for text_x, text in segments:
+            cv2.putText(
+                rectangle, 
+                text, 
+                (text_x, self.text_y), 
+                self.font, 
+                self.font_scale, 
+                self.text_color, 
+                self.font_thickness, 
+                lineType=cv2.LINE_AA
+            )
 
         # Merge the text layer into the main box (preserve alpha)
-        self.box[:, :, :3] = rectangle
+        box[:, :, :3] = rectangle
+        return box
+
+    def text_width(self, text: str) -> int:
+        """Returns the width in pixels of the text rendered with the font of the box."""
+        return cv2.getTextSize(text, self.font, self.font_scale, self.font_thickness)[0][0]
 
     @abstractmethod
     def position(self, img: MatLike) -> MatLike:
         """Abstract method for positioning the text box on an image."""
         pass
 
+    def canvas_height(self, img_height: int) -> int:
+        """Returns the height of the final image (canvas) for an image with the given height."""
+        return img_height
+
+    def image_region(self, canvas: MatLike) -> MatLike:
+        """Returns the view of the canvas where the image should be placed."""
+        return canvas
+
+    def draw_on_canvas(self, canvas: MatLike) -> MatLike:
+        """Draws the text box on a canvas whose image region is already filled.
+        The canvas is modified in place, so it can be a preallocated buffer.
+
+        Returns:
+            MatLike: the same canvas with the text box
+        """
+        return self.position(canvas)
+
     def _remove_alpha_channel_for_vstack(self):
         """Removes the transparency alpha channel for vstack
 
@@ -81,22 +123,45 @@ class TextBox(ABC):
         """
         return self.box[:, :, :3]
 
+    def _blend_layers(self) -> tuple[NDArray[np.uint8], float | None, NDArray[np.uint16] | None]:
+        """Precomputes the layers for blending once per box.
+
+        Returns:
+            tuple: the contiguous BGR part of the box, the alpha as a float if it's uniform
+                (the usual case) and the fixed-point (0-256) alpha mask if it's not
+        """
+        if self._blend_source is not self.box:
+            alpha = self.box[:, :, 3]
+            bgr = np.ascontiguousarray(self.box[:, :, :3])
+            if alpha.min() == alpha.max():
+                self._blend_layers_cache = (bgr, float(alpha.flat[0]) / 255, None)
+            else:
+                fixed_alpha = alpha.astype(np.uint16)
+                fixed_alpha += fixed_alpha >> 7  # scale 0-255 to 0-256
+                self._blend_layers_cache = (bgr, None, fixed_alpha[:, :, np.newaxis])
+            self._blend_source = self.box
+        return self._blend_layers_cache
+
     def blend_with_image(self, img: MatLike, y_offset: int) -> MatLike:
-        """Blends the text box with transparency into the given image."""
-        final_image = img.copy()
+        """Blends the text box with transparency into the given image in place.
+        Only the rows covered by the box are touched and the image is not copied.
 
-        # Extract the alpha channel
-        alpha_mask = self.box[:, :, 3] / 255.0  # Normalize to range 0-1
-        inv_alpha_mask = 1.0 - alpha_mask  # Inverted mask
+        Returns:
+            MatLike: the same image with the blended text box
+        """
+        bgr, alpha, fixed_alpha = self._blend_layers()
+        roi = img[y_offset : y_offset + self.height]
 
-        # Blend each color channel
-        for ch in range(3):  # B, G, R channels
-            final_image[y_offset : y_offset + self.height, :, ch] = (
-                inv_alpha_mask * final_image[y_offset : y_offset + self.height, :, ch]
-                + alpha_mask * self.box[:, :, ch]
-            ).astype(np.uint8)
+        if alpha is not None:
+            cv2.addWeighted(roi, 1.0 - alpha, bgr, alpha, 0, dst=roi)
+        else:
+            blended = roi.astype(np.uint16)
+            blended *= 256 - fixed_alpha
+            blended += bgr * fixed_alpha
+            blended >>= 8
+            roi[...] = blended
 
-        return final_image
+        return img
 
 
 class TopOutsideTextBox(TextBox):
@@ -106,6 +171,16 @@ class TopOutsideTextBox(TextBox):
         text_box_bgr = self._remove_alpha_channel_for_vstack()
         return np.vstack((text_box_bgr, img))
 
+    def canvas_height(self, img_height: int) -> int:
+        return img_height + self.height
+
+    def image_region(self, canvas: MatLike) -> MatLike:
+        return canvas[self.height :]
+
+    def draw_on_canvas(self, canvas: MatLike) -> MatLike:
+        canvas[: self.height] = self._remove_alpha_channel_for_vstack()
+        return canvas
+
 
 class TopInsideTextBox(TextBox):
     """Text box positioned inside the image at the top."""
@@ -127,3 +202,183 @@ class BottomOutsideTextBox(TextBox):
     def position(self, img: MatLike) -> MatLike:
         text_box_bgr = self._remove_alpha_channel_for_vstack()
         return np.vstack((img, text_box_bgr))
+
+    def canvas_height(self, img_height: int) -> int:
+        return img_height + self.height
+
+    def image_region(self, canvas: MatLike) -> MatLike:
+        return canvas[: canvas.shape[0] - self.height]
+
+    def draw_on_canvas(self, canvas: MatLike) -> MatLike:
+        canvas[canvas.shape[0] - self.height :] = self._remove_alpha_channel_for_vstack()
+        return canvas
+
+
+class TextBoxCache:
+    """
+    A bounded LRU cache of rendered text boxes.
+
+    Boxes are keyed by (text, width, height, class, transparency, colors), so a box is rendered
+    only once for as long as it stays in the cache. For the "date time | weather" text of the
+    saved images get_with_clock() renders the whole text once and redraws only the columns of
+    the changing time, so building the text box of a new frame is a copy of the cached box and
+    a putText on a small strip.
+    """
+
+    CLOCK_PATTERN = re.compile(r"[0-9:]+")
+
+    def __init__(self, max_size: int = DEFAULT_TEXT_BOX_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Returns the cached item for the key or creates, caches and returns a new one."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item
+            self.misses += 1
+
+        item = factory()
+
+        with self._lock:
+            self._items[key] = item
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return item
+
+    def clear(self) -> None:
+        """Removes all cached boxes."""
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get(
+        self,
+        text_box_class: type[TextBox],
+        text: str,
+        img_width: int,
+        img_height: int,
+        box_transparency: float = TextBox.TRANSPARENCY_MID,
+        bg_color: tuple[int] = BLACK_BACKGROUND,
+        text_color: tuple[int] = WHITE_TEXT,
+    ) -> TextBox:
+        """Returns a cached text box or renders a new one. The returned box should not be modified."""
+        key = (text, img_width, img_height, text_box_class, box_transparency, bg_color, text_color)
+        return self._get_or_create(
+            key,
+            lambda: text_box_class(
+                text=text,
+                img_width=img_width,
+                img_height=img_height,
+                box_transparency=box_transparency,
+                bg_color=bg_color,
+                text_color=text_color,
+            ),
+        )
+
+    def get_with_clock(
+        self,
+        text_box_class: type[TextBox],
+        date_time_text: str,
+        img_width: int,
+        img_height: int,
+        weather_data_text: str | None = None,
+        box_transparency: float = TextBox.TRANSPARENCY_MID,
+        bg_color: tuple[int] = BLACK_BACKGROUND,
+        text_color: tuple[int] = WHITE_TEXT,
+    ) -> TextBox:
+        """
+        Returns a text box for the text "date time | weather" where the text is rendered and
+        cached once, and only the time is redrawn. The box is identical to a box rendered from
+        the whole text. If the date_time_text doesn't end with a time (digits and colons)
+        the whole text is rendered and cached with get().
+
+        Returns:
+            TextBox - a new text box which shares no data with the cached boxes
+        """
+        suffix = f" | {weather_data_text}" if weather_data_text else ""
+        date_text, _, time_text = date_time_text.rpartition(" ")
+
+        if not date_text or not self.CLOCK_PATTERN.fullmatch(time_text):
+            return self.get(
+                text_box_class, f"{date_time_text}{suffix}", img_width, img_height,
+                box_transparency, bg_color, text_color,
+            )
+
+        template_key = (
+            "clock", date_text, re.sub(r"[0-9]", "0", time_text), suffix, img_width, img_height,
+            text_box_class, box_transparency, bg_color, text_color,
+        )
+        template, slot_x, slot_end = self._get_or_create(
+            template_key,
+            lambda: self._create_clock_template(
+                text_box_class, date_text, time_text, suffix, img_width, img_height,
+                box_transparency, bg_color, text_color,
+            ),
+        )
+        bgr, alpha, fixed_alpha = template._blend_layers()
+
+        text_box = copy(template)
+        text_box.text = f"{date_time_text}{suffix}"
+        text_box.box = template.box.copy()
+        bgr = bgr.copy()
+        if slot_x < slot_end:
+            # The date is drawn left of the slot and clipped, so the time keeps the sub-pixel
+            # position it has in the whole text
+            slot = template._render(
+                ((template.text_x - slot_x, f"{date_text} {time_text}"),), width=slot_end - slot_x
+            )[:, :, :3]
+            text_box.box[:, slot_x:slot_end, :3] = slot
+            bgr[:, slot_x:slot_end] = slot
+        text_box._blend_layers_cache = (bgr, alpha, fixed_alpha)
+        text_box._blend_source = text_box.box
+        return text_box
+
+    def _create_clock_template(
+        self,
+        text_box_class: type[TextBox],
+        date_text: str,
+        time_text: str,
+        suffix: str,
+        img_width: int,
+        img_height: int,
+        box_transparency: float,
+        bg_color: tuple[int],
+        text_color: tuple[int],
+    ) -> tuple[TextBox, int, int]:
+        """Renders the whole text and finds the columns of the time (the slot), which are
+        redrawn for every frame. Digits share the same width in the Hershey fonts, so the
+        slot doesn't depend on the time.
+
+        Returns:
+            tuple[TextBox, int, int]: the template text box and the first and the end column of the slot
+        """
+        text_box = text_box_class(
+            text=f"{date_text} {time_text}{suffix}",
+            img_width=img_width,
+            img_height=img_height,
+            box_transparency=box_transparency,
+            bg_color=bg_color,
+            text_color=text_color,
+        )
+
+        def advance(text: str) -> int:
+            return cv2.getTextSize(text, text_box.font, text_box.font_scale, 0)[0][0]
+
+        # The slot reaches halfway into the spaces around the time
+        margin = advance(" ") // 2
+        clock_x = text_box.text_x + advance(f"{date_text} ")
+        slot_x = max(0, clock_x - margin)
+        slot_end = min(text_box.width, clock_x + advance(time_text) + margin)
+        return text_box, slot_x, slot_end
@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Sequence
+from re import Pattern
+from typing import Any, Callable, Hashable, Iterable, Sequence
 from cv2.typing import MatLike
 from numpy.typing import NDArray
-from numpy import uint8
+from numpy import uint8, uint16
 
 
 BLACK_BACKGROUND: tuple[int, int, int]
@@ -38,15 +39,30 @@ class TextBox(ABC):
         text_color: tuple[int, int, int] = ...,
     ) -> None: ...
 
+    def _render(self, segments: Iterable[tuple[int, str]], width: int | None = ...) -> NDArray[uint8]: ...
+
+    def text_width(self, text: str) -> int: ...
+
     @abstractmethod
     def position(self, img: MatLike) -> MatLike: ...
 
+    def canvas_height(self, img_height: int) -> int: ...
+
+    def image_region(self, canvas: MatLike) -> MatLike: ...
+
+    def draw_on_canvas(self, canvas: MatLike) -> MatLike: ...
+
     def _remove_alpha_channel_for_vstack(self) -> NDArray[uint8]: ...
 
+    def _blend_layers(self) -> tuple[NDArray[uint8], float | None, NDArray[uint16] | None]: ...
+
     def blend_with_image(self, img: MatLike, y_offset: int) -> MatLike: ...
 
 class TopOutsideTextBox(TextBox):
     def position(self, img: MatLike) -> MatLike: ...
+    def canvas_height(self, img_height: int) -> int: ...
+    def image_region(self, canvas: MatLike) -> MatLike: ...
+    def draw_on_canvas(self, canvas: MatLike) -> MatLike: ...
 
 class TopInsideTextBox(TextBox):
     def position(self, img: MatLike) -> MatLike: ...
@@ -55,4 +71,51 @@ class BottomInsideTextBox(TextBox):
     def position(self, img: MatLike) -> MatLike: ...
 
 class BottomOutsideTextBox(TextBox):
-    def position(self, img: MatLike) -> MatLike: ...
\ No newline at end of file
+    def position(self, img: MatLike) -> MatLike: ...
+    def canvas_height(self, img_height: int) -> int: ...
+    def image_region(self, canvas: MatLike) -> MatLike: ...
+    def draw_on_canvas(self, canvas: MatLike) -> MatLike: ...
+
+class TextBoxCache:
+    CLOCK_PATTERN: Pattern[str]
+    max_size: int
+    hits: int
+    misses: int
+
+    def __init__(self, max_size: int = ...) -> None: ...
+    def __len__(self) -> int: ...
+    def _get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any: ...
+    def clear(self) -> None: ...
+    def get(
+        self,
+        text_box_class: type[TextBox],
+        text: str,
+        img_width: int,
+        img_height: int,
+        box_transparency: float = ...,
+        bg_color: tuple[int, int, int] = ...,
+        text_color: tuple[int, int, int] = ...,
+    ) -> TextBox: ...
+    def get_with_clock(
+        self,
+        text_box_class: type[TextBox],
+        date_time_text: str,
+        img_width: int,
+        img_height: int,
+        weather_data_text: str | None = ...,
+        box_transparency: float = ...,
+        bg_color: tuple[int, int, int] = ...,
+        text_color: tuple[int, int, int] = ...,
+    ) -> TextBox: ...
+    def _create_clock_template(
+        self,
+        text_box_class: type[TextBox],
+        date_text: str,
+        time_text: str,
+        suffix: str,
+        img_width: int,
+        img_height: int,
+        box_transparency: float,
+        bg_color: tuple[int, int, int],
+        text_color: tuple[int, int, int],
+    ) -> tuple[TextBox, int, int]: ...
@@ -0,0 +1,213 @@
+from __future__ import annotations
+import logging
+import os
+import time
+from datetime import date, timedelta
+from logging import Logger
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Callable, NamedTuple
+from .common.constants import DEFAULT_MIGRATION_AGE_DAYS, MIGRATION_CHUNK_SIZE, PART_FILE_SUFFIX
+from .common.utils import shorten
+from .encoders import EncoderSettings
+from .media_catalog import CatalogEntry, MediaCatalog
+from .video_manager import VideoManager as vm
+
+
+class MigrationPolicy(NamedTuple):
+    """
+    The cold storage tier of the TierMigrator.
+
+    Attributes:
+        cold_path: str - the root of the cold tier, e.g. a second mount. The videos keep their path
+            relative to the base path
+        min_age_days: dict[str, int] | None - the age in days after which the videos are moved by VideoType
+            value, defaults to DEFAULT_MIGRATION_AGE_DAYS
+        encoder_settings: EncoderSettings | None - re-encodes the videos with these settings (e.g. a slower
+            preset or a denser codec) before they are moved, defaults to None (the videos are copied)
+        max_bytes_per_second: int | None - the write throughput to the cold tier, defaults to None (unbounded)
+    """
+    cold_path: str
+    min_age_days: dict[str, int] | None = None
+    encoder_settings: EncoderSettings | None = None
+    max_bytes_per_second: int | None = None
+
+
+class MigrationReport(NamedTuple):
+    """The videos moved by TierMigrator.migrate() as (old path, new path) and the bytes written to the cold tier."""
+    moved: list[tuple[str, str]]
+    bytes_moved: int
+
+
+class TierMigrator:
+    """
+    Moves the aging videos from the base path to a cold storage tier.
+
+    The videos recorded in the MediaCatalog which are older than the min_age_days of their type are
+    (optionally re-encoded and) copied to the same relative path under the cold_path, with the write
+    throughput bounded by max_bytes_per_second, so the capture keeps its I/O. A video is copied to a
+    ".part" file which is renamed when it is complete, then its new location is recorded in the
+    catalog and only then the local file is deleted, so the summaries, the retention and the other
+    components which locate the videos with the catalog always find them.
+
+    A pass runs in the calling thread with migrate() or in a background thread with
+    migrate_in_background().
+    """
+
+    def __init__(
+        self,
+        catalog: MediaCatalog,
+        policy: MigrationPolicy,
+        base_path: str | Path,
+        logger: Logger | None = None,
+        initializer: Callable[[], None] | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.catalog = catalog
+        self.policy = policy
+        self.base_path = Path(base_path)
+        self.cold_path = Path(policy.cold_path)
+        self.initializer = initializer
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread: Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """True if a background pass is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def migrate(self, today: date | None = None) -> MigrationReport:
+        """
+        Moves the videos which are old enough to the cold tier.
+
+        Args:
+            today: date | None - the current day, defaults to date.today()
+
+        Returns:
+            MigrationReport - the moved videos and the bytes written to the cold tier
+        """
+        today = today or date.today()
+        min_age_days = self.policy.min_age_days if self.policy.min_age_days is not None else DEFAULT_MIGRATION_AGE_DAYS
+        moved: list[tuple[str, str]] = []
+        bytes_moved = 0
+        for media_type, age in min_age_days.items():
+            for entry in self.catalog.find(media_type=media_type, end=today - timedelta(days=age)):
+                if self._stop.is_set():
+                    return MigrationReport(moved, bytes_moved)
+                if not Path(entry.path).is_relative_to(self.base_path):
+                    continue
+                size = self.__move(entry)
+                if size is not None:
+                    moved.append((entry.path, str(self.__target(entry))))
+                    bytes_moved += size
+
+        if moved:
+            self.logger.info(f"Moved {len(moved)} videos ({bytes_moved} bytes) to {shorten(str(self.cold_path))}")
+        return MigrationReport(moved, bytes_moved)
+
+    def migrate_in_background(self, today: date | None = None) -> bool:
+        """
+        Starts a pass in a background thread.
+
+        Returns:
+            bool - False if a pass is already running
+        """
+        with self._lock:
+            if self.is_running:
+                return False
+            self._stop.clear()
+            self._thread = Thread(target=self._work, args=(today,), name="tier-migrator", daemon=True)
+            self._thread.start()
+        return True
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Waits for the background pass. Returns False if it is still running."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return not self.is_running
+
+    def close(self, timeout: float | None = None) -> None:
+        """Stops the background pass after the video which is being moved."""
+        self._stop.set()
+        self.wait(timeout)
+
+    def _work(self, today: date | None) -> None:
+        if self.initializer is not None:
+            self.initializer()
+        try:
+            self.migrate(today)
+        except Exception as exc:
+            self.logger.error(f"Moving the videos to {shorten(str(self.cold_path))} failed: {exc}", exc_info=True)
+
+    def __target(self, entry: CatalogEntry) -> Path:
+        return self.cold_path / Path(entry.path).relative_to(self.base_path)
+
+    def __move(self, entry: CatalogEntry) -> int | None:
+        """Moves the video of the entry. Returns the bytes written or None if it was not moved."""
+        source = Path(entry.path)
+        target = self.__target(entry)
+        if not source.exists():
+            # moved by a pass which was stopped before the catalog was updated
+            if target.exists() and self.catalog.relocate(source, target, target.stat().st_size):
+                return 0
+            return None
+
+        encoded = source.with_name(f"{source.stem}{PART_FILE_SUFFIX}{source.suffix}")
+        part = target.with_name(f"{target.stem}{PART_FILE_SUFFIX}{target.suffix}")
+        try:
+            copied = source
+            if self.policy.encoder_settings is not None and vm.transcode_video(
+                self.logger, str(source), str(encoded), self.policy.encoder_settings
+            ):
+                # the original is kept if the re-encoded video is not smaller
+                if encoded.stat().st_size < source.stat().st_size:
+                    copied = encoded
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            size = self.__copy(copied, part)
+            if size is None:
+                return None
+            os.replace(part, target)
+        except OSError as exc:
+            self.logger.error(f"Could not move {shorten(str(source))}: {exc}")
+            return None
+        finally:
+            for leftover in (encoded, part):
+                if leftover.exists():
+                    leftover.unlink()
+
+        if not self.catalog.relocate(source, target, size):
+            # the video was evicted while it was copied
+            target.unlink()
+            return None
+        source.unlink(missing_ok=True)
+        try:
+            source.parent.rmdir()
+        except OSError:
+            pass
+        return size
+
+    def __copy(self, source: Path, target: Path) -> int | None:
+        """Copies the file in chunks within max_bytes_per_second. Returns None if the migrator was stopped."""
+        rate = self.policy.max_bytes_per_second
+        started = time.monotonic()
+        written = 0
+        with open(source, "rb") as reader, open(target, "wb") as writer:
+            while chunk := reader.read(MIGRATION_CHUNK_SIZE):
+                if self._stop.is_set():
+                    return None
+                writer.write(chunk)
+                written += len(chunk)
+                if rate:
+                    delay = written / rate - (time.monotonic() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+            writer.flush()
+            os.fsync(writer.fileno())
+        return written
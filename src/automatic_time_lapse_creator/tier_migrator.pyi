@@ -0,0 +1,43 @@
+from datetime import date
+from logging import Logger
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Callable, NamedTuple
+from .encoders import EncoderSettings
+from .media_catalog import MediaCatalog
+
+class MigrationPolicy(NamedTuple):
+    cold_path: str
+    min_age_days: dict[str, int] | None = ...
+    encoder_settings: EncoderSettings | None = ...
+    max_bytes_per_second: int | None = ...
+
+class MigrationReport(NamedTuple):
+    moved: list[tuple[str, str]]
+    bytes_moved: int
+
+class TierMigrator:
+    logger: Logger
+    catalog: MediaCatalog
+    policy: MigrationPolicy
+    base_path: Path
+    cold_path: Path
+    initializer: Callable[[], None] | None
+    _lock: Lock
+    _stop: Event
+    _thread: Thread | None
+    def __init__(
+        self,
+        catalog: MediaCatalog,
+        policy: MigrationPolicy,
+        base_path: str | Path,
+        logger: Logger | None = ...,
+        initializer: Callable[[], None] | None = ...,
+    ) -> None: ...
+    @property
+    def is_running(self) -> bool: ...
+    def migrate(self, today: date | None = ...) -> MigrationReport: ...
+    def migrate_in_background(self, today: date | None = ...) -> bool: ...
+    def wait(self, timeout: float | None = ...) -> bool: ...
+    def close(self, timeout: float | None = ...) -> None: ...
+    def _work(self, today: date | None) -> None: ...
@@ -1,14 +1,20 @@
 from __future__ import annotations
+import cv2
 import os
-from datetime import datetime as dt, timedelta as td
-from time import sleep
+import shutil
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import calendar
+from datetime import date, datetime as dt, timedelta as td
+from functools import partial
+from time import sleep, time
 from pathlib import Path
 from queue import Queue
-from typing import Any, Iterable, NamedTuple
+from typing import Any, Callable, Iterable, NamedTuple
 from glob import glob
 from logging import Logger
 from .cache_manager import CacheManager
 from .source import Source
+from .frame import Frame
 from .video_manager import (
     VideoManager as vm,
 )
@@ -38,6 +44,14 @@ from .common.constants import (
     DEFAULT_WAIT_BETWEEN_FRAMES_NIGHTTIME_MULTIPLIER_VALIDATION_RANGE,
     DEFAULT_WAIT_BETWEEN_FRAMES_NIGHTTIME_MULTIPLIER,
     LOG_START_INT,
+    PART_FILE_SUFFIX,
+    JOBS_DB_FILE,
+    UPLOAD_JOB_TYPE,
+    DEFAULT_JOB_WORKERS,
+    CATALOG_DB_FILE,
+    CATALOG_BACKFILL_MARK,
+    FRAMES_MEDIA_TYPE,
+    RETENTION_CHECK_SECONDS,
     VideoType,
 )
 from .common.exceptions import (
@@ -51,10 +65,23 @@ from .common.utils import (
     DailyVideoResponse,
     WeeklyVideoResponse,
     MonthlyVideoResponse,
+    AnnualVideoResponse,
     get_weekly_video_files_paths
 )
 from .common.logger import configure_root_logger
 from .text_box import TextBox, TopOutsideTextBox
+from .weather_hub import WeatherHub
+from .segment_writer import SegmentedVideoWriter
+from .encoders import EncoderSettings
+from .job_queue import Job, JobDeferred, JobQueue, JobWorkerPool
+from .worker_priority import WorkerPriority, apply_worker_priority, initialize_worker_process
+from .frame_manifest import FrameManifest
+from .frame_store import MappedFrameStore, PackedFrameStore
+from .deletion_service import DeletionService
+from .retention import RetentionEngine, RetentionPolicy, RetentionReport
+from .tier_migrator import MigrationPolicy, TierMigrator
+from .storage import StorageBackend
+from .media_catalog import MediaCatalog
 
 CustomTimeSpan = NamedTuple("CustomTimeSpan", [("start_hour", int), ("start_minutes", int), ("end_hour", int), ("end_minutes", int)])
 
@@ -97,6 +124,67 @@ class TimeLapseCreator:
         delete_collected_daily_images: bool - Whether to delete the images after a daily video is created. Defualts to True.
         delete_daily_videos_after_monthly_summary_is_created: bool - Whether to delete daily videos after the monthly summary is generated.
         log_queue: Queue[Any] | None - A queue for handling log messages across processes.
+        raw_capture: bool - Save the fetched images untouched during the day and apply the resizing and
+        the text box when the daily video is created (useful for slow devices with many sources). Defaults to False.
+        incremental_video: bool - Encode the daily videos while the images are collected, so creating the video at the
+        end of the day only joins the encoded segments. The images are saved only if delete_collected_daily_images is False.
+        Ignored if raw_capture is True. Defaults to False.
+        encoder_settings: EncoderSettings | None - The encoder backend (OpenCV, ffmpeg or PyAV), codec, quality, preset
+        and threads of the created videos. Defaults to cv2.VideoWriter with the DEFAULT_VIDEO_CODEC.
+        summary_frames_per_day: int | None - The number of evenly spaced frames of every daily video used in the weekly
+        and monthly summaries. Defaults to None (all frames).
+        summary_duration_seconds: float | None - The approximate duration of the weekly and monthly summaries, the frames
+        are sampled evenly from the daily videos. Defaults to None (the sum of the daily videos).
+        create_annual_summary_video: bool - Whether to generate an annual summary video from the monthly summary videos,
+        when the monthly summary of December is created. Defaults to False.
+        annual_summary_duration_seconds: float | None - The approximate duration of the annual summary, the frames are
+        sampled evenly from the monthly summaries. Defaults to None (the monthly summaries are joined).
+        video_workers: int - The number of worker processes creating the daily videos of the sources in parallel at the
+        end of the day, the sources with most images are started first. Defaults to 1 (the videos are created one by one).
+        video_chunks: int - The number of worker processes encoding contiguous parts of a single daily video in parallel.
+        The parts are joined without re-encoding if ffmpeg is installed. Defaults to 1 (a video is encoded in one process).
+        use_job_queue: bool - Run the daily videos and the summaries as jobs of a durable JobQueue (JOBS_DB_FILE in the
+        base path) in background workers, so the capture loop is not blocked and interrupted work is resumed after a
+        restart. The response of a created video is put to the video queue (e.g. for its upload) by an UPLOAD_JOB_TYPE
+        job, so it is sent once also if the process is stopped before. Defaults to False (the videos are created in the
+        capture loop).
+        job_workers: int - The number of background workers of the job queue. Defaults to DEFAULT_JOB_WORKERS.
+        job_concurrency: dict[str, int] | None - The maximum number of running jobs per VideoType value. Defaults to
+        job_workers for the daily videos and 1 for the summaries.
+        worker_priority: WorkerPriority | None - The niceness, I/O priority, CPU affinity (reserved cores for the capture)
+        and OpenCV threads of the workers creating the videos (process pools, annual summary threads and job workers).
+        The daily videos and the weekly and monthly summaries which are created in the capture loop are encoded in a
+        worker thread with this priority as well. The OpenCV threads are limited for the whole capture process when it
+        starts; the thread pool of OpenCV is shared with the capture, so its threads keep the priority of the capture.
+        Defaults to None (the workers run with the priority of the capture loop).
+        frame_manifest: bool - Append every saved frame (file name, capture time, size and hash) to the FrameManifest of
+        its daily folder, so creating the video, deleting the images and resuming after a restart don't list the folder.
+        Defaults to False.
+        use_media_catalog: bool - Record the frame folders and the videos in a MediaCatalog (CATALOG_DB_FILE in the base
+        path), so the summaries find the videos which were moved to the cold tier. The videos which are not recorded (e.g.
+        created before the catalog was used) are still found in the folders and joined with the recorded ones. When the
+        catalog is opened for the first time, the existing media of the base path are recorded. Defaults to False.
+        packed_frames: bool - Append the encoded images of a source to one PackedFrameStore file per day instead of
+        saving every image as a separate file, so the daily video streams the frames from a single file and the images
+        are deleted with a single unlink. Ignored if raw_capture is True. Defaults to False.
+        mapped_frames: bool - Copy the rendered images of a source into a MappedFrameStore per day instead of encoding
+        them, so the daily video is encoded from memory-mapped frames without decoding a single image. The store is
+        deleted after the daily video is created (delete_collected_daily_images is set). Takes precedence over
+        packed_frames and is ignored if raw_capture or incremental_video is True. Defaults to False.
+        background_deletion: bool - Delete the collected images and the joined daily videos with a DeletionService in a
+        background thread (with the worker_priority), so the capture and the encoding don't wait for the deletion.
+        Defaults to False.
+        retention_policy: RetentionPolicy | None - The disk budgets and the age rules of the media. The media which are
+        too old or exceed the budgets are evicted by a RetentionEngine when a day starts, after the daily videos are
+        created and whenever the free space falls below min_free_bytes (checked every RETENTION_CHECK_SECONDS while
+        the images are collected). The evicted frames are deleted by the DeletionService in the background. Requires
+        the media catalog, so use_media_catalog is set. Defaults to None (the media are kept).
+        migration_policy: MigrationPolicy | None - The cold storage tier of the aging videos. After the daily videos are
+        created a TierMigrator moves the old videos there in the background and records their new location in the
+        media catalog, so use_media_catalog is set. Defaults to None (the videos stay in the base path).
+        storage: StorageBackend | None - Stores the saved images and the created videos after they are written to the
+        base path, e.g. an S3Storage uploads them to an object storage. The collected images and the daily videos are
+        deleted only after they are stored. Defaults to None (only the base path is used).
         video_queue: Queue[Any] | None - A queue for managing video creation and upload tasks.
         location: LocationAndTimeManager - Handles daylight calculations and time-based operations.
         logger: Logger - Logger instance for handling logging.
@@ -124,6 +212,27 @@ class TimeLapseCreator:
         delete_daily_videos_after_summary_is_created: bool = True,
         quiet_mode: bool = True,
         log_queue: Queue[Any] | None = None,
+        raw_capture: bool = False,
+        incremental_video: bool = False,
+        encoder_settings: EncoderSettings | None = None,
+        summary_frames_per_day: int | None = None,
+        summary_duration_seconds: float | None = None,
+        create_annual_summary_video: bool = False,
+        annual_summary_duration_seconds: float | None = None,
+        video_workers: int = 1,
+        video_chunks: int = 1,
+        use_job_queue: bool = False,
+        job_workers: int = DEFAULT_JOB_WORKERS,
+        job_concurrency: dict[str, int] | None = None,
+        worker_priority: WorkerPriority | None = None,
+        frame_manifest: bool = False,
+        use_media_catalog: bool = False,
+        packed_frames: bool = False,
+        mapped_frames: bool = False,
+        background_deletion: bool = False,
+        retention_policy: RetentionPolicy | None = None,
+        migration_policy: MigrationPolicy | None = None,
+        storage: StorageBackend | None = None,
     ) -> None:
         self.base_path = os.path.join(os.getcwd(), path)
 
@@ -154,16 +263,384 @@ class TimeLapseCreator:
         self.text_box_position = text_box_position
         self.text_box_transparency = text_box_transparency
         self.quiet_mode = quiet_mode
+        self.encoder_settings = encoder_settings
+        self.summary_frames_per_day = summary_frames_per_day
+        self.summary_duration_seconds = summary_duration_seconds
+        self.annual_summary_duration_seconds = annual_summary_duration_seconds
+        self.video_workers = max(1, video_workers)
+        self.video_chunks = max(1, video_chunks)
+        self.use_job_queue = use_job_queue
+        self.worker_priority = worker_priority
+        self.frame_manifest = frame_manifest
+        self.use_media_catalog = use_media_catalog
+        self.packed_frames = packed_frames
+        self.mapped_frames = mapped_frames
+        self.background_deletion = background_deletion
+        self.retention_policy = retention_policy
+        self.migration_policy = migration_policy
+        self.storage = storage
+        if retention_policy is not None and not use_media_catalog:
+            self.logger.info("The media catalog is used, because the retention policy is enforced with it")
+            self.use_media_catalog = True
+        if migration_policy is not None and not self.use_media_catalog:
+            self.logger.info("The media catalog is used, because it records the location of the migrated videos")
+            self.use_media_catalog = True
+        self.job_workers = max(1, job_workers)
+        self.job_concurrency = (
+            job_concurrency if job_concurrency is not None else self._default_job_concurrency(self.job_workers)
+        )
+        self.raw_capture = raw_capture
+        self.incremental_video = incremental_video
+        if raw_capture and incremental_video:
+            self.logger.warning("incremental_video is ignored, because raw_capture defers the processing of the images")
+            self.incremental_video = False
+        if raw_capture and packed_frames:
+            self.logger.warning("packed_frames is ignored, because raw_capture saves the fetched images untouched")
+            self.packed_frames = False
+        if mapped_frames and (raw_capture or self.incremental_video):
+            self.logger.warning("mapped_frames is ignored, because the images are not rendered before the daily video")
+            self.mapped_frames = False
+        if self.mapped_frames and self.packed_frames:
+            self.logger.warning("packed_frames is ignored, because the images are kept in a MappedFrameStore")
+            self.packed_frames = False
         self.video_queue = None
         self.log_queue = log_queue
         self.delete_daily_videos = delete_daily_videos_after_summary_is_created
         self.delete_collected_daily_images = delete_collected_daily_images
+        if self.mapped_frames and not delete_collected_daily_images:
+            self.logger.info("The mapped frames are deleted after the daily video is created")
+            self.delete_collected_daily_images = True
         self._weekly_summary = create_weekly_summary_video
         self._monthly_summary = create_monthly_summary_video
+        self._annual_summary = create_annual_summary_video
         self._day_for_monthly_summary = day_for_monthly_summary_video
         self._test_counter = night_time_retry_seconds
         self._initial_wait_before_next_frame = seconds_between_frames
         self._fresh = True
+        self._weather_hub: WeatherHub | None = None
+        self._segment_writers: dict[str, SegmentedVideoWriter] | None = None
+        self._job_queue: JobQueue | None = None
+        self._job_pool: JobWorkerPool | None = None
+        self._media_catalog: MediaCatalog | None = None
+        self._deletion_service: DeletionService | None = None
+        self._tier_migrator: TierMigrator | None = None
+        self._next_disk_check = 0.0
+
+    # Runtime objects (threads, locks, connections) which can't be pickled by the CacheManager
+    _TRANSIENT_ATTRIBUTES: tuple[str, ...] = (
+        "_weather_hub", "_segment_writers", "_job_queue", "_job_pool", "_media_catalog", "_deletion_service",
+        "_tier_migrator",
+    )
+
+    def __getstate__(self) -> dict[str, Any]:
+        """
+        Custom pickle serialisation: strip the runtime objects listed in
+        _TRANSIENT_ATTRIBUTES before the object is pickled by the CacheManager.
+        They are recreated lazily after the object is restored.
+        """
+        state = self.__dict__.copy()
+        for attr in self._TRANSIENT_ATTRIBUTES:
+            state[attr] = None
+        return state
+
+    # The defaults of the attributes which a creator cached by an older version doesn't have
+    _STATE_DEFAULTS: dict[str, Any] = {
+        "raw_capture": False,
+        "incremental_video": False,
+        "encoder_settings": None,
+        "summary_frames_per_day": None,
+        "summary_duration_seconds": None,
+        "_annual_summary": False,
+        "annual_summary_duration_seconds": None,
+        "video_workers": 1,
+        "video_chunks": 1,
+        "use_job_queue": False,
+        "job_workers": DEFAULT_JOB_WORKERS,
+        "worker_priority": None,
+        "frame_manifest": False,
+        "use_media_catalog": False,
+        "packed_frames": False,
+        "mapped_frames": False,
+        "background_deletion": False,
+        "retention_policy": None,
+        "migration_policy": None,
+        "storage": None,
+        "_next_disk_check": 0.0,
+    }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """
+        Custom pickle deserialisation: a creator cached before some attributes were added gets their
+        defaults (see _STATE_DEFAULTS) and no runtime objects, so it can be used after an upgrade.
+        """
+        self.__dict__.update({attr: None for attr in self._TRANSIENT_ATTRIBUTES})
+        self.__dict__.update(self._STATE_DEFAULTS)
+        self.__dict__.update(state)
+        if "job_concurrency" not in state:
+            self.job_concurrency = self._default_job_concurrency(self.job_workers)
+
+    @staticmethod
+    def _default_job_concurrency(job_workers: int) -> dict[str, int]:
+        """job_workers running daily video jobs and one job for every summary."""
+        return {
+            VideoType.DAILY.value: job_workers,
+            VideoType.WEEKLY.value: 1,
+            VideoType.MONTHLY.value: 1,
+            VideoType.ANNUALLY.value: 1,
+        }
+
+    @property
+    def weather_hub(self) -> WeatherHub:
+        """The WeatherHub polling the weather stations of all sources in the background."""
+        if self._weather_hub is None:
+            self._weather_hub = WeatherHub(logger=self.logger)
+        return self._weather_hub
+
+    @property
+    def segment_writers(self) -> dict[str, SegmentedVideoWriter]:
+        """The open SegmentedVideoWriters of the incremental mode by daily folder."""
+        if self._segment_writers is None:
+            self._segment_writers = {}
+        return self._segment_writers
+
+    @property
+    def job_queue(self) -> JobQueue:
+        """The durable queue of the daily video and summary jobs."""
+        if self._job_queue is None:
+            self._job_queue = JobQueue(Path(self.base_path) / JOBS_DB_FILE, logger=self.logger)
+        return self._job_queue
+
+    @property
+    def job_pool(self) -> JobWorkerPool:
+        """The background workers running the jobs of the job_queue."""
+        if self._job_pool is None:
+            self._job_pool = JobWorkerPool(
+                self.job_queue,
+                handlers={
+                    VideoType.DAILY.value: self.__run_daily_video_job,
+                    VideoType.WEEKLY.value: self.__run_summary_job,
+                    VideoType.MONTHLY.value: self.__run_summary_job,
+                    VideoType.ANNUALLY.value: self.__run_summary_job,
+                    UPLOAD_JOB_TYPE: self.__run_upload_job,
+                },
+                concurrency=self.job_concurrency,
+                workers=self.job_workers,
+                logger=self.logger,
+                initializer=partial(apply_worker_priority, self.worker_priority, False, self.logger),
+            )
+        return self._job_pool
+
+    @property
+    def media_catalog(self) -> MediaCatalog:
+        """The index of the frame folders and the videos of the sources."""
+        if self._media_catalog is None:
+            self._media_catalog = MediaCatalog(Path(self.base_path) / CATALOG_DB_FILE, logger=self.logger)
+            if not self._media_catalog.has_mark(CATALOG_BACKFILL_MARK):
+                self.__backfill_media_catalog(self._media_catalog)
+        return self._media_catalog
+
+    def __backfill_media_catalog(self, catalog: MediaCatalog) -> None:
+        """
+        Records the frame folders and the videos which were created before the catalog was used, so the
+        retention and the summaries see them. The folders of the base path are scanned once per catalog.
+        """
+        recorded = 0
+        for source_folder in sorted(Path(self.base_path).iterdir()):
+            if not source_folder.is_dir():
+                continue
+            for media_type, path, day in self.__find_media(source_folder):
+                if catalog.get(path) is not None:
+                    continue
+                if media_type == FRAMES_MEDIA_TYPE:
+                    daily_video = path / f"{day.strftime(YYMMDD_FORMAT)}{MP4_FILE}"
+                    files = [file for file in path.rglob("*") if file.is_file() and file != daily_video]
+                    catalog.add(
+                        source_folder.name, media_type, path, day,
+                        size=sum(file.stat().st_size for file in files),
+                        items=sum(1 for file in files if file.suffix == JPG_FILE),
+                    )
+                else:
+                    catalog.add(source_folder.name, media_type, path, day)
+                recorded += 1
+
+        catalog.mark(CATALOG_BACKFILL_MARK)
+        if recorded:
+            self.logger.info(f"Recorded {recorded} existing media in the media catalog")
+
+    @staticmethod
+    def __find_media(source_folder: Path) -> Iterable[tuple[str, Path, date]]:
+        """Finds the frame folders, the daily videos and the summaries in the folder of a source."""
+
+        def daily_media(folder: Path, day: date) -> Iterable[tuple[str, Path, date]]:
+            daily_video = folder / f"{day.strftime(YYMMDD_FORMAT)}{MP4_FILE}"
+            if any(file != daily_video for file in folder.iterdir()):
+                yield FRAMES_MEDIA_TYPE, folder, day
+            if daily_video.is_file():
+                yield VideoType.DAILY.value, daily_video, day
+
+        for folder in sorted(source_folder.iterdir()):
+            if not folder.is_dir():
+                continue
+            name = folder.name
+            try:
+                yield from daily_media(folder, dt.strptime(name, YYMMDD_FORMAT).date())
+                continue
+            except ValueError:
+                pass
+            try:
+                first_day = dt.strptime(name, "%Y-%m").date()
+                if (folder / f"{name}{MP4_FILE}").is_file():
+                    yield VideoType.MONTHLY.value, folder / f"{name}{MP4_FILE}", first_day
+                continue
+            except ValueError:
+                pass
+            if not (name.isdigit() and len(name) == 4):
+                continue
+
+            if (folder / f"{name}{MP4_FILE}").is_file():
+                yield VideoType.ANNUALLY.value, folder / f"{name}{MP4_FILE}", date(int(name), 1, 1)
+            for week_folder in sorted(folder.iterdir()):
+                if not (week_folder.is_dir() and week_folder.name.isdigit()):
+                    continue
+                try:
+                    first_day = date.fromisocalendar(int(name), int(week_folder.name), 1)
+                except ValueError:
+                    continue
+                weekly_video = week_folder / f"{dash_sep_strings(name, f'W{week_folder.name}')}{MP4_FILE}"
+                if weekly_video.is_file():
+                    yield VideoType.WEEKLY.value, weekly_video, first_day
+                for day_folder in sorted(week_folder.iterdir()):
+                    if day_folder.is_dir() and day_folder.name.isdigit() and 1 <= int(day_folder.name) <= 7:
+                        yield from daily_media(day_folder, first_day + td(days=int(day_folder.name) - 1))
+
+    @property
+    def deletion_service(self) -> DeletionService:
+        """The background deletion of the collected images and the joined videos."""
+        if self._deletion_service is None:
+            self._deletion_service = DeletionService(
+                self.base_path,
+                logger=self.logger,
+                initializer=partial(apply_worker_priority, self.worker_priority, False, self.logger),
+            )
+        return self._deletion_service
+
+    @property
+    def tier_migrator(self) -> TierMigrator | None:
+        """The background migration of the aging videos to the cold tier of the migration_policy."""
+        if self._tier_migrator is None and self.migration_policy is not None:
+            self._tier_migrator = TierMigrator(
+                self.media_catalog,
+                self.migration_policy,
+                self.base_path,
+                logger=self.logger,
+                initializer=partial(apply_worker_priority, self.worker_priority, False, self.logger),
+            )
+        return self._tier_migrator
+
+    def __catalog_add(
+        self, media_type: str, source_name: str, path: str, day: date, size: int | None = None, items: int = 0
+    ) -> None:
+        """Records a media in the media_catalog if it is used."""
+        if self.use_media_catalog:
+            self.media_catalog.add(source_name, media_type, path, day, size=size, items=items)
+
+    def __catalog_remove(self, path: str) -> None:
+        """Removes a deleted media from the media_catalog if it is used."""
+        if self.use_media_catalog:
+            self.media_catalog.remove(path)
+
+    def __catalog_grow(self, full_path: Path) -> None:
+        """Adds a saved image to the size of its frame folder in the media_catalog."""
+        if self.use_media_catalog and full_path.is_file():
+            self.media_catalog.grow(full_path.parent, full_path.stat().st_size)
+
+    def enforce_retention(self) -> RetentionReport | None:
+        """Evicts the media which are too old or exceed the budgets of the retention_policy, if one is set."""
+        if self.retention_policy is None:
+            return None
+        return RetentionEngine(
+            self.media_catalog,
+            self.retention_policy,
+            self.base_path,
+            deletion_service=self.deletion_service,
+            storage=self.storage,
+            logger=self.logger,
+        ).enforce(self.location.time_now.date())
+
+    def __disk_is_low(self) -> bool:
+        """
+        Checks, at most every RETENTION_CHECK_SECONDS, if the free space of the base path is below
+        the min_free_bytes of the retention_policy.
+        """
+        if self.retention_policy is None or self.retention_policy.min_free_bytes <= 0 or time() < self._next_disk_check:
+            return False
+        self._next_disk_check = time() + RETENTION_CHECK_SECONDS
+        return shutil.disk_usage(self.base_path).free < self.retention_policy.min_free_bytes
+
+    def migrate_media(self) -> bool:
+        """Starts moving the aging videos to the cold tier in the background, if a migration_policy is set.
+        Returns False if no pass was started."""
+        if self.tier_migrator is None:
+            return False
+        return self.tier_migrator.migrate_in_background(self.location.time_now.date())
+
+    def __catalog_frames(self, source: Source) -> None:
+        """Records the frame folder of the source for the current day with its images count and size."""
+        if not self.use_media_catalog:
+            return
+        folder = self.__resolve_video_path(source)
+        if self.mapped_frames:
+            size = MappedFrameStore(folder).size()
+        elif self.packed_frames:
+            size = PackedFrameStore(folder).size()
+        else:
+            size = sum(entry.size for entry in FrameManifest(folder).entries()) if self.frame_manifest else 0
+        self.__catalog_add(FRAMES_MEDIA_TYPE, source.location_name, folder, self.__folder_day, size, source.images_count)
+
+    @property
+    def __folder_day(self) -> date:
+        """The day of the current folder_name."""
+        return dt.strptime(self.folder_name, YYMMDD_FORMAT).date()
+
+    def __delete_daily_images(self, input_folder: str) -> None:
+        """Deletes the images of a daily folder and removes the folder from the media_catalog.
+        The frames spooled by the storage are stored first, the images are kept if some could not be stored."""
+        if self.storage is not None:
+            self.storage.flush()
+            if self.__keep_unstored(input_folder):
+                return
+        self.__delete_media_files(input_folder)
+        self.__catalog_remove(input_folder)
+
+    def __keep_unstored(self, path: str) -> bool:
+        """Checks if the storage has media under the path which are not stored yet, so they must be kept."""
+        if self.storage is None:
+            return False
+        pending = self.storage.pending(path)
+        if pending:
+            self.logger.warning(f"{len(pending)} media in {shorten(path)} are not stored yet, they are kept")
+        return bool(pending)
+
+    def __delete_media_files(self, path: str, extension: str = JPG_FILE, delete_folder: bool = False) -> None:
+        """Deletes the media files of the folder, in the background if background_deletion is set."""
+        if self.background_deletion:
+            self.deletion_service.delete_media_files(path, extension, delete_folder)
+        else:
+            _ = vm.delete_source_media_files(
+                logger=self.logger, path=path, extension=extension, delete_folder=delete_folder
+            )
+
+    def __segment_writer(self, folder: str) -> SegmentedVideoWriter:
+        """Returns the writer for the daily folder. A new writer continues after the segments
+        already on disk, e.g. after a restart."""
+        folder = str(Path(folder))
+        writer = self.segment_writers.get(folder)
+        if writer is None:
+            writer = SegmentedVideoWriter(
+                folder, self.video_fps, logger=self.logger, encoder_settings=self.encoder_settings
+            )
+            self.segment_writers[folder] = writer
+        return writer
 
     def __resolve_video_path(self, source: Source):
         if self._weekly_summary:
@@ -255,6 +732,9 @@ class TimeLapseCreator:
         If object of other type than TimeLapseCreator is returned (including Exception) it will be ignored
         and the current object will be returned (self).
 
+        If the cached state can't be used, the images of the current day are counted from the frame manifests
+        of the sources (see resume_from_manifests).
+
         Returns::
             TimeLapseCretor - either the cached object state or the current state"""
         try:
@@ -268,10 +748,33 @@ class TimeLapseCreator:
                 and old_object.folder_name == self.folder_name
             ):
                 return old_object
-            else:
-                return self
         except Exception:
-            return self
+            pass
+        self.resume_from_manifests()
+        return self
+
+    def resume_from_manifests(self) -> None:
+        """
+        Restores the images count of the sources from the frame manifests (or the frame stores) of the current
+        day, e.g. when the process was restarted without a usable cache. The sources with listed frames are set as
+        partially collected, so their video is created even if the capture is not resumed.
+        """
+        if not (self.frame_manifest or self.packed_frames or self.mapped_frames):
+            return
+
+        for source in self.sources:
+            folder = self.__resolve_video_path(source)
+            if self.mapped_frames:
+                images_count = len(MappedFrameStore(folder))
+            elif self.packed_frames:
+                images_count = len(PackedFrameStore(folder))
+            else:
+                images_count = len(FrameManifest(folder).entries())
+            if images_count:
+                source.set_images_count(images_count)
+                source.set_images_partially_collected()
+                self._fresh = False
+                self.logger.info(f"Resumed {source.location_name} with {images_count} images")
 
     def cache_self(self) -> None:
         """Writes the current state of the TimeLapseCreator to the cache."""
@@ -313,7 +816,8 @@ class TimeLapseCreator:
              - Sends the video information to the `video_queue` if provided.
 
         3. If it's the start of a new month, initiates the monthly summary video creation process by calling
-           `process_monthly_summary()`.
+           `process_monthly_summary()` and after the summary of December the annual summary by calling
+           `process_annual_summary()`.
 
         4. If no conditions are met, the program waits for the configured nighttime retry interval before retrying.
 
@@ -337,6 +841,7 @@ class TimeLapseCreator:
             self.logger.info("Program starts!")
             self = self.get_cached_self()
             self.verify_sources_not_empty()
+            self.__start_runtime()
 
             # self._test_counter > 0 for testing purposes only, see Note in TimeLapseCreator docstring
             while self._test_counter > 0:
@@ -349,41 +854,39 @@ class TimeLapseCreator:
                     )
                     and any(not source.daily_video_created for source in self.sources)
                 ):
+                    video_jobs: list[tuple[Source, bool]] = []
                     for source in self.sources:
-                        video_path = self.__resolve_video_path(source)
                         if (
                             self.location.time_now > self.location.end_of_daylight
                             and source.images_collected
                             and not source.images_partially_collected
                             and not source.daily_video_created
                         ):
-                            if self.create_video(source, self.delete_collected_daily_images):
-                                self.__post_video_creation(
-                                    video_path=video_path,
-                                    video_type=VideoType.DAILY.value,
-                                    source=source
-                                )
+                            video_jobs.append((source, self.delete_collected_daily_images))
                         elif (
                             self.location.time_now > self.location.end_of_daylight
                             and source.images_partially_collected
                             and not source.images_collected
                             and not source.daily_video_created
                         ):
-                            if self.create_video(source, delete_source_images=False):
-                                self.__post_video_creation(
-                                    video_path=video_path,
-                                    video_type=VideoType.DAILY.value,
-                                    source=source
-                                )
+                            video_jobs.append((source, False))
+                    self.create_daily_videos(video_jobs)
+                    if video_jobs:
+                        _ = self.enforce_retention()
+                        _ = self.migrate_media()
                 else:
                     if self._monthly_summary:
                         if self.is_next_month():
                             self.process_monthly_summary()
+                            if self._annual_summary:
+                                self.process_annual_summary()
                     sleep(self.nighttime_wait_before_next_retry)
 
                 self.__decrease_test_counter()
         except KeyboardInterrupt:
             self.logger.info("Program execution cancelled...")
+        finally:
+            self.__close_runtime()
 
     def execute_with_custom_time_span(
         self,
@@ -405,12 +908,19 @@ class TimeLapseCreator:
             self.logger.info("Program starts!")
             self = self.get_cached_self()
             self.verify_sources_not_empty()
+            self.__start_runtime()
 
             while True:
                 _ = self.collect_with_custom_time_span(time_span)
 
-                for source in self.sources:
-                    _ = self.create_video(source, delete_source_images=self.delete_collected_daily_images)
+                if self.use_job_queue:
+                    self.create_daily_videos([
+                        (source, self.delete_collected_daily_images)
+                        for source in self.sources if not source.daily_video_created
+                    ])
+                else:
+                    for source in self.sources:
+                        _ = self.create_video(source, delete_source_images=self.delete_collected_daily_images)
             
                 if self._weekly_summary and self.location.calendar.weekday == 7 and self.location.time_now >= _end():
                     self.logger.info(f"Starting weekly video summary process -> time now {self.location.time_now}, end time {_end()}")
@@ -419,6 +929,36 @@ class TimeLapseCreator:
                 sleep(self.wait_before_next_frame)          
         except KeyboardInterrupt:
             self.logger.info("Program execution cancelled...")
+        finally:
+            self.__close_runtime()
+
+    def __start_runtime(self) -> None:
+        """Starts the background workers of the creator. The OpenCV threads of the worker_priority are limited
+        for the whole process, because the encoding threads share the thread pool of OpenCV with the capture."""
+        if self.worker_priority is not None and self.worker_priority.opencv_threads is not None:
+            cv2.setNumThreads(self.worker_priority.opencv_threads)
+        if self.use_job_queue:
+            self.job_pool.start()
+
+    def __close_runtime(self) -> None:
+        """Stops the background workers of the creator."""
+        if self._weather_hub is not None:
+            self._weather_hub.close()
+            self._weather_hub = None
+        for writer in self.segment_writers.values():
+            writer.close()
+        if self._job_pool is not None:
+            self._job_pool.stop()
+        if self._job_queue is not None:
+            self._job_queue.close()
+        if self._tier_migrator is not None:
+            self._tier_migrator.close()
+        if self._media_catalog is not None:
+            self._media_catalog.close()
+        if self._deletion_service is not None:
+            self._deletion_service.close()
+        if self.storage is not None:
+            self.storage.close()
 
     def process_weekly_summary(self):
         """Create and optionally send the weekly summary video to the queue."""
@@ -428,7 +968,21 @@ class TimeLapseCreator:
             weekly_path = os.path.join(self.base_path, source.location_name)
 
             if not source.weekly_video_created:
-                new_video, video_files_count = self.create_weekly_or_monthly_video(
+                if self.use_job_queue:
+                    self.__enqueue_video_job(
+                        VideoType.WEEKLY.value,
+                        source,
+                        f"{_current_calendar.year}-W{_current_calendar.week}",
+                        {
+                            "base_path": weekly_path,
+                            "year": str(_current_calendar.year),
+                            "week_or_month": str(_current_calendar.week),
+                        },
+                    )
+                    continue
+
+                new_video, video_files_count = self.__with_worker_priority(
+                    self.create_weekly_or_monthly_video,
                     weekly_path, 
                     str(_current_calendar.year),
                     str(_current_calendar.week),
@@ -474,23 +1028,11 @@ class TimeLapseCreator:
                 self.__adjust_wait_before_next_frame()
                 for source in self.sources:
                     try:
-                        img = source.get_frame_bytes()
+                        frame = self.__fetch_frame(source)
 
-                        if img:
+                        if frame:
                             full_path, dt_text = self.__pre_collect_actions(source)
-
-                            vm.save_image_with_weather_overlay(
-                                image_bytes=img,
-                                save_path=str(full_path),
-                                width=self.video_width,
-                                height=self.video_height,
-                                date_time_text=dt_text,
-                                weather_data_text=str(source.weather_data_provider)
-                                if source.weather_data_provider
-                                else None,
-                                text_box_position=self.text_box_position,
-                                text_box_transparency=self.text_box_transparency
-                            )
+                            self.__save_frame(source, frame, full_path, dt_text)
                             self.__post_collect_actions(source)
 
                     except Exception:
@@ -524,14 +1066,24 @@ class TimeLapseCreator:
             if not self.quiet_mode:
                 self.logger.info(f"Daytime detected! Decreasing wait_before_next_frame to {self.wait_before_next_frame} seconds")
 
+    def __weather_data_text(self, source: Source) -> str | None:
+        """Gets the latest cached weather data text for the source if a provider is available.
+        The weather stations are polled by the WeatherHub in the background, so this never blocks.
+        """
+        if source.weather_data_provider is None:
+            return None
+        return self.weather_hub.weather_text(source.weather_data_provider)
+
+    def __fetch_frame(self, source: Source) -> Frame | None:
+        """Fetches the next frame of the source. Unless the frames are saved raw, the blank check of the
+        source decodes the frame at the size of the saved image, so the decode is reused when it is saved."""
+        source.frame_size = None if self.raw_capture else (self.video_width, self.video_height)
+        return source.get_frame()
+
     def __pre_collect_actions(self, source: Source) -> tuple[Path, str]:
         """Performs the actions before the image is collected.
-        Gets the weather data for the source if it's available.
         Prepare the folder and file name for the image.
         """
-        if source.weather_data_provider:
-            source.weather_data_provider.get_data()
-
         file_name = self.location.time_now.strftime(HHMMSS_UNDERSCORE_FORMAT)
         current_path = self.__resolve_video_path(source)
         dt_text = f"{self.folder_name} {self.location.time_now.strftime(HHMMSS_COLON_FORMAT)}"
@@ -539,10 +1091,97 @@ class TimeLapseCreator:
         Path(current_path).mkdir(parents=True, exist_ok=True)
         return Path(f"{current_path}/{file_name}{JPG_FILE}"), dt_text
 
+    def __save_frame(self, source: Source, frame: Frame, full_path: Path, dt_text: str) -> None:
+        """Saves the frame with the weather overlay or, in raw capture mode, saves the fetched bytes
+        untouched and defers the processing to the creation of the daily video.
+        In incremental mode the image is appended to the daily video of the source and is saved
+        only if the collected images are kept. With packed_frames (mapped_frames) the image is appended
+        to the PackedFrameStore (MappedFrameStore) of the folder."""
+        manifest = self.__frame_manifest(full_path)
+        if self.raw_capture:
+            save = partial(vm.save_raw_frame, manifest=manifest)
+        elif self.incremental_video:
+            save = partial(self.__append_to_video, source, manifest=manifest)
+        elif self.mapped_frames:
+            save = vm.save_mapped_frame
+        elif self.packed_frames:
+            save = vm.save_packed_frame
+        else:
+            save = partial(vm.save_image_with_weather_overlay, storage=self.storage, manifest=manifest)
+
+        saved = save(
+            image_bytes=frame,
+            save_path=str(full_path),
+            width=self.video_width,
+            height=self.video_height,
+            date_time_text=dt_text,
+            weather_data_text=self.__weather_data_text(source),
+            text_box_position=self.text_box_position,
+            text_box_transparency=self.text_box_transparency
+        )
+        if saved and source.images_count:
+            self.__catalog_grow(full_path)
+
+    def __frame_manifest(self, full_path: Path) -> FrameManifest | None:
+        """The FrameManifest of the folder of the frame, to which the frame is appended when it is saved
+        (in raw capture mode the raw frame is listed). In incremental mode the images are saved only if
+        they are kept. The packed and mapped frames are indexed by their store."""
+        if not self.frame_manifest or self.packed_frames or self.mapped_frames:
+            return None
+        if self.incremental_video and not self.raw_capture and self.delete_collected_daily_images:
+            return None
+        return FrameManifest(full_path.parent)
+
+    def __append_to_video(
+        self, source: Source, save_path: str, manifest: FrameManifest | None = None, **kwargs: Any
+    ) -> bool:
+        """Renders the image and appends it to the segmented video of its daily folder.
+        If the images are not kept, the images count of the source is corrected to the frames of
+        the video when its writer is opened, e.g. after the open segment was lost with the process."""
+        image = vm.render_image_with_weather_overlay(**kwargs)
+        if image is None:
+            return False
+
+        folder = str(Path(save_path).parent)
+        opened = str(Path(folder)) in self.segment_writers
+        writer = self.__segment_writer(folder)
+        if not opened and self.delete_collected_daily_images and source.images_count > writer.frames_count:
+            self.logger.warning(
+                f"{source.location_name}: {source.images_count - writer.frames_count} frames of an "
+                f"incomplete video segment were lost"
+            )
+            source.set_images_count(writer.frames_count)
+
+        if not writer.write(image):
+            return False
+        if self.delete_collected_daily_images:
+            return True
+        if self.packed_frames:
+            encoded, buffer = cv2.imencode(JPG_FILE, image)
+            if encoded:
+                PackedFrameStore(Path(save_path).parent).append(buffer.tobytes())
+            return encoded
+        if manifest is None:
+            return cv2.imwrite(save_path, image)
+        encoded, buffer = cv2.imencode(JPG_FILE, image)
+        if encoded:
+            data = buffer.tobytes()
+            with open(save_path, "wb") as file:
+                file.write(data)
+            frame = kwargs["image_bytes"]
+            manifest.append(save_path, frame.captured_at if isinstance(frame, Frame) else None, data)
+        return encoded
+
     def __post_collect_actions(self, source: Source) -> None:
         """Performs the actions after the image is collected."""
         source.increase_images()
         source.set_images_partially_collected()
+        if source.images_count == 1:
+            self.__catalog_frames(source)
+            _ = self.enforce_retention()
+        elif self.__disk_is_low():
+            self.logger.warning(f"Less than {self.retention_policy.min_free_bytes} bytes are free in {shorten(self.base_path)}")
+            _ = self.enforce_retention()
         self.cache_self()
         self._fresh = False
 
@@ -557,13 +1196,7 @@ class TimeLapseCreator:
             video_type (str)
             source (Source)
         """
-        func_map = {
-            "daily": source.set_daily_video_created,
-            "weekly": source.set_weekly_video_created,
-            "monthly": source.set_monthly_video_created
-        }
-
-        func_map[video_type]()
+        self.__set_video_created(video_type, source)
 
         if self.video_queue is not None:
             self.video_queue.put(
@@ -575,6 +1208,18 @@ class TimeLapseCreator:
             self.logger.info("No video queue provided and response is not sent.")
         self.cache_self()
 
+    @staticmethod
+    def __set_video_created(video_type: str, source: Source) -> None:
+        """Sets the video of the given type as created for the source."""
+        func_map = {
+            "daily": source.set_daily_video_created,
+            "weekly": source.set_weekly_video_created,
+            "monthly": source.set_monthly_video_created,
+            "annually": source.set_annual_video_created,
+        }
+
+        func_map[video_type]()
+
     def collect_images_from_webcams(self) -> bool:
         """While self.location.is_daylight() returns True, the images for every source
         will be extracted from the url. If self.location.is_daylight() returns False
@@ -595,23 +1240,11 @@ class TimeLapseCreator:
             while self.location.is_daylight():
                 for source in self.sources:
                     try:
-                        img = source.get_frame_bytes()
+                        frame = self.__fetch_frame(source)
 
-                        if img:
+                        if frame:
                             full_path, dt_text = self.__pre_collect_actions(source)
-
-                            vm.save_image_with_weather_overlay(
-                                image_bytes=img,
-                                save_path=str(full_path),
-                                width=self.video_width,
-                                height=self.video_height,
-                                date_time_text=dt_text,
-                                weather_data_text=str(source.weather_data_provider)
-                                if source.weather_data_provider
-                                else None,
-                                text_box_position=self.text_box_position,
-                                text_box_transparency=self.text_box_transparency
-                            )
+                            self.__save_frame(source, frame, full_path, dt_text)
                             self.__post_collect_actions(source)
 
                     except Exception:
@@ -647,10 +1280,215 @@ class TimeLapseCreator:
                 f"  End time: {self.location.end_of_daylight.strftime(HHMMSS_COLON_FORMAT)}"
             )
 
+    def create_daily_videos(self, video_jobs: list[tuple[Source, bool]]) -> None:
+        """
+        Creates the daily videos of the sources and calls __post_video_creation for every created video.
+
+        With video_workers > 1 the videos are encoded in a process pool. The sources with most images
+        are submitted first, so the longest jobs don't start last. The results are processed in this
+        process as soon as every job finishes - the images are deleted, the video queue receives the
+        response and the state is cached one source at a time, exactly like in the serial mode.
+        Videos which already exist or are joined from incremental segments are created in this process.
+
+        Args::
+
+            video_jobs: list[tuple[Source, bool]] - the sources and if their images should be deleted
+        """
+        if self.use_job_queue:
+            for source, delete_source_images in video_jobs:
+                input_folder, output_video = self.__daily_video_paths(source)
+                self.__enqueue_video_job(
+                    VideoType.DAILY.value,
+                    source,
+                    self.folder_name.replace("/", "-"),
+                    {
+                        "input_folder": input_folder,
+                        "output_video": output_video,
+                        "delete_source_images": delete_source_images,
+                        "day": self.__folder_day.isoformat(),
+                    },
+                )
+            return
+
+        if self.video_workers <= 1 or len(video_jobs) <= 1:
+            for source, delete_source_images in video_jobs:
+                if self.create_video(source, delete_source_images=delete_source_images):
+                    self.__post_video_creation(
+                        video_path=self.__resolve_video_path(source),
+                        video_type=VideoType.DAILY.value,
+                        source=source
+                    )
+            return
+
+        video_jobs = sorted(video_jobs, key=lambda job: job[0].images_count, reverse=True)
+        local_jobs: list[tuple[Source, bool]] = []
+        futures: dict[Future[bool], tuple[Source, bool]] = {}
+
+        with ProcessPoolExecutor(
+            max_workers=min(self.video_workers, len(video_jobs)),
+            initializer=initialize_worker_process,
+            initargs=(self.worker_priority, self.log_queue, self.logger.name),
+        ) as executor:
+            for source, delete_source_images in video_jobs:
+                input_folder, output_video = self.__daily_video_paths(source)
+                if vm.video_exists(output_video) or self.__has_video_segments(input_folder):
+                    local_jobs.append((source, delete_source_images))
+                    continue
+
+                self.logger.info(f"Video doesn't exist in {shorten(input_folder)}")
+                future = executor.submit(
+                    vm.create_timelapse,
+                    self.logger,
+                    input_folder,
+                    output_video,
+                    self.video_fps,
+                    self.encoder_settings,
+                    self.video_chunks,
+                    self.worker_priority,
+                    self.storage,
+                )
+                futures[future] = (source, delete_source_images)
+
+            for source, delete_source_images in local_jobs:
+                if self.create_video(source, delete_source_images=delete_source_images):
+                    self.__post_video_creation(
+                        video_path=self.__resolve_video_path(source),
+                        video_type=VideoType.DAILY.value,
+                        source=source
+                    )
+
+            for future in as_completed(futures):
+                source, delete_source_images = futures[future]
+                try:
+                    created = future.result()
+                except Exception as exc:
+                    self.logger.error(f"Video for {source.location_name} failed: {exc}", exc_info=True)
+                    continue
+
+                if created:
+                    input_folder, output_video = self.__daily_video_paths(source)
+                    self.__catalog_add(VideoType.DAILY.value, source.location_name, output_video, self.__folder_day)
+                    if delete_source_images:
+                        self.__delete_daily_images(input_folder)
+                    self.__post_video_creation(
+                        video_path=input_folder,
+                        video_type=VideoType.DAILY.value,
+                        source=source
+                    )
+
+    def __enqueue_video_job(self, video_type: str, source: Source, period: str, payload: dict[str, Any]) -> None:
+        """
+        Adds the job of a video to the job_queue and marks the video of the source as created,
+        because the job is stored durably and will be run by the job_pool, also after a restart.
+        The key of the job makes the enqueueing idempotent.
+        """
+        payload["location_name"] = source.location_name
+        if self.job_queue.enqueue(video_type, f"{video_type}:{source.location_name}:{period}", payload):
+            self.logger.info(f"Queued {video_type} video of {source.location_name} for {period}")
+        self.__set_video_created(video_type, source)
+        self.cache_self()
+        self.job_pool.wake()
+
+    def __run_daily_video_job(self, job: Job) -> bool:
+        """
+        Creates a daily video in a job. The video is encoded to a part file and renamed when it is
+        complete, so a video interrupted by a crash is encoded again when the job is retried.
+        """
+        payload = job.payload
+        input_folder, output_video = payload["input_folder"], payload["output_video"]
+        if not vm.video_exists(output_video):
+            part_video = f"{os.path.splitext(output_video)[0]}{PART_FILE_SUFFIX}{MP4_FILE}"
+            if not self.__encode_daily_video(input_folder, part_video):
+                return False
+            os.replace(part_video, output_video)
+        if self.storage is not None and self.storage.store_video(output_video) is None:
+            # the job is retried, the video is not encoded again
+            return False
+        if "day" in payload:
+            self.__catalog_add(
+                VideoType.DAILY.value, payload["location_name"], output_video, date.fromisoformat(payload["day"])
+            )
+
+        if payload["delete_source_images"]:
+            self.__delete_daily_images(input_folder)
+
+        self.__enqueue_upload_job(job, input_folder)
+        return True
+
+    def __run_summary_job(self, job: Job) -> bool:
+        """
+        Creates a weekly, monthly or annual summary video in a job. An annual video is deferred
+        while a monthly video of its year is still queued, so it never misses a month.
+        """
+        payload = job.payload
+        if job.job_type == VideoType.ANNUALLY.value:
+            monthly_jobs = f"{VideoType.MONTHLY.value}:{payload['location_name']}:{payload['year']}-"
+            if self.job_queue.unfinished(monthly_jobs):
+                raise JobDeferred(f"the monthly videos of {payload['year']} are not created yet")
+            new_video, video_files_count = self.create_annual_video(payload["base_path"], payload["year"])
+        else:
+            new_video, video_files_count = self.create_weekly_or_monthly_video(
+                payload["base_path"],
+                payload["year"],
+                payload["week_or_month"],
+                weekly=job.job_type == VideoType.WEEKLY.value,
+            )
+
+        if not (new_video and video_files_count):
+            return False
+
+        self.__enqueue_upload_job(job, new_video, video_files_count)
+        return True
+
+    def __enqueue_upload_job(self, job: Job, video_path: str, video_files_count: int | None = None) -> None:
+        """
+        Adds the job which sends the response of the video created by a job. Its key is derived from the key
+        of the video job, so a video job which is run again (e.g. after a restart) doesn't send the response twice.
+        """
+        payload = {
+            "video_path": video_path,
+            "video_type": job.job_type,
+            "location_name": job.payload["location_name"],
+            "video_files_count": video_files_count,
+        }
+        self.job_queue.enqueue(UPLOAD_JOB_TYPE, f"{UPLOAD_JOB_TYPE}:{job.key}", payload)
+        self.job_pool.wake()
+
+    def __run_upload_job(self, job: Job) -> bool:
+        """Puts the VideoResponse of a video created by a job to the video queue."""
+        payload = job.payload
+        video_path, location_name = payload["video_path"], payload["location_name"]
+        source = next((source for source in self.sources if source.location_name == location_name), None)
+        if source is None:
+            self.logger.warning(f"The source {location_name} of {shorten(video_path)} was removed, no response is sent.")
+            return True
+
+        if payload["video_files_count"] is not None:
+            source.set_videos_count(payload["video_files_count"])
+        if self.video_queue is not None:
+            self.video_queue.put(self.create_response_with_metadata(video_path, payload["video_type"], source))
+        else:
+            self.logger.info("No video queue provided and response is not sent.")
+        return True
+
+    def __daily_video_paths(self, source: Source) -> tuple[str, str]:
+        """Returns the folder with the images of the source and the path of its daily video."""
+        input_folder = self.__resolve_video_path(source)
+        output_video = str(Path(f"{input_folder}/{self.folder_name.replace('/', '-')}{MP4_FILE}"))
+        return input_folder, output_video
+
+    def __has_video_segments(self, input_folder: str) -> bool:
+        """Checks if the daily video of the folder is joined from incremental segments."""
+        return self.incremental_video and (
+            str(Path(input_folder)) in self.segment_writers or SegmentedVideoWriter.has_segments(input_folder)
+        )
+
     def create_video(self, source: Source, delete_source_images: bool = True) -> bool:
         """
         Creates a video from the source collected images. If delete_source_images is True
         the source image files will be deleted after the video is created.
+        In incremental mode the segments encoded during the day are joined instead and
+        the images are used only if there are no segments.
 
         Args::
 
@@ -658,24 +1496,62 @@ class TimeLapseCreator:
 
             delete_source_images: bool - if the source images should be deleted as well
         """
-        input_folder = self.__resolve_video_path(source)
-        output_video = str(Path(f"{input_folder}/{self.folder_name.replace('/', '-')}{MP4_FILE}"))
+        input_folder, output_video = self.__daily_video_paths(source)
 
         created = False
         if not vm.video_exists(output_video):
             self.logger.info(f"Video doesn't exist in {shorten(input_folder)}")
+            created = self.__with_worker_priority(self.__encode_daily_video, input_folder, output_video)
+            if created and self.storage is not None:
+                self.storage.store_video(output_video)
+        else:
+            created = True
+
+        if created:
+            self.__catalog_add(VideoType.DAILY.value, source.location_name, output_video, self.__folder_day)
+        if created and delete_source_images:
+            self.__delete_daily_images(input_folder)
+
+        return created
+
+    def __with_worker_priority(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Calls the function in a worker thread with the worker_priority and waits for its result,
+        so an encoding started by the capture loop does not run with the priority of the capture.
+        Without a worker_priority the function is called in the calling thread.
+        """
+        if self.worker_priority is None:
+            return function(*args, **kwargs)
+
+        with ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="video-worker",
+            initializer=apply_worker_priority,
+            initargs=(self.worker_priority, False, self.logger),
+        ) as executor:
+            return executor.submit(function, *args, **kwargs).result()
+
+    def __encode_daily_video(self, input_folder: str, output_video: str) -> bool:
+        """Joins the incremental segments of the folder or encodes its images into output_video.
+        The video is not stored, because it may be a part file which is renamed by the caller."""
+        created = False
+        if self.__has_video_segments(input_folder):
+            created = self.__segment_writer(input_folder).finalize(output_video)
+            self.segment_writers.pop(str(Path(input_folder)), None)
+
+        if not created:
+            if self.raw_capture and self.storage is not None:
+                # the images are stored when they are processed, create_timelapse processes the rest
+                vm.process_raw_frames(self.logger, input_folder, storage=self.storage)
             created = vm.create_timelapse(
                 self.logger,
                 input_folder,
                 output_video,
                 self.video_fps,
+                self.encoder_settings,
+                self.video_chunks,
+                self.worker_priority,
             )
-        else:
-            created = True
-
-        if created and delete_source_images:
-            _ = vm.delete_source_media_files(self.logger, input_folder)
-
         return created
 
     def verify_sources_not_empty(self) -> None:
@@ -698,7 +1574,7 @@ class TimeLapseCreator:
         resets video_created = False,\n
         resets images_collected = False\n
         resets reset_images_pertially_collected = False\n
-        resets daily, weekly, monthly video_created = False 
+        resets daily, weekly, monthly, annual video_created = False 
         """
         for source in self.sources:
             source.reset_images_counter()
@@ -706,14 +1582,17 @@ class TimeLapseCreator:
             source.reset_daily_video_created()
             source.reset_weekly_video_created()
             source.reset_monthly_video_created()
+            source.reset_annual_video_created()
             source.reset_all_images_collected()
             source.reset_images_partially_collected()
 
     def set_sources_all_images_collected(self) -> None:
         """Sets -> images_collected = True for all self.sources
-        and calls self.reset_images_partially_collected(), because all images are collected
+        and calls self.reset_images_partially_collected(), because all images are collected.
+        The frame folders are recorded in the media_catalog with their images count.
         """
         [source.set_all_images_collected() for source in self.sources]
+        [self.__catalog_frames(source) for source in self.sources if source.images_count]
         self.reset_images_partially_collected()
 
     def add_sources(self, sources: Source | Iterable[Source]) -> None:
@@ -911,6 +1790,8 @@ class TimeLapseCreator:
         week_or_month: str,
         weekly: bool = False,
         extension: str = MP4_FILE,
+        frames_per_day: int | None = None,
+        target_duration_seconds: float | None = None,
     ) -> tuple[str, int] | tuple[None, None]:
         """
         Creates a monthly summary video by combining video files from a specific year and month.
@@ -926,19 +1807,37 @@ class TimeLapseCreator:
             delete_source_files: bool - If True, deletes the source video files and their parent
                 folders after the summary video is created. Defaults to False.
             extension: str - The file extension of the video files to process. Defaults to MP4_FILE.
+            frames_per_day: int | None - The number of frames used from every daily video.
+                Defaults to self.summary_frames_per_day.
+            target_duration_seconds: float | None - The approximate duration of the summary.
+                Defaults to self.summary_duration_seconds.
 
         Returns:
             str | None - Returns the path to the folder containing the created monthly summary video if
                 successful, otherwise None.
         """
 
+        source_name = os.path.basename(os.path.normpath(base_path))
         if not weekly:
-            video_files = self.get_video_files_paths(
-                base_folder=base_path, year=year, month=week_or_month
+            first_day = date(int(year), int(week_or_month), 1)
+            video_files = self.__merge_media_paths(
+                self.__catalog_paths(
+                    source_name,
+                    VideoType.DAILY.value,
+                    start=first_day,
+                    end=first_day.replace(day=calendar.monthrange(first_day.year, first_day.month)[1]),
+                ),
+                self.get_video_files_paths(base_folder=base_path, year=year, month=week_or_month),
             )
             sep = "-"
         else:
-            video_files = get_weekly_video_files_paths(Path(f"{base_path}/{year}/{week_or_month}"))
+            first_day = date.fromisocalendar(int(year), int(week_or_month), 1)
+            video_files = self.__merge_media_paths(
+                self.__catalog_paths(
+                    source_name, VideoType.DAILY.value, iso_year=int(year), iso_week=int(week_or_month)
+                ),
+                get_weekly_video_files_paths(Path(f"{base_path}/{year}/{week_or_month}")),
+            )
             sep = "/"
 
         video_folder_name = dash_sep_strings(year, week_or_month, sep=sep)
@@ -960,23 +1859,63 @@ class TimeLapseCreator:
             video_paths=video_files,
             output_video_path=output_video_name,
             fps=self.video_fps,
+            encoder_settings=self.encoder_settings,
+            frames_per_video=frames_per_day if frames_per_day is not None else self.summary_frames_per_day,
+            target_duration_seconds=(
+                target_duration_seconds if target_duration_seconds is not None else self.summary_duration_seconds
+            ),
+            storage=self.storage,
         ):
             self.logger.info(f"Video created: {shorten(output_video_name)}")
+            self.__catalog_add(
+                VideoType.WEEKLY.value if weekly else VideoType.MONTHLY.value,
+                source_name,
+                output_video_name,
+                first_day,
+                items=len(video_files),
+            )
 
             if self.delete_daily_videos:
+                if self.storage is not None:
+                    self.storage.flush()
                 for video_path in video_files:
+                    if self.__keep_unstored(video_path):
+                        continue
                     head, _ = os.path.split(video_path)
-                    vm.delete_source_media_files(
-                        logger=self.logger,
-                        path=head,
-                        extension=extension,
-                        delete_folder=True,
-                    )
+                    self.__delete_media_files(head, extension, delete_folder=True)
+                    self.__catalog_remove(video_path)
 
             return (full_video_folder_name, len(video_files))
         
         return none_return
 
+    def __catalog_paths(
+        self,
+        source_name: str,
+        media_type: str,
+        start: date | None = None,
+        end: date | None = None,
+        iso_year: int | None = None,
+        iso_week: int | None = None,
+    ) -> list[str]:
+        """Returns the recorded media of the source from the media_catalog, or an empty list if it is not used."""
+        if not self.use_media_catalog:
+            return []
+        return self.media_catalog.paths(source_name, media_type, start, end, iso_year, iso_week)
+
+    @staticmethod
+    def __merge_media_paths(recorded: list[str], found: list[str]) -> list[str]:
+        """
+        Joins the media recorded in the media_catalog with the media found in the folders, e.g. the
+        days of a period which were created before the catalog was used. A media is identified by its
+        folder and file name, so a recorded video which was moved to the cold tier is not added twice.
+        The paths are sorted by their folder and file name, i.e. chronologically.
+        """
+        merged: dict[tuple[str, str], str] = {}
+        for path in (*recorded, *found):
+            merged.setdefault((Path(path).parent.name, Path(path).name), path)
+        return [merged[key] for key in sorted(merged)]
+
     def is_next_month(
         self,
     ) -> bool:
@@ -1001,7 +1940,18 @@ class TimeLapseCreator:
             base_path = os.path.join(self.base_path, source.location_name)
 
             if not source.monthly_video_created:
-                new_video, video_files_count = self.create_weekly_or_monthly_video(base_path, year, month)
+                if self.use_job_queue:
+                    self.__enqueue_video_job(
+                        VideoType.MONTHLY.value,
+                        source,
+                        f"{year}-{month}",
+                        {"base_path": base_path, "year": year, "week_or_month": month},
+                    )
+                    continue
+
+                new_video, video_files_count = self.__with_worker_priority(
+                    self.create_weekly_or_monthly_video, base_path, year, month
+                )
 
                 if new_video and video_files_count:
                     source.set_videos_count(video_files_count)
@@ -1014,6 +1964,119 @@ class TimeLapseCreator:
                             source=source
                         )
 
+    def create_annual_video(
+        self,
+        base_path: str,
+        year: str,
+        extension: str = MP4_FILE,
+    ) -> tuple[str, int] | tuple[None, None]:
+        """
+        Creates an annual summary video from the monthly summary videos of a year.
+
+        The monthly summaries are joined without re-encoding if they share the encoding
+        parameters, or sampled to annual_summary_duration_seconds if it is set, so the
+        daily videos of the year are never decoded again. Months without a summary are skipped.
+
+        Args:
+            base_path: str - The folder of the source, containing the monthly summary folders.
+            year: str - The year of the summary.
+            extension: str - The file extension of the video files. Defaults to MP4_FILE.
+
+        Returns:
+            tuple[str, int] | tuple[None, None] - The folder of the created annual summary video and
+                the number of the monthly videos in it, or (None, None) if no video was created.
+        """
+        source_name = os.path.basename(os.path.normpath(base_path))
+        monthly_videos: list[str] = []
+        for month in range(1, 13):
+            year_and_month = dash_sep_strings(year, f"{month:02d}")
+            monthly_video = os.path.join(base_path, year_and_month, f"{year_and_month}{extension}")
+            if os.path.isfile(monthly_video):
+                monthly_videos.append(monthly_video)
+        video_files = self.__merge_media_paths(
+            self.__catalog_paths(
+                source_name, VideoType.MONTHLY.value, start=date(int(year), 1, 1), end=date(int(year), 12, 31)
+            ),
+            monthly_videos,
+        )
+
+        full_video_folder_name = os.path.join(base_path, year)
+        output_video_name = os.path.join(full_video_folder_name, f"{year}{extension}")
+        if len(video_files) == 0:
+            self.logger.warning(f"No monthly videos found for an annual summary video - {shorten(output_video_name)}!")
+            return None, None
+
+        if vm.create_monthly_summary_video(
+            logger=self.logger,
+            video_paths=video_files,
+            output_video_path=output_video_name,
+            fps=self.video_fps,
+            encoder_settings=self.encoder_settings,
+            target_duration_seconds=self.annual_summary_duration_seconds,
+            storage=self.storage,
+        ):
+            self.logger.info(f"Video created: {shorten(output_video_name)}")
+            self.__catalog_add(
+                VideoType.ANNUALLY.value, source_name, output_video_name, date(int(year), 1, 1), items=len(video_files)
+            )
+            return full_video_folder_name, len(video_files)
+
+        return None, None
+
+    def process_annual_summary(self, year: str | None = None):
+        """
+        Create and optionally send the annual summary videos to the queue. The videos of the
+        sources are created in parallel, the results are processed in the calling thread.
+
+        Args:
+            year: str | None - The year of the summary, defaults to the year of the previous month,
+                but only if the previous month is December.
+        """
+        if year is None:
+            year, month = self.get_previous_year_and_month(self.folder_name)
+            if month != "12":
+                return
+
+        sources = [source for source in self.sources if not source.annual_video_created]
+        if not sources:
+            return
+
+        if self.use_job_queue:
+            for source in sources:
+                self.__enqueue_video_job(
+                    VideoType.ANNUALLY.value,
+                    source,
+                    year,
+                    {"base_path": os.path.join(self.base_path, source.location_name), "year": year},
+                )
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(sources), os.cpu_count() or 1),
+            initializer=apply_worker_priority,
+            initargs=(self.worker_priority, False, self.logger),
+        ) as executor:
+            futures = {
+                executor.submit(self.create_annual_video, os.path.join(self.base_path, source.location_name), year): source
+                for source in sources
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    new_video, video_files_count = future.result()
+                except Exception as exc:
+                    self.logger.error(f"Annual summary for {source.location_name} failed: {exc}", exc_info=True)
+                    continue
+
+                if new_video and video_files_count:
+                    source.set_videos_count(video_files_count)
+                    self.logger.info(f"Annual summary created for {source.location_name}, {year}")
+                    self.__post_video_creation(
+                        video_path=new_video,
+                        video_type=VideoType.ANNUALLY.value,
+                        source=source
+                    )
+
     @staticmethod
     def get_previous_year_and_month(folder_name: str):
         """
@@ -1058,6 +2121,12 @@ class TimeLapseCreator:
                     video_files_count=source.daily_videos_count,
                     video_created=source.monthly_video_created
                 )
+            case VideoType.ANNUALLY.value:
+                response = AnnualVideoResponse(
+                    video_path=video_path,
+                    video_files_count=source.daily_videos_count,
+                    video_created=source.annual_video_created
+                )
             case _:
                 self.logger.warning("Unknown video_type received for creating a VideoResponse with metadata!")
                 return
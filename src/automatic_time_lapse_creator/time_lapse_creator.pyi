@@ -29,6 +29,16 @@ from .common.utils import create_log_message as create_log_message, VideoRespons
 from .source import Source as Source
 from .time_manager import LocationAndTimeManager as LocationAndTimeManager
 from . import text_box as box
+from .weather_hub import WeatherHub
+from .segment_writer import SegmentedVideoWriter
+from .encoders import EncoderSettings
+from .job_queue import JobQueue, JobWorkerPool
+from .worker_priority import WorkerPriority
+from .media_catalog import MediaCatalog
+from .deletion_service import DeletionService
+from .retention import RetentionPolicy, RetentionReport
+from .tier_migrator import MigrationPolicy, TierMigrator
+from .storage import StorageBackend
 from logging import Logger
 from typing import Any, Iterable, NamedTuple
 
@@ -52,9 +62,31 @@ class TimeLapseCreator:
     text_box_position: type[box.TextBox] | None = ...
     text_box_transparency: float = ...
     quiet_mode: bool = True
+    raw_capture: bool = False
+    incremental_video: bool = False
+    encoder_settings: EncoderSettings | None = None
+    summary_frames_per_day: int | None = None
+    summary_duration_seconds: float | None = None
+    annual_summary_duration_seconds: float | None = None
+    video_workers: int = 1
+    video_chunks: int = 1
+    use_job_queue: bool = False
+    job_workers: int
+    job_concurrency: dict[str, int]
+    worker_priority: WorkerPriority | None = None
+    frame_manifest: bool = False
+    use_media_catalog: bool = False
+    packed_frames: bool = False
+    mapped_frames: bool = False
+    background_deletion: bool = False
+    retention_policy: RetentionPolicy | None = None
+    migration_policy: MigrationPolicy | None = None
+    storage: StorageBackend | None = None
     video_queue: Queue[Any | None] | None = ...
     log_queue: Queue[Any] | None = ...
     logger: Logger
+    _TRANSIENT_ATTRIBUTES: tuple[str, ...]
+    _STATE_DEFAULTS: dict[str, Any]
     def __init__(
         self,
         sources: Iterable[Source] = ...,
@@ -77,7 +109,48 @@ class TimeLapseCreator:
         delete_daily_videos_after_summary_is_created: bool = ...,
         sunrise_offset_minutes: int = ...,
         sunset_offset_minutes: int = ...,
+        raw_capture: bool = ...,
+        incremental_video: bool = ...,
+        encoder_settings: EncoderSettings | None = ...,
+        summary_frames_per_day: int | None = ...,
+        summary_duration_seconds: float | None = ...,
+        create_annual_summary_video: bool = ...,
+        annual_summary_duration_seconds: float | None = ...,
+        video_workers: int = ...,
+        video_chunks: int = ...,
+        use_job_queue: bool = ...,
+        job_workers: int = ...,
+        job_concurrency: dict[str, int] | None = ...,
+        worker_priority: WorkerPriority | None = ...,
+        frame_manifest: bool = ...,
+        use_media_catalog: bool = ...,
+        packed_frames: bool = ...,
+        mapped_frames: bool = ...,
+        background_deletion: bool = ...,
+        retention_policy: RetentionPolicy | None = ...,
+        migration_policy: MigrationPolicy | None = ...,
+        storage: StorageBackend | None = ...,
     ) -> None: ...
+    def __getstate__(self) -> dict[str, Any]: ...
+    def __setstate__(self, state: dict[str, Any]) -> None: ...
+    @staticmethod
+    def _default_job_concurrency(job_workers: int) -> dict[str, int]: ...
+    @property
+    def weather_hub(self) -> WeatherHub: ...
+    @property
+    def segment_writers(self) -> dict[str, SegmentedVideoWriter]: ...
+    @property
+    def job_queue(self) -> JobQueue: ...
+    @property
+    def job_pool(self) -> JobWorkerPool: ...
+    @property
+    def media_catalog(self) -> MediaCatalog: ...
+    @property
+    def deletion_service(self) -> DeletionService: ...
+    def enforce_retention(self) -> RetentionReport | None: ...
+    @property
+    def tier_migrator(self) -> TierMigrator | None: ...
+    def migrate_media(self) -> bool: ...
     @staticmethod
     def _validate(attr_name: str, attr_value: int, logger: Logger) -> int: ...
     @property
@@ -87,6 +160,7 @@ class TimeLapseCreator:
     def set_folder_name(self, value: str) -> None: ...
     def set_weekly_folder_name(self, value: str) -> None: ...
     def get_cached_self(self) -> TimeLapseCreator: ...
+    def resume_from_manifests(self) -> None: ...
     def cache_self(self) -> None: ...
     def clear_cache(self) -> None: ...
     def execute(
@@ -105,6 +179,7 @@ class TimeLapseCreator:
     def is_it_next_day(self) -> None: ...
     @staticmethod
     def get_current_calendar(y_w_d_str: str) -> _IsoCalendarDate: ...
+    def create_daily_videos(self, video_jobs: list[tuple[Source, bool]]) -> None: ...
     def create_video(
         self, source: Source, delete_source_images: bool = True
     ) -> bool: ...
@@ -134,10 +209,19 @@ class TimeLapseCreator:
         weekly: bool = False,
         delete_source_files: bool = ...,
         extension: str = ...,
+        frames_per_day: int | None = ...,
+        target_duration_seconds: float | None = ...,
     ) -> tuple[str, int] | tuple[None, None]: ...
     def is_next_month(self) -> bool: ...
     def process_weekly_summary(self) -> None: ...
     def process_monthly_summary(self) -> None: ...
+    def create_annual_video(
+        self,
+        base_path: str,
+        year: str,
+        extension: str = ...,
+    ) -> tuple[str, int] | tuple[None, None]: ...
+    def process_annual_summary(self, year: str | None = ...) -> None: ...
     @staticmethod
     def get_previous_year_and_month(folder_name: str) -> str: ...
     def create_response_with_metadata(self, video_path: str, video_type: str, source: Source) -> VideoResponse | None: ...
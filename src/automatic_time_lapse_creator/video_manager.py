@@ -1,15 +1,36 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Generator
+from threading import Lock, local
+from typing import Any, Callable, Generator, Iterable, Iterator
 import cv2
+import json
 import os
+import shutil
+import subprocess
 import numpy as np
+from cv2.typing import MatLike
 from logging import Logger
 from .common.constants import (
     JPG_FILE,
-    DEFAULT_VIDEO_CODEC,
+    RAW_FILE,
+    FRAMES_METADATA_FILE,
+    PART_FILE_SUFFIX,
+    DEFAULT_READ_AHEAD_FRAMES,
+    DEFAULT_READ_AHEAD_WORKERS,
+    SUMMARY_SEEK_THRESHOLD_FRAMES,
+    MIN_FRAMES_PER_CHUNK,
+    MP4_FILE,
 )
-from .common.utils import shorten
-from .text_box import TextBox
+from .common.utils import find_ffmpeg, shorten
+from .encoders import EncoderSettings, create_encoder
+from .frame import Frame
+from .frame_manifest import FrameManifest
+from .frame_store import MappedFrameStore, PackedFrameStore
+from .storage import StorageBackend
+from .text_box import TextBox, TextBoxCache
+from .worker_priority import WorkerPriority, apply_worker_priority
 
 
 class VideoManager:
@@ -17,6 +38,26 @@ class VideoManager:
     Contains three static methods for creating the video, deleting the image files
     and checking if a video file exists."""
 
+    text_box_cache: TextBoxCache = TextBoxCache()
+    _canvas_buffers = local()
+    _metadata_lock = Lock()
+
+    @classmethod
+    def _get_canvas(cls, height: int, width: int) -> MatLike:
+        """Returns the preallocated output buffer for the resolution. Buffers are kept per thread
+        and reused for every saved image, so the caller must be done with the buffer before
+        requesting it again."""
+        buffers: dict[tuple[int, int], MatLike] | None = getattr(cls._canvas_buffers, "buffers", None)
+        if buffers is None:
+            buffers = {}
+            cls._canvas_buffers.buffers = buffers
+
+        canvas = buffers.get((height, width))
+        if canvas is None:
+            canvas = np.empty((height, width, 3), dtype=np.uint8)
+            buffers[(height, width)] = canvas
+        return canvas
+
     @staticmethod
     def video_exists(path: str | Path) -> bool:
         """Checks if a file exists at the specified path.
@@ -37,6 +78,10 @@ class VideoManager:
         path: str | Path,
         output_video: str,
         fps: int,
+        encoder_settings: EncoderSettings | None = None,
+        chunks: int = 1,
+        worker_priority: WorkerPriority | None = None,
+        storage: StorageBackend | None = None,
     ) -> bool:
         """Gets the image files from the specified folder and sorts them chronologically.
         Then a VideoWriter object creates the video and writes it to the specified folder.
@@ -49,19 +94,45 @@ class VideoManager:
             path: str - the folder, containing the images
             output_video: str - the name of the video file to be created
             fps: int - frames per second of the video
-            width: int - width of the video in pixels
-            height: int - height of the video in pixels
-            with_stamp: bool - put the date and time text in the top left corner
+            encoder_settings: EncoderSettings | None - the encoder backend and its settings,
+                defaults to cv2.VideoWriter with DEFAULT_VIDEO_CODEC
+            chunks: int - the number of worker processes encoding contiguous parts of the images
+                in parallel (see encode_in_chunks), defaults to 1 (the images are encoded in this process)
+            worker_priority: WorkerPriority | None - the priority of the chunk worker processes
+            storage: StorageBackend | None - stores the created video (e.g. uploads it to an S3Storage),
+                defaults to None (the video is kept only in the folder)
 
         Returns::
 
             True - if the video was created successfully;
             False - in case of Exception during the creation of the video
 
+        Raw frames saved with save_raw_frame() are processed to images first (see process_raw_frames).
+        The images are read from the FrameManifest of the folder if it has one, otherwise the folder is listed.
+        Frames saved with save_packed_frame() are streamed from the PackedFrameStore of the folder instead
+        (see encode_packed_frames) and frames saved with save_mapped_frame() from its MappedFrameStore
+        (see encode_mapped_frames).
+
         Note: the source image files are not modified or deleted in any case."""
+        if storage is not None:
+            created = VideoManager.create_timelapse(
+                logger, path, output_video, fps, encoder_settings, chunks, worker_priority
+            )
+            if created:
+                storage.store_video(output_video)
+            return created
+
         path = Path(path)
+        VideoManager.process_raw_frames(logger, path)
+        if MappedFrameStore.exists(path):
+            return VideoManager.encode_mapped_frames(logger, path, output_video, fps, encoder_settings)
+        if PackedFrameStore.exists(path):
+            return VideoManager.encode_packed_frames(logger, path, output_video, fps, encoder_settings)
         logger.info(f"Creating video from images in {shorten(str(path))}")
-        image_files = sorted(map(str, path.glob(f"*{JPG_FILE}")))
+        if FrameManifest.exists(path):
+            image_files = FrameManifest(path).frame_files(JPG_FILE)
+        else:
+            image_files = sorted(map(str, path.glob(f"*{JPG_FILE}")))
         first_element = next(iter(image_files), None)
 
         if first_element is not None:
@@ -76,20 +147,37 @@ class VideoManager:
 
                 height, width, _ = first_image.shape
 
-                fourcc = cv2.VideoWriter.fourcc(*DEFAULT_VIDEO_CODEC)
-                video_writer = cv2.VideoWriter(
-                    output_video, fourcc, fps, (width, height)
-                )
-                video_writer.write(first_image)
+                chunks = min(chunks, len(image_files) // MIN_FRAMES_PER_CHUNK)
+                # without ffmpeg the chunks can't be joined without encoding them a second time
+                if chunks > 1 and find_ffmpeg() is not None:
+                    return VideoManager.encode_in_chunks(
+                        logger,
+                        [os.path.join(path, image_file) for image_file in image_files],
+                        output_video,
+                        fps,
+                        (width, height),
+                        chunks,
+                        encoder_settings,
+                        worker_priority,
+                    )
 
-                for image_file in image_files[1:]:
-                    img_path = os.path.join(path, image_file)
+                with create_encoder(
+                    output_video, fps, (width, height), encoder_settings, logger
+                ) as video_writer:
+                    video_writer.write(first_image)
 
-                    img = cv2.imread(img_path)
+                    # the next images are decoded in background threads while the current one is encoded
+                    for img_path, img in VideoManager.read_images(
+                        [os.path.join(path, image_file) for image_file in image_files[1:]]
+                    ):
+                        if img is None:
+                            logger.warning(f"Could not read image: {shorten(img_path)}. Skipping...")
+                            continue
 
-                    video_writer.write(img)
+                        video_writer.write(img)
 
-                video_writer.release()
+                    if not video_writer.release():
+                        return False
                 logger.info(f"Video created: {shorten(output_video)}")
                 return True
 
@@ -100,6 +188,264 @@ class VideoManager:
             logger.info(f"Folder contained no images {shorten(str(path))}")
             return False
 
+    @staticmethod
+    def encode_images(
+        logger: Logger,
+        image_files: list[str],
+        output_video: str,
+        fps: int,
+        frame_size: tuple[int, int],
+        encoder_settings: EncoderSettings | None = None,
+    ) -> int:
+        """
+        Encodes the images into a video of the given frame size. Images which can't be read
+        are skipped.
+
+        Returns::
+
+            int - the number of encoded frames or -1 if the encoder failed
+        """
+        frames_count = 0
+        with create_encoder(output_video, fps, frame_size, encoder_settings, logger) as video_writer:
+            for img_path, img in VideoManager.read_images(image_files):
+                if img is None:
+                    logger.warning(f"Could not read image: {shorten(img_path)}. Skipping...")
+                    continue
+
+                video_writer.write(img)
+                frames_count += 1
+
+            return frames_count if video_writer.release() else -1
+
+    @staticmethod
+    def encode_in_chunks(
+        logger: Logger,
+        image_files: list[str],
+        output_video: str,
+        fps: int,
+        frame_size: tuple[int, int],
+        chunks: int,
+        encoder_settings: EncoderSettings | None = None,
+        worker_priority: WorkerPriority | None = None,
+    ) -> bool:
+        """
+        Splits the sorted images into contiguous chunks, encodes every chunk in a worker process
+        and joins the chunk videos with the concat demuxer of ffmpeg, copying the streams.
+        The frames of the video are the same and in the same order as if the images were
+        encoded in a single process. If the chunks can't be joined without re-encoding them
+        (ffmpeg is missing or the streams differ), the images are encoded again in the calling
+        process instead, so no frame is encoded twice.
+
+        Args::
+
+            logger: Logger - the logger instance
+            image_files: list[str] - the sorted paths of the images
+            output_video: str - the path of the video
+            fps: int - frames per second of the video
+            frame_size: tuple[int, int] - (width, height) of the video
+            chunks: int - the number of chunks and worker processes
+            encoder_settings: EncoderSettings | None - the encoder backend and its settings
+            worker_priority: WorkerPriority | None - the priority of the worker processes
+
+        Returns::
+
+            bool - True if the video was created
+        """
+        chunk_size = -(-len(image_files) // chunks)
+        output_stem = os.path.splitext(output_video)[0]
+        chunk_videos = [
+            f"{output_stem}{PART_FILE_SUFFIX}{index:03d}{MP4_FILE}"
+            for index in range(-(-len(image_files) // chunk_size))
+        ]
+        logger.info(f"Encoding {len(image_files)} images in {len(chunk_videos)} chunks")
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=len(chunk_videos),
+                initializer=apply_worker_priority,
+                initargs=(worker_priority,),
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        VideoManager.encode_images,
+                        logger,
+                        image_files[index * chunk_size:(index + 1) * chunk_size],
+                        chunk_video,
+                        fps,
+                        frame_size,
+                        encoder_settings,
+                    )
+                    for index, chunk_video in enumerate(chunk_videos)
+                ]
+                frames_counts = [future.result() for future in futures]
+
+            if any(frames_count < 0 for frames_count in frames_counts):
+                logger.error(f"Could not encode the chunks of {shorten(output_video)}")
+                return False
+
+            # empty chunks (all images unreadable) can't be joined
+            encoded_chunks = [video for video, frames_count in zip(chunk_videos, frames_counts) if frames_count > 0]
+            if not encoded_chunks:
+                logger.error(f"No readable images for {shorten(output_video)}")
+                return False
+
+            ffmpeg = find_ffmpeg()
+            if len(encoded_chunks) == 1:
+                shutil.copyfile(encoded_chunks[0], output_video)
+            elif (
+                ffmpeg is None
+                or not VideoManager.can_stream_copy(encoded_chunks, fps)
+                or not VideoManager._concat_videos(logger, ffmpeg, encoded_chunks, output_video)
+            ):
+                logger.warning(f"Could not join the chunks of {shorten(output_video)}, encoding the images serially")
+                if VideoManager.encode_images(
+                    logger, image_files, output_video, fps, frame_size, encoder_settings
+                ) <= 0:
+                    return False
+            logger.info(f"Video created: {shorten(output_video)}")
+            return True
+
+        except Exception as exc:
+            logger.error(exc, exc_info=True)
+            return False
+        finally:
+            for chunk_video in chunk_videos:
+                if os.path.exists(chunk_video):
+                    os.remove(chunk_video)
+
+    @staticmethod
+    def encode_packed_frames(
+        logger: Logger,
+        path: str | Path,
+        output_video: str,
+        fps: int,
+        encoder_settings: EncoderSettings | None = None,
+    ) -> bool:
+        """Streams the frames of the PackedFrameStore of the folder in order into a video.
+        The frames are decoded ahead of the encoder by read_images, the size of the video is
+        the size of the first frame.
+
+        Args::
+
+            logger: Logger - The logger instance for logging warnings, errors, and information.
+            path: str | Path - the folder, containing the packed frames
+            output_video: str - the name of the video file to be created
+            fps: int - frames per second of the video
+            encoder_settings: EncoderSettings | None - the encoder backend and its settings
+
+        Returns::
+
+            bool - True if the video was created"""
+        logger.info(f"Creating video from packed frames in {shorten(str(path))}")
+        images = VideoManager.read_images(PackedFrameStore(path).read_frames(), loader=VideoManager.decode_packed_frame)
+        return VideoManager.encode_frame_stream(logger, path, (img for _, img in images), output_video, fps, encoder_settings)
+
+    @staticmethod
+    def encode_mapped_frames(
+        logger: Logger,
+        path: str | Path,
+        output_video: str,
+        fps: int,
+        encoder_settings: EncoderSettings | None = None,
+    ) -> bool:
+        """Streams the frames of the MappedFrameStore of the folder in order into a video.
+        The encoder gets views of the memory-mapped frames, so nothing is decoded or copied.
+
+        Args::
+
+            The same as encode_packed_frames.
+
+        Returns::
+
+            bool - True if the video was created"""
+        logger.info(f"Creating video from mapped frames in {shorten(str(path))}")
+        images = (np.asarray(img) for _, img in MappedFrameStore(path).read_frames())
+        return VideoManager.encode_frame_stream(logger, path, images, output_video, fps, encoder_settings)
+
+    @staticmethod
+    def encode_frame_stream(
+        logger: Logger,
+        path: str | Path,
+        images: Iterable[MatLike | None],
+        output_video: str,
+        fps: int,
+        encoder_settings: EncoderSettings | None = None,
+    ) -> bool:
+        """Writes the frames of a store in order into a video, the size of the video is the size of the first frame.
+        Frames which could not be read (None) are skipped.
+
+        Returns::
+
+            bool - True if the video was created"""
+        def _valid_images() -> Iterator[MatLike]:
+            for img in images:
+                if img is None:
+                    logger.warning(f"Could not decode a frame in {shorten(str(path))}. Skipping...")
+                    continue
+                yield img
+
+        try:
+            frames = _valid_images()
+            first_image = next(frames, None)
+            if first_image is None:
+                logger.info(f"Folder contained no images {shorten(str(path))}")
+                return False
+
+            height, width = first_image.shape[:2]
+            with create_encoder(output_video, fps, (width, height), encoder_settings, logger) as video_writer:
+                video_writer.write(first_image)
+                for img in frames:
+                    video_writer.write(img)
+                if not video_writer.release():
+                    return False
+            logger.info(f"Video created: {shorten(output_video)}")
+            return True
+
+        except Exception as exc:
+            logger.error(exc, exc_info=True)
+            return False
+
+    @staticmethod
+    def decode_packed_frame(frame: tuple[float, bytes]) -> MatLike | None:
+        """Decodes a (capture time, encoded frame) tuple of PackedFrameStore.read_frames."""
+        return cv2.imdecode(np.frombuffer(frame[1], dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    @staticmethod
+    def read_images(
+        image_files: Iterable[Any],
+        read_ahead: int = DEFAULT_READ_AHEAD_FRAMES,
+        workers: int = DEFAULT_READ_AHEAD_WORKERS,
+        loader: Callable[[Any], MatLike | None] | None = None,
+    ) -> Generator[tuple[Any, MatLike | None], None, None]:
+        """Reads the images in order while the next read_ahead images are read and decoded by a pool
+        of threads (cv2.imread releases the GIL), so the disk reads and the decoding overlap with the
+        work of the consumer. At most read_ahead decoded images are held in memory.
+
+        Args::
+
+            image_files: Iterable[Any] - the paths of the images (or the items read by loader)
+            read_ahead: int - how many images are read ahead of the consumer
+            workers: int - the number of reading threads
+            loader: Callable[[Any], MatLike | None] | None - reads an image, defaults to cv2.imread
+
+        Returns::
+
+            Generator[tuple[Any, MatLike | None]] - the path and the image (None if it could not be read)"""
+        loader = loader or cv2.imread
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            pending: deque[tuple[Any, Future[MatLike | None]]] = deque()
+            files = iter(image_files)
+
+            for image_file in islice(files, max(1, read_ahead)):
+                pending.append((image_file, executor.submit(loader, image_file)))
+
+            while pending:
+                image_file, future = pending.popleft()
+                next_file = next(files, None)
+                if next_file is not None:
+                    pending.append((next_file, executor.submit(loader, next_file)))
+                yield image_file, future.result()
+
     @staticmethod
     def delete_source_media_files(
         logger: Logger,
@@ -108,6 +454,9 @@ class VideoManager:
         delete_folder: bool = False,
     ) -> bool:
         """Deletes the image or video files from the specified folder.
+        The images listed in the FrameManifest of the folder are deleted without listing the folder
+        and the manifest is deleted with them. The frames of a PackedFrameStore are deleted with a single unlink,
+        the frames of a MappedFrameStore with its folder.
 
         Args::
 
@@ -124,15 +473,32 @@ class VideoManager:
         """
         path = Path(path)
         try:
-            media_files: list[str] | Generator[Path] | None = path.glob(f"*{extension}")
-            
+            if extension == JPG_FILE and PackedFrameStore.exists(path):
+                freed = PackedFrameStore(path).delete()
+                logger.info(f"Deleted the packed frames ({freed} bytes) from {shorten(str(path))}")
+            if extension == JPG_FILE and MappedFrameStore.exists(path):
+                freed = MappedFrameStore(path).delete()
+                logger.info(f"Deleted the mapped frames ({freed} bytes) from {shorten(str(path))}")
+
+            manifest = FrameManifest(path) if extension == JPG_FILE and FrameManifest.exists(path) else None
+            media_files: list[str] | Generator[Path] | None = (
+                manifest.frame_files(extension) if manifest is not None else path.glob(f"*{extension}")
+            )
+
             if not media_files:
                 media_files = []
 
             files_count = 0
             for file in media_files:
-                os.remove(file)
+                try:
+                    os.remove(file)
+                except FileNotFoundError:
+                    if manifest is None:
+                        raise
+                    continue
                 files_count += 1
+            if manifest is not None:
+                manifest.remove()
 
             logger.info(f"Deleted {files_count} files from {shorten(str(path))}")
             if delete_folder:
@@ -159,27 +525,57 @@ class VideoManager:
         video_paths: list[str],
         output_video_path: str,
         fps: int,
+        encoder_settings: EncoderSettings | None = None,
+        frames_per_video: int | None = None,
+        target_duration_seconds: float | None = None,
+        storage: StorageBackend | None = None,
     ) -> bool:
         """
         Creates a monthly summary video by concatenating a list of input videos.
 
         This method processes a list of video files and outputs a single video file
-        to the specified location. The resulting video is created in the specified
-        resolution and frame rate.
+        to the specified location. If ffmpeg is installed and all videos share the codec,
+        the resolution and the frame rate, they are joined at container level (stream copy)
+        without decoding and encoding any frame. Otherwise the frames are transcoded into
+        a video with the resolution of the first video and the specified frame rate.
+
+        The summary can be shortened by sampling the input videos - only frames_per_video evenly
+        spaced frames of every video are used (see read_video_frames). A target duration is
+        converted to the same number of frames per video; if both are set the smaller one wins.
 
         Args:
             logger (Logger): The logger instance for logging warnings, errors, and information.
-            video_paths (list[str]): A list of video paths to the input videos.
+            video_paths (list[str]): A list of video paths to the input videos. They are joined in the order
+                of their folder and file name (the list is not changed).
             output_video_path (str): The path where the output video will be saved. If the video already
                 exists, the method skips the operation.
             fps (int): Frames per second for the output video.
-            width (int): Width of the output video in pixels.
-            height (int): Height of the output video in pixels.
+            encoder_settings (EncoderSettings | None): The encoder backend and its settings,
+                defaults to cv2.VideoWriter with DEFAULT_VIDEO_CODEC.
+            frames_per_video (int | None): The number of frames taken from every input video,
+                defaults to None (all frames).
+            target_duration_seconds (float | None): The approximate duration of the summary,
+                defaults to None (the sum of the input videos).
+            storage (StorageBackend | None): Stores the created video (e.g. uploads it to an S3Storage),
+                defaults to None (the video is kept only in its folder).
 
         Returns:
             bool: Returns True if the video is successfully created, otherwise False.
         """
-        video_paths.sort()
+        if storage is not None:
+            created = cls.create_monthly_summary_video(
+                logger, video_paths, output_video_path, fps, encoder_settings, frames_per_video, target_duration_seconds
+            )
+            if created:
+                storage.store_video(output_video_path)
+            return created
+
+        # the videos of a period can be under different roots (e.g. the older days in the cold tier),
+        # so they are ordered by their folder and file name, i.e. chronologically
+        video_paths = sorted(video_paths, key=lambda path: (Path(path).parent.name, Path(path).name))
+        frames_per_video = cls.get_frames_per_video(
+            len(video_paths), fps, frames_per_video, target_duration_seconds
+        )
 
         if cls.video_exists(output_video_path):
             logger.warning(f"Video exists, skipping... {shorten(output_video_path)}")
@@ -189,45 +585,343 @@ class VideoManager:
         if not cls.video_exists(video_parent_folder):
             os.mkdir(video_parent_folder)
 
-        try:
-            output_video = None
+        ffmpeg = find_ffmpeg()
+        if (
+            frames_per_video is None
+            and ffmpeg is not None
+            and len(video_paths) > 1
+            and cls.can_stream_copy(video_paths, fps)
+        ):
+            if cls._concat_videos(logger, ffmpeg, video_paths, output_video_path):
+                return True
+            logger.warning("Transcoding the summary video instead")
 
+        def _video_frames() -> Iterator[MatLike]:
             for video_path in video_paths:
                 cap = cv2.VideoCapture(video_path)
-                if not cap.isOpened():
-                    logger.warning(f"Cannot open video: {shorten(video_path)}. Skipping...")
-                    continue
-
-                while True:
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
+                try:
+                    if not cap.isOpened():
+                        logger.warning(f"Cannot open video: {shorten(video_path)}. Skipping...")
+                        continue
+                    yield from cls.read_video_frames(cap, frames_per_video)
+                finally:
+                    cap.release()
 
-                    if output_video is None:
-                        height, width, _ = frame.shape
-                        fourcc = cv2.VideoWriter.fourcc(*DEFAULT_VIDEO_CODEC)
-                        output_video = cv2.VideoWriter(
-                            output_video_path, fourcc, fps, (width, height)
-                        )
+        try:
+            frames = _video_frames()
+            first_frame = next(frames, None)
+            if first_frame is None:
+                logger.error("No valid videos found to create a summary.")
+                return False
 
+            height, width, _ = first_frame.shape
+            with create_encoder(output_video_path, fps, (width, height), encoder_settings, logger) as output_video:
+                output_video.write(first_frame)
+                for frame in frames:
                     output_video.write(frame)
+                return output_video.release()
 
-                cap.release()
+        except Exception as exc:
+            logger.error(exc, exc_info=True)
+            return False
 
-            if output_video is not None:
-                output_video.release()
-                return True
-            else:
-                logger.error("No valid videos found to create a summary.")
-                return False
+    @staticmethod
+    def get_frames_per_video(
+        videos_count: int,
+        fps: int,
+        frames_per_video: int | None = None,
+        target_duration_seconds: float | None = None,
+    ) -> int | None:
+        """
+        Calculates how many frames of every input video should be used for a summary.
+
+        Args:
+            videos_count (int): The number of input videos.
+            fps (int): Frames per second of the summary.
+            frames_per_video (int | None): A fixed number of frames per video.
+            target_duration_seconds (float | None): The approximate duration of the summary.
+
+        Returns:
+            int | None: The number of frames per video (at least 1) or None if all frames should be used.
+        """
+        limits: list[int] = []
+        if frames_per_video is not None:
+            limits.append(frames_per_video)
+        if target_duration_seconds is not None and videos_count > 0:
+            limits.append(int(target_duration_seconds * fps / videos_count))
+
+        return max(1, min(limits)) if limits else None
+
+    @staticmethod
+    def read_video_frames(cap: cv2.VideoCapture, frames_count: int | None = None) -> Iterator[MatLike]:
+        """
+        Yields the frames of an opened video. If frames_count is set, only frames_count evenly
+        spaced frames are yielded. The skipped frames are passed with grab(), which does not
+        convert and copy the frame, or, for gaps longer than SUMMARY_SEEK_THRESHOLD_FRAMES, with
+        a seek which lets the decoder jump to the nearest key frame.
 
+        Args:
+            cap (cv2.VideoCapture): The opened video.
+            frames_count (int | None): The number of frames to be yielded, defaults to None (all frames).
+
+        Yields:
+            MatLike: The decoded frames.
+        """
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if frames_count else 0
+        if not frames_count or total_frames <= frames_count:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    return
+                yield frame
+
+        step = total_frames / frames_count
+        position = 0
+        for index in range(frames_count):
+            target = int(index * step)
+            if target - position > SUMMARY_SEEK_THRESHOLD_FRAMES:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                position = target
+            while position < target:
+                if not cap.grab():
+                    return
+                position += 1
+
+            ret, frame = cap.read()
+            if not ret:
+                return
+            position += 1
+            yield frame
+
+    @classmethod
+    def stitch_videos(
+        cls,
+        logger: Logger,
+        video_paths: list[str],
+        output_video_path: str,
+        fps: int,
+        encoder_settings: EncoderSettings | None = None,
+    ) -> bool:
+        """
+        Joins videos which were encoded with the same settings (e.g. the segments of a
+        SegmentedVideoWriter) into one video without re-encoding them, using the concat
+        demuxer of ffmpeg. If ffmpeg is not installed or fails, the videos are transcoded
+        with create_monthly_summary_video instead.
+
+        Args:
+            logger (Logger): The logger instance for logging warnings, errors, and information.
+            video_paths (list[str]): The videos in the order in which they should be joined.
+            output_video_path (str): The path of the output video.
+            fps (int): Frames per second of the output video, used only for the transcoding.
+            encoder_settings (EncoderSettings | None): The encoder settings for the transcoding.
+
+        Returns:
+            bool: Returns True if the video is successfully created, otherwise False.
+        """
+        if len(video_paths) == 1:
+            shutil.copyfile(video_paths[0], output_video_path)
+            return True
+
+        ffmpeg = find_ffmpeg()
+        if ffmpeg is not None and cls._concat_videos(logger, ffmpeg, video_paths, output_video_path):
+            return True
+
+        return cls.create_monthly_summary_video(logger, list(video_paths), output_video_path, fps, encoder_settings)
+
+    @classmethod
+    def transcode_video(
+        cls,
+        logger: Logger,
+        video_path: str,
+        output_video_path: str,
+        encoder_settings: EncoderSettings | None = None,
+    ) -> bool:
+        """
+        Re-encodes a video with other encoder settings, e.g. with a slower preset which makes a smaller file.
+        The output keeps the frame size and the frame rate of the video.
+
+        Args:
+            logger (Logger): The logger instance for logging warnings, errors, and information.
+            video_path (str): The path of the video.
+            output_video_path (str): The path of the re-encoded video.
+            encoder_settings (EncoderSettings | None): The encoder backend and its settings.
+
+        Returns:
+            bool: Returns True if the video is successfully re-encoded, otherwise False.
+        """
+        parameters = cls.get_video_parameters(video_path)
+        if parameters is None:
+            logger.warning(f"Cannot open video: {shorten(video_path)}")
+            return False
+
+        _, width, height, fps = parameters
+        cap = cv2.VideoCapture(video_path)
+        try:
+            with create_encoder(
+                output_video_path, max(1, round(fps)), (width, height), encoder_settings, logger
+            ) as video_writer:
+                for frame in cls.read_video_frames(cap):
+                    video_writer.write(frame)
+                return video_writer.release()
         except Exception as exc:
             logger.error(exc, exc_info=True)
             return False
+        finally:
+            cap.release()
 
     @staticmethod
+    def get_video_parameters(video_path: str) -> tuple[int, int, int, float] | None:
+        """
+        Reads the stream parameters of a video from its container, without decoding any frames.
+
+        Args:
+            video_path (str): The path of the video.
+
+        Returns:
+            tuple[int, int, int, float] | None: (fourcc, width, height, fps) of the video or None
+                if the video cannot be opened.
+        """
+        cap = cv2.VideoCapture(video_path)
+        try:
+            if not cap.isOpened():
+                return None
+            return (
+                int(cap.get(cv2.CAP_PROP_FOURCC)),
+                int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                round(cap.get(cv2.CAP_PROP_FPS), 2),
+            )
+        finally:
+            cap.release()
+
+    @classmethod
+    def can_stream_copy(cls, video_paths: list[str], fps: int) -> bool:
+        """
+        Checks if the videos can be joined at container level: all of them must be readable
+        and share the codec, the resolution and the frame rate, which must be equal to fps.
+
+        Args:
+            video_paths (list[str]): The videos to be joined.
+            fps (int): Frames per second of the output video.
+
+        Returns:
+            bool: True if the videos can be joined without decoding and encoding them.
+        """
+        parameters = {cls.get_video_parameters(video_path) for video_path in video_paths}
+        if len(parameters) != 1:
+            return False
+
+        video_parameters = parameters.pop()
+        return video_parameters is not None and video_parameters[3] == round(fps, 2)
+
+    @staticmethod
+    def _concat_videos(logger: Logger, ffmpeg: str, video_paths: list[str], output_video_path: str) -> bool:
+        """
+        Joins the videos with the concat demuxer of ffmpeg, copying the streams without re-encoding.
+        A partially written output is removed if ffmpeg fails.
+
+        Returns:
+            bool: True if the video is created.
+        """
+        list_file = f"{output_video_path}{PART_FILE_SUFFIX}.txt"
+        try:
+            with open(list_file, "w") as file:
+                for video_path in video_paths:
+                    escaped_path = os.path.abspath(video_path).replace("'", "'\\''")
+                    file.write(f"file '{escaped_path}'\n")
+
+            result = subprocess.run(
+                [
+                    ffmpeg, "-y", "-loglevel", "error",
+                    "-f", "concat", "-safe", "0", "-i", list_file,
+                    "-c", "copy", output_video_path,
+                ],
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode == 0:
+                logger.info(f"Stitched {len(video_paths)} videos into {shorten(output_video_path)}")
+                return True
+            logger.warning(f"ffmpeg could not stitch the videos: {result.stderr.strip()}")
+        except Exception as exc:
+            logger.warning(f"ffmpeg could not stitch the videos: {exc}")
+        finally:
+            if os.path.exists(list_file):
+                os.remove(list_file)
+
+        if os.path.exists(output_video_path):
+            os.remove(output_video_path)
+        return False
+
+    @staticmethod
+    def decode_image(image: bytes | Frame, width: int, height: int) -> MatLike | None:
+        """
+        Decodes an image which will be resized to (width, height) at the smallest resolution
+        which is not below the target size (see Frame.get_imread_flag).
+
+        Returns:
+            MatLike | None - the decoded BGR image or None if the bytes could not be decoded
+        """
+        frame = image if isinstance(image, Frame) else Frame(encoded=image)
+        return frame.image_for_size(width, height)
+
+    @classmethod
+    def render_image_with_weather_overlay(
+        cls,
+        image_bytes: bytes | Frame,
+        width: int,
+        height: int,
+        date_time_text: str = "",
+        weather_data_text: str | None = None,
+        text_box_position: type[TextBox] | None = None,
+        text_box_transparency: float = TextBox.TRANSPARENCY_MID,
+    ) -> MatLike | None:
+        """
+        Renders the final image (resized image and text box) without saving it.
+
+        Large JPEGs are decoded at a reduced resolution (see Frame.get_imread_flag).
+        The rendered text boxes are reused from VideoManager.text_box_cache. The image is resized
+        directly into a preallocated output buffer for the resolution and the text box is drawn on
+        the same buffer, so no full-frame arrays are allocated per image.
+        The buffer is reused by the next call in the same thread, so it should be written or copied
+        before that.
+
+        Args:
+            The same as save_image_with_weather_overlay without save_path.
+
+        Returns:
+            MatLike | None - the rendered image or None if the image could not be decoded
+        """
+        img = cls.decode_image(image_bytes, width, height)
+
+        if img is None:
+            return None
+
+        text_box = None
+        if text_box_position is not None:
+            text_box = cls.text_box_cache.get_with_clock(
+                text_box_class=text_box_position,
+                date_time_text=date_time_text,
+                img_width=width,
+                img_height=height,
+                weather_data_text=weather_data_text,
+                box_transparency=text_box_transparency,
+            )
+
+        if text_box is not None:
+            canvas = cls._get_canvas(text_box.canvas_height(height), width)
+            cv2.resize(img, (width, height), dst=text_box.image_region(canvas))
+            text_box.draw_on_canvas(canvas)
+        else:
+            canvas = cls._get_canvas(height, width)
+            cv2.resize(img, (width, height), dst=canvas)
+
+        return canvas
+
+    @classmethod
     def save_image_with_weather_overlay(
-        image_bytes: bytes,
+        cls,
+        image_bytes: bytes | Frame,
         save_path: str,
         width: int,
         height: int,
@@ -235,35 +929,260 @@ class VideoManager:
         weather_data_text: str | None = None,
         text_box_position: type[TextBox] | None = None,
         text_box_transparency: float = TextBox.TRANSPARENCY_MID,
+        storage: StorageBackend | None = None,
+        manifest: FrameManifest | None = None,
     ):
         """
         Saves an image from bytes data with an additional overlay containing weather information at the top.
 
         Args:
-            image_bytes: bytes - Image data received from a request (response.content).
+            image_bytes: bytes | Frame - Image data received from a request (response.content)
+                or a Frame returned by Source.get_frame(), whose decoded image is reused.
             save_path: str - Path where the new image will be saved.
             width: int - Width of the final image.
             height: int - Height of the final image (excluding overlay).
             date_time_text: str - The timestamp to be displayed (YYYY-MM-DD H:M:S).
             weather_data_text: str | None - The text for weather data, defaults to None.
             text_box_position: type[TextBox] | None - the position of the text box on the image.
+            storage: StorageBackend | None - stores the saved image (e.g. spools it for an S3Storage), defaults to None.
+            manifest: FrameManifest | None - lists the saved image with the encoded bytes, defaults to None.
+
+        The image is rendered with render_image_with_weather_overlay.
         """
+        image = cls.render_image_with_weather_overlay(
+            image_bytes=image_bytes,
+            width=width,
+            height=height,
+            date_time_text=date_time_text,
+            weather_data_text=weather_data_text,
+            text_box_position=text_box_position,
+            text_box_transparency=text_box_transparency,
+        )
+        if image is None:
+            return False
 
-        image_array = np.frombuffer(image_bytes, dtype=np.uint8)
-        img = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+        if manifest is None:
+            saved = cv2.imwrite(save_path, image)
+        else:
+            # the image is encoded in memory, so the manifest doesn't read the file back
+            saved, buffer = cv2.imencode(JPG_FILE, image)
+            if saved:
+                data = buffer.tobytes()
+                with open(save_path, "wb") as file:
+                    file.write(data)
+                captured_at = image_bytes.captured_at if isinstance(image_bytes, Frame) else None
+                manifest.append(save_path, captured_at, data)
+        if saved and storage is not None:
+            storage.store_frame(save_path)
+        return saved
 
-        if img is None:
+    @classmethod
+    def save_raw_frame(
+        cls,
+        image_bytes: bytes | Frame,
+        save_path: str,
+        width: int,
+        height: int,
+        date_time_text: str = "",
+        weather_data_text: str | None = None,
+        text_box_position: type[TextBox] | None = None,
+        text_box_transparency: float = TextBox.TRANSPARENCY_MID,
+        manifest: FrameManifest | None = None,
+    ) -> bool:
+        """
+        Saves the fetched image bytes untouched next to save_path (with a RAW_FILE extension) and appends
+        the arguments needed for save_image_with_weather_overlay to the FRAMES_METADATA_FILE of the folder.
+        The decoding, resizing and overlay are deferred to process_raw_frames, so capturing a frame costs
+        only a file write.
+
+        Args:
+            The same as save_image_with_weather_overlay.
+
+        Returns:
+            bool - if the frame was saved
+        """
+        frame_bytes = image_bytes.encoded if isinstance(image_bytes, Frame) else image_bytes
+        if not frame_bytes:
             return False
-        img = cv2.resize(img, (width, height))
 
-        rectangle_text = date_time_text if not weather_data_text else f"{date_time_text} | {weather_data_text}"
-        
-        final_image = None
-        if text_box_position is not None:
-            text_box = text_box_position(text=rectangle_text, img_width=width, img_height=height, box_transparency=text_box_transparency)
-            final_image = text_box.position(img)
+        raw_path = Path(save_path).with_suffix(RAW_FILE)
+        with open(raw_path, "wb") as file:
+            file.write(frame_bytes)
 
-        if final_image is not None:
-            return cv2.imwrite(save_path, final_image)
-        else:
-            return cv2.imwrite(save_path, img)
+        entry = {
+            "file": raw_path.name,
+            "date_time_text": date_time_text,
+            "weather_data_text": weather_data_text,
+            "width": width,
+            "height": height,
+            "text_box_position": None if text_box_position is None else text_box_position.__name__,
+            "text_box_transparency": text_box_transparency,
+        }
+        # the entry is written after the frame, so a listed frame is always complete
+        with cls._metadata_lock, open(raw_path.parent / FRAMES_METADATA_FILE, "a") as file:
+            file.write(json.dumps(entry) + "\n")
+        if manifest is not None:
+            captured_at = image_bytes.captured_at if isinstance(image_bytes, Frame) else None
+            manifest.append(raw_path, captured_at, frame_bytes)
+        return True
+
+    @classmethod
+    def save_packed_frame(
+        cls,
+        image_bytes: bytes | Frame,
+        save_path: str,
+        width: int,
+        height: int,
+        date_time_text: str = "",
+        weather_data_text: str | None = None,
+        text_box_position: type[TextBox] | None = None,
+        text_box_transparency: float = TextBox.TRANSPARENCY_MID,
+    ) -> bool:
+        """
+        Renders the image like save_image_with_weather_overlay and appends the encoded image to the
+        PackedFrameStore of the folder of save_path instead of saving it as a separate file.
+
+        Args:
+            The same as save_image_with_weather_overlay.
+
+        Returns:
+            bool - if the frame was saved
+        """
+        image = cls.render_image_with_weather_overlay(
+            image_bytes=image_bytes,
+            width=width,
+            height=height,
+            date_time_text=date_time_text,
+            weather_data_text=weather_data_text,
+            text_box_position=text_box_position,
+            text_box_transparency=text_box_transparency,
+        )
+        if image is None:
+            return False
+
+        encoded, buffer = cv2.imencode(JPG_FILE, image)
+        if not encoded:
+            return False
+        captured_at = image_bytes.captured_at if isinstance(image_bytes, Frame) else None
+        PackedFrameStore(Path(save_path).parent).append(buffer.tobytes(), captured_at)
+        return True
+
+    @classmethod
+    def save_mapped_frame(
+        cls,
+        image_bytes: bytes | Frame,
+        save_path: str,
+        width: int,
+        height: int,
+        date_time_text: str = "",
+        weather_data_text: str | None = None,
+        text_box_position: type[TextBox] | None = None,
+        text_box_transparency: float = TextBox.TRANSPARENCY_MID,
+    ) -> bool:
+        """
+        Renders the image like save_image_with_weather_overlay and copies the rendered frame into the
+        MappedFrameStore of the folder of save_path, without encoding it.
+
+        Args:
+            The same as save_image_with_weather_overlay.
+
+        Returns:
+            bool - if the frame was saved
+        """
+        image = cls.render_image_with_weather_overlay(
+            image_bytes=image_bytes,
+            width=width,
+            height=height,
+            date_time_text=date_time_text,
+            weather_data_text=weather_data_text,
+            text_box_position=text_box_position,
+            text_box_transparency=text_box_transparency,
+        )
+        if image is None:
+            return False
+
+        captured_at = image_bytes.captured_at if isinstance(image_bytes, Frame) else None
+        return MappedFrameStore(Path(save_path).parent).append(image, captured_at)
+
+    @classmethod
+    def process_raw_frames(
+        cls,
+        logger: Logger,
+        path: str | Path,
+        workers: int | None = None,
+        storage: StorageBackend | None = None,
+    ) -> int:
+        """
+        Processes the raw frames of a folder saved with save_raw_frame into images with weather overlay.
+        The frames are processed in a pool of threads (OpenCV releases the GIL while decoding, resizing and
+        encoding), so all cores are used. The processing is idempotent - a raw frame is deleted only after
+        its image is saved and frames which already have an image are skipped, so an interrupted run can
+        be repeated. A raw frame which can't be decoded or encoded is deleted with an error, so the folder
+        is not kept for it. The metadata file is deleted when all frames are processed.
+
+        Args:
+            logger: Logger - The logger instance for logging warnings, errors, and information.
+            path: str | Path - the folder, containing the raw frames
+            workers: int | None - the number of threads, defaults to os.cpu_count()
+            storage: StorageBackend | None - stores the processed images (e.g. spools them for an S3Storage),
+                defaults to None
+
+        Returns:
+            int - the count of the processed frames
+        """
+        path = Path(path)
+        metadata_file = path / FRAMES_METADATA_FILE
+        if not os.path.exists(metadata_file):
+            return 0
+
+        entries: list[dict[str, Any]] = []
+        with open(metadata_file) as file:
+            for line in file:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # a line can be cut if the process was killed while writing it
+                    logger.warning(f"Skipping invalid raw frame metadata in {shorten(str(metadata_file))}")
+
+        text_box_classes = {box.__name__: box for box in TextBox.__subclasses__()}
+
+        def _process(entry: dict[str, Any]) -> bool:
+            raw_path = path / entry["file"]
+            image_path = raw_path.with_suffix(JPG_FILE)
+            if not os.path.exists(raw_path):
+                return os.path.exists(image_path)
+
+            if not os.path.exists(image_path):
+                # save to a temporary file first, so an interrupted write never leaves a broken image.
+                # Its suffix is not JPG_FILE, so a leftover is never taken for a frame
+                temp_path = raw_path.with_name(f"{image_path.name}{PART_FILE_SUFFIX}")
+                with open(raw_path, "rb") as file:
+                    image = cls.render_image_with_weather_overlay(
+                        image_bytes=file.read(),
+                        width=entry["width"],
+                        height=entry["height"],
+                        date_time_text=entry["date_time_text"],
+                        weather_data_text=entry["weather_data_text"],
+                        text_box_position=text_box_classes.get(entry["text_box_position"]),
+                        text_box_transparency=entry["text_box_transparency"],
+                    )
+                saved, buffer = cv2.imencode(JPG_FILE, image) if image is not None else (False, None)
+                if not saved:
+                    logger.error(f"Could not process raw frame {shorten(str(raw_path))}, it is deleted")
+                    os.remove(raw_path)
+                    return False
+                with open(temp_path, "wb") as file:
+                    file.write(buffer.tobytes())
+                os.replace(temp_path, image_path)
+                if storage is not None:
+                    storage.store_frame(image_path)
+
+            os.remove(raw_path)
+            return True
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            processed = sum(executor.map(_process, entries))
+
+        os.remove(metadata_file)
+        logger.info(f"Processed {processed} of {len(entries)} raw frames in {shorten(str(path))}")
+        return processed
@@ -1,10 +1,24 @@
 from pathlib import Path
+from typing import Any, Callable, Generator, Iterable, Iterator
+import cv2
 from logging import Logger
+from threading import Lock, local
+from cv2.typing import MatLike
 
-from .text_box import TextBox
+from .encoders import EncoderSettings
+from .frame import Frame
+from .frame_manifest import FrameManifest
+from .text_box import TextBox, TextBoxCache
+from .worker_priority import WorkerPriority
+from .storage import StorageBackend
 
 
 class VideoManager:
+    text_box_cache: TextBoxCache
+    _canvas_buffers: local
+    _metadata_lock: Lock
+    @classmethod
+    def _get_canvas(cls, height: int, width: int) -> MatLike: ...
     @staticmethod
     def video_exists(path: str | Path) -> bool: ...
     @staticmethod
@@ -13,8 +27,66 @@ class VideoManager:
         path: str,
         output_video: str,
         fps: int,
+        encoder_settings: EncoderSettings | None = ...,
+        chunks: int = ...,
+        worker_priority: WorkerPriority | None = ...,
+        storage: StorageBackend | None = ...,
+    ) -> bool: ...
+    @staticmethod
+    def encode_images(
+        logger: Logger,
+        image_files: list[str],
+        output_video: str,
+        fps: int,
+        frame_size: tuple[int, int],
+        encoder_settings: EncoderSettings | None = ...,
+    ) -> int: ...
+    @staticmethod
+    def encode_in_chunks(
+        logger: Logger,
+        image_files: list[str],
+        output_video: str,
+        fps: int,
+        frame_size: tuple[int, int],
+        chunks: int,
+        encoder_settings: EncoderSettings | None = ...,
+        worker_priority: WorkerPriority | None = ...,
+    ) -> bool: ...
+    @staticmethod
+    def encode_packed_frames(
+        logger: Logger,
+        path: str | Path,
+        output_video: str,
+        fps: int,
+        encoder_settings: EncoderSettings | None = ...,
+    ) -> bool: ...
+    @staticmethod
+    def encode_mapped_frames(
+        logger: Logger,
+        path: str | Path,
+        output_video: str,
+        fps: int,
+        encoder_settings: EncoderSettings | None = ...,
     ) -> bool: ...
     @staticmethod
+    def encode_frame_stream(
+        logger: Logger,
+        path: str | Path,
+        images: Iterable[MatLike | None],
+        output_video: str,
+        fps: int,
+        encoder_settings: EncoderSettings | None = ...,
+    ) -> bool: ...
+    @staticmethod
+    def decode_packed_frame(frame: tuple[float, bytes]) -> MatLike | None: ...
+    @staticmethod
+    def read_images(
+        image_files: Iterable[Any],
+        read_ahead: int = ...,
+        workers: int = ...,
+        loader: Callable[[Any], MatLike | None] | None = ...,
+    ) -> Generator[tuple[Any, MatLike | None], None, None]: ...
+    @staticmethod
     def delete_source_media_files(
         logger: Logger,
         path: str | Path,
@@ -28,10 +100,87 @@ class VideoManager:
         video_paths: list[str],
         output_video_path: str,
         fps: int,
+        encoder_settings: EncoderSettings | None = ...,
+        frames_per_video: int | None = ...,
+        target_duration_seconds: float | None = ...,
+        storage: StorageBackend | None = ...,
     ) -> bool: ...
     @staticmethod
+    def get_frames_per_video(
+        videos_count: int,
+        fps: int,
+        frames_per_video: int | None = ...,
+        target_duration_seconds: float | None = ...,
+    ) -> int | None: ...
+    @staticmethod
+    def read_video_frames(cap: cv2.VideoCapture, frames_count: int | None = ...) -> Iterator[MatLike]: ...
+    @classmethod
+    def stitch_videos(
+        cls,
+        logger: Logger,
+        video_paths: list[str],
+        output_video_path: str,
+        fps: int,
+        encoder_settings: EncoderSettings | None = ...,
+    ) -> bool: ...
+    @classmethod
+    def transcode_video(
+        cls,
+        logger: Logger,
+        video_path: str,
+        output_video_path: str,
+        encoder_settings: EncoderSettings | None = ...,
+    ) -> bool: ...
+    @staticmethod
+    def get_video_parameters(video_path: str) -> tuple[int, int, int, float] | None: ...
+    @classmethod
+    def can_stream_copy(cls, video_paths: list[str], fps: int) -> bool: ...
+    @staticmethod
+    def _concat_videos(logger: Logger, ffmpeg: str, video_paths: list[str], output_video_path: str) -> bool: ...
+    @staticmethod
+    def decode_image(image: bytes | Frame, width: int, height: int) -> MatLike | None: ...
+    @classmethod
+    def render_image_with_weather_overlay(
+        cls,
+        image_bytes: bytes | Frame,
+        width: int,
+        height: int,
+        date_time_text: str = ...,
+        weather_data_text: str | None = ...,
+        text_box_position: type[TextBox] | None = ...,
+        text_box_transparency: float = ...,
+    ) -> MatLike | None: ...
+    @classmethod
     def save_image_with_weather_overlay(
-        image_bytes: bytes,
+        cls,
+        image_bytes: bytes | Frame,
+        save_path: str,
+        width: int,
+        height: int,
+        date_time_text: str = ...,
+        weather_data_text: str | None = ...,
+        text_box_position: type[TextBox] | None = ...,
+        text_box_transparency: float = ...,
+        storage: StorageBackend | None = ...,
+        manifest: FrameManifest | None = ...,
+    ) -> bool: ...
+    @classmethod
+    def save_raw_frame(
+        cls,
+        image_bytes: bytes | Frame,
+        save_path: str,
+        width: int,
+        height: int,
+        date_time_text: str = ...,
+        weather_data_text: str | None = ...,
+        text_box_position: type[TextBox] | None = ...,
+        text_box_transparency: float = ...,
+        manifest: FrameManifest | None = ...,
+    ) -> bool: ...
+    @classmethod
+    def save_packed_frame(
+        cls,
+        image_bytes: bytes | Frame,
         save_path: str,
         width: int,
         height: int,
@@ -39,4 +188,24 @@ class VideoManager:
         weather_data_text: str | None = ...,
         text_box_position: type[TextBox] | None = ...,
         text_box_transparency: float = ...,
-    ) -> bool: ...
\ No newline at end of file
+    ) -> bool: ...
+    @classmethod
+    def save_mapped_frame(
+        cls,
+        image_bytes: bytes | Frame,
+        save_path: str,
+        width: int,
+        height: int,
+        date_time_text: str = ...,
+        weather_data_text: str | None = ...,
+        text_box_position: type[TextBox] | None = ...,
+        text_box_transparency: float = ...,
+    ) -> bool: ...
+    @classmethod
+    def process_raw_frames(
+        cls,
+        logger: Logger,
+        path: str | Path,
+        workers: int | None = ...,
+        storage: StorageBackend | None = ...,
+    ) -> int: ...
@@ -0,0 +1,144 @@
+from __future__ import annotations
+import logging
+from datetime import datetime
+from logging import Logger
+from threading import Event, Lock, Thread
+from typing import NamedTuple
+from .common.constants import STALE_WEATHER_DATA_MARK
+from .weather_station_info import WeatherStationInfo
+
+
+class WeatherReading(NamedTuple):
+    """A snapshot of a weather station taken by the WeatherHub poller."""
+    text: str
+    station_time: datetime | None
+    fetched_at: datetime
+
+    @property
+    def stale(self) -> bool:
+        """True if the station record is older than OLD_TIMESTAMP_HOURS at the time of reading."""
+        return self.station_time is not None and WeatherStationInfo._is_old(self.station_time)
+
+
+class WeatherHub:
+    """
+    Shares the WeatherStationInfo providers between all sources of a TimeLapseCreator.
+
+    Providers are deduplicated by their url, so a weather station used by several cameras
+    is fetched only once per refresh interval. Every station is polled on its own cadence
+    (WeatherStationInfo.refresh_interval_seconds) by a background daemon thread and the
+    capture loop only reads the latest cached reading, so the request timeout of the
+    provider never blocks the collection of images.
+
+    The formats of the first registered provider for a given url are used for the text.
+    """
+
+    def __init__(self, logger: Logger | None = None) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self._providers: dict[str, WeatherStationInfo] = {}
+        self._readings: dict[str, WeatherReading] = {}
+        self._threads: dict[str, Thread] = {}
+        self._lock = Lock()
+        self._stop = Event()
+
+    @property
+    def stations_count(self) -> int:
+        """The number of unique weather stations polled by the hub."""
+        return len(self._providers)
+
+    def register(self, provider: WeatherStationInfo, start_polling: bool = True) -> WeatherStationInfo:
+        """
+        Registers a provider and starts polling its station in the background if the url
+        is not known yet.
+
+        Args:
+            provider: WeatherStationInfo - the provider of a source
+            start_polling: bool - start the background poller for a new station, defaults to True
+
+        Returns:
+            WeatherStationInfo - the provider which is actually polled for this url
+        """
+        with self._lock:
+            existing = self._providers.get(provider.url)
+            if existing is not None:
+                return existing
+
+            self._providers[provider.url] = provider
+            if start_polling and not self._stop.is_set():
+                thread = Thread(
+                    target=self._poll,
+                    args=(provider.url,),
+                    name=f"weather-hub-{len(self._threads)}",
+                    daemon=True,
+                )
+                self._threads[provider.url] = thread
+                thread.start()
+            return provider
+
+    def refresh(self, url: str) -> WeatherReading | None:
+        """
+        Fetches the data of a registered station and stores a new reading.
+
+        Returns:
+            WeatherReading | None - the new reading or None if the url is not registered
+        """
+        provider = self._providers.get(url)
+        if provider is None:
+            return None
+
+        try:
+            provider.get_data()
+        except Exception as exc:
+            self.logger.warning(f"Weather data for {url} could not be refreshed: {exc}")
+
+        reading = WeatherReading(
+            text=str(provider),
+            station_time=provider.last_updated,
+            fetched_at=datetime.now(),
+        )
+        self._readings[url] = reading
+        return reading
+
+    def reading(self, provider: WeatherStationInfo) -> WeatherReading | None:
+        """
+        Returns the latest cached reading for the provider's station without blocking.
+        The provider is registered on the first call.
+
+        Returns:
+            WeatherReading | None - None until the first refresh of the station completes
+        """
+        self.register(provider)
+        return self._readings.get(provider.url)
+
+    def weather_text(self, provider: WeatherStationInfo) -> str | None:
+        """
+        Returns the text for the images of a source. Stale readings are marked with
+        STALE_WEATHER_DATA_MARK.
+
+        Returns:
+            str | None - the text of the latest reading or None if there is no reading yet
+        """
+        reading = self.reading(provider)
+        if reading is None:
+            return None
+        if reading.stale:
+            return f"{reading.text} {STALE_WEATHER_DATA_MARK}"
+        return reading.text
+
+    def _poll(self, url: str) -> None:
+        """Refreshes the station until the hub is closed."""
+        provider = self._providers[url]
+        self.refresh(url)
+        while not self._stop.wait(max(1, provider.refresh_interval_seconds)):
+            self.refresh(url)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Stops all background pollers."""
+        self._stop.set()
+        for thread in self._threads.values():
+            thread.join(timeout)
+        self._threads.clear()
@@ -0,0 +1,23 @@
+from datetime import datetime
+from logging import Logger
+from typing import NamedTuple
+from .weather_station_info import WeatherStationInfo
+
+class WeatherReading(NamedTuple):
+    text: str
+    station_time: datetime | None
+    fetched_at: datetime
+    @property
+    def stale(self) -> bool: ...
+
+class WeatherHub:
+    logger: Logger
+    def __init__(self, logger: Logger | None = ...) -> None: ...
+    @property
+    def stations_count(self) -> int: ...
+    def register(self, provider: WeatherStationInfo, start_polling: bool = ...) -> WeatherStationInfo: ...
+    def refresh(self, url: str) -> WeatherReading | None: ...
+    def reading(self, provider: WeatherStationInfo) -> WeatherReading | None: ...
+    def weather_text(self, provider: WeatherStationInfo) -> str | None: ...
+    def _poll(self, url: str) -> None: ...
+    def close(self, timeout: float | None = ...) -> None: ...
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from typing import Any
-from .common.constants import OLD_TIMESTAMP_HOURS
+from .common.constants import OLD_TIMESTAMP_HOURS, DEFAULT_WEATHER_REFRESH_SECONDS
 
 import requests
 
@@ -25,7 +25,11 @@ class WeatherStationInfo(ABC):
     """
 
     def __init__(
-        self, url: str, temperature_format: str = "C", wind_speed_format: str = "m/s"
+        self,
+        url: str,
+        temperature_format: str = "C",
+        wind_speed_format: str = "m/s",
+        refresh_interval_seconds: int = DEFAULT_WEATHER_REFRESH_SECONDS,
     ) -> None:
         """
         Initialize the weather station info object with a data source URL.
@@ -36,10 +40,14 @@ class WeatherStationInfo(ABC):
             url: str - The URL from which weather data will be fetched.
             temperature_format: str - Celsius or Fahrenheit, defaults to "C",
             wind_speed_format: str - m/s or km/h, defaults to "m/s"
+            refresh_interval_seconds: int - how often the station is polled in the background
+                by the WeatherHub, defaults to DEFAULT_WEATHER_REFRESH_SECONDS
         """
         self.url = url
         self.temp_format = temperature_format
         self.wind_speed_format = wind_speed_format
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.last_updated: datetime | None = None
         self._temperature: float | None = None
         self._wind_speed_avg: float | None = None
         self._wind_speed_gust: float | None = None
@@ -50,6 +58,11 @@ class WeatherStationInfo(ABC):
         """Fetches weather data from the specified URL and sets the internal properties."""
         pass
 
+    @staticmethod
+    def _is_old(time_stamp: datetime) -> bool:
+        """Checks if a station record timestamp is older than OLD_TIMESTAMP_HOURS."""
+        return datetime.now() - time_stamp >= timedelta(hours=OLD_TIMESTAMP_HOURS)
+
     @property
     def temperature(self) -> float | None:
         """Returns the temperature in degrees Celsius."""
@@ -169,13 +182,13 @@ class MeteoRocks(WeatherStationInfo):
             stamp = data.get("timestamp")
             assert stamp
             time_stamp = datetime.fromtimestamp(float(stamp))
-            last_record = datetime.now() - time_stamp
 
-            if last_record < timedelta(hours=OLD_TIMESTAMP_HOURS):
+            if not self._is_old(time_stamp):
                 self.temperature = data.get("temp")
                 self.wind_speed_avg = data.get("windspeed_average")
                 self.wind_speed_gust = data.get("windspeed_gust")
                 self.wind_direction = data.get("winddirection")
+                self.last_updated = time_stamp
 
         except (requests.RequestException, ValueError) as e:
             print(f"Failed to fetch weather data: {e}")
@@ -1,14 +1,23 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 class WeatherStationInfo(ABC):
     url: str
     temp_format: str
     wind_speed_format: str
+    refresh_interval_seconds: int
+    last_updated: datetime | None
     def __init__(
-        self, url: str, temperature_format: str = ..., wind_speed_format: str = ...
+        self,
+        url: str,
+        temperature_format: str = ...,
+        wind_speed_format: str = ...,
+        refresh_interval_seconds: int = ...,
     ) -> None: ...
     @abstractmethod
     def get_data(self) -> None: ...
+    @staticmethod
+    def _is_old(time_stamp: datetime) -> bool: ...
     @property
     def temperature(self) -> float | None: ...
     @temperature.setter
@@ -0,0 +1,122 @@
+from __future__ import annotations
+import cv2
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from logging import Logger
+from queue import Queue
+from typing import Any, NamedTuple
+from .common.constants import DEFAULT_WORKER_NICE, IONICE_EXECUTABLE
+from .common.logger import configure_worker_logger
+
+
+class WorkerPriority(NamedTuple):
+    """
+    The scheduling settings of the workers which create the videos, so they don't delay
+    the capture of the images.
+
+    Attributes:
+        nice: int | None - the niceness of the workers (0-19, higher is lower priority), defaults to DEFAULT_WORKER_NICE
+        io_class: int | None - the I/O scheduling class (1 realtime, 2 best-effort, 3 idle), defaults to None (unchanged)
+        io_level: int | None - the priority within the best-effort class (0-7, higher is lower priority)
+        cpu_affinity: tuple[int, ...] | None - the CPUs of the workers, defaults to None (all CPUs but the reserved)
+        reserved_cores: int - the number of the first CPUs which are left for the capture loop, defaults to 0
+        opencv_threads: int | None - the maximum number of OpenCV threads in a worker process, defaults to None (unchanged)
+    """
+    nice: int | None = DEFAULT_WORKER_NICE
+    io_class: int | None = None
+    io_level: int | None = None
+    cpu_affinity: tuple[int, ...] | None = None
+    reserved_cores: int = 0
+    opencv_threads: int | None = None
+
+    def worker_cpus(self) -> set[int] | None:
+        """
+        Returns the CPUs the workers may run on or None if the affinity should not be changed.
+        The reserved cores are removed from the CPUs, unless no CPU would be left.
+        """
+        if not hasattr(os, "sched_getaffinity") or (self.cpu_affinity is None and self.reserved_cores <= 0):
+            return None
+
+        cpus = sorted(self.cpu_affinity if self.cpu_affinity is not None else os.sched_getaffinity(0))
+        if len(cpus) > self.reserved_cores > 0:
+            cpus = cpus[self.reserved_cores:]
+        return set(cpus)
+
+
+def apply_worker_priority(
+    priority: WorkerPriority | None,
+    process_wide: bool = True,
+    logger: Logger | None = None,
+) -> None:
+    """
+    Applies the priority to the calling thread, e.g. as the initializer of a worker pool.
+    The threads started later by the worker inherit the niceness and the CPU affinity.
+
+    The settings are applied to the calling thread only (Linux schedules threads separately), so
+    a worker thread of the capture process does not lower the priority of the capture loop.
+    The number of OpenCV threads is global for a process and is set only if process_wide is True - the
+    capture process sets it once when it starts. The thread pool of OpenCV is shared by the threads of a
+    process, so only in a worker process the OpenCV threads run with the priority of the worker.
+    Settings which are not supported by the platform or not permitted are skipped with a warning.
+
+    Args:
+        priority: WorkerPriority | None - the settings, None does nothing
+        process_wide: bool - the caller is a worker process (not a thread of the capture process), defaults to True
+        logger: Logger | None - the logger for the warnings
+    """
+    if priority is None:
+        return
+    logger = logger or logging.getLogger(__name__)
+    thread_id = threading.get_native_id()
+
+    if priority.nice is not None and hasattr(os, "setpriority"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, thread_id, priority.nice)
+        except OSError as exc:
+            logger.warning(f"Could not set the niceness of the worker to {priority.nice}: {exc}")
+
+    cpus = priority.worker_cpus()
+    if cpus is not None:
+        try:
+            os.sched_setaffinity(thread_id, cpus)
+        except OSError as exc:
+            logger.warning(f"Could not set the CPU affinity of the worker to {sorted(cpus)}: {exc}")
+
+    if priority.io_class is not None:
+        ionice = shutil.which(IONICE_EXECUTABLE)
+        if ionice is None:
+            logger.warning(f"{IONICE_EXECUTABLE} was not found, the I/O priority of the worker is not changed")
+        else:
+            command = [ionice, "-c", str(priority.io_class)]
+            if priority.io_level is not None:
+                command += ["-n", str(priority.io_level)]
+            result = subprocess.run(command + ["-p", str(thread_id)], capture_output=True, text=True)
+            if result.returncode != 0:
+                logger.warning(f"Could not set the I/O priority of the worker: {result.stderr.strip()}")
+
+    if process_wide and priority.opencv_threads is not None:
+        cv2.setNumThreads(priority.opencv_threads)
+
+
+def initialize_worker_process(
+    priority: WorkerPriority | None,
+    log_queue: Queue[Any] | None = None,
+    logger_name: str | None = None,
+) -> None:
+    """
+    The initializer of the video worker processes. Applies the priority and, if a log_queue is
+    given, sends the records of the logger_name logger to it, so the logs of the workers reach
+    the log listener of the parent with any start method (fork, spawn or forkserver).
+
+    Args:
+        priority: WorkerPriority | None - the settings of the worker, None leaves them unchanged
+        log_queue: Queue[Any] | None - a multiprocessing queue of the log listener
+        logger_name: str | None - the name of the logger which is passed to the jobs
+    """
+    logger = None
+    if log_queue is not None and logger_name is not None:
+        logger = configure_worker_logger(log_queue, logger_name)
+    apply_worker_priority(priority, logger=logger)
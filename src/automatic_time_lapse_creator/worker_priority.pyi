@@ -0,0 +1,24 @@
+from logging import Logger
+from queue import Queue
+from typing import Any, NamedTuple
+
+class WorkerPriority(NamedTuple):
+    nice: int | None = ...
+    io_class: int | None = ...
+    io_level: int | None = ...
+    cpu_affinity: tuple[int, ...] | None = ...
+    reserved_cores: int = ...
+    opencv_threads: int | None = ...
+    def worker_cpus(self) -> set[int] | None: ...
+
+def apply_worker_priority(
+    priority: WorkerPriority | None,
+    process_wide: bool = ...,
+    logger: Logger | None = ...,
+) -> None: ...
+
+def initialize_worker_process(
+    priority: WorkerPriority | None,
+    log_queue: Queue[Any] | None = ...,
+    logger_name: str | None = ...,
+) -> None: ...
@@ -0,0 +1,117 @@
+import os
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+from src.automatic_time_lapse_creator.common.constants import (
+    JPG_FILE,
+    MAPPED_FRAMES_DIR,
+    MP4_FILE,
+    PACKED_FRAMES_FILE,
+    TRASH_DIR,
+)
+from src.automatic_time_lapse_creator.deletion_service import DeletionService
+from src.automatic_time_lapse_creator.frame_manifest import FrameManifest
+
+
+def test_delete_folder_moves_the_folder_to_the_trash_and_deletes_it(tmp_path: Path):
+    # Arrange
+    folder = tmp_path / "2025-01-01"
+    (folder / "nested").mkdir(parents=True)
+    for index in range(5):
+        (folder / f"{index}{JPG_FILE}").write_bytes(b"12345")
+    (folder / "nested" / f"video{MP4_FILE}").write_bytes(b"123")
+    service = DeletionService(tmp_path, batch_size=2)
+
+    # Act
+    deleted = service.delete_folder(folder)
+    moved = not folder.exists()
+    finished = service.wait(5)
+    service.close(5)
+
+    # Assert
+    assert deleted and moved and finished
+    assert not service.delete_folder(folder)
+    assert service.stats == (6, 2, 28, 0)
+    assert list((tmp_path / TRASH_DIR).iterdir()) == []
+
+
+def test_delete_media_files_keeps_the_other_files_and_the_files_saved_later(tmp_path: Path):
+    # Arrange
+    (tmp_path / f"a{JPG_FILE}").write_bytes(b"a")
+    (tmp_path / f"video{MP4_FILE}").write_bytes(b"video")
+    later = tmp_path / f"b{JPG_FILE}"
+    later.write_bytes(b"b")
+    os.utime(later, (time.time() + 60, time.time() + 60))
+    service = DeletionService(tmp_path)
+
+    # Act
+    service.delete_media_files(tmp_path, JPG_FILE, delete_folder=True)
+    service.wait(5)
+    service.close(5)
+
+    # Assert
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"b{JPG_FILE}", f"video{MP4_FILE}"]
+    assert service.stats.files == 1
+    assert service.stats.folders == 0
+
+
+def test_delete_media_files_detaches_the_manifest_and_the_frame_stores(tmp_path: Path):
+    # Arrange
+    folder = tmp_path / "day"
+    (folder / MAPPED_FRAMES_DIR).mkdir(parents=True)
+    (folder / MAPPED_FRAMES_DIR / "segment_000.npy").write_bytes(b"frames")
+    (folder / PACKED_FRAMES_FILE).write_bytes(b"pack")
+    (folder / f"a{JPG_FILE}").write_bytes(b"a")
+    FrameManifest(folder).append(folder / f"a{JPG_FILE}")
+    logger = MagicMock()
+    service = DeletionService(tmp_path, logger=logger)
+
+    # Act
+    service.delete_media_files(folder, delete_folder=True)
+    detached = not FrameManifest.exists(folder) and not (folder / PACKED_FRAMES_FILE).exists()
+    service.wait(5)
+    service.close(5)
+
+    # Assert
+    assert detached
+    assert not folder.exists()
+    assert service.stats.files == 3
+    assert service.stats.bytes_freed == len(b"framespacka")
+    logger.info.assert_called_once()
+
+
+def test_the_trash_left_by_a_stopped_service_is_deleted_on_start(tmp_path: Path):
+    # Arrange
+    (tmp_path / TRASH_DIR / "old").mkdir(parents=True)
+    (tmp_path / TRASH_DIR / "old" / f"a{JPG_FILE}").write_bytes(b"a")
+
+    # Act
+    service = DeletionService(tmp_path)
+    service.wait(5)
+    service.close(5)
+
+    # Assert
+    assert service.pending == 0
+    assert list((tmp_path / TRASH_DIR).iterdir()) == []
+    assert service.stats.files == 1
+
+
+def test_close_finishes_the_requested_deletions(tmp_path: Path):
+    # Arrange
+    folders = [tmp_path / f"2025-01-0{day}" for day in range(1, 4)]
+    for folder in folders:
+        folder.mkdir()
+        for index in range(3):
+            (folder / f"{index}{JPG_FILE}").write_bytes(b"a")
+            FrameManifest(folder).append(folder / f"{index}{JPG_FILE}")
+    service = DeletionService(tmp_path, batch_size=1, pause=0.01)
+
+    # Act
+    for folder in folders:
+        service.delete_media_files(folder, delete_folder=True)
+    service.close()
+
+    # Assert
+    assert service.pending == 0
+    assert [folder for folder in folders if folder.exists()] == []
+    assert service.stats.files == 3 * 3
@@ -0,0 +1,200 @@
+import cv2
+import numpy as np
+import pytest
+from logging import Logger
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.automatic_time_lapse_creator.common.constants import MP4_FILE
+from src.automatic_time_lapse_creator.encoders import (
+    EncoderBackend,
+    EncoderSettings,
+    FFmpegPipeEncoder,
+    OpenCVEncoder,
+    PyAVEncoder,
+    create_encoder,
+)
+
+
+@pytest.fixture
+def mock_logger():
+    return MagicMock(spec=Logger)
+
+
+def test_opencv_encoder_writes_a_readable_video(tmp_path: Path):
+    # Arrange
+    output_video = str(tmp_path / f"video{MP4_FILE}")
+    encoder = create_encoder(output_video, 10, (96, 64))
+
+    # Act
+    for _ in range(3):
+        encoder.write(np.zeros((64, 96, 3), dtype=np.uint8))
+    result = encoder.release()
+
+    # Assert
+    assert isinstance(encoder, OpenCVEncoder)
+    assert result
+    cap = cv2.VideoCapture(output_video)
+    assert cap.get(cv2.CAP_PROP_FRAME_COUNT) == 3
+    cap.release()
+
+
+def test_build_command_uses_crf_before_bitrate():
+    # Arrange
+    settings = EncoderSettings(
+        backend=EncoderBackend.FFMPEG, codec="libx265", crf=28, bitrate="2M", preset="fast", threads=4
+    )
+
+    # Act
+    command = FFmpegPipeEncoder.build_command("ffmpeg", "out.mp4", 30, (640, 360), settings)
+
+    # Assert
+    assert command[command.index("-c:v") + 1] == "libx265"
+    assert command[command.index("-crf") + 1] == "28"
+    assert "-b:v" not in command
+    assert command[command.index("-preset") + 1] == "fast"
+    assert command[command.index("-threads") + 1] == "4"
+    assert command[command.index("-s") + 1] == "640x360"
+    assert command[-1] == "out.mp4"
+
+
+def test_build_command_uses_bitrate_and_default_codec():
+    # Arrange
+    settings = EncoderSettings(backend=EncoderBackend.FFMPEG, bitrate="2M")
+
+    # Act
+    command = FFmpegPipeEncoder.build_command("ffmpeg", "out.mp4", 30, (640, 360), settings)
+
+    # Assert
+    assert command[command.index("-c:v") + 1] == "libx264"
+    assert command[command.index("-b:v") + 1] == "2M"
+    assert "-crf" not in command
+    assert "-preset" not in command
+
+
+def test_ffmpeg_pipe_encoder_pipes_raw_frames():
+    # Arrange
+    settings = EncoderSettings(backend=EncoderBackend.FFMPEG)
+    mock_process = MagicMock()
+    mock_process.communicate.return_value = (b"", b"")
+    mock_process.returncode = 0
+    frame = np.zeros((360, 640, 3), dtype=np.uint8)
+
+    with patch("subprocess.Popen", return_value=mock_process):
+        encoder = FFmpegPipeEncoder("out.mp4", 30, (640, 360), settings, ffmpeg="ffmpeg")
+
+        # Act
+        encoder.write(frame)
+        result = encoder.release()
+
+    # Assert
+    assert result
+    mock_process.stdin.write.assert_called_once_with(frame.tobytes())
+
+
+def test_ffmpeg_pipe_encoder_release_returns_False_if_ffmpeg_fails():
+    # Arrange
+    mock_process = MagicMock()
+    mock_process.communicate.return_value = (b"", b"Unknown encoder")
+    mock_process.returncode = 1
+
+    with patch("subprocess.Popen", return_value=mock_process):
+        encoder = FFmpegPipeEncoder(
+            "out.mp4", 30, (640, 360), EncoderSettings(backend=EncoderBackend.FFMPEG), ffmpeg="ffmpeg"
+        )
+
+        # Act & Assert
+        assert not encoder.release()
+
+
+def test_ffmpeg_pipe_encoder_logs_the_error_to_its_logger(mock_logger: MagicMock):
+    # Arrange
+    mock_process = MagicMock()
+    mock_process.communicate.return_value = (b"", b"Unknown encoder")
+    mock_process.returncode = 1
+
+    with patch("subprocess.Popen", return_value=mock_process):
+        encoder = FFmpegPipeEncoder(
+            "out.mp4", 30, (640, 360), EncoderSettings(backend=EncoderBackend.FFMPEG), mock_logger, ffmpeg="ffmpeg"
+        )
+
+        # Act
+        encoder.release()
+
+    # Assert
+    mock_logger.error.assert_called_once()
+
+
+def test_encoder_is_aborted_if_the_with_block_fails(tmp_path: Path):
+    # Arrange
+    output_video = tmp_path / f"video{MP4_FILE}"
+    output_video.write_bytes(b"truncated")
+    mock_process = MagicMock()
+    mock_process.communicate.return_value = (b"", b"")
+
+    with patch("subprocess.Popen", return_value=mock_process):
+        # Act
+        with pytest.raises(RuntimeError):
+            with FFmpegPipeEncoder(
+                str(output_video), 30, (640, 360), EncoderSettings(backend=EncoderBackend.FFMPEG), ffmpeg="ffmpeg"
+            ):
+                raise RuntimeError("boom")
+
+    # Assert
+    mock_process.kill.assert_called_once()
+    assert not output_video.exists()
+
+
+def test_create_encoder_falls_back_to_opencv_without_ffmpeg(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    settings = EncoderSettings(backend=EncoderBackend.FFMPEG, codec="libx264")
+
+    with patch("src.automatic_time_lapse_creator.encoders.find_ffmpeg", return_value=None):
+        # Act
+        encoder = create_encoder(str(tmp_path / f"video{MP4_FILE}"), 10, (96, 64), settings, mock_logger)
+
+    # Assert
+    assert isinstance(encoder, OpenCVEncoder)
+    mock_logger.warning.assert_called_once()
+    encoder.release()
+
+
+def test_create_encoder_falls_back_to_opencv_without_pyav(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    settings = EncoderSettings(backend=EncoderBackend.PYAV)
+
+    with patch("src.automatic_time_lapse_creator.encoders.av", None):
+        # Act
+        encoder = create_encoder(str(tmp_path / f"video{MP4_FILE}"), 10, (96, 64), settings, mock_logger)
+
+    # Assert
+    assert isinstance(encoder, OpenCVEncoder)
+    mock_logger.warning.assert_called_once()
+    encoder.release()
+
+
+@pytest.mark.parametrize("bitrate, expected", [("2500k", 2_500_000), ("2M", 2_000_000), ("800000", 800_000)])
+def test_parse_bitrate(bitrate: str, expected: int):
+    # Act & Assert
+    assert PyAVEncoder.parse_bitrate(bitrate) == expected
+
+
+def test_pyav_encoder_pads_odd_sized_frames_to_the_size_of_the_stream(tmp_path: Path):
+    # Arrange
+    settings = EncoderSettings(backend=EncoderBackend.PYAV)
+
+    with patch("src.automatic_time_lapse_creator.encoders.av") as mock_av:
+        mock_stream = mock_av.open.return_value.add_stream.return_value
+        mock_stream.encode.return_value = []
+        encoder = PyAVEncoder(str(tmp_path / f"video{MP4_FILE}"), 10, (63, 35), settings)
+
+        # Act
+        encoder.write(np.full((35, 63, 3), 255, dtype=np.uint8))
+
+    # Assert
+    assert (mock_stream.width, mock_stream.height) == (64, 36)
+    padded_frame = mock_av.VideoFrame.from_ndarray.call_args.args[0]
+    assert padded_frame.shape == (36, 64, 3)
+    assert padded_frame[:35, :63].min() == 255
+    assert padded_frame[35:, :].max() == 0
+    assert padded_frame[:, 63:].max() == 0
@@ -0,0 +1,188 @@
+import cv2
+import numpy as np
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.automatic_time_lapse_creator.common.constants import (
+    VIDEO_WIDTH_360p,
+    VIDEO_HEIGHT_360p,
+)
+from src.automatic_time_lapse_creator.frame import Frame
+
+
+def _encode(width: int, height: int, brightness: int = 0, ext: str = ".jpg") -> bytes:
+    _, buffer = cv2.imencode(ext, np.full((height, width, 3), brightness, dtype=np.uint8))
+    return buffer.tobytes()
+
+
+def test_frame_requires_encoded_bytes_or_image():
+    # Act & Assert
+    with pytest.raises(ValueError):
+        Frame()
+
+
+def test_frame_keeps_capture_metadata():
+    # Arrange
+    captured_at = datetime(2025, 1, 1, 12, 0, 0)
+
+    # Act
+    frame = Frame(encoded=b"bytes", source_name="fake", captured_at=captured_at)
+
+    # Assert
+    assert frame.source_name == "fake"
+    assert frame.captured_at == captured_at
+
+
+@pytest.mark.parametrize(
+    "source_size, expected_flag",
+    [
+        ((3840, 2160), cv2.IMREAD_REDUCED_COLOR_4),
+        ((1920, 1080), cv2.IMREAD_REDUCED_COLOR_2),
+        ((1280, 720), cv2.IMREAD_REDUCED_COLOR_2),
+        ((1080, 1920), cv2.IMREAD_REDUCED_COLOR_2),
+        ((1000, 700), cv2.IMREAD_COLOR),
+    ],
+)
+def test_get_imread_flag_chooses_the_largest_reduction_above_the_target_size(
+    source_size: tuple[int, int], expected_flag: int
+):
+    # Arrange
+    width, height = source_size
+
+    # Act
+    result = Frame.get_imread_flag(_encode(width, height), VIDEO_WIDTH_360p, VIDEO_HEIGHT_360p)
+
+    # Assert
+    assert result == expected_flag
+
+
+def test_get_imread_flag_returns_full_decode_for_non_jpeg_images():
+    # Arrange
+    image_bytes = _encode(3840, 2160, ext=".png")
+
+    # Act & Assert
+    assert Frame.get_imread_flag(image_bytes, VIDEO_WIDTH_360p, VIDEO_HEIGHT_360p) == cv2.IMREAD_COLOR
+
+
+def test_image_for_size_decodes_only_once():
+    # Arrange
+    frame = Frame(encoded=_encode(1920, 1080, 100))
+
+    # Act
+    with patch("cv2.imdecode", wraps=cv2.imdecode) as mock_imdecode:
+        first = frame.image_for_size(VIDEO_WIDTH_360p, VIDEO_HEIGHT_360p)
+        second = frame.image_for_size(VIDEO_WIDTH_360p, VIDEO_HEIGHT_360p)
+
+    # Assert
+    assert first is second
+    assert first is not None
+    assert first.shape == (540, 960, 3)
+    mock_imdecode.assert_called_once()
+
+
+def test_image_for_size_reuses_the_full_image():
+    # Arrange
+    image = np.full((1080, 1920, 3), 100, dtype=np.uint8)
+    frame = Frame(image=image)
+
+    # Act & Assert
+    assert frame.image_for_size(VIDEO_WIDTH_360p, VIDEO_HEIGHT_360p) is image
+    assert frame.image is image
+
+
+def test_encoded_is_created_lazily_from_the_image():
+    # Arrange
+    frame = Frame(image=np.full((90, 160, 3), 100, dtype=np.uint8))
+
+    # Act
+    with patch("cv2.imencode", wraps=cv2.imencode) as mock_imencode:
+        first = frame.encoded
+        second = frame.encoded
+
+    # Assert
+    assert first is second
+    assert first is not None
+    assert first[:2] == b"\xff\xd8"
+    mock_imencode.assert_called_once()
+
+
+def test_encoded_returns_None_if_the_image_cannot_be_encoded():
+    # Arrange
+    frame = Frame(image=np.zeros((90, 160, 3), dtype=np.uint8))
+
+    # Act
+    with patch("cv2.imencode", return_value=(False, None)):
+        result = frame.encoded
+
+    # Assert
+    assert result is None
+
+
+def test_thumbnail_and_brightness_are_computed_from_the_encoded_bytes():
+    # Arrange
+    frame = Frame(encoded=_encode(160, 80, 128))
+
+    # Act
+    thumbnail = frame.thumbnail
+    brightness = frame.brightness
+
+    # Assert
+    assert thumbnail is not None
+    assert thumbnail.shape == (10, 20)
+    assert brightness is not None
+    assert abs(brightness - 128) <= 2
+    assert frame.thumbnail is thumbnail
+
+
+def test_brightness_reuses_the_colour_decode_for_the_target_size():
+    # Arrange
+    frame = Frame(encoded=_encode(1280, 720, 128), target_size=(VIDEO_WIDTH_360p, VIDEO_HEIGHT_360p))
+
+    # Act
+    with patch("cv2.imdecode", wraps=cv2.imdecode) as mock_imdecode:
+        brightness = frame.brightness
+        image = frame.image_for_size(VIDEO_WIDTH_360p, VIDEO_HEIGHT_360p)
+
+    # Assert
+    assert brightness is not None
+    assert abs(brightness - 128) <= 2
+    assert image is not None
+    assert image.shape == (360, 640, 3)
+    mock_imdecode.assert_called_once()
+    assert mock_imdecode.call_args.args[1] == cv2.IMREAD_REDUCED_COLOR_2
+
+
+def test_brightness_of_a_decoded_image_does_not_encode_it():
+    # Arrange
+    frame = Frame(image=np.full((90, 160, 3), 50, dtype=np.uint8))
+
+    # Act
+    with patch("cv2.imencode") as mock_imencode:
+        brightness = frame.brightness
+
+    # Assert
+    assert brightness == pytest.approx(50)
+    mock_imencode.assert_not_called()
+
+
+def test_brightness_is_None_for_invalid_bytes():
+    # Arrange
+    frame = Frame(encoded=b"invalid_bytes")
+
+    # Act & Assert
+    assert frame.brightness is None
+    assert frame.image is None
+
+
+def test_size_is_read_from_the_jpeg_header():
+    # Arrange
+    frame = Frame(encoded=_encode(160, 90))
+
+    # Act
+    with patch("cv2.imdecode") as mock_imdecode:
+        result = frame.size
+
+    # Assert
+    assert result == (160, 90)
+    mock_imdecode.assert_not_called()
@@ -0,0 +1,75 @@
+from datetime import datetime as dt
+from pathlib import Path
+from src.automatic_time_lapse_creator.common.constants import FRAMES_MANIFEST_FILE, JPG_FILE, RAW_FILE
+from src.automatic_time_lapse_creator.frame_manifest import FrameManifest
+
+
+def test_append_records_the_saved_frames(tmp_path: Path):
+    # Arrange
+    manifest = FrameManifest(tmp_path)
+    (tmp_path / f"12_00_10{JPG_FILE}").write_bytes(b"second")
+    (tmp_path / f"12_00_00{JPG_FILE}").write_bytes(b"first frame")
+
+    # Act
+    appended = [
+        manifest.append(tmp_path / f"12_00_10{JPG_FILE}", dt(2025, 1, 1, 12, 0, 10)),
+        manifest.append(tmp_path / f"12_00_00{JPG_FILE}", dt(2025, 1, 1, 12, 0, 0)),
+        manifest.append(tmp_path / f"12_00_20{JPG_FILE}"),
+    ]
+    entries = manifest.entries()
+
+    # Assert
+    assert appended == [True, True, False]
+    assert FrameManifest.exists(tmp_path)
+    assert [entry.file for entry in entries] == [f"12_00_00{JPG_FILE}", f"12_00_10{JPG_FILE}"]
+    assert entries[0].captured_at == "2025-01-01T12:00:00"
+    assert entries[0].size == len(b"first frame")
+    assert all(manifest.verify(entry) for entry in entries)
+    assert manifest.frame_files() == [str(tmp_path / entry.file) for entry in entries]
+
+
+def test_entries_skips_lines_cut_by_a_crash_and_duplicates(tmp_path: Path):
+    # Arrange
+    (tmp_path / FRAMES_MANIFEST_FILE).write_text(
+        f"a{RAW_FILE}\t2025-01-01T12:00:00\t3\thash\n"
+        f"a{RAW_FILE}\t2025-01-01T12:00:00\t4\thash2\n"
+        f"b{RAW_FILE}\t2025-01-01T12:00:10\t3"
+    )
+    manifest = FrameManifest(tmp_path)
+
+    # Act
+    entries = manifest.entries()
+
+    # Assert
+    assert len(entries) == 1
+    assert entries[0].size == 4
+    assert manifest.frame_files(JPG_FILE) == [str(tmp_path / f"a{JPG_FILE}")]
+    assert not manifest.verify(entries[0])
+
+
+def test_remove_deletes_the_manifest(tmp_path: Path):
+    # Arrange
+    (tmp_path / f"a{JPG_FILE}").write_bytes(b"a")
+    manifest = FrameManifest(tmp_path)
+    manifest.append(tmp_path / f"a{JPG_FILE}")
+
+    # Act
+    manifest.remove()
+    manifest.remove()
+
+    # Assert
+    assert not FrameManifest.exists(tmp_path)
+    assert manifest.entries() == []
+
+
+def test_append_lists_the_given_bytes_without_reading_the_file(tmp_path: Path):
+    # Arrange
+    manifest = FrameManifest(tmp_path)
+
+    # Act
+    appended = manifest.append(tmp_path / f"12_00_00{JPG_FILE}", dt(2025, 1, 1, 12), data=b"encoded")
+
+    # Assert
+    assert appended
+    assert manifest.entries()[0].size == len(b"encoded")
+    assert not (tmp_path / f"12_00_00{JPG_FILE}").exists()
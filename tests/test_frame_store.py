@@ -0,0 +1,129 @@
+from datetime import datetime as dt
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+from src.automatic_time_lapse_creator.common.constants import PACKED_FRAMES_FILE
+from src.automatic_time_lapse_creator.frame_store import MappedFrameStore, PackedFrameStore
+
+
+def test_append_streams_and_reads_frames_by_time(tmp_path: Path):
+    # Arrange
+    store = PackedFrameStore(tmp_path)
+    frames = [(dt(2025, 1, 1, 12, 0, second), bytes([second]) * (second + 1)) for second in (0, 10, 20)]
+
+    # Act
+    for captured_at, data in frames:
+        store.append(data, captured_at)
+    reopened = PackedFrameStore(tmp_path)
+
+    # Assert
+    assert PackedFrameStore.exists(tmp_path)
+    assert len(reopened) == 3
+    assert [data for _, data in reopened.read_frames()] == [data for _, data in frames]
+    assert reopened.read_at(dt(2025, 1, 1, 12, 0, 15)) == frames[1][1]
+    assert reopened.read_at(dt(2025, 1, 1, 12, 0, 20)) == frames[2][1]
+    assert reopened.read_at(dt(2025, 1, 1, 11, 59, 59)) is None
+
+
+def test_a_record_cut_by_a_crash_is_ignored_and_truncated(tmp_path: Path):
+    # Arrange
+    store = PackedFrameStore(tmp_path)
+    store.append(b"complete")
+    with open(tmp_path / PACKED_FRAMES_FILE, "ab") as file:
+        file.write(b"\x10\x00\x00\x00cut")
+    PackedFrameStore._repaired.discard(str(store.path))
+
+    # Act
+    frames_before_repair = [data for _, data in PackedFrameStore(tmp_path).read_frames()]
+    PackedFrameStore(tmp_path).append(b"next")
+
+    # Assert
+    assert frames_before_repair == [b"complete"]
+    assert [data for _, data in PackedFrameStore(tmp_path).read_frames()] == [b"complete", b"next"]
+
+
+def test_delete_removes_all_frames_with_a_single_unlink(tmp_path: Path):
+    # Arrange
+    store = PackedFrameStore(tmp_path)
+    store.append(b"frame")
+    size = store.size()
+
+    # Act
+    freed = store.delete()
+
+    # Assert
+    assert freed == size > 0
+    assert not PackedFrameStore.exists(tmp_path)
+    assert len(store) == 0
+    assert store.delete() == 0
+
+
+def test_mapped_frames_fill_the_segments_and_are_read_by_time(tmp_path: Path):
+    # Arrange
+    store = MappedFrameStore(tmp_path, frames_per_segment=2)
+    frames = [(dt(2025, 1, 1, 12, 0, second), np.full((4, 6, 3), second, dtype=np.uint8)) for second in (0, 10, 20)]
+
+    # Act
+    appended = [store.append(image, captured_at) for captured_at, image in frames]
+    rejected = store.append(np.zeros((2, 2, 3), dtype=np.uint8))
+    reopened = MappedFrameStore(tmp_path)
+
+    # Assert
+    assert appended == [True, True, True] and not rejected
+    assert MappedFrameStore.exists(tmp_path)
+    assert len(store.segments()) == 2
+    assert len(reopened) == 3
+    assert [int(image[0, 0, 0]) for _, image in reopened.read_frames()] == [0, 10, 20]
+    assert int(reopened.read_at(dt(2025, 1, 1, 12, 0, 15))[0, 0, 0]) == 10
+    assert reopened.read_at(dt(2025, 1, 1, 11, 59, 59)) is None
+
+
+def test_delete_removes_the_mapped_frames(tmp_path: Path):
+    # Arrange
+    store = MappedFrameStore(tmp_path)
+    store.append(np.ones((4, 6, 3), dtype=np.uint8))
+
+    # Act
+    freed = store.delete()
+
+    # Assert
+    assert freed > 0
+    assert not MappedFrameStore.exists(tmp_path)
+    assert len(store) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_mapped_frames_are_appended_without_reloading_the_segment(tmp_path: Path):
+    # Arrange
+    store = MappedFrameStore(tmp_path, frames_per_segment=2)
+    store.append(np.zeros((4, 6, 3), dtype=np.uint8), dt(2025, 1, 1, 12, 0, 0))
+
+    # Act
+    with patch("src.automatic_time_lapse_creator.frame_store.np.load") as mock_load:
+        appended = [
+            MappedFrameStore(tmp_path, frames_per_segment=2).append(
+                np.full((4, 6, 3), second, dtype=np.uint8), dt(2025, 1, 1, 12, 0, second)
+            )
+            for second in (10, 20)
+        ]
+
+    # Assert
+    assert appended == [True, True]
+    mock_load.assert_not_called()
+    assert len(store.segments()) == 2
+    assert [int(image[0, 0, 0]) for _, image in store.read_frames()] == [0, 10, 20]
+
+
+def test_read_at_returns_a_copy_of_the_mapped_frame(tmp_path: Path):
+    # Arrange
+    store = MappedFrameStore(tmp_path)
+    store.append(np.full((4, 6, 3), 7, dtype=np.uint8), dt(2025, 1, 1, 12, 0, 0))
+
+    # Act
+    frame = store.read_at(dt(2025, 1, 1, 12, 0, 5))
+    store.delete()
+
+    # Assert
+    assert frame is not None
+    assert not isinstance(frame, np.memmap) and frame.flags.owndata
+    assert int(frame[0, 0, 0]) == 7
@@ -0,0 +1,167 @@
+from pathlib import Path
+from threading import Event
+from unittest.mock import MagicMock, patch
+import pytest
+from src.automatic_time_lapse_creator.job_queue import Job, JobDeferred, JobQueue, JobStatus, JobWorkerPool
+
+
+@pytest.fixture
+def job_queue(tmp_path: Path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3", max_attempts=3, backoff_seconds=10, max_backoff_seconds=15)
+    yield queue
+    queue.close()
+
+
+def test_enqueue_is_idempotent(job_queue: JobQueue):
+    # Act
+    first = job_queue.enqueue("daily", "daily:camera:2025-01-01", {"folder": "a"})
+    second = job_queue.enqueue("daily", "daily:camera:2025-01-01", {"folder": "b"})
+
+    # Assert
+    assert first
+    assert not second
+    job = job_queue.get("daily:camera:2025-01-01")
+    assert job is not None
+    assert job.payload == {"folder": "a"}
+    assert job_queue.counts()[JobStatus.PENDING] == 1
+
+
+def test_claim_returns_the_oldest_ready_job_of_the_requested_types(job_queue: JobQueue):
+    # Arrange
+    job_queue.enqueue("monthly", "monthly:1")
+    job_queue.enqueue("daily", "daily:1")
+    job_queue.enqueue("daily", "daily:2", delay_seconds=60)
+
+    # Act
+    daily = job_queue.claim(["daily"])
+    nothing_ready = job_queue.claim(["daily"])
+    monthly = job_queue.claim()
+
+    # Assert
+    assert daily is not None and daily.key == "daily:1"
+    assert daily.status == JobStatus.RUNNING
+    assert daily.attempts == 1
+    assert nothing_ready is None
+    assert monthly is not None and monthly.key == "monthly:1"
+    assert job_queue.claim([]) is None
+
+
+def test_fail_retries_with_backoff_and_gives_up_after_max_attempts(job_queue: JobQueue):
+    # Arrange
+    job_queue.enqueue("daily", "daily:1")
+    statuses: list[JobStatus] = []
+    delays: list[float] = []
+
+    # Act
+    with patch("src.automatic_time_lapse_creator.job_queue.time.time", return_value=1000.0):
+        for _ in range(3):
+            job_queue._connection.execute("UPDATE jobs SET run_after = 0")
+            job = job_queue.claim()
+            assert job is not None
+            statuses.append(job_queue.fail(job.id, "error"))
+            failed_job = job_queue.get("daily:1")
+            assert failed_job is not None
+            delays.append(failed_job.run_after - 1000.0)
+
+    # Assert
+    assert statuses == [JobStatus.PENDING, JobStatus.PENDING, JobStatus.FAILED]
+    assert delays[:2] == [10, 15]
+    assert failed_job.last_error == "error"
+
+
+def test_interrupted_jobs_are_recovered_when_the_queue_is_opened(tmp_path: Path):
+    # Arrange
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    queue.enqueue("daily", "daily:1")
+    assert queue.claim() is not None
+    queue.close()
+
+    # Act
+    reopened = JobQueue(tmp_path / "jobs.sqlite3")
+    job = reopened.claim()
+    reopened.close()
+
+    # Assert
+    assert job is not None
+    assert job.key == "daily:1"
+    assert job.attempts == 2
+
+
+def test_run_pending_completes_and_fails_jobs(job_queue: JobQueue):
+    # Arrange
+    handler = MagicMock(side_effect=[True, False, Exception("boom")])
+    pool = JobWorkerPool(job_queue, {"daily": handler}, logger=MagicMock())
+    for index in range(3):
+        job_queue.enqueue("daily", f"daily:{index}")
+
+    # Act
+    count = pool.run_pending()
+
+    # Assert
+    assert count == 3
+    assert isinstance(handler.call_args.args[0], Job)
+    counts = job_queue.counts()
+    assert counts[JobStatus.DONE] == 1
+    assert counts[JobStatus.PENDING] == 2
+
+
+def test_a_deferred_job_is_postponed_without_counting_the_attempt(job_queue: JobQueue):
+    # Arrange
+    handler = MagicMock(side_effect=JobDeferred("waiting", delay_seconds=60))
+    pool = JobWorkerPool(job_queue, {"annually": handler}, logger=MagicMock())
+    job_queue.enqueue("monthly", "monthly:camera:2025-12")
+    job_queue.enqueue("annually", "annually:camera:2025")
+
+    # Act
+    count = pool.run_pending()
+
+    # Assert
+    assert count == 1
+    job = job_queue.get("annually:camera:2025")
+    assert job is not None
+    assert job.status == JobStatus.PENDING
+    assert job.attempts == 0
+    assert job.last_error is None
+    assert job_queue.claim(["annually"]) is None
+    assert job_queue.unfinished("monthly:camera:2025-") == 1
+    assert job_queue.unfinished("monthly:camera:2024-") == 0
+
+
+def test_worker_pool_respects_the_concurrency_per_job_type(job_queue: JobQueue):
+    # Arrange
+    release = Event()
+    started = {"daily": 0, "monthly": 0}
+    all_started = Event()
+
+    def handler(job: Job) -> bool:
+        started[job.job_type] += 1
+        if sum(started.values()) == 3:
+            all_started.set()
+        release.wait(5)
+        return True
+
+    pool = JobWorkerPool(
+        job_queue,
+        {"daily": handler, "monthly": handler},
+        concurrency={"daily": 2},
+        workers=4,
+        poll_interval=0.01,
+    )
+    for index in range(3):
+        job_queue.enqueue("daily", f"daily:{index}")
+    job_queue.enqueue("monthly", "monthly:0")
+    job_queue.enqueue("monthly", "monthly:1")
+
+    # Act
+    pool.start()
+    assert all_started.wait(5)
+    running = dict(started)
+    release.set()
+    while job_queue.counts()[JobStatus.DONE] < 5:
+        pool.wake()
+        release.wait(0.01)
+    pool.stop(5)
+
+    # Assert
+    assert running == {"daily": 2, "monthly": 1}
+    assert not pool.is_running
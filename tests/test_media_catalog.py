@@ -0,0 +1,71 @@
+from datetime import date
+from pathlib import Path
+import pytest
+from src.automatic_time_lapse_creator.common.constants import FRAMES_MEDIA_TYPE, VideoType
+from src.automatic_time_lapse_creator.media_catalog import MediaCatalog
+
+
+@pytest.fixture
+def media_catalog(tmp_path: Path):
+    catalog = MediaCatalog(tmp_path / "catalog.sqlite3")
+    yield catalog
+    catalog.close()
+
+
+def test_find_filters_by_source_type_and_date(media_catalog: MediaCatalog):
+    # Arrange
+    daily = VideoType.DAILY.value
+    media_catalog.add("camera", daily, "/camera/2025-01-31.mp4", date(2025, 1, 31), size=10)
+    media_catalog.add("camera", daily, "/camera/2025-02-02.mp4", date(2025, 2, 2), size=20)
+    media_catalog.add("camera", daily, "/camera/2025-02-01.mp4", date(2025, 2, 1), size=30)
+    media_catalog.add("other", daily, "/other/2025-02-01.mp4", date(2025, 2, 1), size=40)
+    media_catalog.add("camera", FRAMES_MEDIA_TYPE, "/camera/2025-02-01", date(2025, 2, 1), size=50, items=3)
+
+    # Act
+    february = media_catalog.paths("camera", daily, start=date(2025, 2, 1), end=date(2025, 2, 28))
+    week = media_catalog.paths("camera", daily, iso_year=2025, iso_week=5)
+
+    # Assert
+    assert february == ["/camera/2025-02-01.mp4", "/camera/2025-02-02.mp4"]
+    assert week == ["/camera/2025-01-31.mp4", "/camera/2025-02-01.mp4", "/camera/2025-02-02.mp4"]
+    assert media_catalog.total_size("camera") == 110
+    assert media_catalog.total_size(media_type=daily) == 100
+    assert media_catalog.total_size() == 150
+
+
+def test_add_updates_and_remove_deletes_a_media(media_catalog: MediaCatalog, tmp_path: Path):
+    # Arrange
+    video = tmp_path / "2025-02-01.mp4"
+    video.write_bytes(b"video")
+    media_catalog.add("camera", FRAMES_MEDIA_TYPE, tmp_path, date(2025, 2, 1), items=1)
+
+    # Act
+    media_catalog.add("camera", VideoType.DAILY.value, video, date(2025, 2, 1))
+    media_catalog.add("camera", FRAMES_MEDIA_TYPE, tmp_path, date(2025, 2, 1), items=5)
+    removed = media_catalog.remove(tmp_path)
+    removed_again = media_catalog.remove(tmp_path)
+
+    # Assert
+    entry = media_catalog.get(video)
+    assert entry is not None
+    assert entry.size == len(b"video")
+    assert (entry.iso_year, entry.iso_week) == (2025, 5)
+    assert removed and not removed_again
+    assert media_catalog.get(tmp_path) is None
+    assert len(media_catalog.find()) == 1
+
+
+def test_grow_adds_the_new_frames_to_the_usage(media_catalog: MediaCatalog):
+    # Arrange
+    media_catalog.add("camera", FRAMES_MEDIA_TYPE, "/camera/2025-01-01", date(2025, 1, 1), size=10, items=1)
+    media_catalog.add("other", VideoType.DAILY.value, "/other/2025-01-01.mp4", date(2025, 1, 1), size=5)
+
+    # Act
+    grown = media_catalog.grow("/camera/2025-01-01", 15)
+    missing = media_catalog.grow("/camera/2025-01-02", 15)
+
+    # Assert
+    assert grown and not missing
+    assert media_catalog.usage() == {"camera": 25, "other": 5}
+    entry = media_catalog.get("/camera/2025-01-01")
+    assert entry is not None and entry.items == 2
@@ -0,0 +1,151 @@
+from datetime import date
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from src.automatic_time_lapse_creator.common.constants import FRAMES_MEDIA_TYPE, JPG_FILE, MP4_FILE, VideoType
+from src.automatic_time_lapse_creator.media_catalog import MediaCatalog
+from src.automatic_time_lapse_creator.retention import RetentionEngine, RetentionPolicy
+
+TODAY = date(2025, 3, 10)
+DAILY = VideoType.DAILY.value
+MONTHLY = VideoType.MONTHLY.value
+
+
+def _add_day(catalog: MediaCatalog, tmp_path: Path, source: str, day: date, size: int) -> tuple[Path, Path]:
+    """Records a frame folder with one image and its daily video of the given size."""
+    folder = tmp_path / source / day.isoformat()
+    folder.mkdir(parents=True)
+    (folder / f"12_00_00{JPG_FILE}").write_bytes(b"i" * size)
+    video = folder / f"{day.isoformat()}{MP4_FILE}"
+    video.write_bytes(b"v" * size)
+    catalog.add(source, FRAMES_MEDIA_TYPE, folder, day, size=size, items=1)
+    catalog.add(source, DAILY, video, day)
+    return folder, video
+
+
+def test_enforce_evicts_the_media_older_than_their_maximum_age(tmp_path: Path):
+    # Arrange
+    catalog = MediaCatalog(tmp_path / "catalog.sqlite3")
+    old_folder, old_video = _add_day(catalog, tmp_path, "cam", date(2025, 3, 1), 10)
+    new_folder, new_video = _add_day(catalog, tmp_path, "cam", date(2025, 3, 9), 10)
+    today_folder, _ = _add_day(catalog, tmp_path, "cam", TODAY, 10)
+    engine = RetentionEngine(catalog, RetentionPolicy(max_age_days={DAILY: 5, FRAMES_MEDIA_TYPE: 0}), tmp_path)
+
+    # Act
+    report = engine.enforce(TODAY)
+
+    # Assert
+    assert sorted(entry.path for entry in report.evicted) == sorted(
+        [str(old_folder), str(old_video), str(new_folder)]
+    )
+    assert report.bytes_freed == 30
+    assert not old_folder.exists()
+    assert new_video.exists() and not list(new_folder.glob(f"*{JPG_FILE}"))
+    assert catalog.get(today_folder) is not None
+    catalog.close()
+
+
+def test_enforce_keeps_the_sources_within_their_budgets_evicting_the_lowest_priority_first(tmp_path: Path):
+    # Arrange
+    catalog = MediaCatalog(tmp_path / "catalog.sqlite3")
+    first_folder, first_video = _add_day(catalog, tmp_path, "cam", date(2025, 3, 1), 10)
+    second_folder, _ = _add_day(catalog, tmp_path, "cam", date(2025, 3, 2), 10)
+    _add_day(catalog, tmp_path, "other", date(2025, 3, 1), 10)
+    engine = RetentionEngine(catalog, RetentionPolicy(source_max_bytes={"cam": 25}), tmp_path)
+
+    # Act
+    report = engine.enforce(TODAY)
+
+    # Assert
+    assert [entry.path for entry in report.evicted] == [str(first_folder), str(second_folder)]
+    assert first_video.exists()
+    assert catalog.usage() == {"cam": 20, "other": 20}
+    catalog.close()
+
+
+def test_enforce_keeps_the_total_budget_and_the_free_space(tmp_path: Path):
+    # Arrange
+    catalog = MediaCatalog(tmp_path / "catalog.sqlite3")
+    _, first_video = _add_day(catalog, tmp_path, "cam", date(2025, 3, 1), 10)
+    _, second_video = _add_day(catalog, tmp_path, "other", date(2025, 3, 2), 10)
+    policy = RetentionPolicy(max_bytes=100, min_free_bytes=50, priorities={FRAMES_MEDIA_TYPE: 5, DAILY: 1})
+    deletion_service = MagicMock()
+    engine = RetentionEngine(catalog, policy, tmp_path, deletion_service=deletion_service)
+
+    # Act
+    with patch(
+        "src.automatic_time_lapse_creator.retention.shutil.disk_usage", return_value=MagicMock(free=35)
+    ):
+        report = engine.enforce(TODAY)
+
+    # Assert
+    assert [entry.path for entry in report.evicted] == [str(first_video), str(second_video)]
+    assert not first_video.exists() and not second_video.exists()
+    deletion_service.delete_media_files.assert_not_called()
+    assert policy.priority(MONTHLY) == 3
+    catalog.close()
+
+
+def test_enforce_ignores_the_videos_on_the_cold_tier_for_the_budgets(tmp_path: Path):
+    # Arrange
+    base_path = tmp_path / "base"
+    catalog = MediaCatalog(tmp_path / "catalog.sqlite3")
+    _, moved_video = _add_day(catalog, base_path, "cam", date(2025, 3, 1), 100)
+    cold_video = tmp_path / "cold" / moved_video.relative_to(base_path)
+    cold_video.parent.mkdir(parents=True)
+    moved_video.rename(cold_video)
+    catalog.relocate(moved_video, cold_video)
+    local_folder, local_video = _add_day(catalog, base_path, "cam", date(2025, 3, 2), 10)
+    policy = RetentionPolicy(max_bytes=150, source_max_bytes={"cam": 150}, min_free_bytes=50)
+    engine = RetentionEngine(catalog, policy, base_path)
+
+    # Act
+    with patch(
+        "src.automatic_time_lapse_creator.retention.shutil.disk_usage", return_value=MagicMock(free=60)
+    ):
+        report = engine.enforce(TODAY)
+
+    # Assert
+    assert report.evicted == []
+    assert cold_video.exists() and local_video.exists() and local_folder.exists()
+    assert catalog.usage(base_path) == {"cam": 120}
+    assert catalog.usage() == {"cam": 220}
+    catalog.close()
+
+
+def test_enforce_keeps_the_frames_of_a_day_without_a_daily_video(tmp_path: Path):
+    # Arrange
+    catalog = MediaCatalog(tmp_path / "catalog.sqlite3")
+    encoded_folder, _ = _add_day(catalog, tmp_path, "cam", date(2025, 3, 1), 10)
+    queued_folder = tmp_path / "cam" / "2025-03-02"
+    queued_folder.mkdir(parents=True)
+    (queued_folder / f"12_00_00{JPG_FILE}").write_bytes(b"i" * 10)
+    catalog.add("cam", FRAMES_MEDIA_TYPE, queued_folder, date(2025, 3, 2), size=10, items=1)
+    engine = RetentionEngine(catalog, RetentionPolicy(max_bytes=0, max_age_days={FRAMES_MEDIA_TYPE: 0}), tmp_path)
+
+    # Act
+    report = engine.enforce(TODAY)
+
+    # Assert
+    assert str(encoded_folder) in [entry.path for entry in report.evicted]
+    assert str(queued_folder) not in [entry.path for entry in report.evicted]
+    assert (queued_folder / f"12_00_00{JPG_FILE}").exists()
+    assert catalog.get(queued_folder) is not None
+    catalog.close()
+
+
+def test_enforce_keeps_the_media_which_are_not_stored_yet(tmp_path: Path):
+    # Arrange
+    catalog = MediaCatalog(tmp_path / "catalog.sqlite3")
+    folder, video = _add_day(catalog, tmp_path, "cam", date(2025, 3, 1), 10)
+    storage = MagicMock()
+    storage.pending.side_effect = lambda path: [str(video)] if Path(path) == video else []
+    engine = RetentionEngine(catalog, RetentionPolicy(max_bytes=0), tmp_path, storage=storage)
+
+    # Act
+    report = engine.enforce(TODAY)
+
+    # Assert
+    assert [entry.path for entry in report.evicted] == [str(folder)]
+    assert video.exists()
+    assert catalog.get(video) is not None
+    catalog.close()
@@ -0,0 +1,167 @@
+import cv2
+import numpy as np
+import pytest
+from logging import Logger
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.automatic_time_lapse_creator.common.constants import (
+    MP4_FILE,
+    PART_FILE_SUFFIX,
+    SEGMENTS_DIR,
+)
+from src.automatic_time_lapse_creator.segment_writer import SegmentedVideoWriter
+
+
+@pytest.fixture
+def mock_logger():
+    return MagicMock(spec=Logger)
+
+
+def _image(value: int = 100):
+    return np.full((64, 96, 3), value, dtype=np.uint8)
+
+
+def _frames_count(video_path: str) -> int:
+    cap = cv2.VideoCapture(video_path)
+    count = 0
+    while cap.read()[0]:
+        count += 1
+    cap.release()
+    return count
+
+
+def test_write_completes_a_segment_every_frames_per_segment(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    writer = SegmentedVideoWriter(tmp_path, fps=10, frames_per_segment=3, logger=mock_logger)
+
+    # Act
+    for _ in range(7):
+        writer.write(_image())
+
+    # Assert
+    assert writer.frames_count == 7
+    assert len(writer.segments()) == 2
+    assert len(list((tmp_path / SEGMENTS_DIR).glob(f"*{PART_FILE_SUFFIX}{MP4_FILE}"))) == 1
+    writer.close()
+    assert len(writer.segments()) == 3
+
+
+def test_write_resizes_images_to_the_size_of_the_first_image(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    writer = SegmentedVideoWriter(tmp_path, fps=10, frames_per_segment=5, logger=mock_logger)
+
+    # Act
+    writer.write(_image())
+    with patch("cv2.resize", wraps=cv2.resize) as mock_resize:
+        writer.write(np.zeros((32, 48, 3), dtype=np.uint8))
+    writer.close()
+
+    # Assert
+    mock_resize.assert_called_once()
+    assert _frames_count(str(writer.segments()[0])) == 2
+
+
+def test_new_writer_removes_incomplete_segments_and_continues_numbering(
+    tmp_path: Path, mock_logger: MagicMock
+):
+    # Arrange
+    first = SegmentedVideoWriter(tmp_path, fps=10, frames_per_segment=2, logger=mock_logger)
+    for _ in range(3):
+        first.write(_image())
+    # the open segment of a killed process is left as a part file
+    first._writer.release()  # type: ignore
+
+    # Act
+    second = SegmentedVideoWriter(tmp_path, fps=10, frames_per_segment=2, logger=mock_logger)
+    second.write(_image())
+    second.close()
+
+    # Assert
+    assert [segment.name for segment in second.segments()] == ["segment_00000.mp4", "segment_00001.mp4"]
+    mock_logger.warning.assert_called_once()
+
+
+def test_finalize_joins_the_segments_and_deletes_them(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    writer = SegmentedVideoWriter(tmp_path, fps=10, frames_per_segment=2, logger=mock_logger)
+    for _ in range(5):
+        writer.write(_image())
+    output_video = str(tmp_path / f"daily{MP4_FILE}")
+
+    # Act
+    with patch(
+        "src.automatic_time_lapse_creator.video_manager.find_ffmpeg", return_value=None
+    ):
+        result = writer.finalize(output_video)
+
+    # Assert
+    assert result
+    assert _frames_count(output_video) == 5
+    assert not (tmp_path / SEGMENTS_DIR).exists()
+    assert not SegmentedVideoWriter.has_segments(tmp_path)
+
+
+def test_finalize_returns_False_without_segments(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    writer = SegmentedVideoWriter(tmp_path, fps=10, logger=mock_logger)
+
+    # Act & Assert
+    assert not writer.finalize(str(tmp_path / f"daily{MP4_FILE}"))
+
+
+def test_write_completes_a_segment_after_segment_seconds(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    writer = SegmentedVideoWriter(tmp_path, fps=10, logger=mock_logger, segment_seconds=60)
+
+    # Act
+    with patch(
+        "src.automatic_time_lapse_creator.segment_writer.time.monotonic", side_effect=[0.0, 30.0, 60.0, 61.0, 62.0]
+    ):
+        for _ in range(3):
+            writer.write(_image())
+
+    # Assert
+    assert len(writer.segments()) == 1
+    assert _frames_count(str(writer.segments()[0])) == 2
+    assert writer._writer is not None  # type: ignore
+
+
+def test_new_writer_counts_the_frames_of_the_complete_segments(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    first = SegmentedVideoWriter(tmp_path, fps=10, frames_per_segment=2, logger=mock_logger)
+    for _ in range(5):
+        first.write(_image())
+    first._writer.release()  # type: ignore
+
+    # Act
+    second = SegmentedVideoWriter(tmp_path, fps=10, frames_per_segment=2, logger=mock_logger)
+
+    # Assert
+    assert second.frames_count == 4
+
+
+def test_write_saves_images_if_the_segment_cannot_be_opened(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    writer = SegmentedVideoWriter(tmp_path, fps=10, frames_per_segment=2, logger=mock_logger)
+    writer.write(_image())
+    writer.write(_image())
+
+    # Act
+    with patch(
+        "src.automatic_time_lapse_creator.encoders.OpenCVEncoder.is_opened", return_value=False
+    ):
+        results = [writer.write(_image()) for _ in range(2)]
+    writer.write(_image())
+    output_video = str(tmp_path / f"daily{MP4_FILE}")
+    with patch(
+        "src.automatic_time_lapse_creator.video_manager.find_ffmpeg", return_value=None
+    ):
+        created = writer.finalize(output_video)
+
+    # Assert
+    assert results == [True, True]
+    mock_logger.warning.assert_called_once()
+    assert created
+    assert _frames_count(output_video) == 5
+    assert not (tmp_path / SEGMENTS_DIR).exists()
@@ -11,6 +11,7 @@ from src.automatic_time_lapse_creator.source import (
     StreamSource,
     Source,
 )
+from src.automatic_time_lapse_creator.frame import Frame
 from src.automatic_time_lapse_creator.common.constants import (
     YOUTUBE_URL_PREFIX,
     OK_STATUS_CODE,
@@ -196,6 +197,19 @@ def test_reset_monthly_video_created_changes_monthly_video_created_to_False(
     assert not sample_source.monthly_video_created
 
 
+def test_set_and_reset_annual_video_created(
+    sample_source: Source,
+):
+    # Arrange & Act
+    sample_source.set_annual_video_created()
+    created = sample_source.annual_video_created
+    sample_source.reset_annual_video_created()
+
+    # Assert
+    assert created
+    assert not sample_source.annual_video_created
+
+
 def test_set_videos_count_sets_the_value(sample_source: Source):
     # Arrange & Act
     video_files_count = 12
@@ -480,6 +494,86 @@ def test_stream_source_get_frame_bytes_returns_None_for_blank_frame(
     mock_logger.debug.assert_called_once()
 
 
+def test_image_source_get_frame_returns_frame_with_response_content(
+    sample_source: ImageSource,
+):
+    mock_response = Mock(spec=Response)
+    mock_response.status_code = OK_STATUS_CODE
+    mock_response.content = _make_jpeg(128)
+
+    with patch("requests.get", return_value=mock_response):
+        result = sample_source.get_frame()
+
+    assert isinstance(result, Frame)
+    assert result.encoded == mock_response.content
+    assert result.source_name == sample_source.location_name
+
+
+def test_image_source_get_frame_checks_the_blank_frame_at_the_frame_size(
+    sample_source: ImageSource,
+):
+    mock_response = Mock(spec=Response)
+    mock_response.status_code = OK_STATUS_CODE
+    mock_response.content = _make_jpeg(128)
+    sample_source.frame_size = (50, 50)
+
+    with (
+        patch("requests.get", return_value=mock_response),
+        patch("cv2.imdecode", wraps=cv2.imdecode) as mock_imdecode,
+    ):
+        result = sample_source.get_frame()
+        assert result is not None
+        image = result.image_for_size(50, 50)
+
+    assert result.target_size == (50, 50)
+    assert image is not None
+    mock_imdecode.assert_called_once()
+
+
+def test_stream_source_get_frame_keeps_the_decoded_image(
+    sample_StreamSource: StreamSource,
+):
+    bright_frame = np.full((100, 100, 3), 128, dtype=np.uint8)
+
+    with (
+        patch.object(sample_StreamSource, "_read_frame", return_value=(True, bright_frame)),
+        patch("cv2.imencode") as mock_imencode,
+    ):
+        result = sample_StreamSource.get_frame()
+
+    assert isinstance(result, Frame)
+    assert result.image is bright_frame
+    mock_imencode.assert_not_called()
+
+
+def test_stream_source_get_frame_bytes_does_not_encode_blank_frames(
+    sample_StreamSource: StreamSource, mock_logger: Mock
+):
+    sample_StreamSource.logger = mock_logger
+    black_frame = np.zeros((100, 100, 3), dtype=np.uint8)
+
+    with (
+        patch.object(sample_StreamSource, "_read_frame", return_value=(True, black_frame)),
+        patch("cv2.imencode") as mock_imencode,
+    ):
+        result = sample_StreamSource.get_frame_bytes()
+
+    assert result is None
+    mock_imencode.assert_not_called()
+
+
+def test_stream_source_get_frame_bytes_returns_jpeg_for_bright_frame(
+    sample_StreamSource: StreamSource,
+):
+    bright_frame = np.full((100, 100, 3), 128, dtype=np.uint8)
+
+    with patch.object(sample_StreamSource, "_read_frame", return_value=(True, bright_frame)):
+        result = sample_StreamSource.get_frame_bytes()
+
+    assert isinstance(result, bytes)
+    assert result[:2] == b"\xff\xd8"
+
+
 # ---------------------------------------------------------------------------
 # BrowserSource fixtures
 # ---------------------------------------------------------------------------
@@ -0,0 +1,200 @@
+import pickle
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from unittest.mock import MagicMock, patch
+import pytest
+from src.automatic_time_lapse_creator.common.constants import JPG_FILE, MP4_FILE, S3_MIN_PART_SIZE
+from src.automatic_time_lapse_creator.storage import LocalStorage, S3Storage
+
+
+class FakeS3Client:
+    """An in-memory stand-in for the S3 API of MinIO."""
+
+    def __init__(self, fail_part: int | None = None) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.uploads: dict[str, dict[int, bytes]] = {}
+        self.aborted: list[str] = []
+        self.fail_part = fail_part
+        self._lock = Lock()
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes) -> dict[str, Any]:
+        self.objects[f"{Bucket}/{Key}"] = Body
+        return {}
+
+    def create_multipart_upload(self, Bucket: str, Key: str) -> dict[str, Any]:
+        upload_id = f"upload-{len(self.uploads)}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes) -> dict[str, Any]:
+        if PartNumber == self.fail_part:
+            raise ConnectionError("connection reset")
+        with self._lock:
+            self.uploads[UploadId][PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(
+        self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict[str, Any]
+    ) -> dict[str, Any]:
+        parts = MultipartUpload["Parts"]
+        assert [part["PartNumber"] for part in parts] == sorted(self.uploads[UploadId])
+        assert all(part["ETag"] == f"etag-{part['PartNumber']}" for part in parts)
+        uploaded = self.uploads.pop(UploadId)
+        self.objects[f"{Bucket}/{Key}"] = b"".join(uploaded[part["PartNumber"]] for part in parts)
+        return {}
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str) -> dict[str, Any]:
+        self.aborted.append(UploadId)
+        self.uploads.pop(UploadId, None)
+        return {}
+
+
+def test_store_video_uploads_large_videos_in_parallel_parts(tmp_path: Path):
+    # Arrange
+    video = tmp_path / "camera" / f"2025-01-01{MP4_FILE}"
+    video.parent.mkdir()
+    video.write_bytes(bytes(range(256)) * (S3_MIN_PART_SIZE // 100))
+    client = FakeS3Client()
+    storage = S3Storage(tmp_path, "bucket", prefix="timelapse/", client=client, part_size=1000, max_workers=3)
+
+    # Act
+    location = storage.store_video(video)
+
+    # Assert
+    assert location == f"s3://bucket/timelapse/camera/2025-01-01{MP4_FILE}"
+    assert client.objects[f"bucket/timelapse/camera/2025-01-01{MP4_FILE}"] == video.read_bytes()
+    assert client.uploads == {}
+    assert storage.part_size == S3_MIN_PART_SIZE
+
+
+def test_store_video_aborts_a_failed_multipart_upload(tmp_path: Path):
+    # Arrange
+    video = tmp_path / f"video{MP4_FILE}"
+    video.write_bytes(b"v" * (S3_MIN_PART_SIZE * 5 // 2))
+    client = FakeS3Client(fail_part=2)
+    logger = MagicMock()
+    storage = S3Storage(tmp_path, "bucket", client=client, upload_attempts=1, logger=logger)
+
+    # Act
+    location = storage.store_video(video)
+
+    # Assert
+    assert location is None
+    assert client.aborted == ["upload-0"]
+    assert client.objects == {}
+    logger.error.assert_called_once()
+    assert storage.pending(tmp_path) == [str(video)]
+
+
+def test_store_frame_uploads_the_spooled_frames_in_batches(tmp_path: Path):
+    # Arrange
+    frames = [tmp_path / f"12_00_0{second}{JPG_FILE}" for second in range(3)]
+    for frame in frames:
+        frame.write_bytes(frame.name.encode())
+    client = FakeS3Client()
+    storage = S3Storage(tmp_path, "bucket", client=client, upload_frames=True, frames_batch_size=2)
+
+    # Act
+    stored = [storage.store_frame(frame) for frame in frames]
+    storage._pending[0].result()
+    uploaded_before_flush = len(client.objects)
+    flushed = storage.flush()
+    storage.close()
+
+    # Assert
+    assert stored == [True, True, True]
+    assert uploaded_before_flush == 2
+    assert flushed == 1
+    assert client.objects[f"bucket/{frames[2].name}"] == frames[2].name.encode()
+
+
+def test_failed_uploads_are_retried_and_kept_pending_until_they_are_stored(tmp_path: Path):
+    # Arrange
+    frames = [tmp_path / "camera" / f"12_00_0{second}{JPG_FILE}" for second in range(2)]
+    frames[0].parent.mkdir()
+    for frame in frames:
+        frame.write_bytes(frame.name.encode())
+    client = FakeS3Client()
+    client.put_object = MagicMock(side_effect=[ConnectionError("reset"), {}] + [ConnectionError("reset")] * 4)
+    logger = MagicMock()
+    storage = S3Storage(
+        tmp_path, "bucket", client=client, upload_frames=True, upload_attempts=2, retry_seconds=0, logger=logger
+    )
+
+    # Act
+    stored = [storage.store_frame(frame) for frame in frames]
+    flushed = storage.flush()
+    pending = storage.pending(frames[0].parent)
+    storage.close()
+    client.put_object = MagicMock(return_value={})
+    restarted = S3Storage(tmp_path, "bucket", client=client, upload_frames=True)
+    pending_after_restart = restarted.pending(tmp_path)
+    flushed_after_restart = restarted.flush()
+
+    # Assert
+    assert stored == [True, True]
+    assert flushed == 1
+    assert pending == [str(frames[1])]
+    logger.warning.assert_called()
+    assert pending_after_restart == [str(frames[1])]
+    assert flushed_after_restart == 1
+    assert restarted.pending(tmp_path) == []
+    S3Storage(tmp_path, "bucket", client=client)
+    assert not restarted.pending_file.exists()
+
+
+def test_flush_does_not_upload_the_media_which_another_process_is_uploading(tmp_path: Path):
+    # Arrange
+    video = tmp_path / f"video{MP4_FILE}"
+    video.write_bytes(b"video")
+    client = FakeS3Client()
+    storage = S3Storage(tmp_path, "bucket", client=client)
+    worker_storage = pickle.loads(pickle.dumps(storage))
+    worker_storage._client = client
+    during_upload: dict[str, Any] = {}
+
+    def _upload_file(path: str, key: str) -> None:
+        during_upload.update(flushed=storage.flush(), pending=storage.pending(tmp_path))
+        client.put_object(Bucket="bucket", Key=key, Body=b"video")
+
+    # Act
+    with patch.object(worker_storage, "upload_file", side_effect=_upload_file):
+        location = worker_storage.store_video(video)
+
+    # Assert
+    assert location is not None
+    assert during_upload == {"flushed": 0, "pending": [str(video)]}
+    assert list(client.objects) == [f"bucket/video{MP4_FILE}"]
+    assert storage.pending(tmp_path) == []
+
+
+def test_s3_storage_is_pickled_without_the_client(tmp_path: Path):
+    # Arrange
+    storage = S3Storage(tmp_path, "bucket", endpoint_url="http://localhost:9000", client=FakeS3Client())
+
+    # Act
+    restored = pickle.loads(pickle.dumps(storage))
+
+    # Assert
+    assert restored._client is None
+    assert restored.endpoint_url == "http://localhost:9000"
+    with patch("src.automatic_time_lapse_creator.storage.boto3", None):
+        with pytest.raises(ImportError):
+            _ = restored.client
+    with patch("src.automatic_time_lapse_creator.storage.boto3") as mock_boto3:
+        assert restored.client is mock_boto3.client.return_value
+    mock_boto3.client.assert_called_once_with("s3", endpoint_url="http://localhost:9000")
+
+
+def test_local_storage_keeps_the_media_in_place(tmp_path: Path):
+    # Arrange
+    video = tmp_path / f"video{MP4_FILE}"
+    video.write_bytes(b"video")
+    storage = LocalStorage(tmp_path)
+
+    # Act & Assert
+    assert storage.store_video(video) == str(video)
+    assert storage.store_video(tmp_path / f"missing{MP4_FILE}") is None
+    assert not storage.store_frame(tmp_path / f"missing{JPG_FILE}")
+    assert storage.key(video) == f"video{MP4_FILE}"
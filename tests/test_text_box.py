@@ -1,13 +1,16 @@
 import pytest
 import numpy as np
 from cv2.typing import MatLike
+from unittest.mock import patch
 
 from src.automatic_time_lapse_creator.text_box import (
     TopOutsideTextBox,
     TopInsideTextBox,
     BottomInsideTextBox,
     BottomOutsideTextBox,
+    TextBoxCache,
 )
+import tests.test_data as td
 
 @pytest.fixture
 def mock_image():
@@ -74,3 +77,161 @@ def test_remove_alpha_channel_for_vstack():
     
     # Assert
     assert result.shape[2] == 3
+
+
+def test_text_box_cache_returns_the_same_box_for_the_same_key():
+    # Arrange
+    cache = TextBoxCache()
+
+    # Act
+    first = cache.get(TopInsideTextBox, "Test", 800, 600)
+    second = cache.get(TopInsideTextBox, "Test", 800, 600)
+    other_class = cache.get(TopOutsideTextBox, "Test", 800, 600)
+
+    # Assert
+    assert first is second
+    assert other_class is not first
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_text_box_cache_evicts_least_recently_used_boxes():
+    # Arrange
+    cache = TextBoxCache(max_size=2)
+    first = cache.get(TopInsideTextBox, "first", 800, 600)
+    cache.get(TopInsideTextBox, "second", 800, 600)
+
+    # Act
+    cache.get(TopInsideTextBox, "first", 800, 600)
+    cache.get(TopInsideTextBox, "third", 800, 600)
+
+    # Assert
+    assert len(cache) == 2
+    assert cache.get(TopInsideTextBox, "first", 800, 600) is first
+    assert cache.misses == 3
+
+
+def test_text_box_cache_get_with_clock_composes_the_time_into_a_cached_template():
+    # Arrange
+    cache = TextBoxCache()
+    direct = TopInsideTextBox(f"{td.sample_date_time_text} | {td.sample_weather_data_text}", 800, 600)
+
+    # Act
+    first = cache.get_with_clock(
+        TopInsideTextBox, td.sample_date_time_text, 800, 600, td.sample_weather_data_text
+    )
+    second = cache.get_with_clock(
+        TopInsideTextBox, "2025-01-01 12:00:01", 800, 600, td.sample_weather_data_text
+    )
+
+    # Assert
+    assert first.text == direct.text
+    assert first.box.shape == direct.box.shape
+    assert first.box is not second.box
+    assert not np.array_equal(first.box, second.box)
+    assert len(cache) == 1
+
+
+@pytest.mark.parametrize("img_width, img_height", [(640, 360), (1920, 1080)])
+def test_text_box_cache_get_with_clock_matches_a_direct_render(img_width: int, img_height: int):
+    # Arrange
+    cache = TextBoxCache()
+    texts = ["2025-01-01 12:00:01", "2025-01-01 23:59:58", "2025-01-01 08:47:10"]
+
+    for date_time_text in texts:
+        # Act
+        result = cache.get_with_clock(
+            TopOutsideTextBox, date_time_text, img_width, img_height, td.sample_weather_data_text
+        )
+        direct = TopOutsideTextBox(
+            f"{date_time_text} | {td.sample_weather_data_text}", img_width, img_height
+        )
+
+        # Assert
+        assert np.array_equal(result.box, direct.box)
+        assert np.array_equal(result._blend_layers()[0], direct._blend_layers()[0])
+    assert len(cache) == 1
+
+
+def test_text_box_cache_get_with_clock_reuses_the_blend_layers_of_the_template():
+    # Arrange
+    cache = TextBoxCache()
+    template_layers = cache.get_with_clock(
+        TopInsideTextBox, td.sample_date_time_text, 800, 600, td.sample_weather_data_text
+    )._blend_layers()
+
+    # Act
+    result = cache.get_with_clock(
+        TopInsideTextBox, "2025-01-01 12:00:01", 800, 600, td.sample_weather_data_text
+    )
+
+    # Assert
+    with patch.object(np, "ascontiguousarray") as mock_contiguous:
+        bgr, alpha, _ = result._blend_layers()
+    mock_contiguous.assert_not_called()
+    assert alpha == template_layers[1]
+    assert np.array_equal(bgr, np.ascontiguousarray(result.box[:, :, :3]))
+
+
+def test_text_box_cache_get_with_clock_falls_back_to_the_whole_text():
+    # Arrange
+    cache = TextBoxCache()
+
+    # Act
+    result = cache.get_with_clock(TopInsideTextBox, "no time here", 800, 600)
+
+    # Assert
+    assert result is cache.get(TopInsideTextBox, "no time here", 800, 600)
+
+
+
+def test_blend_with_image_blends_in_place_only_inside_the_box():
+    # Arrange
+    image = np.full((600, 800, 3), 200, dtype=np.uint8)
+    text_box = BottomInsideTextBox("Test", 800, 600, box_transparency=TopInsideTextBox.TRANSPARENCY_MID)
+    y_offset = image.shape[0] - text_box.height
+
+    # Act
+    result = text_box.position(image)
+
+    # Assert
+    assert result is image
+    assert np.all(image[:y_offset] == 200)
+    assert np.abs(int(image[y_offset, -1, 0]) - 100) <= 1
+
+
+def test_blend_with_image_uses_fixed_point_math_for_non_uniform_alpha():
+    # Arrange
+    image = np.full((600, 800, 3), 200, dtype=np.uint8)
+    text_box = TopInsideTextBox("Test", 800, 600)
+    text_box.box = text_box.box.copy()
+    text_box.box[:, :400, 3] = 255
+    text_box.box[:, 400:, 3] = 0
+    text_box.box[:, :, :3] = 0
+
+    # Act
+    text_box.blend_with_image(image, 0)
+
+    # Assert
+    assert np.all(image[: text_box.height, :400] == 0)
+    assert np.all(image[: text_box.height, 400:] == 200)
+    assert np.all(image[text_box.height :] == 200)
+
+
+@pytest.mark.parametrize(
+    "text_box_class", [TopOutsideTextBox, TopInsideTextBox, BottomInsideTextBox, BottomOutsideTextBox]
+)
+def test_draw_on_canvas_matches_position(text_box_class: type[TopInsideTextBox]):
+    # Arrange
+    image = np.full((600, 800, 3), 120, dtype=np.uint8)
+    text_box = text_box_class("Test", 800, 600)
+    canvas = np.zeros((text_box.canvas_height(600), 800, 3), dtype=np.uint8)
+    text_box.image_region(canvas)[:] = image
+
+    # Act
+    expected = text_box.position(image.copy())
+    result = text_box.draw_on_canvas(canvas)
+
+    # Assert
+    assert result is canvas
+    assert np.array_equal(result, expected)
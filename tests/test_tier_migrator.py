@@ -0,0 +1,94 @@
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+from src.automatic_time_lapse_creator.common.constants import MP4_FILE, VideoType
+from src.automatic_time_lapse_creator.encoders import EncoderSettings
+from src.automatic_time_lapse_creator.media_catalog import MediaCatalog
+from src.automatic_time_lapse_creator.tier_migrator import MigrationPolicy, TierMigrator
+
+MODULE = "src.automatic_time_lapse_creator.tier_migrator"
+TODAY = date(2025, 3, 31)
+DAILY = VideoType.DAILY.value
+
+
+def _add_video(catalog: MediaCatalog, base: Path, day: date, data: bytes = b"video") -> Path:
+    video = base / "cam" / day.isoformat() / f"{day.isoformat()}{MP4_FILE}"
+    video.parent.mkdir(parents=True)
+    video.write_bytes(data)
+    catalog.add("cam", DAILY, video, day)
+    return video
+
+
+def test_migrate_moves_the_old_videos_within_the_throughput(tmp_path: Path):
+    # Arrange
+    base, cold = tmp_path / "base", tmp_path / "cold"
+    catalog = MediaCatalog(tmp_path / "catalog.sqlite3")
+    old_video = _add_video(catalog, base, date(2025, 3, 1), b"x" * 100)
+    new_video = _add_video(catalog, base, date(2025, 3, 30))
+    policy = MigrationPolicy(str(cold), min_age_days={DAILY: 7}, max_bytes_per_second=50)
+    migrator = TierMigrator(catalog, policy, base)
+
+    # Act
+    with patch(f"{MODULE}.time.sleep") as mock_sleep:
+        report = migrator.migrate(TODAY)
+
+    # Assert
+    target = cold / old_video.relative_to(base)
+    assert report.moved == [(str(old_video), str(target))]
+    assert report.bytes_moved == 100
+    assert target.read_bytes() == b"x" * 100
+    assert not old_video.parent.exists()
+    assert new_video.exists()
+    assert mock_sleep.call_args.args[0] > 1
+    assert catalog.paths("cam", DAILY) == [str(target), str(new_video)]
+    catalog.close()
+
+
+def test_migrate_keeps_the_re_encoded_video_only_if_it_is_smaller(tmp_path: Path):
+    # Arrange
+    base, cold = tmp_path / "base", tmp_path / "cold"
+    catalog = MediaCatalog(tmp_path / "catalog.sqlite3")
+    smaller = _add_video(catalog, base, date(2025, 3, 1), b"x" * 100)
+    larger = _add_video(catalog, base, date(2025, 3, 2), b"y")
+    policy = MigrationPolicy(str(cold), min_age_days={DAILY: 7}, encoder_settings=EncoderSettings(preset="slow"))
+    migrator = TierMigrator(catalog, policy, base)
+
+    def _transcode(logger, video_path, output_video_path, encoder_settings):
+        Path(output_video_path).write_bytes(b"small")
+        return True
+
+    # Act
+    with patch(f"{MODULE}.vm.transcode_video", side_effect=_transcode) as mock_transcode:
+        report = migrator.migrate(TODAY)
+
+    # Assert
+    assert mock_transcode.call_count == 2
+    assert (cold / smaller.relative_to(base)).read_bytes() == b"small"
+    assert (cold / larger.relative_to(base)).read_bytes() == b"y"
+    assert report.bytes_moved == len(b"small") + 1
+    assert not list(base.rglob("*.part*"))
+    entry = catalog.get(cold / smaller.relative_to(base))
+    assert entry is not None and entry.size == len(b"small")
+    catalog.close()
+
+
+def test_migrate_in_background_records_a_video_moved_by_a_stopped_pass(tmp_path: Path):
+    # Arrange
+    base, cold = tmp_path / "base", tmp_path / "cold"
+    catalog = MediaCatalog(tmp_path / "catalog.sqlite3")
+    video = _add_video(catalog, base, date(2025, 3, 1))
+    target = cold / video.relative_to(base)
+    target.parent.mkdir(parents=True)
+    video.rename(target)
+    migrator = TierMigrator(catalog, MigrationPolicy(str(cold)), base)
+
+    # Act
+    started = migrator.migrate_in_background(TODAY)
+    finished = migrator.wait(5)
+    migrator.close()
+
+    # Assert
+    assert started and finished
+    assert catalog.get(video) is None
+    assert catalog.get(target) is not None
+    catalog.close()
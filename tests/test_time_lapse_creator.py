@@ -1,5 +1,7 @@
 from queue import Queue
 import pytest
+import numpy as np
+import cv2
 from unittest.mock import MagicMock, mock_open, patch
 import os
 from logging import Logger
@@ -7,6 +9,7 @@ from pathlib import Path
 from src.automatic_time_lapse_creator.common.utils import dash_sep_strings
 from src.automatic_time_lapse_creator.common.constants import (
     DEFAULT_DAY_FOR_MONTHLY_VIDEO,
+    JPG_FILE,
     MP4_FILE,
     YYMMDD_FORMAT,
     DEFAULT_PATH_STRING,
@@ -19,21 +22,33 @@ from src.automatic_time_lapse_creator.common.constants import (
     DEFAULT_SUNSET_OFFSET_MINUTES,
     DEFAULT_SUNRISE_OFFSET_MINUTES,
     MAX_SUNRISE_OFFSET_MINUTES,
+    PART_FILE_SUFFIX,
     VideoType,
+    FRAMES_MEDIA_TYPE,
+    UPLOAD_JOB_TYPE,
     
 )
-from src.automatic_time_lapse_creator.source import Source
+from src.automatic_time_lapse_creator.source import ImageSource, Source
 from src.automatic_time_lapse_creator.time_lapse_creator import (
     TimeLapseCreator,
 )
 from src.automatic_time_lapse_creator.time_manager import (
     LocationAndTimeManager,
 )
+from src.automatic_time_lapse_creator.weather_hub import WeatherHub
+from src.automatic_time_lapse_creator.frame import Frame
+from src.automatic_time_lapse_creator.job_queue import JobStatus
+from src.automatic_time_lapse_creator.frame_manifest import FrameManifest
+from src.automatic_time_lapse_creator.frame_store import MappedFrameStore, PackedFrameStore
+from src.automatic_time_lapse_creator.retention import RetentionPolicy
+from src.automatic_time_lapse_creator.tier_migrator import MigrationPolicy
+from src.automatic_time_lapse_creator.worker_priority import WorkerPriority
+from src.automatic_time_lapse_creator.storage import S3Storage
 from src.automatic_time_lapse_creator.common.exceptions import (
     InvalidCollectionException,
 )
 import tests.test_data as td
-from datetime import datetime as dt, timedelta
+from datetime import date, datetime as dt, timedelta
 from astral import LocationInfo
 import tests.test_mocks as tm
 
@@ -500,6 +515,149 @@ def test_create_video_returns_True_if_video_is_created(
         assert mock_logger_info.call_count == 3
 
 
+def test_create_video_joins_the_segments_in_incremental_mode(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator,
+):
+    # Arrange
+    sample_non_empty_time_lapse_creator.incremental_video = True
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.video_exists",
+            return_value=False,
+        ),
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.SegmentedVideoWriter.has_segments",
+            return_value=True,
+        ),
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.SegmentedVideoWriter.finalize",
+            return_value=True,
+        ) as mock_finalize,
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.create_timelapse",
+        ) as mock_create_timelapse,
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.delete_source_media_files",
+            return_value=True,
+        ),
+        patch.object(sample_non_empty_time_lapse_creator.logger, "info", return_value=None),
+    ):
+        # Act
+        for source in sample_non_empty_time_lapse_creator.sources:
+            assert sample_non_empty_time_lapse_creator.create_video(source)
+
+    # Assert
+    assert mock_finalize.call_count == 3
+    mock_create_timelapse.assert_not_called()
+    assert sample_non_empty_time_lapse_creator.segment_writers == {}
+
+
+def test_collect_images_from_webcams_appends_frames_to_the_video_in_incremental_mode(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Arrange
+    bools = [True, True]
+
+    def mock_bool():
+        if len(bools) > 0:
+            return bools.pop(0)
+        else:
+            return False
+
+    sample_non_empty_time_lapse_creator.incremental_video = True
+    sample_non_empty_time_lapse_creator.delete_collected_daily_images = True
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.Path.mkdir",
+            return_value=None,
+        ),
+        patch(
+            "src.automatic_time_lapse_creator.source.ImageSource.get_frame",
+            return_value=Frame(encoded=b"some_content"),
+        ),
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.render_image_with_weather_overlay",
+            return_value=np.zeros((VIDEO_HEIGHT_360p, VIDEO_WIDTH_360p, 3), dtype=np.uint8),
+        ),
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.SegmentedVideoWriter.write",
+        ) as mock_write,
+        patch("cv2.imwrite") as mock_imwrite,
+    ):
+        monkeypatch.setattr(
+            sample_non_empty_time_lapse_creator.location, "is_daylight", mock_bool
+        )
+        monkeypatch.setattr(
+            sample_non_empty_time_lapse_creator, "cache_self", tm.mock_None
+        )
+        sample_non_empty_time_lapse_creator.wait_before_next_frame = 0
+
+        # Act
+        result = sample_non_empty_time_lapse_creator.collect_images_from_webcams()
+
+    # Assert
+    assert result
+    assert mock_write.call_count == len(sample_non_empty_time_lapse_creator.sources)
+    assert len(sample_non_empty_time_lapse_creator.segment_writers) == len(sample_non_empty_time_lapse_creator.sources)
+    mock_imwrite.assert_not_called()
+
+
+def test_collect_images_from_webcams_corrects_the_images_count_to_the_frames_of_the_video(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Arrange
+    bools = [True, True]
+
+    def mock_bool():
+        if len(bools) > 0:
+            return bools.pop(0)
+        else:
+            return False
+
+    sample_non_empty_time_lapse_creator.incremental_video = True
+    sample_non_empty_time_lapse_creator.delete_collected_daily_images = True
+    sample_non_empty_time_lapse_creator._fresh = False
+    for source in sample_non_empty_time_lapse_creator.sources:
+        # e.g. the cached count of a process which was killed with an open segment
+        source.set_images_count(10)
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.Path.mkdir",
+            return_value=None,
+        ),
+        patch(
+            "src.automatic_time_lapse_creator.source.ImageSource.get_frame",
+            return_value=Frame(encoded=b"some_content"),
+        ),
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.render_image_with_weather_overlay",
+            return_value=np.zeros((VIDEO_HEIGHT_360p, VIDEO_WIDTH_360p, 3), dtype=np.uint8),
+        ),
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.SegmentedVideoWriter.write",
+            return_value=True,
+        ),
+    ):
+        monkeypatch.setattr(
+            sample_non_empty_time_lapse_creator.location, "is_daylight", mock_bool
+        )
+        monkeypatch.setattr(
+            sample_non_empty_time_lapse_creator, "cache_self", tm.mock_None
+        )
+        sample_non_empty_time_lapse_creator.wait_before_next_frame = 0
+
+        # Act
+        sample_non_empty_time_lapse_creator.collect_images_from_webcams()
+
+    # Assert
+    assert all(source.images_count == 1 for source in sample_non_empty_time_lapse_creator.sources)
+
+
 def test_create_video_returns_True_if_video_is_created_and_source_images_are_not_deleted(
     sample_non_empty_time_lapse_creator: TimeLapseCreator,
 ):
@@ -599,8 +757,8 @@ def test_collect_images_from_webcams_returns_True_if_daylight_and_all_images_col
         ),
         patch("builtins.open", mock_file),
         patch(
-            "src.automatic_time_lapse_creator.source.Source.get_frame_bytes",
-            return_value=b"some_content",
+            "src.automatic_time_lapse_creator.source.ImageSource.get_frame",
+            return_value=Frame(encoded=b"some_content"),
         ),
     ):
         monkeypatch.setattr(
@@ -616,6 +774,55 @@ def test_collect_images_from_webcams_returns_True_if_daylight_and_all_images_col
         assert mock_logger.call_count == 2
 
 
+def test_collect_images_from_webcams_saves_raw_frames_in_raw_capture_mode(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Arrange
+    bools = [True, True]
+
+    def mock_bool():
+        if len(bools) > 0:
+            return bools.pop(0)
+        else:
+            return False
+
+    sample_non_empty_time_lapse_creator.raw_capture = True
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.Path.mkdir",
+            return_value=None,
+        ),
+        patch(
+            "src.automatic_time_lapse_creator.source.ImageSource.get_frame",
+            return_value=Frame(encoded=b"some_content"),
+        ),
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.save_raw_frame",
+            return_value=True,
+        ) as mock_save_raw,
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.save_image_with_weather_overlay",
+        ) as mock_save_image,
+    ):
+        monkeypatch.setattr(
+            sample_non_empty_time_lapse_creator.location, "is_daylight", mock_bool
+        )
+        monkeypatch.setattr(
+            sample_non_empty_time_lapse_creator, "cache_self", tm.mock_None
+        )
+        sample_non_empty_time_lapse_creator.wait_before_next_frame = 0
+
+        # Act
+        result = sample_non_empty_time_lapse_creator.collect_images_from_webcams()
+
+    # Assert
+    assert result
+    assert mock_save_raw.call_count == len(sample_non_empty_time_lapse_creator.sources)
+    mock_save_image.assert_not_called()
+
+
 def test_collect_images_from_webcams_returns_True_even_if_request_returns_Exception(
     sample_non_empty_time_lapse_creator: TimeLapseCreator,
     monkeypatch: pytest.MonkeyPatch,
@@ -636,7 +843,7 @@ def test_collect_images_from_webcams_returns_True_even_if_request_returns_Except
             return_value=None,
         ),
         patch(
-            "src.automatic_time_lapse_creator.source.Source.get_frame_bytes",
+            "src.automatic_time_lapse_creator.source.ImageSource.get_frame",
             return_value=Exception,
         ),
         patch("builtins.open", mock_file),
@@ -702,6 +909,90 @@ def test_execute_sleeps_if_images_are_not_collected(
         )
 
 
+def test_execute_closes_the_weather_hub_when_the_loop_fails(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Arrange
+    hub = MagicMock()
+    sample_non_empty_time_lapse_creator._weather_hub = hub
+    monkeypatch.setattr(
+        sample_non_empty_time_lapse_creator, "verify_sources_not_empty", lambda: True
+    )
+
+    def _fail():
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(
+        sample_non_empty_time_lapse_creator, "collect_images_from_webcams", _fail
+    )
+
+    # Act
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.cache_manager.CacheManager.get",
+            return_value=sample_non_empty_time_lapse_creator,
+        ),
+        pytest.raises(RuntimeError),
+    ):
+        sample_non_empty_time_lapse_creator.execute()
+
+    # Assert
+    hub.close.assert_called_once()
+    assert sample_non_empty_time_lapse_creator._weather_hub is None
+
+
+def test_execute_limits_the_opencv_threads_of_the_worker_priority(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Arrange
+    sample_non_empty_time_lapse_creator.worker_priority = WorkerPriority(opencv_threads=2)
+    monkeypatch.setattr(sample_non_empty_time_lapse_creator, "verify_sources_not_empty", lambda: True)
+
+    def _interrupt():
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(sample_non_empty_time_lapse_creator, "collect_images_from_webcams", _interrupt)
+
+    # Act
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.cache_manager.CacheManager.get",
+            return_value=sample_non_empty_time_lapse_creator,
+        ),
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.cv2.setNumThreads") as mock_set_threads,
+    ):
+        sample_non_empty_time_lapse_creator.execute()
+
+    # Assert
+    mock_set_threads.assert_called_once_with(2)
+
+
+def test_a_creator_cached_by_an_older_version_gets_the_defaults_of_the_new_attributes(tmp_path: Path):
+    # Arrange
+    source = ImageSource("cached_source", "https://example.com/cached.jpg", skip_validation=True)
+    creator = TimeLapseCreator([source], path=str(tmp_path))
+    state = creator.__getstate__()
+    for attr in (*TimeLapseCreator._STATE_DEFAULTS, *TimeLapseCreator._TRANSIENT_ATTRIBUTES, "job_concurrency"):
+        del state[attr]
+    source_state = source.__dict__.copy()
+    del source_state["_annual_video_created"]
+    state["sources"] = {ImageSource.__new__(ImageSource)}
+    next(iter(state["sources"])).__setstate__(source_state)
+    restored = TimeLapseCreator.__new__(TimeLapseCreator)
+
+    # Act
+    restored.__setstate__(state)
+
+    # Assert
+    assert restored.storage is None and not restored.use_job_queue and not restored.frame_manifest
+    assert restored._weather_hub is None and restored._job_queue is None
+    assert restored.job_concurrency == creator.job_concurrency
+    assert not next(iter(restored.sources)).annual_video_created
+    assert isinstance(restored.weather_hub, WeatherHub)
+
+
 def test_execute_creates_video_for_every_source_when_all_images_are_collected():
     # Arrange, Act & Assert
     with (
@@ -748,7 +1039,9 @@ def test_execute_creates_video_for_every_source_when_all_images_are_collected():
             fake_non_empty_time_lapse_creator.sources
         )
         for source in fake_non_empty_time_lapse_creator.sources:
-            mock_create_video.assert_called_once_with(source, fake_non_empty_time_lapse_creator.delete_collected_daily_images)
+            mock_create_video.assert_called_once_with(
+                source, delete_source_images=fake_non_empty_time_lapse_creator.delete_collected_daily_images
+            )
             assert source.daily_video_created
 
         # Tear down
@@ -1245,6 +1538,10 @@ def test_create_weekly_or_monthly_video_creates_monthly_video_and_keeps_existing
             video_paths=video_files,
             output_video_path=output_video_name,
             fps=DEFAULT_VIDEO_FPS,
+            encoder_settings=sample_non_empty_time_lapse_creator.encoder_settings,
+            frames_per_video=None,
+            target_duration_seconds=None,
+            storage=None,
         )
         mock_shorten.assert_called_once_with(output_video_name)
         assert mock_delete_media_files.call_count == 0
@@ -1314,6 +1611,10 @@ def test_create_weekly_or_monthly_video_creates_weekly_video_and_keeps_existing_
             video_paths=video_files,
             output_video_path=output_video_name,
             fps=DEFAULT_VIDEO_FPS,
+            encoder_settings=sample_non_empty_time_lapse_creator.encoder_settings,
+            frames_per_video=None,
+            target_duration_seconds=None,
+            storage=None,
         )
         mock_shorten.assert_called_once_with(output_video_name)
         assert mock_delete_media_files.call_count == 0
@@ -1415,6 +1716,10 @@ def test_create_weekly_or_monthly_video_deletes_source_files_for_monthly_summary
             video_paths=video_files,
             output_video_path=output_video_name,
             fps=DEFAULT_VIDEO_FPS,
+            encoder_settings=sample_non_empty_time_lapse_creator.encoder_settings,
+            frames_per_video=None,
+            target_duration_seconds=None,
+            storage=None,
         )
         assert mock_delete_source_media_files.call_count == len(video_files)
         for video_path in video_files:
@@ -1825,4 +2130,861 @@ def test_add_metadata_to_weekly_video_type(
     assert expected_result.location_sunset_offset_minutes is not None
     assert expected_result.location_sunrise_offset_minutes is not None
     assert expected_result.nighttime_wait_before_next_retry is not None
-    assert expected_result.delete_daily_videos_after_monthly_summary_is_created is not None
\ No newline at end of file
+    assert expected_result.delete_daily_videos_after_monthly_summary_is_created is not None
+
+def test_getstate_drops_weather_hub(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator,
+):
+    # Arrange
+    hub = sample_non_empty_time_lapse_creator.weather_hub
+
+    # Act
+    state = sample_non_empty_time_lapse_creator.__getstate__()
+
+    # Assert
+    assert isinstance(hub, WeatherHub)
+    assert state["_weather_hub"] is None
+    assert sample_non_empty_time_lapse_creator._weather_hub is hub
+    hub.close()
+
+
+def test_create_weekly_or_monthly_video_passes_the_summary_sampling(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator,
+):
+    # Arrange
+    sample_non_empty_time_lapse_creator.summary_frames_per_day = 10
+    sample_non_empty_time_lapse_creator.summary_duration_seconds = 60
+    sample_non_empty_time_lapse_creator.delete_daily_videos = False
+
+    with (
+        patch.object(
+            sample_non_empty_time_lapse_creator,
+            "get_video_files_paths",
+            return_value=[td.sample_video_file1, td.sample_video_file2],
+        ),
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.create_monthly_summary_video",
+            return_value=True,
+        ) as mock_create_monthly_summary_video,
+    ):
+        # Act
+        sample_non_empty_time_lapse_creator.create_weekly_or_monthly_video(
+            td.sample_base_path, td.sample_year, td.sample_month_january, frames_per_day=5
+        )
+
+    # Assert
+    kwargs = mock_create_monthly_summary_video.call_args.kwargs
+    assert kwargs["frames_per_video"] == 5
+    assert kwargs["target_duration_seconds"] == 60
+
+
+def test_create_annual_video_uses_the_monthly_summaries(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator, tmp_path: Path
+):
+    # Arrange
+    sample_non_empty_time_lapse_creator.logger = MagicMock()
+    for month in ("01", "02", "12"):
+        monthly_folder = tmp_path / f"{td.sample_year}-{month}"
+        monthly_folder.mkdir()
+        (monthly_folder / f"{td.sample_year}-{month}{MP4_FILE}").touch()
+    (tmp_path / f"{td.sample_year}-03-01").mkdir()
+    sample_non_empty_time_lapse_creator.annual_summary_duration_seconds = 120
+
+    with patch(
+        "src.automatic_time_lapse_creator.time_lapse_creator.vm.create_monthly_summary_video",
+        return_value=True,
+    ) as mock_create_summary:
+        # Act
+        video_folder, video_files_count = sample_non_empty_time_lapse_creator.create_annual_video(
+            str(tmp_path), td.sample_year
+        )
+
+    # Assert
+    assert video_folder == str(tmp_path / td.sample_year)
+    assert video_files_count == 3
+    kwargs = mock_create_summary.call_args.kwargs
+    assert [Path(path).name for path in kwargs["video_paths"]] == [
+        f"{td.sample_year}-{month}{MP4_FILE}" for month in ("01", "02", "12")
+    ]
+    assert kwargs["output_video_path"] == str(tmp_path / td.sample_year / f"{td.sample_year}{MP4_FILE}")
+    assert kwargs["target_duration_seconds"] == 120
+
+
+def test_create_annual_video_returns_none_without_monthly_summaries(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator, tmp_path: Path
+):
+    # Arrange
+    sample_non_empty_time_lapse_creator.logger = MagicMock()
+    with patch(
+        "src.automatic_time_lapse_creator.time_lapse_creator.vm.create_monthly_summary_video"
+    ) as mock_create_summary:
+        # Act
+        result = sample_non_empty_time_lapse_creator.create_annual_video(str(tmp_path), td.sample_year)
+
+    # Assert
+    assert result == (None, None)
+    mock_create_summary.assert_not_called()
+    sample_non_empty_time_lapse_creator.logger.warning.assert_called_once()
+
+
+def test_process_annual_summary_creates_videos_and_sends_to_queue(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator,
+):
+    # Arrange
+    mock_video_queue = MagicMock(spec=Queue)
+    sample_non_empty_time_lapse_creator.video_queue = mock_video_queue
+
+    with (
+        patch.object(
+            sample_non_empty_time_lapse_creator,
+            "get_previous_year_and_month",
+            return_value=(td.sample_year, "12"),
+        ),
+        patch.object(
+            sample_non_empty_time_lapse_creator,
+            "create_annual_video",
+            return_value=(td.sample_folder_path, 12),
+        ) as mock_create_video,
+        patch.object(sample_non_empty_time_lapse_creator, "cache_self", return_value=None),
+    ):
+        # Act
+        sample_non_empty_time_lapse_creator.process_annual_summary()
+
+    # Assert
+    assert mock_create_video.call_count == len(sample_non_empty_time_lapse_creator.sources)
+    assert mock_video_queue.put.call_count == len(sample_non_empty_time_lapse_creator.sources)
+    assert VideoType.ANNUALLY.value in mock_video_queue.put.call_args.args[0]
+    for src in sample_non_empty_time_lapse_creator.sources:
+        mock_create_video.assert_any_call(
+            os.path.join(sample_non_empty_time_lapse_creator.base_path, src.location_name), td.sample_year
+        )
+        assert src.annual_video_created
+
+    # Tear down
+    [src.reset_annual_video_created() for src in sample_non_empty_time_lapse_creator.sources]
+
+
+def test_process_annual_summary_waits_for_december(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator,
+):
+    # Arrange
+    with (
+        patch.object(
+            sample_non_empty_time_lapse_creator,
+            "get_previous_year_and_month",
+            return_value=(td.sample_year, td.sample_month_january),
+        ),
+        patch.object(sample_non_empty_time_lapse_creator, "create_annual_video") as mock_create_video,
+    ):
+        # Act
+        sample_non_empty_time_lapse_creator.process_annual_summary()
+
+    # Assert
+    mock_create_video.assert_not_called()
+
+
+def test_create_daily_videos_runs_the_largest_jobs_first_and_posts_every_video(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator,
+):
+    # Arrange
+    from concurrent.futures import ThreadPoolExecutor
+
+    sources = sorted(sample_non_empty_time_lapse_creator.sources, key=lambda source: source.location_name)
+    for count, source in enumerate(sources):
+        source.reset_images_counter()
+        for _ in range(count + 1):
+            source.increase_images()
+    sample_non_empty_time_lapse_creator.video_workers = 2
+    mock_video_queue = MagicMock(spec=Queue)
+    sample_non_empty_time_lapse_creator.video_queue = mock_video_queue
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.ProcessPoolExecutor",
+            ThreadPoolExecutor,
+        ),
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.video_exists",
+            return_value=False,
+        ),
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.create_timelapse",
+            return_value=True,
+        ) as mock_create_timelapse,
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.delete_source_media_files",
+        ) as mock_delete,
+        patch.object(sample_non_empty_time_lapse_creator, "cache_self", return_value=None) as mock_cache,
+    ):
+        # Act
+        sample_non_empty_time_lapse_creator.create_daily_videos([(source, source is sources[0]) for source in sources])
+
+    # Assert
+    submitted_folders = [call.args[1] for call in mock_create_timelapse.call_args_list]
+    assert [Path(folder).parts[-2] for folder in submitted_folders] == [
+        source.location_name for source in reversed(sources)
+    ]
+    mock_delete.assert_called_once()
+    assert mock_video_queue.put.call_count == len(sources)
+    assert mock_cache.call_count == len(sources)
+    assert all(source.daily_video_created for source in sources)
+
+    # Tear down
+    for source in sources:
+        source.reset_images_counter()
+        source.reset_daily_video_created()
+
+
+def test_create_daily_videos_in_worker_processes(
+    sample_non_empty_time_lapse_creator: TimeLapseCreator, tmp_path: Path
+):
+    # Arrange
+    sample_non_empty_time_lapse_creator.video_workers = 2
+    sample_non_empty_time_lapse_creator.base_path = str(tmp_path)
+    sources = list(sample_non_empty_time_lapse_creator.sources)
+
+    with patch.object(sample_non_empty_time_lapse_creator, "cache_self") as mock_cache:
+        # Act
+        sample_non_empty_time_lapse_creator.create_daily_videos([(source, False) for source in sources])
+
+    # Assert - the folders are empty, so the workers return False and nothing is posted
+    mock_cache.assert_not_called()
+    assert not any(source.daily_video_created for source in sources)
+
+
+def test_create_daily_videos_with_job_queue_runs_the_videos_as_jobs(tmp_path: Path):
+    # Arrange
+    source = ImageSource("job_camera", "https://example.com/job_camera.jpg", skip_validation=True)
+    creator = TimeLapseCreator([source], path=str(tmp_path), use_job_queue=True)
+    mock_video_queue = MagicMock(spec=Queue)
+    creator.video_queue = mock_video_queue
+
+    def create_timelapse(logger: Logger, folder: str, output_video: str, *args: object) -> bool:
+        Path(output_video).write_bytes(b"video")
+        return True
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.create_timelapse",
+            side_effect=create_timelapse,
+        ) as mock_create_timelapse,
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.delete_source_media_files",
+        ) as mock_delete,
+        patch.object(creator, "cache_self") as mock_cache,
+    ):
+        Path(creator.base_path, source.location_name, creator.folder_name).mkdir(parents=True)
+
+        # Act
+        creator.create_daily_videos([(source, True)])
+        creator.create_daily_videos([(source, True)])
+        queued_before_run = mock_create_timelapse.call_count
+        jobs_run = creator.job_pool.run_pending()
+        # the video job is run again, e.g. it was interrupted before it was marked as done
+        creator.job_queue._connection.execute(
+            "UPDATE jobs SET status = ? WHERE job_type = ?", (JobStatus.PENDING.value, VideoType.DAILY.value)
+        )
+        jobs_rerun = creator.job_pool.run_pending()
+
+    # Assert
+    assert source.daily_video_created
+    assert queued_before_run == 0
+    assert jobs_run == 2
+    assert jobs_rerun == 1
+    output_video = mock_create_timelapse.call_args.args[2]
+    assert PART_FILE_SUFFIX in output_video
+    assert not os.path.exists(output_video)
+    assert Path(creator.base_path, source.location_name, creator.folder_name, f"{creator.folder_name}{MP4_FILE}").exists()
+    assert mock_create_timelapse.call_count == 1
+    assert mock_delete.call_count == 2
+    mock_video_queue.put.assert_called_once()
+    assert mock_cache.call_count == 2
+    assert creator.job_queue.counts()[JobStatus.DONE] == 2
+    assert creator.job_queue.get(f"{UPLOAD_JOB_TYPE}:{VideoType.DAILY.value}:job_camera:{creator.folder_name}") is not None
+
+    # Tear down
+    creator.job_queue.close()
+
+
+def test_daily_video_job_uploads_the_renamed_video_to_the_storage(tmp_path: Path):
+    # Arrange
+    from tests.test_storage import FakeS3Client
+
+    source = ImageSource("job_camera", "https://example.com/job_camera.jpg", skip_validation=True)
+    client = FakeS3Client()
+    storage = S3Storage(tmp_path, "bucket", client=client)
+    creator = TimeLapseCreator([source], path=str(tmp_path), use_job_queue=True, storage=storage)
+
+    def create_timelapse(logger: Logger, folder: str, output_video: str, *args: object) -> bool:
+        Path(output_video).write_bytes(b"video")
+        return True
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.create_timelapse",
+            side_effect=create_timelapse,
+        ),
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.vm.delete_source_media_files"),
+        patch.object(creator, "cache_self"),
+    ):
+        Path(creator.base_path, source.location_name, creator.folder_name).mkdir(parents=True)
+
+        # Act
+        creator.create_daily_videos([(source, False)])
+        creator.job_pool.run_pending()
+
+    # Assert
+    key = f"{source.location_name}/{creator.folder_name}/{creator.folder_name}{MP4_FILE}"
+    assert client.objects == {f"bucket/{key}": b"video"}
+
+    # Tear down
+    creator.job_queue.close()
+
+
+def test_create_video_keeps_the_images_which_are_not_stored_yet(tmp_path: Path):
+    # Arrange
+    source = ImageSource("stored_source", "https://example.com/stored.jpg", skip_validation=True)
+    storage = MagicMock()
+    creator = TimeLapseCreator([source], path=str(tmp_path), storage=storage)
+    input_folder = str(tmp_path / source.location_name / creator.folder_name)
+    storage.pending.return_value = [os.path.join(input_folder, f"12_00_00{JPG_FILE}")]
+
+    with (
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.vm.video_exists", return_value=False),
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.vm.create_timelapse", return_value=True),
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.vm.delete_source_media_files") as mock_delete,
+    ):
+        # Act
+        created = creator.create_video(source, delete_source_images=True)
+
+    # Assert
+    assert created
+    storage.flush.assert_called_once()
+    storage.pending.assert_called_once_with(input_folder)
+    mock_delete.assert_not_called()
+
+
+def test_daily_video_job_is_retried_if_the_video_is_not_stored(tmp_path: Path):
+    # Arrange
+    source = ImageSource("job_camera", "https://example.com/job_camera.jpg", skip_validation=True)
+    storage = MagicMock()
+    storage.store_video.side_effect = [None, "s3://bucket/video"]
+    creator = TimeLapseCreator([source], path=str(tmp_path), use_job_queue=True, storage=storage)
+
+    def create_timelapse(logger: Logger, folder: str, output_video: str, *args: object) -> bool:
+        Path(output_video).write_bytes(b"video")
+        return True
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.create_timelapse",
+            side_effect=create_timelapse,
+        ) as mock_create_timelapse,
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.vm.delete_source_media_files"),
+        patch.object(creator, "cache_self"),
+    ):
+        Path(creator.base_path, source.location_name, creator.folder_name).mkdir(parents=True)
+
+        # Act
+        creator.create_daily_videos([(source, False)])
+        creator.job_pool.run_pending()
+        creator.job_queue._connection.execute("UPDATE jobs SET run_after = 0")
+        creator.job_pool.run_pending()
+
+    # Assert
+    assert mock_create_timelapse.call_count == 1
+    assert storage.store_video.call_count == 2
+    assert creator.job_queue.counts()[JobStatus.DONE] == 2
+
+    # Tear down
+    creator.job_queue.close()
+
+
+def test_time_lapse_creator_with_job_queue_can_be_pickled(tmp_path: Path):
+    # Arrange
+    import pickle
+
+    creator = TimeLapseCreator(path=str(tmp_path), use_job_queue=True)
+    _ = creator.job_pool
+
+    # Act
+    restored = pickle.loads(pickle.dumps(creator))
+
+    # Assert
+    assert restored._job_queue is None
+    assert restored._job_pool is None
+    assert creator._job_queue is not None
+
+    # Tear down
+    creator.job_queue.close()
+
+
+def test_process_monthly_summary_with_job_queue_enqueues_the_summaries(tmp_path: Path):
+    # Arrange
+    source = ImageSource("job_camera", "https://example.com/job_camera.jpg", skip_validation=True)
+    creator = TimeLapseCreator([source], path=str(tmp_path), use_job_queue=True)
+
+    with (
+        patch.object(creator, "get_previous_year_and_month", return_value=(td.sample_year, td.sample_month_january)),
+        patch.object(creator, "create_weekly_or_monthly_video", return_value=(td.sample_folder_path, 20)) as mock_create,
+        patch.object(creator, "cache_self"),
+    ):
+        # Act
+        creator.process_monthly_summary()
+        mock_create.assert_not_called()
+        creator.job_pool.run_pending()
+
+    # Assert
+    mock_create.assert_called_once_with(
+        os.path.join(creator.base_path, source.location_name), td.sample_year, td.sample_month_january, weekly=False
+    )
+    assert source.monthly_video_created
+    assert source.daily_videos_count == 20
+    job = creator.job_queue.get(f"{VideoType.MONTHLY.value}:{source.location_name}:{td.sample_year}-{td.sample_month_january}")
+    assert job is not None and job.status == JobStatus.DONE
+
+    # Tear down
+    creator.job_queue.close()
+
+
+def test_create_video_encodes_in_a_worker_thread_with_the_worker_priority(tmp_path: Path):
+    # Arrange
+    import threading
+
+    source = ImageSource("priority_camera", "https://example.com/priority_camera.jpg", skip_validation=True)
+    priority = WorkerPriority(nice=10)
+    creator = TimeLapseCreator([source], path=str(tmp_path), worker_priority=priority)
+    threads: list[str] = []
+
+    def create_timelapse(*args: object) -> bool:
+        threads.append(threading.current_thread().name)
+        return True
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.time_lapse_creator.vm.create_timelapse",
+            side_effect=create_timelapse,
+        ),
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.apply_worker_priority") as mock_apply,
+        patch.object(creator, "create_weekly_or_monthly_video", return_value=(None, None)) as mock_monthly,
+        patch.object(creator, "get_previous_year_and_month", return_value=(td.sample_year, td.sample_month_january)),
+    ):
+        # Act
+        created = creator.create_video(source, delete_source_images=False)
+        creator.process_monthly_summary()
+
+    # Assert
+    assert created
+    assert len(threads) == 1 and threads[0].startswith("video-worker")
+    assert threads[0] != threading.current_thread().name
+    mock_monthly.assert_called_once()
+    assert mock_apply.call_count == 2
+    assert mock_apply.call_args.args == (priority, False, creator.logger)
+
+
+def test_annual_summary_job_waits_for_the_monthly_summaries_of_its_year(tmp_path: Path):
+    # Arrange
+    source = ImageSource("job_camera", "https://example.com/job_camera.jpg", skip_validation=True)
+    creator = TimeLapseCreator([source], path=str(tmp_path), use_job_queue=True)
+    monthly_key = f"{VideoType.MONTHLY.value}:{source.location_name}:{td.sample_year}-12"
+    annual_key = f"{VideoType.ANNUALLY.value}:{source.location_name}:{td.sample_year}"
+    creator.job_queue.enqueue(VideoType.MONTHLY.value, monthly_key, delay_seconds=60)
+
+    with (
+        patch.object(creator, "create_annual_video", return_value=(td.sample_folder_path, 12)) as mock_create,
+        patch.object(creator, "cache_self"),
+    ):
+        creator.process_annual_summary(td.sample_year)
+
+        # Act
+        creator.job_pool.run_pending()
+        mock_create.assert_not_called()
+        creator.job_queue._connection.execute("UPDATE jobs SET run_after = 0")
+        monthly_job = creator.job_queue.claim([VideoType.MONTHLY.value])
+        assert monthly_job is not None
+        creator.job_queue.complete(monthly_job.id)
+        creator.job_pool.run_pending()
+
+    # Assert
+    mock_create.assert_called_once()
+    job = creator.job_queue.get(annual_key)
+    assert job is not None and job.status == JobStatus.DONE
+    assert job.attempts == 1
+
+    # Tear down
+    creator.job_queue.close()
+
+
+def test_collect_images_from_webcams_appends_the_saved_frames_to_the_manifest(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # Arrange
+    source = ImageSource("manifest_source", "https://example.com/manifest.jpg", skip_validation=True)
+    creator = TimeLapseCreator([source], path=str(tmp_path), frame_manifest=True, text_box_position=None)
+    bools = [True, True]
+    _, encoded = cv2.imencode(JPG_FILE, np.zeros((VIDEO_HEIGHT_360p, VIDEO_WIDTH_360p, 3), dtype=np.uint8))
+
+    with patch(
+        "src.automatic_time_lapse_creator.source.ImageSource.get_frame", return_value=Frame(encoded=encoded.tobytes())
+    ):
+        monkeypatch.setattr(creator.location, "is_daylight", lambda: bools.pop(0) if bools else False)
+        monkeypatch.setattr(creator, "cache_self", tm.mock_None)
+        creator.wait_before_next_frame = 0
+
+        # Act
+        creator.collect_images_from_webcams()
+
+    # Assert
+    manifest = FrameManifest(tmp_path / source.location_name / creator.folder_name)
+    entries = manifest.entries()
+    assert len(entries) == 1
+    assert entries[0].size == (manifest.folder / entries[0].file).stat().st_size
+    assert manifest.verify(entries[0])
+    assert not TimeLapseCreator([source], path=str(tmp_path)).frame_manifest
+
+
+def test_get_cached_self_resumes_the_images_count_from_the_manifests(tmp_path: Path):
+    # Arrange
+    source = ImageSource("resumed_source", "https://example.com/resumed.jpg", skip_validation=True)
+    creator = TimeLapseCreator([source], path=str(tmp_path), frame_manifest=True)
+    folder = tmp_path / source.location_name / creator.folder_name
+    folder.mkdir(parents=True)
+    manifest = FrameManifest(folder)
+    for index in range(3):
+        (folder / f"12_00_0{index}.jpg").write_bytes(b"image")
+        manifest.append(folder / f"12_00_0{index}.jpg")
+
+    # Act
+    with patch(
+        "src.automatic_time_lapse_creator.cache_manager.CacheManager.get",
+        return_value=Exception(),
+    ):
+        result = creator.get_cached_self()
+
+    # Assert
+    assert result is creator
+    assert source.images_count == 3
+    assert source.images_partially_collected
+    assert not creator._fresh
+
+
+def test_media_catalog_records_the_daily_videos_and_selects_the_monthly_summary(tmp_path: Path):
+    # Arrange
+    source = ImageSource("catalog_source", "https://example.com/catalog.jpg", skip_validation=True)
+    creator = TimeLapseCreator([source], path=str(tmp_path), use_media_catalog=True)
+    creator.cache_self = tm.mock_None
+    input_folder = tmp_path / source.location_name / creator.folder_name
+    output_video = input_folder / f"{creator.folder_name}{MP4_FILE}"
+    year, month = creator.folder_name.split("-")[:2]
+
+    with (
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.vm.video_exists", return_value=False),
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.vm.create_timelapse", return_value=True),
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.vm.delete_source_media_files", return_value=True),
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.vm.create_monthly_summary_video", return_value=True)
+        as mock_create_summary,
+        patch.object(TimeLapseCreator, "get_video_files_paths", return_value=[]),
+    ):
+        source.increase_images()
+        creator.set_sources_all_images_collected()
+        frames_recorded = creator.media_catalog.get(input_folder) is not None
+
+        # Act
+        created = creator.create_video(source)
+        new_video, video_files_count = creator.create_weekly_or_monthly_video(
+            str(tmp_path / source.location_name), year, month
+        )
+
+    # Assert
+    assert frames_recorded and created
+    assert new_video is not None and video_files_count == 1
+    assert mock_create_summary.call_args.kwargs["video_paths"] == [str(output_video)]
+    catalog = creator.media_catalog
+    assert catalog.get(input_folder) is None
+    assert catalog.get(output_video) is None
+    assert catalog.paths(source.location_name, VideoType.MONTHLY.value) == [
+        os.path.join(new_video, f"{year}-{month}{MP4_FILE}")
+    ]
+    catalog.close()
+
+
+def test_create_weekly_or_monthly_video_joins_the_recorded_and_the_unrecorded_days(tmp_path: Path):
+    # Arrange
+    source_path = tmp_path / "partly_recorded"
+    creator = TimeLapseCreator(path=str(tmp_path), use_media_catalog=True)
+    _ = creator.media_catalog
+    daily_videos = []
+    for day in ("2025-03-01", "2025-03-02", "2025-03-03"):
+        video = source_path / day / f"{day}{MP4_FILE}"
+        video.parent.mkdir(parents=True)
+        video.write_bytes(b"video")
+        daily_videos.append(str(video))
+    # the second day was created before the catalog was used
+    creator.media_catalog.add("partly_recorded", VideoType.DAILY.value, daily_videos[0], date(2025, 3, 1))
+    creator.media_catalog.add("partly_recorded", VideoType.DAILY.value, daily_videos[2], date(2025, 3, 3))
+
+    with patch(
+        "src.automatic_time_lapse_creator.time_lapse_creator.vm.create_monthly_summary_video", return_value=True
+    ) as mock_create_summary:
+        # Act
+        new_video, video_files_count = creator.create_weekly_or_monthly_video(str(source_path), "2025", "03")
+
+    # Assert
+    assert new_video is not None and video_files_count == 3
+    assert mock_create_summary.call_args.kwargs["video_paths"] == daily_videos
+
+    # Tear down
+    creator.media_catalog.close()
+
+
+def test_collect_images_from_webcams_appends_the_frames_to_the_packed_store(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # Arrange
+    source = ImageSource("packed_source", "https://example.com/packed.jpg", skip_validation=True)
+    creator = TimeLapseCreator([source], path=str(tmp_path), packed_frames=True, text_box_position=None)
+    bools = [True, True, True]
+    image = np.zeros((VIDEO_HEIGHT_360p, VIDEO_WIDTH_360p, 3), dtype=np.uint8)
+
+    with patch("src.automatic_time_lapse_creator.source.ImageSource.get_frame", return_value=Frame(image=image)):
+        monkeypatch.setattr(creator.location, "is_daylight", lambda: bools.pop(0) if bools else False)
+        monkeypatch.setattr(creator, "cache_self", tm.mock_None)
+        creator.wait_before_next_frame = 0
+
+        # Act
+        creator.collect_images_from_webcams()
+
+    # Assert
+    folder = tmp_path / source.location_name / creator.folder_name
+    assert len(PackedFrameStore(folder)) == 2
+    assert not list(folder.glob("*.jpg"))
+    source.reset_images_counter()
+    creator.resume_from_manifests()
+    assert source.images_count == 2
+
+
+def test_collect_images_from_webcams_copies_the_frames_to_the_mapped_store(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # Arrange
+    source = ImageSource("mapped_source", "https://example.com/mapped.jpg", skip_validation=True)
+    creator = TimeLapseCreator(
+        [source], path=str(tmp_path), mapped_frames=True, packed_frames=True,
+        delete_collected_daily_images=False, text_box_position=None,
+    )
+    bools = [True, True, True]
+    image = np.zeros((VIDEO_HEIGHT_360p, VIDEO_WIDTH_360p, 3), dtype=np.uint8)
+
+    with patch("src.automatic_time_lapse_creator.source.ImageSource.get_frame", return_value=Frame(image=image)):
+        monkeypatch.setattr(creator.location, "is_daylight", lambda: bools.pop(0) if bools else False)
+        monkeypatch.setattr(creator, "cache_self", tm.mock_None)
+        creator.wait_before_next_frame = 0
+
+        # Act
+        creator.collect_images_from_webcams()
+
+    # Assert
+    folder = tmp_path / source.location_name / creator.folder_name
+    assert not creator.packed_frames
+    assert creator.delete_collected_daily_images
+    assert len(MappedFrameStore(folder)) == 2
+    assert not PackedFrameStore.exists(folder)
+    assert not list(folder.glob("*.jpg"))
+    source.reset_images_counter()
+    creator.resume_from_manifests()
+    assert source.images_count == 2
+
+
+def test_create_video_deletes_the_images_in_the_background(tmp_path: Path):
+    # Arrange
+    source = ImageSource("background_source", "https://example.com/background.jpg", skip_validation=True)
+    creator = TimeLapseCreator([source], path=str(tmp_path), background_deletion=True)
+    folder = tmp_path / source.location_name / creator.folder_name
+    folder.mkdir(parents=True)
+    (folder / f"12_00_00{JPG_FILE}").write_bytes(b"image")
+
+    # Act
+    with (
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.vm.video_exists", return_value=False),
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.vm.create_timelapse", return_value=True),
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.vm.delete_source_media_files") as mock_delete,
+    ):
+        created = creator.create_video(source)
+    finished = creator.deletion_service.wait(5)
+    creator.deletion_service.close(5)
+
+    # Assert
+    assert created and finished
+    mock_delete.assert_not_called()
+    assert not list(folder.glob(f"*{JPG_FILE}"))
+    assert creator.deletion_service.stats.files == 1
+    assert creator.__getstate__()["_deletion_service"] is None
+
+
+def test_enforce_retention_evicts_the_media_of_the_catalog(tmp_path: Path):
+    # Arrange
+    source = ImageSource("retention_source", "https://example.com/retention.jpg", skip_validation=True)
+    creator = TimeLapseCreator(
+        [source], path=str(tmp_path), retention_policy=RetentionPolicy(max_age_days={VideoType.DAILY.value: 1})
+    )
+    old_video = tmp_path / source.location_name / "2020-01-01" / f"2020-01-01{MP4_FILE}"
+    old_video.parent.mkdir(parents=True)
+    old_video.write_bytes(b"video")
+    creator.media_catalog.add(source.location_name, VideoType.DAILY.value, old_video, dt(2020, 1, 1).date())
+
+    # Act
+    report = creator.enforce_retention()
+
+    # Assert
+    assert creator.use_media_catalog
+    assert report is not None and report.bytes_freed == len(b"video")
+    assert not old_video.exists()
+    assert creator.media_catalog.get(old_video) is None
+    creator.media_catalog.close()
+
+
+def test_media_catalog_records_the_existing_media_once(tmp_path: Path):
+    # Arrange
+    source_folder = tmp_path / "archived_source"
+    frames = source_folder / "2020-01-01"
+    frames.mkdir(parents=True)
+    (frames / f"10_00_00{JPG_FILE}").write_bytes(b"image")
+    (frames / f"2020-01-01{MP4_FILE}").write_bytes(b"daily")
+    weekday = source_folder / "2020" / "2" / "3"
+    weekday.mkdir(parents=True)
+    (weekday / f"2020-01-08{MP4_FILE}").write_bytes(b"daily")
+    (source_folder / "2020" / "2" / f"2020-W2{MP4_FILE}").write_bytes(b"weekly")
+    (source_folder / "2020-01").mkdir()
+    (source_folder / "2020-01" / f"2020-01{MP4_FILE}").write_bytes(b"monthly")
+    (source_folder / "2020" / f"2020{MP4_FILE}").write_bytes(b"annual")
+    (source_folder / "logs").mkdir()
+    creator = TimeLapseCreator(path=str(tmp_path), use_media_catalog=True)
+
+    # Act
+    entries = {(entry.media_type, entry.date, entry.size, entry.items) for entry in creator.media_catalog.find()}
+    creator.media_catalog.remove(frames / f"2020-01-01{MP4_FILE}")
+    creator.media_catalog.close()
+    reopened = TimeLapseCreator(path=str(tmp_path), use_media_catalog=True)
+
+    # Assert
+    assert entries == {
+        (FRAMES_MEDIA_TYPE, "2020-01-01", len(b"image"), 1),
+        (VideoType.DAILY.value, "2020-01-01", len(b"daily"), 0),
+        (VideoType.DAILY.value, "2020-01-08", len(b"daily"), 0),
+        (VideoType.WEEKLY.value, "2020-01-06", len(b"weekly"), 0),
+        (VideoType.MONTHLY.value, "2020-01-01", len(b"monthly"), 0),
+        (VideoType.ANNUALLY.value, "2020-01-01", len(b"annual"), 0),
+    }
+    assert reopened.media_catalog.get(frames / f"2020-01-01{MP4_FILE}") is None
+    assert all(entry.source == "archived_source" for entry in reopened.media_catalog.find())
+
+    # Tear down
+    reopened.media_catalog.close()
+
+
+def test_enforce_retention_deletes_the_frames_in_the_background(tmp_path: Path):
+    # Arrange
+    source = ImageSource("retention_source", "https://example.com/retention.jpg", skip_validation=True)
+    creator = TimeLapseCreator(
+        [source], path=str(tmp_path), retention_policy=RetentionPolicy(max_age_days={FRAMES_MEDIA_TYPE: 1})
+    )
+    old_frames = tmp_path / source.location_name / "2020-01-01"
+    old_frames.mkdir(parents=True)
+    (old_frames / f"10_00_00{JPG_FILE}").write_bytes(b"image")
+    (old_frames / f"2020-01-01{MP4_FILE}").write_bytes(b"video")
+
+    with patch("src.automatic_time_lapse_creator.retention.vm.delete_source_media_files") as mock_delete:
+        # Act
+        report = creator.enforce_retention()
+        creator.deletion_service.wait(5)
+
+    # Assert
+    assert not creator.background_deletion
+    assert report is not None and [entry.path for entry in report.evicted] == [str(old_frames)]
+    mock_delete.assert_not_called()
+    assert not (old_frames / f"10_00_00{JPG_FILE}").exists()
+
+    # Tear down
+    creator.deletion_service.close()
+    creator.media_catalog.close()
+
+
+def test_collect_images_from_webcams_enforces_the_retention_when_the_disk_is_low(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # Arrange
+    source = ImageSource("low_disk_source", "https://example.com/low_disk.jpg", skip_validation=True)
+    creator = TimeLapseCreator(
+        [source], path=str(tmp_path), retention_policy=RetentionPolicy(min_free_bytes=1000), text_box_position=None
+    )
+    bools = [True, True, True, True]
+    image = np.zeros((VIDEO_HEIGHT_360p, VIDEO_WIDTH_360p, 3), dtype=np.uint8)
+
+    with (
+        patch("src.automatic_time_lapse_creator.source.ImageSource.get_frame", return_value=Frame(image=image)),
+        patch("src.automatic_time_lapse_creator.time_lapse_creator.shutil.disk_usage", return_value=MagicMock(free=10)),
+        patch.object(creator, "enforce_retention", return_value=None) as mock_enforce,
+    ):
+        monkeypatch.setattr(creator.location, "is_daylight", lambda: bools.pop(0) if bools else False)
+        monkeypatch.setattr(creator, "cache_self", tm.mock_None)
+        creator.wait_before_next_frame = 0
+
+        # Act
+        creator.collect_images_from_webcams()
+
+    # Assert - the first frame of the day and the first check of the free space
+    assert source.images_count == 3
+    assert mock_enforce.call_count == 2
+
+    # Tear down
+    creator.media_catalog.close()
+
+
+def test_migrate_media_moves_the_old_videos_to_the_cold_tier(tmp_path: Path):
+    # Arrange
+    source = ImageSource("migrated_source", "https://example.com/migrated.jpg", skip_validation=True)
+    cold = tmp_path / "cold"
+    creator = TimeLapseCreator([source], path=str(tmp_path / "base"), migration_policy=MigrationPolicy(str(cold)))
+    old_video = Path(creator.base_path) / source.location_name / "2020-01-01" / f"2020-01-01{MP4_FILE}"
+    old_video.parent.mkdir(parents=True)
+    old_video.write_bytes(b"video")
+    creator.media_catalog.add(source.location_name, VideoType.DAILY.value, old_video, dt(2020, 1, 1).date())
+
+    # Act
+    started = creator.migrate_media()
+    assert creator.tier_migrator is not None
+    finished = creator.tier_migrator.wait(5)
+
+    # Assert
+    assert creator.use_media_catalog
+    assert started and finished
+    target = cold / source.location_name / "2020-01-01" / f"2020-01-01{MP4_FILE}"
+    assert target.read_bytes() == b"video"
+    assert creator.media_catalog.paths(source.location_name, VideoType.DAILY.value) == [str(target)]
+    assert creator.__getstate__()["_tier_migrator"] is None
+    creator.media_catalog.close()
+
+
+def test_collect_images_from_webcams_hands_the_images_to_the_storage(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # Arrange
+    source = ImageSource("stored_source", "https://example.com/stored.jpg", skip_validation=True)
+    storage = MagicMock()
+    creator = TimeLapseCreator([source], path=str(tmp_path), storage=storage, text_box_position=None)
+    bools = [True, True]
+    image = np.zeros((VIDEO_HEIGHT_360p, VIDEO_WIDTH_360p, 3), dtype=np.uint8)
+
+    with patch("src.automatic_time_lapse_creator.source.ImageSource.get_frame", return_value=Frame(image=image)):
+        monkeypatch.setattr(creator.location, "is_daylight", lambda: bools.pop(0) if bools else False)
+        monkeypatch.setattr(creator, "cache_self", tm.mock_None)
+        creator.wait_before_next_frame = 0
+
+        # Act
+        creator.collect_images_from_webcams()
+
+    # Assert
+    folder = tmp_path / source.location_name / creator.folder_name
+    saved = list(folder.glob(f"*{JPG_FILE}"))
+    assert len(saved) == 1
+    storage.store_frame.assert_called_once_with(str(saved[0]))
@@ -3,9 +3,11 @@ from src.automatic_time_lapse_creator.common.utils import (
     create_log_message,
     dash_sep_strings,
     create_description_for_monthly_video,
+    get_jpeg_size,
     DailyVideoResponse,
     MonthlyVideoResponse,
-    WeeklyVideoResponse
+    WeeklyVideoResponse,
+    AnnualVideoResponse,
 )
 from src.automatic_time_lapse_creator.common.constants import (
     DEFAULT_VIDEO_DESCRIPTION,
@@ -16,6 +18,8 @@ from tests.test_data import sample_source_no_weather_data, sample_folder_path, s
 import os
 from unittest.mock import patch
 import json
+import cv2
+import numpy as np
 
 
 def test_daily_video_response_returns_correct_json():
@@ -258,3 +262,40 @@ def test_create_log_message_returns_correct_message_for_unknown_method():
 
     # Assert
     assert expected == result
+
+
+def test_get_jpeg_size_returns_width_and_height():
+    # Arrange
+    _, buffer = cv2.imencode(".jpg", np.zeros((90, 160, 3), dtype=np.uint8))
+
+    # Act
+    result = get_jpeg_size(buffer.tobytes())
+
+    # Assert
+    assert result == (160, 90)
+
+
+def test_get_jpeg_size_returns_None_for_other_formats():
+    # Arrange
+    _, buffer = cv2.imencode(".png", np.zeros((90, 160, 3), dtype=np.uint8))
+
+    # Act & Assert
+    assert get_jpeg_size(buffer.tobytes()) is None
+    assert get_jpeg_size(b"\xff\xd8\xff") is None
+
+
+def test_annual_video_response_returns_correct_json():
+    # Arrange
+    instance = AnnualVideoResponse(
+        video_path=sample_folder_path,
+        video_files_count=sample_count,
+        video_created=True,
+    )
+
+    # Act
+    expected_result = json.loads(instance.to_json())
+
+    # Assert
+    assert expected_result["video_files_count"] == sample_count
+    assert expected_result["video_type"] == VideoType.ANNUALLY.value
+    assert "images_count" not in expected_result
@@ -1,3 +1,4 @@
+import logging
 from logging import Logger
 import os
 from pathlib import Path
@@ -5,10 +6,14 @@ from typing import Any, Generator
 from unittest.mock import patch, MagicMock
 import numpy as np
 import pytest
-from src.automatic_time_lapse_creator.common.utils import shorten
+from src.automatic_time_lapse_creator.common.utils import find_ffmpeg, shorten
 from src.automatic_time_lapse_creator.video_manager import (
     VideoManager as vm,
 )
+from src.automatic_time_lapse_creator.text_box import BottomOutsideTextBox
+from src.automatic_time_lapse_creator.frame import Frame
+from src.automatic_time_lapse_creator.frame_manifest import FrameManifest
+from src.automatic_time_lapse_creator.frame_store import MappedFrameStore, PackedFrameStore
 from src.automatic_time_lapse_creator.common.constants import (
     YYMMDD_FORMAT,
     MP4_FILE,
@@ -16,11 +21,17 @@ from src.automatic_time_lapse_creator.common.constants import (
     VIDEO_WIDTH_360p,
     VIDEO_HEIGHT_360p,
     DEFAULT_VIDEO_FPS,
+    RAW_FILE,
+    FRAMES_METADATA_FILE,
+    FRAMES_MANIFEST_FILE,
+    PART_FILE_SUFFIX,
 )
 from datetime import datetime
 import tests.test_mocks as tm
 import tests.test_data as td
 from cv2 import VideoWriter
+import cv2
+import json
 
 cwd = os.getcwd()
 empty_list: list[Any] = []
@@ -38,6 +49,12 @@ def mock_video_paths():
     return ["video1.mp4", "video2.mp4", "video3.mp4"]
 
 
+@pytest.fixture
+def no_ffmpeg():
+    with patch("src.automatic_time_lapse_creator.video_manager.find_ffmpeg", return_value=None):
+        yield
+
+
 def test_video_exists_returns_true_with_existing_video_file():
     # Arrange
     fake_file_path = f"fake/path/to/video_file{MP4_FILE}"
@@ -148,6 +165,76 @@ def test_create_timelapse_returns_False_if_exception_occurs(mock_logger: MagicMo
         mock_logger.error.assert_called_once()
 
 
+def test_create_timelapse_removes_the_incomplete_video_if_writing_fails(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    for index in range(3):
+        cv2.imwrite(str(tmp_path / f"{index:02d}{JPG_FILE}"), np.zeros((64, 96, 3), dtype=np.uint8))
+    output_video = tmp_path / f"video{MP4_FILE}"
+
+    with patch(
+        "src.automatic_time_lapse_creator.encoders.OpenCVEncoder.write", side_effect=[None, OSError("disk full")]
+    ):
+        # Act
+        result = vm.create_timelapse(mock_logger, tmp_path, str(output_video), tm.mock_video_frames_per_second)
+
+    # Assert
+    assert not result
+    assert not output_video.exists()
+    mock_logger.error.assert_called_once()
+
+
+def test_read_images_returns_images_in_order():
+    # Arrange
+    image_files = [f"{index}{JPG_FILE}" for index in range(20)]
+
+    with patch("cv2.imread", side_effect=lambda path: path) as mock_imread:
+        # Act
+        result = list(vm.read_images(image_files, read_ahead=4, workers=3))
+
+    # Assert
+    assert result == [(image_file, image_file) for image_file in image_files]
+    assert mock_imread.call_count == 20
+
+
+def test_read_images_reads_at_most_read_ahead_images_ahead():
+    # Arrange
+    image_files = [f"{index}{JPG_FILE}" for index in range(20)]
+
+    with patch("cv2.imread", side_effect=lambda path: path) as mock_imread:
+        # Act
+        images = vm.read_images(image_files, read_ahead=4, workers=2)
+        next(images)
+        calls_after_first_image = mock_imread.call_count
+        images.close()
+
+    # Assert
+    assert calls_after_first_image <= 5
+
+
+def test_create_timelapse_skips_images_which_cannot_be_read(mock_logger: MagicMock):
+    # Arrange
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.video_manager.Path.glob",
+            return_value=[f"{index}{JPG_FILE}" for index in range(3)],
+        ),
+        patch("cv2.imread", side_effect=[tm.mock_MatLike, None, tm.mock_MatLike]),
+        patch("cv2.VideoWriter") as mock_writer,
+    ):
+        # Act
+        result = vm.create_timelapse(
+            logger=mock_logger,
+            path=tm.mock_path_to_images_folder,
+            output_video=tm.mock_output_video_name,
+            fps=tm.mock_video_frames_per_second,
+        )
+
+    # Assert
+    assert result
+    assert mock_writer.return_value.write.call_count == 2
+    mock_logger.warning.assert_called_once()
+
+
 def test_delete_source_media_files_returns_True_on_success(mock_logger: MagicMock):
     # Arrange & Act
     with (
@@ -326,6 +413,70 @@ def test_save_image_with_weather_overlay_saves_image_successfully():
         mock_imwrite.assert_called_once()
 
 
+def test_decode_image_decodes_at_reduced_size():
+    # Arrange
+    _, buffer = cv2.imencode(".jpg", np.zeros((1080, 1920, 3), dtype=np.uint8))
+
+    # Act
+    result = vm.decode_image(buffer.tobytes(), VIDEO_WIDTH_360p, VIDEO_HEIGHT_360p)
+
+    # Assert
+    assert result is not None
+    assert result.shape == (540, 960, 3)
+
+
+def test_save_image_with_weather_overlay_reuses_the_output_buffer():
+    # Arrange
+    image = np.full((100, 100, 3), 50, dtype=np.uint8)
+    saved: list[np.ndarray] = []
+
+    with (
+        patch("cv2.imdecode", return_value=image),
+        patch("cv2.imwrite", side_effect=lambda path, img: saved.append(img) or True),
+    ):
+        # Act
+        for _ in range(2):
+            vm.save_image_with_weather_overlay(
+                tm.mock_bytes,
+                tm.mock_save_file_path,
+                VIDEO_WIDTH_360p,
+                VIDEO_HEIGHT_360p,
+                td.sample_date_time_text,
+                td.sample_weather_data_text,
+                text_box_position=BottomOutsideTextBox,
+            )
+
+    # Assert
+    assert saved[0] is saved[1]
+    assert saved[0].shape[0] > VIDEO_HEIGHT_360p
+    assert saved[0].shape[1] == VIDEO_WIDTH_360p
+    assert np.all(saved[0][:VIDEO_HEIGHT_360p] == 50)
+
+
+def test_save_image_with_weather_overlay_uses_the_decoded_image_of_a_frame():
+    # Arrange
+    frame = Frame(image=np.full((VIDEO_HEIGHT_360p, VIDEO_WIDTH_360p, 3), 50, dtype=np.uint8))
+
+    with (
+        patch("cv2.imdecode") as mock_imdecode,
+        patch("cv2.imwrite", return_value=True) as mock_imwrite,
+    ):
+        # Act
+        result = vm.save_image_with_weather_overlay(
+            frame,
+            tm.mock_save_file_path,
+            VIDEO_WIDTH_360p,
+            VIDEO_HEIGHT_360p,
+            td.sample_date_time_text,
+            td.sample_weather_data_text,
+        )
+
+    # Assert
+    assert result
+    mock_imdecode.assert_not_called()
+    mock_imwrite.assert_called_once()
+
+
 def test_save_image_with_weather_overlay_handles_invalid_image():
     # Arrange
     invalid_bytes = b"invalid_bytes"
@@ -409,6 +560,7 @@ def test_create_monthly_summary_video_skips_if_output_exists2(
     mock_logger.warning.assert_called_once_with(f"Video exists, skipping... {shorten(tm.mock_output_video_name)}")
 
 
+@pytest.mark.usefixtures("no_ffmpeg")
 def test_create_monthly_summary_video_creates_video_successfully(
     mock_logger: MagicMock, mock_video_paths: list[str]
 ):
@@ -452,6 +604,7 @@ def test_create_monthly_summary_video_creates_video_successfully(
     mock_video_writer_instance.release.assert_called_once()
 
 
+@pytest.mark.usefixtures("no_ffmpeg")
 def test_create_monthly_summary_video_skips_invalid_videos2(
     mock_logger: MagicMock, mock_video_paths: list[str]
 ):
@@ -490,6 +643,7 @@ def test_create_monthly_summary_video_skips_invalid_videos2(
     mock_video_writer_instance.release.assert_called_once()
 
 
+@pytest.mark.usefixtures("no_ffmpeg")
 def test_create_monthly_summary_video_returns_false_if_no_valid_videos(
     mock_logger: MagicMock,
 ):
@@ -515,6 +669,7 @@ def test_create_monthly_summary_video_returns_false_if_no_valid_videos(
     )
 
 
+@pytest.mark.usefixtures("no_ffmpeg")
 def test_create_monthly_summary_video_handles_exceptions(
     mock_logger: MagicMock, mock_video_paths: list[str]
 ):
@@ -537,3 +692,577 @@ def test_create_monthly_summary_video_skips_if_output_exists(mock_logger: MagicM
     # Act & Assert
     with patch("src.automatic_time_lapse_creator.video_manager.os.path.exists", return_value=True):
         assert not vm.create_monthly_summary_video(mock_logger, mock_video_paths, "output.mp4", mock_logger)
+
+
+def test_save_raw_frame_writes_bytes_and_metadata(tmp_path: Path):
+    # Arrange
+    save_path = tmp_path / f"12_00_00{JPG_FILE}"
+
+    # Act
+    result = vm.save_raw_frame(
+        tm.mock_bytes,
+        str(save_path),
+        VIDEO_WIDTH_360p,
+        VIDEO_HEIGHT_360p,
+        td.sample_date_time_text,
+        td.sample_weather_data_text,
+        text_box_position=BottomOutsideTextBox,
+    )
+
+    # Assert
+    assert result
+    assert (tmp_path / f"12_00_00{RAW_FILE}").read_bytes() == tm.mock_bytes
+    assert not save_path.exists()
+    entry = json.loads((tmp_path / FRAMES_METADATA_FILE).read_text())
+    assert entry["file"] == f"12_00_00{RAW_FILE}"
+    assert entry["text_box_position"] == BottomOutsideTextBox.__name__
+    assert entry["weather_data_text"] == td.sample_weather_data_text
+
+
+def test_process_raw_frames_creates_images_and_is_idempotent(
+    tmp_path: Path, mock_logger: MagicMock
+):
+    # Arrange
+    _, buffer = cv2.imencode(JPG_FILE, np.full((720, 1280, 3), 100, dtype=np.uint8))
+    for name in ("12_00_00", "12_01_00"):
+        vm.save_raw_frame(
+            buffer.tobytes(),
+            str(tmp_path / f"{name}{JPG_FILE}"),
+            VIDEO_WIDTH_360p,
+            VIDEO_HEIGHT_360p,
+            td.sample_date_time_text,
+            text_box_position=BottomOutsideTextBox,
+        )
+
+    # Act
+    first_run = vm.process_raw_frames(mock_logger, tmp_path, workers=2)
+    second_run = vm.process_raw_frames(mock_logger, tmp_path, workers=2)
+
+    # Assert
+    assert first_run == 2
+    assert second_run == 0
+    assert sorted(file.name for file in tmp_path.iterdir()) == [f"12_00_00{JPG_FILE}", f"12_01_00{JPG_FILE}"]
+    image = cv2.imread(str(tmp_path / f"12_00_00{JPG_FILE}"))
+    assert image.shape[1] == VIDEO_WIDTH_360p
+    assert image.shape[0] > VIDEO_HEIGHT_360p
+
+
+def test_process_raw_frames_overwrites_a_leftover_temporary_file(
+    tmp_path: Path, mock_logger: MagicMock
+):
+    # Arrange
+    _, buffer = cv2.imencode(JPG_FILE, np.full((720, 1280, 3), 100, dtype=np.uint8))
+    vm.save_raw_frame(buffer.tobytes(), str(tmp_path / f"12_00_00{JPG_FILE}"), VIDEO_WIDTH_360p, VIDEO_HEIGHT_360p)
+    leftover = tmp_path / f"12_00_00{JPG_FILE}{PART_FILE_SUFFIX}"
+    leftover.write_bytes(b"cut")
+
+    # Act
+    glob_before = list(tmp_path.glob(f"*{JPG_FILE}"))
+    result = vm.process_raw_frames(mock_logger, tmp_path)
+
+    # Assert
+    assert glob_before == []
+    assert result == 1
+    assert not leftover.exists()
+    assert cv2.imread(str(tmp_path / f"12_00_00{JPG_FILE}")) is not None
+
+
+def test_process_raw_frames_deletes_frames_which_cannot_be_processed(
+    tmp_path: Path, mock_logger: MagicMock
+):
+    # Arrange
+    vm.save_raw_frame(b"invalid_bytes", str(tmp_path / f"12_00_00{JPG_FILE}"), VIDEO_WIDTH_360p, VIDEO_HEIGHT_360p)
+
+    # Act
+    result = vm.process_raw_frames(mock_logger, tmp_path)
+
+    # Assert
+    assert result == 0
+    assert list(tmp_path.iterdir()) == []
+    mock_logger.error.assert_called_once()
+
+
+def test_process_raw_frames_stores_the_processed_images(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    _, buffer = cv2.imencode(JPG_FILE, np.full((720, 1280, 3), 100, dtype=np.uint8))
+    vm.save_raw_frame(buffer.tobytes(), str(tmp_path / f"12_00_00{JPG_FILE}"), VIDEO_WIDTH_360p, VIDEO_HEIGHT_360p)
+    storage = MagicMock()
+
+    # Act
+    result = vm.process_raw_frames(mock_logger, tmp_path, storage=storage)
+
+    # Assert
+    assert result == 1
+    storage.store_frame.assert_called_once_with(tmp_path / f"12_00_00{JPG_FILE}")
+
+
+def test_stitch_videos_uses_ffmpeg_stream_copy(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    output_video = str(tmp_path / f"output{MP4_FILE}")
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.video_manager.find_ffmpeg", return_value="ffmpeg"
+        ),
+        patch("subprocess.run", return_value=MagicMock(returncode=0)) as mock_run,
+        patch.object(vm, "create_monthly_summary_video") as mock_transcode,
+    ):
+        # Act
+        result = vm.stitch_videos(mock_logger, ["a.mp4", "b.mp4"], output_video, DEFAULT_VIDEO_FPS)
+
+    # Assert
+    assert result
+    command = mock_run.call_args.args[0]
+    assert command[command.index("-c") + 1] == "copy"
+    assert command[-1] == output_video
+    mock_transcode.assert_not_called()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stitch_videos_transcodes_if_ffmpeg_fails(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    output_video = str(tmp_path / f"output{MP4_FILE}")
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.video_manager.find_ffmpeg", return_value="ffmpeg"
+        ),
+        patch("subprocess.run", return_value=MagicMock(returncode=1, stderr="error")),
+        patch.object(vm, "create_monthly_summary_video", return_value=True) as mock_transcode,
+    ):
+        # Act
+        result = vm.stitch_videos(mock_logger, ["a.mp4", "b.mp4"], output_video, DEFAULT_VIDEO_FPS)
+
+    # Assert
+    assert result
+    mock_transcode.assert_called_once_with(mock_logger, ["a.mp4", "b.mp4"], output_video, DEFAULT_VIDEO_FPS, None)
+    mock_logger.warning.assert_called_once()
+
+
+def test_can_stream_copy_returns_true_for_matching_videos():
+    # Arrange
+    parameters = (cv2.VideoWriter.fourcc(*"mp4v"), VIDEO_WIDTH_360p, VIDEO_HEIGHT_360p, float(DEFAULT_VIDEO_FPS))
+
+    with patch.object(vm, "get_video_parameters", return_value=parameters):
+        # Act & Assert
+        assert vm.can_stream_copy(["a.mp4", "b.mp4"], DEFAULT_VIDEO_FPS)
+        assert not vm.can_stream_copy(["a.mp4", "b.mp4"], DEFAULT_VIDEO_FPS + 1)
+
+
+def test_can_stream_copy_returns_false_for_different_or_unreadable_videos():
+    # Arrange
+    parameters = (cv2.VideoWriter.fourcc(*"mp4v"), VIDEO_WIDTH_360p, VIDEO_HEIGHT_360p, float(DEFAULT_VIDEO_FPS))
+    other_size = (cv2.VideoWriter.fourcc(*"mp4v"), VIDEO_WIDTH_360p * 2, VIDEO_HEIGHT_360p * 2, float(DEFAULT_VIDEO_FPS))
+
+    # Act & Assert
+    with patch.object(vm, "get_video_parameters", side_effect=[parameters, other_size]):
+        assert not vm.can_stream_copy(["a.mp4", "b.mp4"], DEFAULT_VIDEO_FPS)
+    with patch.object(vm, "get_video_parameters", return_value=None):
+        assert not vm.can_stream_copy(["a.mp4", "b.mp4"], DEFAULT_VIDEO_FPS)
+
+
+def test_get_video_parameters_reads_the_container(tmp_path: Path):
+    # Arrange
+    video_path = str(tmp_path / f"video{MP4_FILE}")
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter.fourcc(*"mp4v"), DEFAULT_VIDEO_FPS, (64, 48))
+    for _ in range(3):
+        writer.write(np.zeros((48, 64, 3), dtype=np.uint8))
+    writer.release()
+
+    # Act
+    parameters = vm.get_video_parameters(video_path)
+
+    # Assert
+    assert parameters is not None
+    assert parameters[1:] == (64, 48, float(DEFAULT_VIDEO_FPS))
+    assert vm.get_video_parameters(str(tmp_path / f"missing{MP4_FILE}")) is None
+
+
+def test_transcode_video_keeps_the_size_and_the_frames(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    video_path = str(tmp_path / f"video{MP4_FILE}")
+    output_video = str(tmp_path / f"output{MP4_FILE}")
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter.fourcc(*"mp4v"), DEFAULT_VIDEO_FPS, (64, 48))
+    for _ in range(3):
+        writer.write(np.zeros((48, 64, 3), dtype=np.uint8))
+    writer.release()
+
+    # Act
+    result = vm.transcode_video(mock_logger, video_path, output_video)
+    missing = vm.transcode_video(mock_logger, str(tmp_path / f"missing{MP4_FILE}"), output_video)
+
+    # Assert
+    assert result and not missing
+    cap = cv2.VideoCapture(output_video)
+    assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 3
+    assert int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) == 64
+    cap.release()
+    mock_logger.warning.assert_called_once()
+
+
+def test_create_monthly_summary_video_stream_copies_matching_videos(
+    tmp_path: Path, mock_logger: MagicMock, mock_video_paths: list[str]
+):
+    # Arrange
+    output_video = str(tmp_path / f"output{MP4_FILE}")
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.video_manager.find_ffmpeg", return_value="ffmpeg"
+        ),
+        patch.object(vm, "can_stream_copy", return_value=True),
+        patch("subprocess.run", return_value=MagicMock(returncode=0)) as mock_run,
+        patch("cv2.VideoCapture") as mock_capture,
+    ):
+        # Act
+        result = vm.create_monthly_summary_video(mock_logger, mock_video_paths, output_video, DEFAULT_VIDEO_FPS)
+
+    # Assert
+    assert result
+    command = mock_run.call_args.args[0]
+    assert command[command.index("-c") + 1] == "copy"
+    mock_capture.assert_not_called()
+
+
+def test_create_monthly_summary_video_orders_the_videos_of_the_base_and_the_cold_root_by_day(
+    tmp_path: Path, mock_logger: MagicMock
+):
+    # Arrange
+    output_video = str(tmp_path / f"output{MP4_FILE}")
+    video_paths = [
+        "/base/source/2020-01-02/2020-01-02.mp4",
+        "/base/source/2020-01-03/2020-01-03.mp4",
+        "/archive/source/2020-01-01/2020-01-01.mp4",
+    ]
+    passed_paths = list(video_paths)
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.video_manager.find_ffmpeg", return_value=None
+        ),
+        patch("cv2.VideoCapture") as mock_capture,
+        patch("cv2.VideoWriter"),
+    ):
+        mock_capture.return_value.isOpened.return_value = True
+        mock_capture.return_value.read.side_effect = [(True, tm.mock_MatLike), (False, None)] * 3
+
+        # Act
+        result = vm.create_monthly_summary_video(mock_logger, video_paths, output_video, DEFAULT_VIDEO_FPS)
+
+    # Assert
+    assert result
+    assert [call.args[0] for call in mock_capture.call_args_list] == [
+        "/archive/source/2020-01-01/2020-01-01.mp4",
+        "/base/source/2020-01-02/2020-01-02.mp4",
+        "/base/source/2020-01-03/2020-01-03.mp4",
+    ]
+    assert video_paths == passed_paths
+
+
+def test_create_monthly_summary_video_transcodes_videos_with_different_parameters(
+    tmp_path: Path, mock_logger: MagicMock, mock_video_paths: list[str]
+):
+    # Arrange
+    output_video = str(tmp_path / f"output{MP4_FILE}")
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.video_manager.find_ffmpeg", return_value="ffmpeg"
+        ),
+        patch.object(vm, "can_stream_copy", return_value=False),
+        patch("subprocess.run") as mock_run,
+        patch("cv2.VideoCapture") as mock_capture,
+        patch("cv2.VideoWriter") as mock_writer,
+    ):
+        mock_capture.return_value.isOpened.return_value = True
+        mock_capture.return_value.read.side_effect = [(True, tm.mock_MatLike), (False, None)] * 3
+
+        # Act
+        result = vm.create_monthly_summary_video(mock_logger, mock_video_paths, output_video, DEFAULT_VIDEO_FPS)
+
+    # Assert
+    assert result
+    mock_run.assert_not_called()
+    assert mock_writer.return_value.write.call_count == 3
+
+
+def test_get_frames_per_video():
+    # Act & Assert
+    assert vm.get_frames_per_video(30, DEFAULT_VIDEO_FPS) is None
+    assert vm.get_frames_per_video(30, DEFAULT_VIDEO_FPS, frames_per_video=20) == 20
+    assert vm.get_frames_per_video(30, 30, target_duration_seconds=60) == 60
+    assert vm.get_frames_per_video(30, 30, frames_per_video=20, target_duration_seconds=60) == 20
+    assert vm.get_frames_per_video(30, 30, target_duration_seconds=0.1) == 1
+
+
+def test_read_video_frames_samples_evenly_spaced_frames(tmp_path: Path):
+    # Arrange
+    video_path = str(tmp_path / f"video{MP4_FILE}")
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter.fourcc(*"mp4v"), DEFAULT_VIDEO_FPS, (64, 48))
+    for _ in range(100):
+        writer.write(np.zeros((48, 64, 3), dtype=np.uint8))
+    writer.release()
+
+    # Act
+    cap = cv2.VideoCapture(video_path)
+    sampled = list(vm.read_video_frames(cap, 4))
+    cap.release()
+    cap = cv2.VideoCapture(video_path)
+    all_frames = list(vm.read_video_frames(cap))
+    cap.release()
+
+    # Assert
+    assert len(sampled) == 4
+    assert sampled[0].shape == (48, 64, 3)
+    assert len(all_frames) == 100
+
+
+def test_read_video_frames_grabs_short_gaps_and_seeks_long_gaps():
+    # Arrange
+    cap = MagicMock()
+    cap.get.return_value = 100
+    cap.grab.return_value = True
+    cap.read.return_value = (True, tm.mock_MatLike)
+
+    # Act
+    short_gaps = list(vm.read_video_frames(cap, 50))
+    grabs = cap.grab.call_count
+    cap.reset_mock()
+    long_gaps = list(vm.read_video_frames(cap, 2))
+
+    # Assert
+    assert len(short_gaps) == 50
+    assert grabs == 49
+    assert len(long_gaps) == 2
+    cap.set.assert_called_once_with(cv2.CAP_PROP_POS_FRAMES, 50)
+    cap.grab.assert_not_called()
+
+
+def test_create_monthly_summary_video_does_not_stream_copy_sampled_summaries(
+    tmp_path: Path, mock_logger: MagicMock, mock_video_paths: list[str]
+):
+    # Arrange
+    output_video = str(tmp_path / f"output{MP4_FILE}")
+
+    with (
+        patch(
+            "src.automatic_time_lapse_creator.video_manager.find_ffmpeg", return_value="ffmpeg"
+        ),
+        patch.object(vm, "can_stream_copy", return_value=True) as mock_can_stream_copy,
+        patch.object(vm, "read_video_frames", return_value=iter([tm.mock_MatLike])) as mock_read_frames,
+        patch("cv2.VideoCapture") as mock_capture,
+        patch("cv2.VideoWriter"),
+    ):
+        mock_capture.return_value.isOpened.return_value = True
+
+        # Act
+        result = vm.create_monthly_summary_video(
+            mock_logger, mock_video_paths, output_video, DEFAULT_VIDEO_FPS, frames_per_video=10
+        )
+
+    # Assert
+    assert result
+    mock_can_stream_copy.assert_not_called()
+    assert mock_read_frames.call_args.args[1] == 10
+
+
+@pytest.mark.skipif(find_ffmpeg() is None, reason="the chunks are joined with ffmpeg")
+def test_create_timelapse_in_chunks_keeps_the_frames_and_their_order(tmp_path: Path):
+    # Arrange
+    logger = logging.getLogger(__name__)  # a mock can't be sent to the worker processes
+    brightness = list(range(20, 240, 10))
+    for index, value in enumerate(brightness):
+        cv2.imwrite(str(tmp_path / f"12_{index:02d}_00{JPG_FILE}"), np.full((48, 64, 3), value, dtype=np.uint8))
+    serial_video = str(tmp_path / f"serial{MP4_FILE}")
+    chunked_video = str(tmp_path / f"chunked{MP4_FILE}")
+
+    with (
+        patch("src.automatic_time_lapse_creator.video_manager.MIN_FRAMES_PER_CHUNK", 5),
+        patch.object(vm, "_concat_videos", wraps=vm._concat_videos) as mock_concat,
+        patch.object(vm, "create_monthly_summary_video") as mock_transcode,
+    ):
+        # Act
+        serial = vm.create_timelapse(logger, tmp_path, serial_video, DEFAULT_VIDEO_FPS)
+        chunked = vm.create_timelapse(logger, tmp_path, chunked_video, DEFAULT_VIDEO_FPS, chunks=3)
+
+    # Assert
+    def frames_brightness(video: str) -> list[float]:
+        cap = cv2.VideoCapture(video)
+        frames = [float(frame.mean()) for frame in vm.read_video_frames(cap)]
+        cap.release()
+        return frames
+
+    assert serial and chunked
+    mock_concat.assert_called_once()
+    mock_transcode.assert_not_called()
+    serial_frames = frames_brightness(serial_video)
+    chunked_frames = frames_brightness(chunked_video)
+    assert len(chunked_frames) == len(serial_frames) == len(brightness)
+    # the codec is lossy, but every frame must stay closer to its own image than to the neighbours
+    assert all(abs(chunked - serial) < 5 for chunked, serial in zip(chunked_frames, serial_frames))
+    assert chunked_frames == sorted(chunked_frames)
+    assert sorted(path.name for path in tmp_path.glob(f"*{MP4_FILE}")) == [f"chunked{MP4_FILE}", f"serial{MP4_FILE}"]
+
+
+def test_create_timelapse_encodes_serially_without_ffmpeg(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    for index in range(10):
+        cv2.imwrite(str(tmp_path / f"12_{index:02d}_00{JPG_FILE}"), np.zeros((48, 64, 3), dtype=np.uint8))
+
+    with (
+        patch("src.automatic_time_lapse_creator.video_manager.MIN_FRAMES_PER_CHUNK", 5),
+        patch("src.automatic_time_lapse_creator.video_manager.find_ffmpeg", return_value=None),
+        patch.object(vm, "encode_in_chunks") as mock_encode_in_chunks,
+    ):
+        # Act
+        result = vm.create_timelapse(mock_logger, tmp_path, str(tmp_path / f"video{MP4_FILE}"), DEFAULT_VIDEO_FPS, chunks=2)
+
+    # Assert
+    assert result
+    mock_encode_in_chunks.assert_not_called()
+
+
+def test_encode_in_chunks_encodes_the_images_serially_if_the_chunks_cant_be_joined(
+    tmp_path: Path, mock_logger: MagicMock
+):
+    # Arrange
+    from concurrent.futures import ThreadPoolExecutor
+
+    image_files = []
+    for index in range(10):
+        image_files.append(str(tmp_path / f"12_{index:02d}_00{JPG_FILE}"))
+        cv2.imwrite(image_files[-1], np.full((48, 64, 3), index * 20, dtype=np.uint8))
+    output_video = str(tmp_path / f"video{MP4_FILE}")
+
+    with (
+        patch("src.automatic_time_lapse_creator.video_manager.ProcessPoolExecutor", ThreadPoolExecutor),
+        patch("src.automatic_time_lapse_creator.video_manager.find_ffmpeg", return_value="ffmpeg"),
+        patch.object(vm, "_concat_videos", return_value=False),
+        patch.object(vm, "encode_images", wraps=vm.encode_images) as mock_encode_images,
+        patch.object(vm, "create_monthly_summary_video") as mock_transcode,
+    ):
+        # Act
+        result = vm.encode_in_chunks(mock_logger, image_files, output_video, DEFAULT_VIDEO_FPS, (64, 48), 2)
+
+    # Assert
+    assert result
+    mock_transcode.assert_not_called()
+    assert mock_encode_images.call_args.args[1:3] == (image_files, output_video)
+    assert vm.get_video_parameters(output_video) is not None
+    assert sorted(path.name for path in tmp_path.glob(f"*{MP4_FILE}")) == [f"video{MP4_FILE}"]
+
+
+def test_create_timelapse_encodes_small_days_in_one_process(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    for index in range(3):
+        cv2.imwrite(str(tmp_path / f"12_{index:02d}_00{JPG_FILE}"), np.zeros((48, 64, 3), dtype=np.uint8))
+
+    with patch.object(vm, "encode_in_chunks") as mock_encode_in_chunks:
+        # Act
+        result = vm.create_timelapse(mock_logger, tmp_path, str(tmp_path / f"video{MP4_FILE}"), DEFAULT_VIDEO_FPS, chunks=4)
+
+    # Assert
+    assert result
+    mock_encode_in_chunks.assert_not_called()
+
+
+def test_create_timelapse_reads_the_images_from_the_manifest(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    manifest = FrameManifest(tmp_path)
+    for index in range(3):
+        image_path = tmp_path / f"12_{index:02d}_00{JPG_FILE}"
+        cv2.imwrite(str(image_path), np.zeros((48, 64, 3), dtype=np.uint8))
+        if index != 1:
+            manifest.append(image_path)
+    output_video = str(tmp_path / f"video{MP4_FILE}")
+
+    # Act
+    with patch("src.automatic_time_lapse_creator.video_manager.Path.glob") as mock_glob:
+        result = vm.create_timelapse(mock_logger, tmp_path, output_video, DEFAULT_VIDEO_FPS)
+
+    # Assert
+    assert result
+    mock_glob.assert_not_called()
+    cap = cv2.VideoCapture(output_video)
+    assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 2
+    cap.release()
+
+
+def test_delete_source_media_files_deletes_the_images_of_the_manifest(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    manifest = FrameManifest(tmp_path)
+    for name in ("a", "b"):
+        (tmp_path / f"{name}{JPG_FILE}").write_bytes(b"image")
+        manifest.append(tmp_path / f"{name}{JPG_FILE}")
+    os.remove(tmp_path / f"b{JPG_FILE}")
+    (tmp_path / f"video{MP4_FILE}").write_bytes(b"video")
+
+    # Act
+    with patch("src.automatic_time_lapse_creator.video_manager.Path.glob") as mock_glob:
+        result = vm.delete_source_media_files(mock_logger, tmp_path)
+
+    # Assert
+    assert result
+    mock_glob.assert_not_called()
+    assert not (tmp_path / FRAMES_MANIFEST_FILE).exists()
+    assert [path.name for path in tmp_path.iterdir()] == [f"video{MP4_FILE}"]
+    mock_logger.info.assert_called_once_with(f"Deleted 1 files from {shorten(str(tmp_path))}")
+
+
+def test_create_timelapse_streams_the_packed_frames(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    frame = Frame(encoded=cv2.imencode(JPG_FILE, np.full((48, 64, 3), 128, dtype=np.uint8))[1].tobytes())
+    for second in range(3):
+        assert vm.save_packed_frame(frame, str(tmp_path / f"12_00_0{second}{JPG_FILE}"), 64, 48)
+    output_video = str(tmp_path / f"video{MP4_FILE}")
+
+    # Act
+    created = vm.create_timelapse(mock_logger, tmp_path, output_video, DEFAULT_VIDEO_FPS)
+    deleted = vm.delete_source_media_files(mock_logger, tmp_path)
+
+    # Assert
+    assert created and deleted
+    assert not list(tmp_path.glob(f"*{JPG_FILE}"))
+    cap = cv2.VideoCapture(output_video)
+    assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 3
+    assert int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) == 64
+    cap.release()
+    assert not PackedFrameStore.exists(tmp_path)
+
+
+def test_create_timelapse_encodes_the_mapped_frames(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    frame = Frame(image=np.full((48, 64, 3), 128, dtype=np.uint8))
+    for second in range(3):
+        assert vm.save_mapped_frame(frame, str(tmp_path / f"12_00_0{second}{JPG_FILE}"), 64, 48)
+    output_video = str(tmp_path / f"video{MP4_FILE}")
+
+    # Act
+    created = vm.create_timelapse(mock_logger, tmp_path, output_video, DEFAULT_VIDEO_FPS)
+    deleted = vm.delete_source_media_files(mock_logger, tmp_path)
+
+    # Assert
+    assert created and deleted
+    assert not list(tmp_path.glob(f"*{JPG_FILE}"))
+    cap = cv2.VideoCapture(output_video)
+    assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 3
+    assert int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) == 48
+    cap.release()
+    assert not MappedFrameStore.exists(tmp_path)
+
+
+def test_create_timelapse_and_save_image_hand_the_media_to_the_storage(tmp_path: Path, mock_logger: MagicMock):
+    # Arrange
+    storage = MagicMock()
+    image = np.full((48, 64, 3), 128, dtype=np.uint8)
+    frame_path = str(tmp_path / f"12_00_00{JPG_FILE}")
+    output_video = str(tmp_path / f"video{MP4_FILE}")
+
+    # Act
+    saved = vm.save_image_with_weather_overlay(Frame(image=image), frame_path, 64, 48, storage=storage)
+    created = vm.create_timelapse(mock_logger, tmp_path, output_video, DEFAULT_VIDEO_FPS, storage=storage)
+
+    # Assert
+    assert saved and created
+    storage.store_frame.assert_called_once_with(frame_path)
+    storage.store_video.assert_called_once_with(output_video)
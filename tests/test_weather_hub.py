@@ -0,0 +1,123 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from src.automatic_time_lapse_creator.common.constants import (
+    OLD_TIMESTAMP_HOURS,
+    STALE_WEATHER_DATA_MARK,
+)
+from src.automatic_time_lapse_creator.weather_hub import WeatherHub, WeatherReading
+from src.automatic_time_lapse_creator.weather_station_info import MeteoRocks
+import tests.test_data as td
+
+
+@pytest.fixture
+def weather_hub():
+    hub = WeatherHub()
+    yield hub
+    hub.close()
+
+
+def fake_get_data(provider: MeteoRocks, hours_old: int = 0):
+    def _get_data():
+        provider.temperature = 5
+        provider.wind_speed_avg = 3.2
+        provider.wind_speed_gust = 6
+        provider.wind_direction = "N"
+        provider.last_updated = datetime.now() - timedelta(hours=hours_old)
+
+    return _get_data
+
+
+def test_register_deduplicates_providers_by_url(weather_hub: WeatherHub):
+    # Arrange
+    first = MeteoRocks(td.valid_url)
+    second = MeteoRocks(td.valid_url)
+
+    # Act
+    result_first = weather_hub.register(first, start_polling=False)
+    result_second = weather_hub.register(second, start_polling=False)
+
+    # Assert
+    assert result_first is first
+    assert result_second is first
+    assert weather_hub.stations_count == 1
+
+
+def test_reading_returns_None_before_first_refresh(weather_hub: WeatherHub):
+    # Arrange
+    provider = MeteoRocks(td.valid_url)
+    weather_hub.register(provider, start_polling=False)
+
+    # Act & Assert
+    assert weather_hub.reading(provider) is None
+    assert weather_hub.weather_text(provider) is None
+
+
+def test_refresh_stores_reading_for_all_providers_with_the_same_url(weather_hub: WeatherHub):
+    # Arrange
+    provider = MeteoRocks(td.valid_url)
+    duplicate = MeteoRocks(td.valid_url)
+    weather_hub.register(provider, start_polling=False)
+    weather_hub.register(duplicate, start_polling=False)
+
+    # Act
+    with patch.object(provider, "get_data", side_effect=fake_get_data(provider)) as mock_get_data:
+        reading = weather_hub.refresh(td.valid_url)
+
+    # Assert
+    assert isinstance(reading, WeatherReading)
+    mock_get_data.assert_called_once()
+    assert not reading.stale
+    assert weather_hub.weather_text(duplicate) == str(provider)
+
+
+def test_refresh_returns_None_for_unknown_url(weather_hub: WeatherHub):
+    # Act & Assert
+    assert weather_hub.refresh(td.empty_url) is None
+
+
+def test_refresh_keeps_previous_values_if_provider_raises(weather_hub: WeatherHub):
+    # Arrange
+    provider = MeteoRocks(td.valid_url)
+    weather_hub.register(provider, start_polling=False)
+
+    # Act
+    with patch.object(provider, "get_data", side_effect=Exception):
+        reading = weather_hub.refresh(td.valid_url)
+
+    # Assert
+    assert reading is not None
+    assert reading.text == str(provider)
+    assert reading.station_time is None
+
+
+def test_weather_text_marks_stale_readings(weather_hub: WeatherHub):
+    # Arrange
+    provider = MeteoRocks(td.valid_url)
+    weather_hub.register(provider, start_polling=False)
+
+    with patch.object(
+        provider, "get_data", side_effect=fake_get_data(provider, OLD_TIMESTAMP_HOURS + 1)
+    ):
+        weather_hub.refresh(td.valid_url)
+
+    # Act
+    result = weather_hub.weather_text(provider)
+
+    # Assert
+    assert result == f"{provider} {STALE_WEATHER_DATA_MARK}"
+
+
+def test_register_starts_background_polling(weather_hub: WeatherHub):
+    # Arrange
+    provider = MeteoRocks(td.valid_url, refresh_interval_seconds=60)
+
+    # Act
+    with patch.object(provider, "get_data", side_effect=fake_get_data(provider)) as mock_get_data:
+        weather_hub.register(provider)
+        weather_hub.close(timeout=5)
+
+    # Assert
+    mock_get_data.assert_called_once()
+    assert weather_hub.reading(provider) is not None
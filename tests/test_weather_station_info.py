@@ -300,3 +300,18 @@ def test_WeatherStationInfo_parse_float_returns_none_for_invalid_values():
 
         # Assert
         assert result is None
+
+
+def test_meteo_rocks_get_data_sets_last_updated(
+    mock_weather_station_info: MeteoRocks, mock_get: Response
+):
+    # Arrange
+    with patch(
+        "src.automatic_time_lapse_creator.weather_station_info.requests.get",
+        return_value=mock_get,
+    ):
+        # Act
+        mock_weather_station_info.get_data()
+
+    # Assert
+    assert mock_weather_station_info.last_updated is not None
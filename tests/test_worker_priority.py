@@ -0,0 +1,119 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from threading import Event
+from unittest.mock import MagicMock, patch
+from src.automatic_time_lapse_creator.job_queue import JobQueue, JobWorkerPool
+from src.automatic_time_lapse_creator.worker_priority import WorkerPriority, apply_worker_priority, initialize_worker_process
+
+MODULE = "src.automatic_time_lapse_creator.worker_priority"
+
+
+def test_worker_cpus_leaves_the_reserved_cores_for_the_capture():
+    # Arrange
+    priority = WorkerPriority(reserved_cores=1)
+
+    # Act
+    with patch(f"{MODULE}.os.sched_getaffinity", return_value={0, 1, 2, 3}, create=True):
+        cpus = priority.worker_cpus()
+
+    # Assert
+    assert cpus == {1, 2, 3}
+
+
+def test_worker_cpus_keeps_the_cpus_if_all_would_be_reserved():
+    # Arrange
+    priority = WorkerPriority(cpu_affinity=(2, 3), reserved_cores=2)
+
+    # Act
+    cpus = priority.worker_cpus()
+
+    # Assert
+    assert cpus == {2, 3}
+    assert WorkerPriority().worker_cpus() is None
+
+
+def test_apply_worker_priority_sets_the_calling_thread():
+    # Arrange
+    priority = WorkerPriority(nice=15, io_class=2, io_level=7, cpu_affinity=(1,), opencv_threads=1)
+    mock_run = MagicMock(return_value=MagicMock(returncode=0))
+
+    # Act
+    with (
+        patch(f"{MODULE}.threading.get_native_id", return_value=4321),
+        patch(f"{MODULE}.os.setpriority", create=True) as mock_setpriority,
+        patch(f"{MODULE}.os.sched_setaffinity", create=True) as mock_setaffinity,
+        patch(f"{MODULE}.shutil.which", return_value="/usr/bin/ionice"),
+        patch(f"{MODULE}.subprocess.run", mock_run),
+        patch(f"{MODULE}.cv2.setNumThreads") as mock_set_threads,
+    ):
+        apply_worker_priority(priority)
+
+    # Assert
+    assert mock_setpriority.call_args.args[1:] == (4321, 15)
+    mock_setaffinity.assert_called_once_with(4321, {1})
+    assert mock_run.call_args.args[0] == ["/usr/bin/ionice", "-c", "2", "-n", "7", "-p", "4321"]
+    mock_set_threads.assert_called_once_with(1)
+
+
+def test_apply_worker_priority_in_a_thread_logs_errors_and_keeps_opencv_threads():
+    # Arrange
+    priority = WorkerPriority(nice=5, io_class=3, opencv_threads=1)
+    logger = MagicMock()
+
+    # Act
+    with (
+        patch(f"{MODULE}.os.setpriority", side_effect=PermissionError("denied"), create=True),
+        patch(f"{MODULE}.shutil.which", return_value=None),
+        patch(f"{MODULE}.cv2.setNumThreads") as mock_set_threads,
+    ):
+        apply_worker_priority(priority, process_wide=False, logger=logger)
+        apply_worker_priority(None, logger=logger)
+
+    # Assert
+    assert logger.warning.call_count == 2
+    mock_set_threads.assert_not_called()
+
+
+def test_job_workers_run_the_initializer(tmp_path: Path):
+    # Arrange
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    initialized = Event()
+    pool = JobWorkerPool(queue, {}, workers=1, poll_interval=0.01, initializer=initialized.set)
+
+    # Act
+    pool.start()
+    result = initialized.wait(5)
+    pool.stop(5)
+    queue.close()
+
+    # Assert
+    assert result
+
+
+def _log_from_worker(logger: logging.Logger) -> str:
+    logger.info("encoded in the worker")
+    return logger.name
+
+
+def test_initialize_worker_process_sends_the_logs_of_a_spawned_worker_to_the_queue():
+    # Arrange
+    context = multiprocessing.get_context("spawn")
+    log_queue = context.Queue()
+    logger = logging.getLogger("test_worker_logger")
+
+    # Act
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=context,
+        initializer=initialize_worker_process,
+        initargs=(None, log_queue, logger.name),
+    ) as executor:
+        name = executor.submit(_log_from_worker, logger).result()
+    record = log_queue.get(timeout=10)
+
+    # Assert
+    assert name == logger.name
+    assert record.name == logger.name
+    assert record.getMessage() == "encoded in the worker"